@@ -1,4 +1,6 @@
 import maya.cmds as cmds
+import rig_manifest
+import rig_symmetry
 
 
 # ----------------- HELPERS ----------------- #
@@ -53,13 +55,6 @@ def _ensure_node(name, type_name):
 		return name
 	return cmds.createNode(type_name, n=name)
 
-def _lr_mirror(name):
-	if "_l_" in name:
-		return name.replace("_l_", "_r_", 1)
-	elif "_r_" in name:
-		return name.replace("_r_", "_l_", 1)
-	return name
-
 
 ft_upperleg_jnt = 'jnt_l_ft_upperlegTwist_0001'
 
@@ -96,13 +91,14 @@ def create_rbf(jnt, side, desc, values):
 	create rbf weight driver
 	"""
 	# create rbf weight driver
-	part = jnt.split('_')[3]
 	region = jnt.split('_')[2]
-	# side = _side_from_name(jnt)
-	index = _push_index_from_name(jnt)
 	
-	# for side in ['l', 'r']:
-	jnt = f'jnt_{side}_{region}_{part}_{index}'
+	# driver joint of this side from the symmetry map
+	side_jnt = rig_symmetry.current([jnt]).on_side(jnt, side)
+	if side_jnt is None:
+		cmds.warning(f"RBF driver joint missing for side {side}: {rig_symmetry.mirror_name(jnt)}")
+		return None
+	jnt = side_jnt
 	rbf_name = f'rbf_{side}_{region}_{desc}_0001'
 	rbf_node = cmds.createNode('weightDriver', n=rbf_name)
 	rbf_transform = cmds.listRelatives(rbf_node, parent=True)[0]
@@ -135,10 +131,12 @@ def create_rbf(jnt, side, desc, values):
 	return rbf_node
 
 # connect to pose
-def connect_pose_loc(loc, side):
+def connect_pose_loc(loc, side, manifest=None):
 	"""
 	connect to pose nodes
+	manifest: rig_manifest.RigManifest, loaded from the master node when not given.
 	"""
+	manifest = manifest or rig_manifest.RigManifest.find()
 	part = loc.split('_')[3]
 	region = loc.split('_')[2]
 	# side = _side_from_name(loc)
@@ -146,7 +144,7 @@ def connect_pose_loc(loc, side):
 	
 	nodes = []
 	
-	pose_num = len(cmds.ls(f'loc_{side}_{region}_{part}_pushPose_{index}_*', type='transform'))
+	pose_num = len(rig_manifest.ls(f'loc_{side}_{region}_{part}_pushPose_{index}_*', 'transform', manifest))
 	
 	for val in ['trans', 'rot', 'scale']:
 		for i in range(1, pose_num+1):
@@ -158,9 +156,12 @@ def connect_pose_loc(loc, side):
 	return nodes, int(pose_num)
 
 def rbf_setup(jnt, desc, values, loc):
+	manifest = rig_manifest.RigManifest.find()
 	for side in ['l', 'r']:
 		rbf_node = create_rbf(jnt, side, desc, values)
-		pose_nodes, index = connect_pose_loc(loc, side)
+		if rbf_node is None:
+			continue
+		pose_nodes, index = connect_pose_loc(loc, side, manifest)
 		
 		for node in pose_nodes:
 			# find 0001 / 0002 from node name
@@ -169,8 +170,9 @@ def rbf_setup(jnt, desc, values, loc):
 			
 			for attr in 'XYZ':
 				connect_attr(rbf_node, f'output[{pose_index}]', node, f'input2{attr}')
-	
-	
-rbf_setup('jnt_l_ft_upperlegTwist_0001', 'upperleg', ft_upperleg_dict, 'loc_l_ft_upperleg_pushPose_0001_0001')
+
+
+if __name__ == "__main__":
+	rbf_setup('jnt_l_ft_upperlegTwist_0001', 'upperleg', ft_upperleg_dict, 'loc_l_ft_upperleg_pushPose_0001_0001')
 # rbf_setup('jnt_l_bk_upperlegTwist_0001', 'upperleg', bk_upperleg_dict)
 	
@@ -1,6 +1,41 @@
+from collections import namedtuple
+
 import maya.cmds as cmds
 
+import rig_name_cache
+import rig_symmetry
+from rig_registry import RigRegistry
+
+HIERARCHY_LEVELS = ("zero", "offset", "driven", "connect")
+
+
+class ControlHierarchy(namedtuple('ControlHierarchy', ('ctrl',) + HIERARCHY_LEVELS)):
+	"""
+	Groups build_control_hierarchy made above a control, None for levels it did not make:
+		hierarchy = AutoRigHelpers.build_control_hierarchy('ctrl_c_head_0001', 2, parent=grp)
+		hierarchy.zero, hierarchy.offset, hierarchy.top, hierarchy.bottom
+	"""
+	__slots__ = ()
+	
+	@property
+	def groups(self):
+		"""{level_name: group_name, ...} of the levels made, top first."""
+		return {lvl: getattr(self, lvl) for lvl in HIERARCHY_LEVELS if getattr(self, lvl)}
+	
+	@property
+	def top(self):
+		"""The zero group, the one callers parent."""
+		return self.zero
+	
+	@property
+	def bottom(self):
+		"""The group the control sits under."""
+		return list(self.groups.values())[-1]
+
+
 class AutoRigHelpers(object):
+	# shared with the Master / LimbsAutoRig of the current build
+	registry = RigRegistry()
 	
 	@classmethod
 	def add_attr(cls, node, long_name, attr_type, default_value=None, min_value=None, max_value=None, keyable=True,
@@ -95,14 +130,19 @@ class AutoRigHelpers(object):
 	@classmethod
 	def create_empty_group(cls, name, parent=None):
 		group = cmds.createNode('transform', name=name, parent=parent)
+		# existence only, callers may still move it with cmds.parent
+		rig_name_cache.current().record(group)
 		
 		return group
 	
 	@classmethod
-	def create_control_hierarchy(cls, ctrl, levels=4):
+	def build_control_hierarchy(cls, ctrl, levels=4, parent=None, matrix=None):
 		"""
-		Create a flexible control hierarchy for the given control.
-
+		Create the zero / offset / driven / connect groups above a control.
+		
+		The control's world matrix is read once (or given) and set on the zero group only,
+		the other groups are created under their parent with an identity local transform.
+		
 		Args:
 			ctrl (str): Name of the control curve transform.
 			levels (int): Number of hierarchy levels to create.
@@ -110,44 +150,53 @@ class AutoRigHelpers(object):
 				2 = zero, offset
 				3 = zero, offset, driven
 				4 = zero, offset, driven, connect (default)
-
+			parent (str): create the zero group under this node, in the world otherwise.
+			matrix (list): world matrix of the control when the caller already has it.
+		
 		Returns:
-			dict: {level_name: group_name, ...}
+			ControlHierarchy: None when the control does not exist or levels < 1.
 		"""
-		if not cmds.objExists(ctrl):
+		names = rig_name_cache.current()
+		if not names.exists(ctrl):
 			cmds.warning(f"Control {ctrl} does not exist.")
-			return {}
+			return None
 		
-		# Predefined hierarchy naming
-		base_levels = ["zero", "offset", "driven", "connect"]
 		if levels < 1:
 			cmds.warning("Levels must be at least 1.")
-			return {}
-		levels = min(levels, len(base_levels))  # Clamp to max supported
-		used_levels = base_levels[:levels]
-		
-		hierarchy = {}
-		previous_grp = None
+			return None
+		used_levels = HIERARCHY_LEVELS[:levels]  # Clamp to max supported
 		
 		# Extract base naming (e.g. "ctrl_c_head_0001" → "c_head_0001")
 		parts = ctrl.split("_")
 		base_suffix = "_".join(parts[1:]) if len(parts) > 1 else ctrl
 		
-		# Build hierarchy
+		if matrix is None:
+			matrix = cmds.xform(ctrl, q=True, ws=True, m=True)
+		
+		# only the zero group is placed, the rest inherit it
+		hierarchy = {}
+		previous_grp = parent
 		for lvl in used_levels:
-			grp_name = f"{lvl}_{base_suffix}"
-			grp = cmds.createNode("transform", name=grp_name)
-			cmds.matchTransform(grp, ctrl)
-			
-			if previous_grp:
-				cmds.parent(grp, previous_grp)
+			grp = names.create_node("transform", f"{lvl}_{base_suffix}", parent=previous_grp)
+			if lvl == used_levels[0]:
+				cmds.xform(grp, ws=True, m=matrix)
 			previous_grp = grp
 			hierarchy[lvl] = grp
 		
 		# Parent the control under the last created group
-		cmds.parent(ctrl, previous_grp)
+		names.reparent(ctrl, previous_grp)
+		# callers may move the zero group with cmds.parent, its parent is asked from the scene
+		names.release(hierarchy[used_levels[0]])
 		
-		return hierarchy
+		return ControlHierarchy(ctrl=ctrl, **{lvl: hierarchy.get(lvl) for lvl in HIERARCHY_LEVELS})
+	
+	@classmethod
+	def create_control_hierarchy(cls, ctrl, levels=4):
+		"""
+		build_control_hierarchy returning {level_name: group_name, ...}, empty when nothing was made.
+		"""
+		hierarchy = cls.build_control_hierarchy(ctrl, levels)
+		return hierarchy.groups if hierarchy else {}
 	
 	@classmethod
 	def get_parent_grp(cls, ctrl):
@@ -156,107 +205,128 @@ class AutoRigHelpers(object):
 		zero → offset → driven → connect → ctrl
 
 		This function is safe even if some groups don't exist.
-		It will return None for missing groups.
+		It will return None for missing groups. Right after building, use the
+		ControlHierarchy build_control_hierarchy returns instead.
 
 		Returns:
 			(zero, offset, driven, connect)
 		"""
-		if not cmds.objExists(ctrl):
+		names = rig_name_cache.current()
+		if not names.exists(ctrl):
 			cmds.warning(f"Control '{ctrl}' does not exist.")
 			return None, None, None, None
 		
 		zero = offset = driven = connect = None
 		
 		try:
-			connect = cmds.listRelatives(ctrl, parent=True, type="transform")
+			# groups made by create_control_hierarchy are answered from the name cache
+			connect = names.parent(ctrl)
 			if connect:
-				connect = connect[0]
-				driven = cmds.listRelatives(connect, parent=True, type="transform")
+				driven = names.parent(connect)
 				if driven:
-					driven = driven[0]
-					offset = cmds.listRelatives(driven, parent=True, type="transform")
+					offset = names.parent(driven)
 					if offset:
-						offset = offset[0]
-						zero = cmds.listRelatives(offset, parent=True, type="transform")
-						if zero:
-							zero = zero[0]
+						zero = names.parent(offset)
 		except Exception as e:
 			cmds.warning(f"Error getting parent hierarchy for {ctrl}: {e}")
 		
 		return zero, offset, driven, connect
 	
+	# ======================
+	# Shape Mirroring
+	# ======================
+	@classmethod
+	def read_cv_positions(cls, shape):
+		"""World space position of every CV as one flat [x, y, z, x, y, z, ...] list (single xform query)."""
+		return cmds.xform(f"{shape}.cv[*]", q=True, ws=True, t=True) or []
+	
+	@classmethod
+	def write_cv_positions(cls, shape, positions):
+		"""
+		Write a flat world space CV list back onto a curve shape with a single setAttr.
+		Periodic curves get their overlapping CVs filled from the first points.
+		"""
+		count = len(positions) // 3
+		if not count:
+			return
+		
+		parent = cmds.listRelatives(shape, parent=True, fullPath=True)[0]
+		inv = cmds.getAttr(f"{parent}.worldInverseMatrix[0]")
+		local = []
+		for i in range(0, count * 3, 3):
+			x, y, z = positions[i:i + 3]
+			local.extend((
+				x * inv[0] + y * inv[4] + z * inv[8] + inv[12],
+				x * inv[1] + y * inv[5] + z * inv[9] + inv[13],
+				x * inv[2] + y * inv[6] + z * inv[10] + inv[14],
+			))
+		
+		num_cvs = cmds.getAttr(f"{shape}.spans") + cmds.getAttr(f"{shape}.degree")
+		if num_cvs > count:
+			local.extend(local[:(num_cvs - count) * 3])
+		cmds.setAttr(f"{shape}.controlPoints[0:{len(local) // 3 - 1}]", *local)
+	
+	@classmethod
+	def mirror_cv_positions(cls, positions):
+		"""Negate every X component of a flat CV list in one slice pass."""
+		mirrored = list(positions)
+		mirrored[0::3] = [-x for x in mirrored[0::3]]
+		return mirrored
+	
 	@classmethod
 	def mirror_curve_shape(cls, left_ctrl, right_ctrl):
 		"""
 		Mirror only the NURBS curve shape from left_ctrl → right_ctrl.
 		Does NOT touch transforms or hierarchy.
+		
+		Returns:
+			int: number of shapes mirrored
 		"""
 		if not cmds.objExists(left_ctrl) or not cmds.objExists(right_ctrl):
 			cmds.warning(f"❌ Missing controls: {left_ctrl}, {right_ctrl}")
-			return
+			return 0
 		
 		shapes_l = cmds.listRelatives(left_ctrl, shapes=True, type='nurbsCurve', fullPath=True) or []
 		shapes_r = cmds.listRelatives(right_ctrl, shapes=True, type='nurbsCurve', fullPath=True) or []
 		
 		if not shapes_l or not shapes_r:
 			cmds.warning(f"⚠️ Missing shapes on {left_ctrl} or {right_ctrl}")
-			return
+			return 0
 		
+		mirrored = 0
 		for shape_l, shape_r in zip(shapes_l, shapes_r):
-			cvs_l = cmds.ls(f"{shape_l}.cv[*]", flatten=True)
-			cvs_r = cmds.ls(f"{shape_r}.cv[*]", flatten=True)
-			
-			if len(cvs_l) != len(cvs_r):
+			positions = cls.read_cv_positions(shape_l)
+			if len(positions) != len(cls.read_cv_positions(shape_r)):
 				cmds.warning(f"⚠️ CV count mismatch: {shape_l} vs {shape_r}")
 				continue
 			
-			for i, cv_l in enumerate(cvs_l):
-				pos = cmds.xform(cv_l, q=True, ws=True, t=True)
-				pos[0] *= -1  # Mirror X only
-				cmds.xform(cvs_r[i], ws=True, t=pos)
-
-	@classmethod
+			cls.write_cv_positions(shape_r, cls.mirror_cv_positions(positions))
+			mirrored += 1
+		
+		return mirrored
+	
 	# ======================
 	# Final Shape Mirror Utility
 	# ======================
-	def mirror_all_right_shapes(self):
+	@classmethod
+	def mirror_all_right_shapes(cls):
 		"""Mirror all right-side control shapes from their left counterparts (ignores moveAll)."""
 		print("🔁 Starting final shape mirroring pass (ctrl_r_ only)...")
 		
-		# Find all right-side controls in the scene
-		right_ctrls = [c for c in cmds.ls(type="transform") if c.startswith("ctrl_r_")]
-		if not right_ctrls:
+		# counterparts from the rig's symmetry map instead of a replace + objExists per control
+		symmetry = rig_symmetry.current()
+		pairs = symmetry.pairs("ctrl_l_*")
+		for ctrl_r in symmetry.unpaired("r", "ctrl_r_*"):
+			print(f"⚠️ Left control not found for: {ctrl_r}")
+		if not pairs:
 			print("⚠️ No right-side controls found (ctrl_r_)")
 			return
 		
 		mirrored_count = 0
-		for ctrl_r in right_ctrls:
-			ctrl_l = ctrl_r.replace("_r_", "_l_")
-			if not cmds.objExists(ctrl_l):
-				print(f"⚠️ Left control not found for: {ctrl_r}")
-				continue
-			
-			# Get shape nodes
-			shapes_r = cmds.listRelatives(ctrl_r, shapes=True, type="nurbsCurve", fullPath=True) or []
-			shapes_l = cmds.listRelatives(ctrl_l, shapes=True, type="nurbsCurve", fullPath=True) or []
-			if not shapes_l or not shapes_r:
-				print(f"⚠️ Missing shapes on: {ctrl_r} or {ctrl_l}")
-				continue
-			
-			# Mirror CVs
-			for shape_l, shape_r in zip(shapes_l, shapes_r):
-				cvs_l = cmds.ls(f"{shape_l}.cv[*]", flatten=True)
-				cvs_r = cmds.ls(f"{shape_r}.cv[*]", flatten=True)
-				if len(cvs_l) != len(cvs_r):
-					print(f"⚠️ Shape mismatch: {shape_l} vs {shape_r}")
-					continue
-				
-				for i, cv_l in enumerate(cvs_l):
-					pos = cmds.xform(cv_l, q=True, ws=True, t=True)
-					pos[0] *= -1  # mirror on X
-					cmds.xform(cvs_r[i], ws=True, t=pos)
-				
-				mirrored_count += 1
+		for ctrl_l, ctrl_r in pairs:
+			mirrored_count += cls.mirror_curve_shape(ctrl_l, ctrl_r)
+		
+		print(f"✅ Mirrored {mirrored_count} right-side shapes")
 	
 	@classmethod
 	def lock_and_hide_ctrls(cls, ctrl=None):
@@ -280,19 +350,17 @@ class AutoRigHelpers(object):
 	
 	@classmethod
 	def store(cls, name, value):
-		"""Convenience for self variable assignment"""
-		setattr(cls, name, value)
-		return value
+		"""Register a rig handle by name, see rig_registry.RigRegistry."""
+		return cls.registry.register(name, value)
 	
 	@classmethod
 	def get(cls, name, default=None, warn=True):
-		"""Safely retrieve a stored self variable by name."""
-		if hasattr(cls, name):
-			return getattr(cls, name)
-		else:
-			if warn:
-				cmds.warning(f"[Rig] Missing attribute: self.{name}")
-			return default
+		"""Safely retrieve a registered rig handle by name."""
+		if name in cls.registry:
+			return cls.registry.get(name)
+		if warn:
+			cmds.warning(f"[Rig] Missing attribute: self.{name}")
+		return default
 	
 	@staticmethod
 	def set_ctrl_color(ctrls, side="c"):
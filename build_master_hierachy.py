@@ -1,20 +1,23 @@
 import maya.cmds as cmds
 import maya.mel as mel
-import importlib
-import auto_rig_helpers
-import neck_spine_auto_rig
 import curve_library
+import rig_name_cache
 
-importlib.reload(auto_rig_helpers)
-importlib.reload(curve_library)
-importlib.reload(neck_spine_auto_rig)
 from auto_rig_helpers import AutoRigHelpers
+from rig_registry import RigRegistry
 
 crv_lib = curve_library.RigCurveLibrary()
 
 class Master(object):
 	
 	def __init__(self):
+		# one registry per build, shared through AutoRigHelpers.store / get
+		self.registry = RigRegistry()
+		AutoRigHelpers.registry = self.registry
+		# and one name cache, nodes of an earlier build may be gone
+		self.names = rig_name_cache.reset()
+		
+		self.master_grp = None
 		self.control_grp = None
 		self.joint_grp = None
 		self.rig_nodes_local = None
@@ -36,6 +39,7 @@ class Master(object):
 		AutoRigHelpers.set_attr(rig_nodes_local, 'visibility', False)
 		AutoRigHelpers.set_attr(rig_nodes_world, 'visibility', False)
 		
+		self.master_grp = master_grp
 		self.control_grp = control_grp
 		self.joint_grp = joint_grp
 		self.rig_nodes_world = rig_nodes_world
@@ -48,21 +52,15 @@ class Master(object):
 		AutoRigHelpers.store(f'rig_nodes_local', rig_nodes_local)
 		
 	def create_move_all_ctrl(self, control_grp):
-		move_all_ctrl = crv_lib.circle(22, 'ctrl_c_move_all_0001')
-		move_all_off_ctrl = crv_lib.create_four_arrow_curve('ctrl_c_move_all_0002')
+		move_all_ctrl = crv_lib.create('circle', 'ctrl_c_move_all_0001', 22)
+		move_all_off_ctrl = crv_lib.create('four_arrow', 'ctrl_c_move_all_0002')
 		
-		AutoRigHelpers.create_control_hierarchy(move_all_ctrl, 1)
-		AutoRigHelpers.create_control_hierarchy(move_all_off_ctrl, 1)
+		AutoRigHelpers.build_control_hierarchy(move_all_ctrl, 1, parent=control_grp)
+		AutoRigHelpers.build_control_hierarchy(move_all_off_ctrl, 1, parent=move_all_ctrl)
 		
 		AutoRigHelpers.lock_hide_attr(move_all_ctrl, ['visibility'])
 		AutoRigHelpers.lock_hide_attr(move_all_off_ctrl, ['visibility'])
 		
-		move_all_zero = AutoRigHelpers.get_parent_grp(move_all_ctrl)[3]
-		move_all_off_zero = AutoRigHelpers.get_parent_grp(move_all_off_ctrl)[3]
-		
-		cmds.parent(move_all_zero, control_grp)
-		cmds.parent(move_all_off_zero, move_all_ctrl)
-		
 		cmds.scaleConstraint(move_all_off_ctrl, AutoRigHelpers.get('joint_grp'))
 		cmds.scaleConstraint(move_all_off_ctrl, AutoRigHelpers.get('rig_nodes_world'))
 		
@@ -70,4 +68,8 @@ class Master(object):
 		
 	def construct_master(self):
 		self.create_groups()
-		self.create_move_all_ctrl(AutoRigHelpers.get(f'control_grp'))
\ No newline at end of file
+		self.create_move_all_ctrl(AutoRigHelpers.get(f'control_grp'))
+	
+	def save_registry(self):
+		"""Store every registered handle on the master node for later sessions."""
+		self.registry.save(self.master_grp)
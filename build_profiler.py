@@ -0,0 +1,338 @@
+"""
+Opt-in build profiler.
+
+Wraps every maya.cmds command and the stage methods of the rig builders so a
+build reports where its time goes:
+	- wall time per stage (inclusive and self)
+	- cmds calls per command name, in total and per stage
+	- nodes created by type
+	- the slowest individual cmds calls
+
+Example:
+	profiler = BuildProfiler()
+	with profiler:
+		master = profiler.instrument(build_master_hierachy.Master())
+		master.construct_master()
+		...
+	profiler.write_json(r"D:/profile/cat_build.json")
+	profiler.write_collapsed(r"D:/profile/cat_build.folded")
+
+The collapsed file is the `frame;frame;frame value` format read by
+flamegraph.pl / speedscope, values are self time in microseconds.
+"""
+import heapq
+import inspect
+import json
+import time
+from collections import defaultdict
+from functools import wraps
+
+import maya.cmds as cmds
+
+# cmds commands that create nodes, mapped to the node type they create when it is not passed in
+NODE_CREATING_COMMANDS = {
+	'createNode': None,
+	'shadingNode': None,
+	'joint': 'joint',
+	'spaceLocator': 'locator',
+	'curve': 'nurbsCurve',
+	'circle': 'nurbsCurve',
+	'duplicate': 'duplicate',
+	'mirrorJoint': 'joint',
+	'ikHandle': 'ikHandle',
+	'parentConstraint': 'parentConstraint',
+	'pointConstraint': 'pointConstraint',
+	'orientConstraint': 'orientConstraint',
+	'aimConstraint': 'aimConstraint',
+	'scaleConstraint': 'scaleConstraint',
+	'poleVectorConstraint': 'poleVectorConstraint',
+	'skinCluster': 'skinCluster',
+	'createDisplayLayer': 'displayLayer',
+	'annotate': 'annotationShape',
+}
+
+# cmds attributes that are not commands and should never be wrapped
+_SKIP_COMMANDS = ('get_scene', 'new_scene', 'mel_eval')
+
+
+class BuildProfiler(object):
+	"""
+	Collects timings while active. Use as a context manager, or call
+	start() / stop() around the build.
+	"""
+
+	def __init__(self, top_n=25):
+		self.top_n = top_n
+		self._original_cmds = {}
+		self._instrumented = []
+		self._stack = []
+		self._in_cmds = False
+		self.reset()
+
+	def reset(self):
+		self.stage_total = defaultdict(float)
+		self.stage_self = defaultdict(float)
+		self.stage_calls = defaultdict(int)
+		self.cmds_counts = defaultdict(int)
+		self.cmds_time = defaultdict(float)
+		self.stage_cmds_counts = defaultdict(lambda: defaultdict(int))
+		self.nodes_created = defaultdict(int)
+		self.collapsed = defaultdict(float)
+		self._slowest = []
+		self._wall_start = None
+		self.wall_time = 0.0
+
+	# ======================
+	# Activation
+	# ======================
+
+	def __enter__(self):
+		self.start()
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.stop()
+		return False
+
+	def start(self):
+		"""Wrap every public cmds command."""
+		if self._original_cmds:
+			return
+		for name in dir(cmds):
+			if name.startswith('_') or name in _SKIP_COMMANDS:
+				continue
+			func = getattr(cmds, name)
+			if not callable(func) or inspect.isclass(func) or inspect.ismodule(func):
+				continue
+			self._original_cmds[name] = func
+			setattr(cmds, name, self._wrap_command(name, func))
+		self._wall_start = time.perf_counter()
+
+	def stop(self):
+		"""Restore cmds and every instrumented object."""
+		for name, func in self._original_cmds.items():
+			setattr(cmds, name, func)
+		self._original_cmds = {}
+
+		for target, name, original, on_instance in reversed(self._instrumented):
+			if on_instance:
+				delattr(target, name)
+			else:
+				setattr(target, name, original)
+		self._instrumented = []
+
+		if self._wall_start is not None:
+			self.wall_time += time.perf_counter() - self._wall_start
+			self._wall_start = None
+
+	def instrument(self, target, methods=None):
+		"""
+		Time the public methods of a rig builder (instance or class) as stages.
+
+		Args:
+			target: e.g. a LimbsAutoRig instance or the AutoRigHelpers class.
+			methods (list): names to wrap, defaults to every public method.
+
+		Returns:
+			the target, so it can wrap a constructor call inline.
+		"""
+		is_class = inspect.isclass(target)
+		cls = target if is_class else type(target)
+		label = cls.__name__
+
+		for name in methods or dir(cls):
+			if name.startswith('_'):
+				continue
+			raw = inspect.getattr_static(cls, name, None)
+			if raw is None:
+				continue
+
+			if is_class:
+				if isinstance(raw, classmethod):
+					wrapped = classmethod(self._wrap_stage(f"{label}.{name}", raw.__func__))
+				elif isinstance(raw, staticmethod):
+					wrapped = staticmethod(self._wrap_stage(f"{label}.{name}", raw.__func__))
+				elif inspect.isfunction(raw):
+					wrapped = self._wrap_stage(f"{label}.{name}", raw)
+				else:
+					continue
+				self._instrumented.append((target, name, raw, False))
+				setattr(target, name, wrapped)
+			else:
+				if not (inspect.isfunction(raw) or isinstance(raw, (classmethod, staticmethod))):
+					continue
+				bound = getattr(target, name)
+				self._instrumented.append((target, name, None, True))
+				setattr(target, name, self._wrap_stage(f"{label}.{name}", bound))
+		return target
+
+	# ======================
+	# Wrappers
+	# ======================
+
+	def _wrap_stage(self, stage_name, func):
+		@wraps(func)
+		def stage(*args, **kwargs):
+			self._stack.append([stage_name, 0.0])
+			start = time.perf_counter()
+			try:
+				return func(*args, **kwargs)
+			finally:
+				elapsed = time.perf_counter() - start
+				_, child_time = self._stack.pop()
+				self._record_frame(stage_name, elapsed, child_time)
+				self.stage_calls[stage_name] += 1
+
+		return stage
+
+	def _wrap_command(self, name, func):
+		@wraps(func)
+		def command(*args, **kwargs):
+			# commands called from inside another command (memory backend) are part of the outer call
+			if self._in_cmds:
+				return func(*args, **kwargs)
+			self._in_cmds = True
+			start = time.perf_counter()
+			try:
+				result = func(*args, **kwargs)
+			finally:
+				elapsed = time.perf_counter() - start
+				self._in_cmds = False
+				self._record_command(name, args, kwargs, elapsed)
+			if name in NODE_CREATING_COMMANDS and not kwargs.get('q') and not kwargs.get('query') \
+					and not kwargs.get('e') and not kwargs.get('edit'):
+				self._record_creation(name, args, result)
+			return result
+
+		return command
+
+	# ======================
+	# Recording
+	# ======================
+
+	def _current_stage(self):
+		return self._stack[-1][0] if self._stack else '<top>'
+
+	def _stack_path(self):
+		return ';'.join(frame[0] for frame in self._stack) or '<top>'
+
+	def _record_frame(self, stage_name, elapsed, child_time):
+		self.stage_total[stage_name] += elapsed
+		self.stage_self[stage_name] += elapsed - child_time
+		path = ';'.join([frame[0] for frame in self._stack] + [stage_name])
+		self.collapsed[path] += elapsed - child_time
+		if self._stack:
+			self._stack[-1][1] += elapsed
+
+	def _record_command(self, name, args, kwargs, elapsed):
+		stage = self._current_stage()
+		self.cmds_counts[name] += 1
+		self.cmds_time[name] += elapsed
+		self.stage_cmds_counts[stage][name] += 1
+		self.collapsed[f"{self._stack_path()};cmds.{name}"] += elapsed
+		if self._stack:
+			self._stack[-1][1] += elapsed
+
+		entry = (elapsed, name, stage, _describe_args(args, kwargs))
+		if len(self._slowest) < self.top_n:
+			heapq.heappush(self._slowest, entry)
+		elif elapsed > self._slowest[0][0]:
+			heapq.heapreplace(self._slowest, entry)
+
+	def _record_creation(self, name, args, result):
+		node_type = NODE_CREATING_COMMANDS[name]
+		if node_type is None:
+			node_type = args[0] if args else 'unknown'
+		count = len(result) if name in ('duplicate', 'mirrorJoint') and isinstance(result, list) else 1
+		self.nodes_created[node_type] += count
+
+	# ======================
+	# Reports
+	# ======================
+
+	def slowest_calls(self):
+		return [
+			{'command': name, 'stage': stage, 'seconds': elapsed, 'args': described}
+			for elapsed, name, stage, described in sorted(self._slowest, reverse=True)
+		]
+
+	def as_dict(self):
+		stages = {}
+		for stage in sorted(self.stage_total, key=self.stage_total.get, reverse=True):
+			stages[stage] = {
+				'calls': self.stage_calls[stage],
+				'total_seconds': self.stage_total[stage],
+				'self_seconds': self.stage_self[stage],
+				'cmds_calls': dict(sorted(self.stage_cmds_counts[stage].items(), key=lambda kv: -kv[1])),
+			}
+		return {
+			'wall_seconds': self.wall_time,
+			'cmds_calls_total': sum(self.cmds_counts.values()),
+			'stages': stages,
+			'cmds': {
+				name: {'calls': self.cmds_counts[name], 'seconds': self.cmds_time[name]}
+				for name in sorted(self.cmds_counts, key=self.cmds_counts.get, reverse=True)
+			},
+			'nodes_created': dict(sorted(self.nodes_created.items(), key=lambda kv: -kv[1])),
+			'slowest_calls': self.slowest_calls(),
+		}
+
+	def write_json(self, path):
+		with open(path, 'w') as f:
+			json.dump(self.as_dict(), f, indent=4)
+		print(f"✅ Build profile written: {path}")
+
+	def write_collapsed(self, path):
+		"""Flame graph input, one `stack value` line per path, value in microseconds."""
+		with open(path, 'w') as f:
+			for path_key in sorted(self.collapsed):
+				micro = int(round(self.collapsed[path_key] * 1e6))
+				if micro > 0:
+					f.write(f"{path_key} {micro}\n")
+		print(f"✅ Collapsed stacks written: {path}")
+
+	def report(self, limit=15):
+		"""Print a short summary to the script editor."""
+		data = self.as_dict()
+		print(f"=== Build profile: {data['wall_seconds']:.3f}s, {data['cmds_calls_total']} cmds calls ===")
+		for stage, info in list(data['stages'].items())[:limit]:
+			print(f"{info['total_seconds']:9.3f}s  self {info['self_seconds']:8.3f}s  x{info['calls']:<4} {stage}")
+		print("--- slowest cmds calls ---")
+		for call in data['slowest_calls'][:limit]:
+			print(f"{call['seconds'] * 1000:9.2f}ms  cmds.{call['command']}  [{call['stage']}]  {call['args']}")
+
+
+def _describe_args(args, kwargs, limit=120):
+	text = ', '.join([repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()])
+	return text if len(text) <= limit else text[:limit - 3] + '...'
+
+
+def profile_rig_build(json_path=None, collapsed_path=None, top_n=25):
+	"""
+	Build master + spine/neck + limbs with every stage instrumented.
+	Expects the template scene to be loaded.
+
+	Returns:
+		BuildProfiler
+	"""
+	import build_master_hierachy
+	import neck_spine_auto_rig
+	import limbs_auto_rig
+	from auto_rig_helpers import AutoRigHelpers
+
+	profiler = BuildProfiler(top_n=top_n)
+	with profiler:
+		profiler.instrument(AutoRigHelpers)
+		master = profiler.instrument(build_master_hierachy.Master())
+		master.construct_master()
+		spine_rig = profiler.instrument(neck_spine_auto_rig.SpineNeckAutoRig(master))
+		spine_rig.construct_rig()
+		limbs_rig = profiler.instrument(limbs_auto_rig.LimbsAutoRig(master, spine_rig))
+		limbs_rig.construct_rig()
+
+	if json_path:
+		profiler.write_json(json_path)
+	if collapsed_path:
+		profiler.write_collapsed(collapsed_path)
+	profiler.report()
+	return profiler
@@ -1,6 +1,31 @@
 import maya.cmds as cmds
+import hashlib
 import json
+import mmap
 import os
+import struct
+import time
+from array import array
+
+# ======================
+# JSON Shape Data
+# ======================
+# {
+#     "schema": "controller_shapes",
+#     "version": 2,
+#     "controllers": {
+#         "ctrl_l_ft_foot_0001": {
+#             "translate": [x, y, z], "rotate": [x, y, z], "scale": [x, y, z],
+#             "shapes": [{"name": "ctrl_l_ft_foot_0001Shape", "color_index": 17,
+#                         "cv_positions": [[x, y, z], ...]}]
+#         }
+#     }
+# }
+# CV positions are world space. Version 1 files (no header, one flat cv_positions
+# list and color_index per controller) are upgraded when loaded.
+
+SHAPE_SCHEMA = "controller_shapes"
+SHAPE_SCHEMA_VERSION = 2
 
 
 def save_controller_shapes(controls, json_path):
@@ -8,44 +33,32 @@ def save_controller_shapes(controls, json_path):
     Save controller world transforms, CV positions, and color index to JSON.
     """
     folder = os.path.dirname(json_path)
-    if not os.path.exists(folder):
+    if folder and not os.path.exists(folder):
         os.makedirs(folder)
 
-    data = {}
+    controllers = {}
 
     for ctrl in controls:
         if not cmds.objExists(ctrl):
             continue
 
-        # === Transform data ===
-        pos = cmds.xform(ctrl, q=True, ws=True, t=True)
-        rot = cmds.xform(ctrl, q=True, ws=True, ro=True)
-        scl = cmds.xform(ctrl, q=True, r=True, s=True)
-
-        # === Shape data ===
-        shapes = cmds.listRelatives(ctrl, s=True, ni=True, f=True) or []
-        cvs_data = []
-        color_index = None
-
-        for shape in shapes:
-            # save CVs
-            cvs = cmds.ls(f"{shape}.cv[*]", fl=True)
-            for cv in cvs:
-                cvs_data.append(cmds.pointPosition(cv, w=True))
-
-            # save indexed color
-            if cmds.getAttr(f"{shape}.overrideEnabled"):
-                color_index = cmds.getAttr(f"{shape}.overrideColor")
-
-        data[ctrl] = {
-            "translate": pos,
-            "rotate": rot,
-            "scale": scl,
-            "cv_positions": cvs_data,
+        record = _query_controller_record(ctrl)
+        shape_names = cmds.listRelatives(ctrl, s=True, ni=True) or []
+        controllers[ctrl] = {
+            "translate": record["translate"],
+            "rotate": record["rotate"],
+            "scale": record["scale"],
+            "shapes": [
+                {
+                    "name": shape_name,
+                    "color_index": color_index,
+                    "cv_positions": [flat[i:i + 3] for i in range(0, len(flat), 3)],
+                }
+                for shape_name, flat, color_index in zip(shape_names, record["shapes"], record["shape_colors"])
+            ],
         }
 
-        if color_index is not None:
-            data[ctrl]["color_index"] = color_index
+    data = {"schema": SHAPE_SCHEMA, "version": SHAPE_SCHEMA_VERSION, "controllers": controllers}
 
     # === Write JSON file ===
     with open(json_path, "w") as f:
@@ -53,68 +66,550 @@ def save_controller_shapes(controls, json_path):
 
     print(f"Controller shapes and colors saved to: {json_path}")
 
-import maya.cmds as cmds
-import json
-import os
 
-def load_controller_shapes(json_path):
+def _flat_points(points, where):
+    flat = []
+    for point in points:
+        if len(point) != 3:
+            raise ValueError(f"{where}: CV positions must be [x, y, z], got {point}")
+        flat.extend(float(v) for v in point)
+    return flat
+
+
+def validate_shape_data(data):
+    """
+    Check shape data once and bring it to the current schema.
+
+    Returns:
+        dict: controller name -> {"shapes": [{"name", "color_index", "cv_positions": flat list}]}
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Shape data must be a JSON object")
+
+    if "version" not in data:
+        # version 1: controller -> flat cv_positions / color_index
+        controllers = {
+            ctrl: {
+                "translate": info.get("translate"),
+                "rotate": info.get("rotate"),
+                "scale": info.get("scale"),
+                "shapes": [{"name": None, "color_index": info.get("color_index"),
+                            "cv_positions": info.get("cv_positions", [])}],
+            }
+            for ctrl, info in data.items()
+        }
+    elif data.get("schema") != SHAPE_SCHEMA or data["version"] != SHAPE_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported shape data: schema {data.get('schema')}, version {data['version']}")
+    else:
+        controllers = data.get("controllers", {})
+
+    validated = {}
+    for ctrl, info in controllers.items():
+        shapes = info.get("shapes")
+        if not isinstance(shapes, list):
+            raise ValueError(f"{ctrl}: 'shapes' must be a list")
+        validated[ctrl] = {
+            "shapes": [
+                {
+                    "name": shape.get("name"),
+                    "color_index": shape.get("color_index"),
+                    "cv_positions": _flat_points(shape.get("cv_positions", []), ctrl),
+                }
+                for shape in shapes
+            ],
+        }
+    return validated
+
+
+def _cv_count(shape):
+    """CVs of a shape as save_controller_shapes reads them, one xform query."""
+    from auto_rig_helpers import AutoRigHelpers
+
+    return len(AutoRigHelpers.read_cv_positions(shape)) // 3
+
+
+def _split_across_shapes(flat, cv_counts):
+    """A controller saved as one CV list (version 1 data) is split over its shapes in order."""
+    split = []
+    for count in cv_counts:
+        size = count * 3
+        split.append(flat[:size])
+        flat = flat[size:]
+    return split
+
+
+def _apply_controller_shapes(ctrl, saved_shapes, report):
+    """
+    Apply saved shape records to a controller, all CVs of a shape in one setAttr.
+    saved_shapes: [{"cv_positions": flat list, "color_index": int or None}]
+    """
+    from auto_rig_helpers import AutoRigHelpers
+
+    current_shapes = cmds.listRelatives(ctrl, s=True, ni=True, f=True) or []
+    if not current_shapes:
+        report["skipped"].append(ctrl)
+        return
+
+    cv_counts = [_cv_count(shape) for shape in current_shapes]
+    if len(saved_shapes) == 1 and len(current_shapes) > 1:
+        color_index = saved_shapes[0]["color_index"]
+        saved_shapes = [
+            {"cv_positions": flat, "color_index": color_index}
+            for flat in _split_across_shapes(saved_shapes[0]["cv_positions"], cv_counts)
+        ]
+
+    for shape, count, saved in zip(current_shapes, cv_counts, saved_shapes):
+        flat = saved["cv_positions"]
+        if not flat or len(flat) != count * 3:
+            report["skipped"].append(shape)
+            continue
+        AutoRigHelpers.write_cv_positions(shape, flat)
+
+        if saved["color_index"] is not None:
+            try:
+                _apply_color(shape, saved["color_index"])
+            except Exception:
+                report["color_fail"].append(shape)
+        report["applied"] += 1
+
+
+def _print_load_report(path, report):
+    if report["missing"]:
+        print(f"Skipped missing controllers: {report['missing']}")
+    if report["skipped"]:
+        print(f"Skipped shapes with no or mismatching CVs: {report['skipped']}")
+    if report["color_fail"]:
+        print(f"Color failed to apply on: {report['color_fail']}")
+
+    print(f"Controller shapes loaded from: {path} - {report['applied']} shapes applied, "
+          f"{len(report['skipped'])} skipped, {len(report['missing'])} missing controllers "
+          f"({report['seconds']:.3f}s)")
+
+
+def load_controller_shapes(json_path, controls=None):
     """
     Load controller shapes and colors
-   
+    Accepts the JSON file or a binary shape library (see save_controller_shapes_binary).
+    controls: optional list of controller names to load, binary files only read those records.
+
+    Returns:
+        dict: applied shape count, skipped shapes, missing controllers, color failures, seconds
     """
     if not os.path.exists(json_path):
         cmds.warning(f"⚠️ Shape file not found: {json_path}")
         return
 
-    with open(json_path, "r") as f:
-        data = json.load(f)
+    if is_binary_shape_file(json_path):
+        return load_controller_shapes_binary(json_path, controls)
 
-    missing_ctrls = []
-    color_fail = []
+    start = time.perf_counter()
+    with open(json_path, "r") as f:
+        data = validate_shape_data(json.load(f))
 
-    for ctrl, ctrl_info in data.items():
-        if not cmds.objExists(ctrl):
-            missing_ctrls.append(ctrl)
+    report = {"applied": 0, "skipped": [], "missing": [], "color_fail": []}
+    for ctrl in controls or list(data):
+        if ctrl not in data or not cmds.objExists(ctrl):
+            report["missing"].append(ctrl)
             continue
+        _apply_controller_shapes(ctrl, data[ctrl]["shapes"], report)
+
+    report["seconds"] = time.perf_counter() - start
+    _print_load_report(json_path, report)
+    return report
+
+
+# ======================
+# Binary Shape Library
+# ======================
+# Little-endian layout (version 3):
+#   header   magic b"CSHP", version u32, controller count u32, index offset u64
+#   CV block x, y, z f32 per CV, world space, shapes one after another
+#   index    per controller: name length u16, utf-8 name, translate/rotate/scale 9 x f32,
+#            shape count u32, CV count u32 per shape, color index i32 per shape (-1 = none),
+#            first CV u64 (in CVs, from the start of the CV block), 16 byte CV/color hash
+# The index sits at the end so an incremental save can overwrite CVs in place or
+# append new ones and only rewrite the index. Version 1 files (index first, no
+# hash, header holds the CV block offset) and version 2 files (one color index
+# i32 per controller in front of the transforms) are still read, their color goes
+# to every shape.
+# Only the index is parsed on open, CVs are read from the memory map on demand.
+
+BINARY_MAGIC = b"CSHP"
+BINARY_VERSION = 3
+
+_HEADER = struct.Struct("<4sIIQ")
+_NAME_LEN = struct.Struct("<H")
+_RECORD = struct.Struct("<9fI")
+# versions 1 and 2: controller color index in front
+_RECORD_V2 = struct.Struct("<i9fI")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_HASH_SIZE = 16
+_BIG_ENDIAN = struct.pack("<f", 1.0) != struct.pack("=f", 1.0)
+
+
+def is_binary_shape_file(path):
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def _pack_cvs(shapes):
+    """float32 little-endian bytes of every shape's CVs."""
+    floats = array("f")
+    for flat in shapes:
+        floats.extend(flat[:len(flat) // 3 * 3])
+    if _BIG_ENDIAN:
+        floats.byteswap()
+    return floats.tobytes()
+
+
+def _pack_colors(shape_colors):
+    return struct.pack(f"<{len(shape_colors)}i", *[-1 if color is None else int(color) for color in shape_colors])
+
+
+def shape_record_hash(cv_bytes, shape_colors):
+    """Hash of the packed float32 CVs and the color index of every shape, as stored in the index."""
+    digest = hashlib.blake2b(cv_bytes, digest_size=_HASH_SIZE)
+    digest.update(_pack_colors(shape_colors))
+    return digest.digest()
+
+
+class ControllerShapeLibrary(object):
+    """
+    Read-only, memory-mapped view of a binary shape library.
 
-        # === Restore shapes ===
-        saved_shapes = ctrl_info.get("shapes", {})
-        current_shapes = cmds.listRelatives(ctrl, s=True, ni=True, f=True) or []
+    Example:
+        with ControllerShapeLibrary(path) as library:
+            info = library.get("ctrl_l_ft_foot_0001")
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            self._file.close()
+            raise ValueError(f"Not a controller shape library: {path}")
+        self.version = None
+        self.index = {}
+        self._read_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+    def names(self):
+        return list(self.index)
+
+    def _read_index(self):
+        magic, self.version, count, block_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != BINARY_MAGIC:
+            self.close()
+            raise ValueError(f"Not a controller shape library: {self.path}")
+        if self.version not in (1, 2, BINARY_VERSION):
+            self.close()
+            raise ValueError(f"Unsupported shape library version {self.version}: {self.path}")
+
+        if self.version == 1:
+            offset, self._cv_block = _HEADER.size, block_offset
+        else:
+            offset, self._cv_block = block_offset, _HEADER.size
+        self.index_offset = offset
+
+        for _ in range(count):
+            (name_len,) = _NAME_LEN.unpack_from(self._map, offset)
+            offset += _NAME_LEN.size
+            name = self._map[offset:offset + name_len].decode("utf-8")
+            offset += name_len
+
+            if self.version < 3:
+                values = _RECORD_V2.unpack_from(self._map, offset)
+                offset += _RECORD_V2.size
+                color_index, values = values[0], values[1:]
+            else:
+                values = _RECORD.unpack_from(self._map, offset)
+                offset += _RECORD.size
+            shape_count = values[-1]
+            cv_counts = list(struct.unpack_from(f"<{shape_count}I", self._map, offset))
+            offset += _U32.size * shape_count
+            if self.version < 3:
+                shape_colors = [color_index] * shape_count
+            else:
+                shape_colors = list(struct.unpack_from(f"<{shape_count}i", self._map, offset))
+                offset += _U32.size * shape_count
+            (first_cv,) = _U64.unpack_from(self._map, offset)
+            offset += _U64.size
+            record_hash = None
+            if self.version > 1:
+                record_hash = self._map[offset:offset + _HASH_SIZE]
+                offset += _HASH_SIZE
+
+            self.index[name] = {
+                "translate": list(values[0:3]),
+                "rotate": list(values[3:6]),
+                "scale": list(values[6:9]),
+                "cv_counts": cv_counts,
+                "shape_colors": [color if color >= 0 else None for color in shape_colors],
+                "first_cv": first_cv,
+                "hash": record_hash,
+            }
+
+    def read_shapes(self, name):
+        """
+        Returns:
+            list: one flat [x, y, z, x, y, z, ...] world space list per shape.
+        """
+        entry = self.index[name]
+        start = self._cv_block + entry["first_cv"] * 12
+        floats = array("f")
+        floats.frombytes(self._map[start:start + sum(entry["cv_counts"]) * 12])
+        if _BIG_ENDIAN:
+            floats.byteswap()
+
+        shapes = []
+        cursor = 0
+        for cv_count in entry["cv_counts"]:
+            shapes.append(floats[cursor:cursor + cv_count * 3].tolist())
+            cursor += cv_count * 3
+        return shapes
+
+    def get(self, name):
+        """Controller record with its CVs, in the JSON layout plus per-shape CV lists."""
+        entry = dict(self.index[name])
+        entry["shapes"] = self.read_shapes(name)
+        return entry
+
+
+def _pack_index(entries):
+    index = bytearray()
+    for name, entry in entries.items():
+        encoded = name.encode("utf-8")
+        cv_counts = entry["cv_counts"]
+
+        index += _NAME_LEN.pack(len(encoded)) + encoded
+        index += _RECORD.pack(*(list(entry.get("translate") or [0, 0, 0]) +
+                                list(entry.get("rotate") or [0, 0, 0]) +
+                                list(entry.get("scale") or [1, 1, 1])),
+                              len(cv_counts))
+        index += struct.pack(f"<{len(cv_counts)}I", *cv_counts)
+        index += _pack_colors(entry["shape_colors"])
+        index += _U64.pack(entry["first_cv"])
+        index += entry["hash"]
+    return bytes(index)
+
+
+def _shape_colors(record):
+    """Color index per shape of a record, None where a shape has no override."""
+    return list(record.get("shape_colors") or [None] * len(record["shapes"]))
+
+
+def _index_entry(record, first_cv, cv_bytes):
+    shape_colors = _shape_colors(record)
+    return {
+        "translate": record.get("translate"),
+        "rotate": record.get("rotate"),
+        "scale": record.get("scale"),
+        "cv_counts": [len(flat) // 3 for flat in record["shapes"]],
+        "shape_colors": shape_colors,
+        "first_cv": first_cv,
+        "hash": shape_record_hash(cv_bytes, shape_colors),
+    }
+
+
+def write_shape_library(records, path):
+    """
+    Write controller records to a binary shape library, replacing the file.
+
+    Args:
+        records (dict): controller name -> {"translate", "rotate", "scale",
+            "shapes": [flat world space CV list per shape], "shape_colors": [color index or None per shape]}
+        path (str): output file
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
 
-        for i, (saved_shape, shape_info) in enumerate(saved_shapes.items()):
-            if not current_shapes:
+    entries = {}
+    first_cv = 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, 0))
+        for name, record in records.items():
+            cv_bytes = _pack_cvs(record["shapes"])
+            entries[name] = _index_entry(record, first_cv, cv_bytes)
+            f.write(cv_bytes)
+            first_cv += len(cv_bytes) // 12
+
+        index_offset = f.tell()
+        f.write(_pack_index(entries))
+        f.seek(0)
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(entries), index_offset))
+
+
+def update_shape_library(records, path):
+    """
+    Incrementally update a binary shape library.
+
+    Records whose CV/color hash matches the file are left alone. Changed records
+    with the same CV counts are overwritten in place, new or resized ones are
+    appended to the CV block. The index is rewritten at the end of the file, so
+    the cost is the changed CVs plus the index, not the whole library.
+    Records in the file but not in `records` are kept.
+
+    Returns:
+        tuple: (written names, unchanged names)
+    """
+    if not os.path.exists(path):
+        write_shape_library(records, path)
+        return list(records), []
+
+    with ControllerShapeLibrary(path) as library:
+        version = library.version
+        entries = {name: dict(entry) for name, entry in library.index.items()}
+        cv_end = library.index_offset
+
+    if version != BINARY_VERSION:
+        # old layout has no hashes and the index in front, rewrite it once
+        with ControllerShapeLibrary(path) as library:
+            merged = {name: library.get(name) for name in library.names()}
+        merged.update(records)
+        write_shape_library(merged, path)
+        return list(records), []
+
+    written = []
+    unchanged = []
+    with open(path, "r+b") as f:
+        for name, record in records.items():
+            cv_bytes = _pack_cvs(record["shapes"])
+            old = entries.get(name)
+            new_hash = shape_record_hash(cv_bytes, _shape_colors(record))
+            if old is not None and old["hash"] == new_hash:
+                # TRS lives in the index only, keep it current
+                old.update(translate=record.get("translate"), rotate=record.get("rotate"),
+                           scale=record.get("scale"))
+                unchanged.append(name)
                 continue
 
-            # Try to match shapes 1:1, otherwise fallback to first
-            shape = current_shapes[i] if i < len(current_shapes) else current_shapes[-1]
+            cv_counts = [len(flat) // 3 for flat in record["shapes"]]
+            if old is not None and old["cv_counts"] == cv_counts:
+                first_cv = old["first_cv"]
+            else:
+                first_cv = (cv_end - _HEADER.size) // 12
+                cv_end += len(cv_bytes)
+            f.seek(_HEADER.size + first_cv * 12)
+            f.write(cv_bytes)
+            entries[name] = _index_entry(record, first_cv, cv_bytes)
+            written.append(name)
+
+        f.seek(cv_end)
+        f.write(_pack_index(entries))
+        f.truncate()
+        f.seek(0)
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(entries), cv_end))
+
+    return written, unchanged
+
+
+def _query_controller_record(ctrl):
+    from auto_rig_helpers import AutoRigHelpers
 
-            # Apply CV positions
-            cvs = cmds.ls(f"{shape}.cv[*]", fl=True)
-            cvs_data = shape_info.get("cv_positions", [])
-            for j, cv in enumerate(cvs):
-                if j < len(cvs_data):
-                    cmds.xform(cv, ws=True, t=cvs_data[j])
+    record = {
+        "translate": cmds.xform(ctrl, q=True, ws=True, t=True),
+        "rotate": cmds.xform(ctrl, q=True, ws=True, ro=True),
+        "scale": cmds.xform(ctrl, q=True, r=True, s=True),
+        "shapes": [],
+        "shape_colors": [],
+    }
+    for shape in cmds.listRelatives(ctrl, s=True, ni=True, f=True) or []:
+        record["shapes"].append(AutoRigHelpers.read_cv_positions(shape))
+        color_index = None
+        if cmds.getAttr(f"{shape}.overrideEnabled"):
+            color_index = cmds.getAttr(f"{shape}.overrideColor")
+        record["shape_colors"].append(color_index)
+    return record
+
+
+def save_controller_shapes_binary(controls, path, incremental=False):
+    """
+    Binary counterpart of save_controller_shapes, one float32 CV block for every control.
+    incremental: only rewrite controllers whose CVs or color changed since the last save,
+        see update_shape_library(). A full save also compacts space left by resized records.
+    """
+    records = {}
+    for ctrl in controls:
+        if cmds.objExists(ctrl):
+            records[ctrl] = _query_controller_record(ctrl)
+
+    if incremental:
+        written, unchanged = update_shape_library(records, path)
+        print(f"Controller shapes saved to: {path} ({len(written)} written, {len(unchanged)} unchanged)")
+        return
 
-            # Apply color (index-based)
-            color_index = shape_info.get("color_index")
-            if color_index is not None:
-                try:
-                    cmds.setAttr(f"{shape}.overrideEnabled", 1)
-                    cmds.setAttr(f"{shape}.overrideRGBColors", 0)
-                    cmds.setAttr(f"{shape}.overrideColor", int(color_index))
-                except Exception:
-                    color_fail.append(shape)
+    write_shape_library(records, path)
+    print(f"Controller shapes and colors saved to: {path}")
 
-    if missing_ctrls:
-        print(f"Skipped missing controllers: {missing_ctrls}")
-    if color_fail:
-        print(f"Color failed to apply on: {color_fail}")
 
-    print(f"Controller shapes loaded successfully from: {json_path}")
+def convert_json_to_binary(json_path, path):
+    """Migrate a JSON shape file written by save_controller_shapes to the binary format."""
+    with open(json_path, "r") as f:
+        raw = json.load(f)
+    data = validate_shape_data(raw)
+    controllers = raw.get("controllers", {}) if "version" in raw else raw
 
+    records = {}
+    for ctrl, info in data.items():
+        records[ctrl] = {
+            "translate": controllers[ctrl].get("translate"),
+            "rotate": controllers[ctrl].get("rotate"),
+            "scale": controllers[ctrl].get("scale"),
+            "shapes": [shape["cv_positions"] for shape in info["shapes"]],
+            "shape_colors": [shape["color_index"] for shape in info["shapes"]],
+        }
 
+    write_shape_library(records, path)
+    print(f"Converted {len(records)} controllers: {json_path} -> {path}")
 
+def _apply_color(shape, color_index):
+    cmds.setAttr(f"{shape}.overrideEnabled", 1)
+    cmds.setAttr(f"{shape}.overrideRGBColors", 0)
+    cmds.setAttr(f"{shape}.overrideColor", int(color_index))
 
 
+def load_controller_shapes_binary(path, controls=None):
+    """
+    Apply a binary shape library, one setAttr per shape.
+    A record saved from a single flat CV list is split across the current shapes in order.
+    """
+    start = time.perf_counter()
+    report = {"applied": 0, "skipped": [], "missing": [], "color_fail": []}
+
+    with ControllerShapeLibrary(path) as library:
+        for ctrl in controls or library.names():
+            if ctrl not in library or not cmds.objExists(ctrl):
+                report["missing"].append(ctrl)
+                continue
 
+            saved_shapes = [{"cv_positions": flat, "color_index": color_index}
+                            for flat, color_index in zip(library.read_shapes(ctrl),
+                                                         library.index[ctrl]["shape_colors"])]
+            _apply_controller_shapes(ctrl, saved_shapes, report)
 
+    report["seconds"] = time.perf_counter() - start
+    _print_load_report(path, report)
+    return report
@@ -1,745 +1,235 @@
+"""
+Control curve shapes.
+
+Every shape but the circle is a record of curve_catalog.txt, one line per
+shape. The file is indexed on first use and each record is parsed the first
+time its shape is asked for. All controls come from one call:
+
+	RigCurveLibrary.create('cube', 'ctrl_c_cog_0001')
+	RigCurveLibrary.create('circle', 'ctrl_c_move_all_0001', scale=22)
+	RigCurveLibrary.create('lollipop', 'ctrl_c_spineSwitch_0001', color=17)
+
+Controls are built from their points with cmds.curve. With
+RigCurveLibrary.use_templates a shape is built once into a hidden template and
+later controls are copies of it (see RigCurveLibrary.copy_template); time both
+with rig_benchmark.py --shapes before turning it on, headless it is the slower one.
+"""
 import json
-import maya.cmds as cmds
 import os
 
+import maya.cmds as cmds
+
+import rig_name_cache
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "curve_catalog.txt")
+
+# hidden group holding one template per shape, see RigCurveLibrary.template()
+TEMPLATE_GRP = "grp_shapeTemplates_0001"
+
+
+def _build_circle(name, scale):
+	circle = cmds.circle(center=(0, 0, 0), normal=(0, 1, 0), radius=scale, name=name)[0]
+	cmds.delete(circle, ch=True)
+	return circle
+
+
+# shapes made by a Maya command instead of catalog points: name -> build(name, scale)
+GENERATED_SHAPES = {
+	"circle": _build_circle,
+}
+
+
+class ShapeCatalog(object):
+	"""Shape records of a catalog file, indexed on first use, each one parsed on first use of its shape."""
+
+	def __init__(self, path=CATALOG_PATH):
+		self.path = path
+		self._records = None  # shape name -> unparsed record
+		self._shapes = {}     # shape name -> parsed curves
+
+	def _index(self):
+		if self._records is not None:
+			return self._records
+		records = {}
+		with open(self.path, "r") as f:
+			for number, line in enumerate(f, 1):
+				line = line.strip()
+				if not line or line.startswith("#"):
+					continue
+				name, _, record = line.partition("\t")
+				if name in records or name in GENERATED_SHAPES:
+					raise ValueError(f"{self.path}:{number}: shape '{name}' is defined twice")
+				records[name] = record
+		self._records = records
+		return records
+
+	def __contains__(self, name):
+		return name in self._index()
+
+	def names(self):
+		return sorted(self._index())
+
+	def get(self, name):
+		"""
+		Returns:
+			list: one dict per curve: degree, periodic, knots, points as (x, y, z), shape suffix
+				and closeCurve flags.
+		"""
+		curves = self._shapes.get(name)
+		if curves is not None:
+			return curves
+		records = self._index()
+		if name not in records:
+			raise ValueError(f"Unknown control shape '{name}', expected one of {', '.join(self.names())}")
+		curves = json.loads(records[name])
+		for i, curve in enumerate(curves):
+			flat = curve["points"]
+			curve["points"] = list(zip(flat[0::3], flat[1::3], flat[2::3]))
+			curve.setdefault("periodic", False)
+			curve.setdefault("shape", "Shape" if i == 0 else f"Shape{i}")
+			curve.setdefault("close", None)
+		self._shapes[name] = curves
+		return curves
+
 
 class RigCurveLibrary(object):
-	
-	@classmethod
-	def circle(cls, radius=1.0, name="circle_crv"):
-		circle = cmds.circle(center=(0, 0, 0), normal=(0, 1, 0), radius=radius, name=name)[0]
-		cmds.delete(circle, ch=True)
-		return  circle
-	
-	@classmethod
-	def two_way_arrow(cls, name="two_way_arrow_crv"):
-		return cmds.curve(
-			degree=1,
-			point=[
-				(-1, 0, -2),
-				(-2, 0, -2),
-				(0, 0, -4),
-				(2, 0, -2),
-				(1, 0, -2),
-				(1, 0, 2),
-				(2, 0, 2),
-				(0, 0, 4),
-				(-2, 0, 2),
-				(-1, 0, 2),
-				(-1, 0, -2)
-			],
-			knot=list(range(11)),
-			name=name
-		)
-	@classmethod
-	def create_cube_curve(cls, name="cube"):
-		cube = cmds.curve(degree=1, point=[
-			[-0.5, 0.5, 0.5],
-			[0.5, 0.5, 0.5],
-			[0.5, -0.5, 0.5],
-			[-0.5, -0.5, 0.5],
-			[-0.5, 0.5, 0.5],
-			[-0.5, 0.5, -0.5],
-			[0.5, 0.5, -0.5],
-			[0.5, 0.5, 0.5],
-			[0.5, -0.5, 0.5],
-			[0.5, -0.5, -0.5],
-			[0.5, 0.5, -0.5],
-			[-0.5, 0.5, -0.5],
-			[-0.5, -0.5, -0.5],
-			[0.5, -0.5, -0.5],
-			[0.5, -0.5, 0.5],
-			[-0.5, -0.5, 0.5],
-			[-0.5, -0.5, -0.5]
-		],
-						  name=name)
-		return cube
+
+	catalog = ShapeCatalog()
+	# opt-in: build each shape once and copy it, by default every control is built from its points
+	use_templates = False
+	_templates = {}  # shape name -> (template transform, [template shapes], [shape suffixes])
+
 	@classmethod
-	def create_rectangle_line_curve(cls, name="rectangle_line"):
-		points = [
-			[-1.0, 0.0, -1.0],  # CV[0]
-			[-1.0, 0.0, 0.0],  # CV[1]
-			[0.0, 0.0, 0.0],  # CV[2]
-			[1.0, 0.0, 0.0],  # CV[3]
-			[1.0, 0.0, -1.0],  # CV[4]
-			[-1.0, 0.0, -1.0],  # CV[5] - close loop
-			[-1.0, 0.0, 0.0],  # CV[6]
-			[0.0, 0.0, 0.0],  # CV[7]
-			[0.0, 0.0, -1.0],  # CV[8]
-			[0.0, 0.0, 0.0],  # CV[9]
-			[0.0, 0.0, 1.0]  # CV[10]
-		]
-		
-		rec_line = cmds.curve(degree=1, point=points, name=name)
-		return rec_line
-	
+	def shape_names(cls):
+		return sorted(set(cls.catalog.names()) | set(GENERATED_SHAPES))
+
 	@classmethod
-	def create_square_curve(cls, name="square_ctrl", size=2.0):
+	def create(cls, shape_name, name, scale=1.0, color=None):
 		"""
-		Create a simple square control curve on the XZ plane.
+		Create a control curve.
 
 		Args:
-			name (str): name of the resulting control
-			size (float): half-length of the square side (2.0 → 4x4 square)
+			shape_name (str): catalog shape or 'circle', see shape_names().
+			name (str): name of the new control.
+			scale (float): uniform scale of the points, the radius of a circle.
+			color (int): override color index of every shape, left alone when None.
 
 		Returns:
-			str: the created curve transform name
-		"""
-		half = size
-		points = [
-			[-half, 0.0, half],  # CV[0]
-			[half, 0.0, half],  # CV[1]
-			[half, 0.0, -half],  # CV[2]
-			[-half, 0.0, -half],  # CV[3]
-			[-half, 0.0, half],  # CV[4] - close the loop
-		]
-		
-		square = cmds.curve(name=name, degree=1, point=points)
-		return square
-	
-	@classmethod
-	def create_rectangle_curve(cls, name="rectangle"):
-		points = [
-			[-1.0, 0.0, -1.0],  # CV[0]
-			[-1.0, 0.0, 0.0],  # CV[1]
-			[1.0, 0.0, 0.0],  # CV[2]
-			[1.0, 0.0, -1.0],  # CV[3]
-			[-1.0, 0.0, -1.0]  # CV[4] - closing the loop
-		]
-		
-		rec = cmds.curve(degree=1, point=points, name=name)
-		return rec
-	@classmethod
-	def create_square_curve(cls, name="square", size=50):
-		points = [
-			[-1.0, 0.0, -1.0],  # CV[0]
-			[-1.0, 0.0, 1.0],  # CV[1]
-			[1.0, 0.0, 1.0],  # CV[2]
-			[1.0, 0.0, -1.0],  # CV[3]
-			[-1.0, 0.0, -1.0]  # CV[4] - closing the loop
-		]
-		
-		square = cmds.curve(name=name, degree=1, point=points)
-		return square
-	@classmethod
-	def create_rectangle_line_2(cls, name="rectangle line 2"):
-		points = [
-			[-2.0, 1.0, 0.0],  # CV[0]
-			[-2.0, -1.0, 0.0],  # CV[1]
-			[2.0, -1.0, 0.0],  # CV[2]
-			[2.0, 1.0, 0.0],  # CV[3]
-			[-2.0, 1.0, 0.0],  # CV[4]
-			[0.0, 0.0, 0.0],  # CV[5]
-			[0.0, 0.0, 2.0],  # CV[6]
-			[0.0, 0.0, 0.0],  # CV[7]
-			[2.0, 1.0, 0.0],  # CV[8]
-			[2.0, -1.0, 0.0],  # CV[9]
-			[0.0, 0.0, 0.0],  # CV[10]
-			[2.0, -1.0, 0.0],  # CV[11]
-			[-2.0, -1.0, 0.0],  # CV[12]
-			[0.0, 0.0, 0.0]  # CV[13]
-		]
-		
-		curve = cmds.curve(name=name, degree=1, point=points)
-		return curve
-	
-	@classmethod
-	def create_diamond(cls, name="diamond"):
-		points = [
-			[7.360295492086398e-07, 12.854696039846903, 2.6969651662128694e-06],
-			[4.532699824175749, 10.977191977264255, 1.978351797561391e-06],
-			[6.410202845855181, 6.4444924579622445, 1.6806927194639979e-06],
-			[4.532698783272554, 1.9117933698159675, 1.978351797561391e-06],
-			[-7.360293973393767e-07, 0.03429034813648535, 2.6969651662128694e-06],
-			[-4.5326998241756975, 1.9117944107191747, 2.740154668859026e-06],
-			[-6.410202845855189, 6.4444939300211495, 2.758040441847511e-06],
-			[-4.53269878327252, 10.977193018167426, 2.740154668859026e-06],
-			[7.360295492086398e-07, 12.854696039846903, 2.6969651662128694e-06],
-			[2.26635275507834, 10.977192237489763, -3.925426399464013],
-			[3.205100542810302, 6.4444928259770435, -5.551393730752744],
-			[2.2663517141751557, 1.911793630041462, -3.925426399464013],
-			[-7.360293973393767e-07, 0.03429034813648535, 2.6969651662128694e-06],
-			[2.26634654864588, 1.911793630042082, 3.92543107478102],
-			[3.2051023030449786, 6.4444928259768695, 5.551398108410686],
-			[2.266347589549069, 10.977192237490303, 3.92543107478102],
-			[7.360295492086398e-07, 12.854696039846903, 2.6969651662128694e-06],
-			[-2.2663465486467453, 10.977192757941367, -3.925432091053521],
-			[-3.2051023030458317, 6.444493562006521, -5.551399124683152],
-			[-2.2663475895499317, 1.9117941504930531, -3.925432091053521],
-			[-7.360293973393767e-07, 0.03429034813648535, 2.6969651662128694e-06],
-			[-2.2663463448753403, 1.911794150492904, 3.925431793393355],
-			[-3.205100542810149, 6.444493562006308, 5.551399124683115],
-			[-2.266345303972156, 10.977192757941204, 3.925431793393355],
-			[7.360295492086398e-07, 12.854696039846903, 2.6969651662128694e-06],
-			[2.266347589549069, 10.977192237490303, 3.92543107478102],
-			[-2.266345303972156, 10.977192757941204, 3.925431793393355],
-			[-4.53269878327252, 10.977193018167426, 2.740154668859026e-06],
-			[-2.2663465486467453, 10.977192757941367, -3.925432091053521],
-			[2.26635275507834, 10.977192237489763, -3.925426399464013],
-			[4.532699824175749, 10.977191977264255, 1.978351797561391e-06],
-			[2.266347589549069, 10.977192237490303, 3.92543107478102],
-			[3.2051023030449786, 6.4444928259768695, 5.551398108410686],
-			[6.410202845855181, 6.4444924579622445, 1.6806927194639979e-06],
-			[3.205100542810302, 6.4444928259770435, -5.551393730752744],
-			[-3.2051023030458317, 6.444493562006521, -5.551399124683152],
-			[-6.410202845855189, 6.4444939300211495, 2.758040441847511e-06],
-			[-3.205100542810149, 6.444493562006308, 5.551399124683115],
-			[3.2051023030449786, 6.4444928259768695, 5.551398108410686],
-			[2.26634654864588, 1.911793630042082, 3.92543107478102],
-			[-2.2663463448753403, 1.911794150492904, 3.925431793393355],
-			[-4.5326998241756975, 1.9117944107191747, 2.740154668859026e-06],
-			[-2.2663475895499317, 1.9117941504930531, -3.925432091053521],
-			[2.2663517141751557, 1.911793630041462, -3.925426399464013],
-			[4.532698783272554, 1.9117933698159675, 1.978351797561391e-06],
-			[2.26634654864588, 1.911793630042082, 3.92543107478102],
-		]
-		
-		diamond = cmds.curve(name=name, degree=1, point=points)
-		return diamond
-	
+			str: the new transform at the world origin
+		"""
+		if cls.use_templates:
+			crv = cls.copy_template(cls.template(shape_name), name, scale, color)
+		else:
+			crv, suffixes = cls._build(shape_name, name, scale)
+			shapes = cmds.listRelatives(crv, s=True, path=True) or []
+			cls._name_shapes(crv, shapes, suffixes, color)
+		# existence only, callers parent the control with cmds.parent or build_control_hierarchy
+		rig_name_cache.current().record(crv)
+		return crv
+
 	@classmethod
-	def create_lollipop_ctrl(cls, name="lollipop_ctrl", scale=1.0):
-		"""
-		Create a stylized lollipop control as one transform with two curve shapes:
-		- a stick (linear)
-		- a circular head (periodic cubic)
-		"""
-		
-		# --- Lollipop stick (curve 1) ---
-		lollipop_1 = [
-			1,  # degree
-			[(0.0, 0.0, -0.595),
-			 (0.0, 0.0, 0.202),
-			 (0.0, 0.0, 1.0)],  # CVs
-			[0.0, 1.0, 2.0]  # knots
-		]
-		
-		stick = cmds.curve(
-			d=lollipop_1[0],
-			p=[(x * scale, y * scale, z * scale) for x, y, z in lollipop_1[1]],
-			k=lollipop_1[2],
-			n=f"{name}_stickTmp"
-		)
-		
-		# --- Lollipop head (curve 2) ---
-		lollipop_2 = [
-			True,  # periodic
-			3,  # degree
-			[(0.156, 0.0, -0.951),
-			 (0.0, 0.0, -1.015),
-			 (-0.156, 0.0, -0.951),
-			 (-0.221, 0.0, -0.794),
-			 (-0.156, 0.0, -0.638),
-			 (0.0, 0.0, -0.573),
-			 (0.156, 0.0, -0.638),
-			 (0.221, 0.0, -0.794),
-			 (0.156, 0.0, -0.951),
-			 (0.0, 0.0, -1.015),
-			 (-0.156, 0.0, -0.951)],  # CVs
-			[-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]  # knots
-		]
-		
-		head = cmds.curve(
-			per=lollipop_2[0],
-			d=lollipop_2[1],
-			p=[(x * scale, y * scale, z * scale) for x, y, z in lollipop_2[2]],
-			k=lollipop_2[3],
-			n=f"{name}_headTmp"
-		)
-		
-		# --- Combine both curves into one transform ---
-		ctrl = cmds.createNode("transform", n=name)
-		for src in (stick, head):
-			shapes = cmds.listRelatives(src, s=True, path=True) or []
-			for s in shapes:
-				cmds.parent(s, ctrl, add=True, shape=True)
-			cmds.delete(src)
-		
-		# --- Optional: tidy up shape names ---
-		shapes = cmds.listRelatives(ctrl, s=True, fullPath=False) or []
-		for i, s in enumerate(shapes, 1):
-			cmds.rename(s, f"{name}Shape_{i:02d}")
-		
-		return ctrl
+	def _build(cls, shape_name, name, scale=1.0):
+		"""Build a shape from scratch, returns (transform, [shape suffixes])."""
+		if shape_name in GENERATED_SHAPES:
+			return GENERATED_SHAPES[shape_name](name, scale), ["Shape"]
+
+		curves = cls.catalog.get(shape_name)
+		transforms = []
+		for i, curve in enumerate(curves):
+			crv = cmds.curve(
+				d=curve["degree"],
+				p=[(x * scale, y * scale, z * scale) for x, y, z in curve["points"]],
+				k=curve["knots"],
+				per=curve["periodic"],
+				n=name if i == 0 else f"{name}_{i:02d}Tmp"
+			)
+			if curve["close"]:
+				cmds.closeCurve(crv, ch=False, rpo=True, **curve["close"])
+			transforms.append(crv)
 
+		# every shape under the first transform
+		crv = transforms[0]
+		for extra in transforms[1:]:
+			for shape in cmds.listRelatives(extra, s=True, path=True) or []:
+				cmds.parent(shape, crv, s=True, r=True)
+			cmds.delete(extra)
+		return crv, [curve["shape"] for curve in curves]
 
 	@classmethod
-	def create_arrow_curve(cls, name="arrow_crv", scale=1.0):
-		"""
-		Create an arrow-shaped curve using predefined CV data.
-		"""
-		points = [
-			(0.166, 0.0, 0.166),
-			(0.664, 0.0, 0.166),
-			(0.664, 0.0, 0.332),
-			(0.996, 0.0, 0.0),
-			(0.664, 0.0, -0.332),
-			(0.664, 0.0, -0.166),
-			(0.166, 0.0, -0.166),
-			(0.166, 0.0, -0.664),
-			(0.332, 0.0, -0.664),
-			(0.0, 0.0, -0.996),
-			(-0.332, 0.0, -0.664),
-			(-0.166, 0.0, -0.664),
-			(-0.166, 0.0, -0.166),
-			(-0.664, 0.0, -0.166),
-			(-0.664, 0.0, -0.332),
-			(-0.996, 0.0, 0.0),
-			(-0.664, 0.0, 0.332),
-			(-0.664, 0.0, 0.166),
-			(-0.166, 0.0, 0.166),
-			(-0.166, 0.0, 0.664),
-			(-0.332, 0.0, 0.664),
-			(0.0, 0.0, 0.996),
-			(0.332, 0.0, 0.664),
-			(0.166, 0.0, 0.664),
-			(0.166, 0.0, 0.166)
-		]
-		
-		points = [(p[0] * scale, p[1] * scale, p[2] * scale) for p in points]
-		
-		crv = cmds.curve(name=name, degree=1, point=points)
-		return crv
+	def _name_shapes(cls, crv, shapes, suffixes, color=None):
+		"""Name shapes {crv}{suffix}, e.g. ctrl_c_cog_0001Shape, and set their override color."""
+		renamed = []
+		for shape, suffix in zip(shapes, suffixes):
+			shape = cmds.rename(shape, f"{crv}{suffix}")
+			if color is not None:
+				cmds.setAttr(f"{shape}.overrideEnabled", 1)
+				cmds.setAttr(f"{shape}.overrideRGBColors", 0)
+				cmds.setAttr(f"{shape}.overrideColor", int(color))
+			renamed.append(shape)
+		return renamed
+
+	# ======================
+	# Templates
+	# ======================
 
 	@classmethod
-	def create_arrow_curve(cls, name="arrow_ctrl"):
+	def template(cls, shape_name):
 		"""
-		Create a simple arrow-shaped curve controller.
-		Uses predefined CV and knot data.
+		The template of a shape, built at scale 1 under TEMPLATE_GRP on first use or after it was deleted.
+
+		Returns:
+			tuple: (template transform, [template shapes], [shape suffixes])
 		"""
-		points = [
-			(-0.243, 0.0, -1.0),
-			(0.243, 0.0, -1.0),
-			(0.243, 0.0, 0.271),
-			(0.485, 0.0, 0.271),
-			(0.0, 0.0, 1.0),
-			(-0.485, 0.0, 0.271),
-			(-0.243, 0.0, 0.271),
-			(-0.243, 0.0, -1.0)
-		]
-	
-		knots = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
-	
-		curve = cmds.curve(
-			name=name,
-			degree=1,
-			point=points,
-			knot=knots
-		)
-	
-		return curve
-	
+		template = cls._templates.get(shape_name)
+		if template is not None and cmds.objExists(template[0]):
+			return template
+
+		if not cmds.objExists(TEMPLATE_GRP):
+			cmds.createNode("transform", n=TEMPLATE_GRP)
+			cmds.setAttr(f"{TEMPLATE_GRP}.visibility", 0)
+		transform, suffixes = cls._build(shape_name, f"shapeTemplate_{shape_name}")
+		transform = cmds.parent(transform, TEMPLATE_GRP)[0]
+		shapes = cls._name_shapes(transform, cmds.listRelatives(transform, s=True, path=True) or [], suffixes)
+		template = (transform, shapes, suffixes)
+		cls._templates[shape_name] = template
+		return template
+
 	@classmethod
-	def create_prism_line(cls, name="prism_line_crv", scale=1.0):
+	def copy_template(cls, template, name, scale=1.0, color=None):
 		"""
-		Create a stylized prism-like line curve using fixed CV data.
-		The design forms a faceted geometric prism line, good for
-		indicator or tangent-style controls.
+		Copy a template's curve shapes onto a new transform at the world origin.
 
 		Args:
-			name (str): Name for the resulting curve transform.
-			scale (float): Global scale factor for the shape.
+			template (tuple): as returned by template().
+			name (str): name of the new control.
+			scale (float): uniform scale baked into the CVs.
+			color (int): override color index of every shape, left alone when None.
 
 		Returns:
-			str: The name of the created curve transform.
-		"""
-		# Base CV coordinates
-		prism_points = [
-			(15.824022630594634, -0.2481229434638692, -5.309948661739526),
-			(15.824022630594637, -0.24812294346386787, 5.053492313992219),
-			(14.482894681937026, 4.7570347003769715, -0.1282281738736497),
-			(15.824022630594634, -0.2481229434638692, -5.309948661739526),
-			(17.16515057925225, -5.253280587304701, -0.1282281738736497),
-			(15.824022630594637, -0.24812294346386787, 5.053492313992219),
-			(10.818864986753798, -1.5892508921214819, -0.12822817387364793),
-			(15.824022630594634, -0.2481229434638692, -5.309948661739526),
-			(20.829180274435473, 1.0930050051937448, -0.12822817387365504),
-			(15.824022630594637, -0.24812294346386787, 5.053492313992219),
-			(14.482894681937026, 4.7570347003769715, -0.1282281738736497),
-			(10.818864986753798, -1.5892508921214819, -0.12822817387364793),
-			(17.16515057925225, -5.253280587304701, -0.1282281738736497),
-			(20.829180274435473, 1.0930050051937448, -0.12822817387365504),
-			(14.482894681937026, 4.7570347003769715, -0.1282281738736497),
-			(15.824022630594637, -0.24812294346386832, -0.1282281738736497),
-			(17.16515057925225, -5.253280587304701, -0.1282281738736497),
-			(15.824022630594637, -0.24812294346386832, -0.1282281738736497),
-			(0.3395592963495222, -4.397172389104176, -0.12822817387365326)
-		]
-		
-		# Apply scale
-		prism_points = [(x * scale, y * scale, z * scale) for (x, y, z) in prism_points]
-		
-		# Create curve
-		prism_curve = cmds.curve(
-			degree=1,  # Straight-line segments (faceted)
-			p=prism_points,
-			name=name
-		)
-		
-		return prism_curve
-	
-	import maya.cmds as cmds
-	
-	@classmethod
-	def create_diamond_sphere(cls, name="diamond_sphere_crv"):
-		"""Create a stylized diamond-sphere curve using stored CV positions."""
-		cvs = [
-			[-0.0659922907553101, 0.7032221129186319, 0.001103400818318296],
-			[-0.059964922671826244, 0.5921042524786723, 0.2692981222833049],
-			[-0.05746830827729792, 0.3238417849614283, 0.38038787039074273],
-			[-0.05996492405596008, 0.055579342961629176, 0.269298060694229],
-			[-0.0659922927127701, -0.05553845587370498, 0.0011033137182413467],
-			[-0.07201962083218144, 0.05557940456625579, -0.26709140864489067],
-			[-0.07451621867283681, 0.3238418720834961, -0.3781811571243625],
-			[-0.07201961944804756, 0.5921043140832948, -0.26709134705581644],
-			[-0.0659922907553101, 0.7032221129186319, 0.001103400818318296],
-			[0.16928461327492197, 0.5921042678798076, 0.12998109601794453],
-			[0.26673957047121427, 0.32384180674194946, 0.18336363105638814],
-			[0.16928461189078836, 0.05557935836276711, 0.1299810344288709],
-			[-0.0659922927127701, -0.05553845587370498, 0.0011033137182413467],
-			[-0.29524182837285795, 0.055579358362804594, 0.14042035273910086],
-			[-0.3902001704825563, 0.32384180674193913, 0.19812759660263765],
-			[-0.29524182698872314, 0.5921042678798423, 0.1404204143281759],
-			[-0.0659922907553101, 0.7032221129186319, 0.001103400818318296],
-			[0.1632576241892897, 0.5921042986821231, -0.13821364672652553],
-			[0.25821596629898574, 0.32384185030298457, -0.19592089059006115],
-			[0.1632576228051562, 0.055579389165079755, -0.13821370831560004],
-			[-0.0659922927127701, -0.05553845587370498, 0.0011033137182413467],
-			[-0.3012691882190205, 0.055579389165071685, -0.12777400219687207],
-			[-0.39872415393929683, 0.3238418503029723, -0.18115691651982804],
-			[-0.30126918683488707, 0.5921042986821127, -0.12777394060779743],
-			[-0.0659922907553101, 0.7032221129186319, 0.001103400818318296],
-			[-0.29524182698872314, 0.5921042678798423, 0.1404204143281759],
-			[-0.30126918683488707, 0.5921042986821127, -0.12777394060779743],
-			[-0.07201961944804756, 0.5921043140832948, -0.26709134705581644],
-			[0.1632576241892897, 0.5921042986821231, -0.13821364672652553],
-			[0.16928461327492197, 0.5921042678798076, 0.12998109601794453],
-			[-0.059964922671826244, 0.5921042524786723, 0.2692981222833049],
-			[-0.29524182698872314, 0.5921042678798423, 0.1404204143281759],
-			[-0.3902001704825563, 0.32384180674193913, 0.19812759660263765],
-			[-0.05746830827729792, 0.3238417849614283, 0.38038787039074273],
-			[0.26673957047121427, 0.32384180674194946, 0.18336363105638814],
-			[0.25821596629898574, 0.32384185030298457, -0.19592089059006115],
-			[-0.07451621867283681, 0.3238418720834961, -0.3781811571243625],
-			[-0.39872415393929683, 0.3238418503029723, -0.18115691651982804],
-			[-0.3902001704825563, 0.32384180674193913, 0.19812759660263765],
-			[-0.29524182837285795, 0.055579358362804594, 0.14042035273910086],
-			[-0.3012691882190205, 0.055579389165071685, -0.12777400219687207],
-			[-0.07201962083218144, 0.05557940456625579, -0.26709140864489067],
-			[0.1632576228051562, 0.055579389165079755, -0.13821370831560004],
-			[0.16928461189078836, 0.05557935836276711, 0.1299810344288709],
-			[-0.05996492405596008, 0.055579342961629176, 0.269298060694229],
-			[-0.29524182837285795, 0.055579358362804594, 0.14042035273910086],
-		]
-		
-		curve = cmds.curve(degree=1, point=cvs, name=name)
-		cmds.closeCurve(curve, preserveShape=True, replaceOriginal=True)
-		return curve
-
-	@classmethod
-	def create_closed_arc(cls, name="crv_closedArc_0001"):
-		"""
-		Create a closed smooth arc curve (matches exported CV data).
-		"""
-		points = [
-			[1.1661818804187263e-05, 7.140804715697577e-17, -1.1661819098648338],
-			[1.0098622622512424e-21, 1.009862287519727e-16, -1.6492302731250061],
-			[-1.1661819098648338, 7.140804715697576e-17, -1.1661819098648336],
-			[-1.6492302731250073, 5.2351439313339124e-33, -8.54963885910424e-17],
-			[-1.1661819098648338, -7.140804715697577e-17, 1.1661819098648338],
-			[-1.6520452021744633e-21, -1.0098622875197275e-16, 1.6492302731250075],
-			[1.1661818804187263e-05, -7.140804715697576e-17, 1.1661819098648336],
-			[1.649230230915677e-05, -1.3771456358908273e-32, 2.2490495003941555e-16]
-		]
-		
-		# degree = 3 for smooth circular curve
-		degree = 3
-		
-		# uniform knots
-		knots = list(range(len(points) + degree - 1))
-		
-		# create curve
-		crv = cmds.curve(d=degree, p=points, k=knots, n=name)
-		
-		# close the curve (periodic)
-		cmds.closeCurve(crv, ch=False, ps=True, rpo=True)
-		
-		return crv
-	
-	@classmethod
-	def create_cross(cls, name="crv_cross_0001"):
-		"""
-		Create a cross-shaped curve (X, Y, Z intersecting lines).
-		"""
-		points = [
-			[-4.209149223011579, 0.0, 1.7763568394002505e-15],
-			[0.0, 0.0, 1.7763568394002505e-15],
-			[4.209149223011579, 0.0, 1.7763568394002505e-15],
-			[0.0, 0.0, 1.7763568394002505e-15],
-			[0.0, 0.0, -4.209149223011579],
-			[0.0, 0.0, 1.7763568394002505e-15],
-			[0.0, 0.0, 4.209149223011579],
-			[0.0, 0.0, 1.7763568394002505e-15],
-			[0.0, 4.209149223011579, 1.7763568394002505e-15],
-			[0.0, 0.0, 1.7763568394002505e-15],
-			[0.0, -4.209149223011579, 1.7763568394002505e-15],
-		]
-		
-		degree = 1
-		knots = list(range(len(points)))
-		
-		crv = cmds.curve(d=degree, p=points, k=knots, n=name)
-		
-		return crv
-	
-	@classmethod
-	def create_lollipop_round(cls, name="crv_lollipop_round"):
-		"""
-		Create a 'lollipop'-style rounded control curve using the provided CV data.
-		The shape will be cubic (d=3), smooth, and properly closed at the *bottom*.
-		"""
-		import maya.cmds as cmds
-		
-		# CV data reordered so the last (closing) CV is the *bottom/stick* position
-		points = [
-			[0.0, 0.0, 4.200835800833189],  # top of the head
-			[0.14250059713649532, 0.0, 0.0904995298629434],
-			[1.107288881249637, 0.0, -0.8303719518471747],
-			[1.0084497546476305, 0.0, -2.077950261453218],
-			[0.0, 0.0, -2.4956638268000866],  # bottom center (stick start)
-			[-1.0084497546476305, 0.0, -2.077950261453218],
-			[-1.107288881249637, 0.0, -0.8303719518471749],
-			[-0.14250059713649532, 0.0, 0.09049952986294707],
-			[0.0, 0.0, 4.200835800833189],  # close back to top
-			[0.0, 0.0, -2.4956638268000866]  # explicit bottom closing point
-		]
-		
-		# Create cubic NURBS curve
-		crv = cmds.curve(d=3, p=points, n=name)
-		
-		# Ensure curve closes cleanly at the *bottom* rather than top
-		cmds.closeCurve(crv, ch=False, ps=False, rpo=True, bb=0.5, bki=False)
-		
-		# Freeze transforms
-		cmds.makeIdentity(crv, apply=True, t=1, r=1, s=1, n=0)
-		
-		return crv
-	
-	@classmethod
-	def create_ten_cross(cls, name="crv_cross"):
-		"""
-		Create a 'cross' style control curve.
-		Shape: square border with a centered cross inside.
-		"""
-		import maya.cmds as cmds
-		
-		# Rounded + clean CVs from your saved data
-		points = [
-			[-2.0, 0.0, 0.499],
-			[-2.0, 0.0, -0.499],
-			[-0.499, 0.0, -0.499],
-			[-0.499, 0.0, -2.0],
-			[0.499, 0.0, -2.0],
-			[0.499, 0.0, -0.499],
-			[2.0, 0.0, -0.499],
-			[2.0, 0.0, 0.499],
-			[0.499, 0.0, 0.499],
-			[0.499, 0.0, 2.0],
-			[-0.499, 0.0, 2.0],
-			[-0.499, 0.0, 0.499],
-			[-2.0, 0.0, 0.499],  # close loop
-		]
-		
-		# Create linear curve (degree 1 = straight lines)
-		crv = cmds.curve(d=1, p=points, n=name)
-		
-		# Freeze transforms
-		cmds.makeIdentity(crv, apply=True, t=1, r=1, s=1, n=0)
-		
-		return crv
-	
-	@classmethod
-	def create_curved_double_arrow(cls, name="crv_curvedDoubleArrow", scale=1.0):
+			str: the new transform
 		"""
-		Create a curved double-arrow NURBS curve (smooth, degree=3, closed loop).
-		Based on stored CV positions from design reference.
-		"""
-		
-		points = [
-			(0.05, 0.323, 0.167), (-0.05, 0.323, 0.167), (-0.169, 0.318, 0.167),
-			(-0.228, 0.309, 0.167), (-0.344, 0.289, 0.167), (-0.51, 0.239, 0.167),
-			(-0.616, 0.194, 0.167), (-0.667, 0.168, 0.167), (-0.667, 0.168, 0.225),
-			(-0.667, 0.168, 0.279), (-0.667, 0.168, 0.334), (-0.778, 0.115, 0.222),
-			(-0.89, 0.063, 0.111), (-1.001, 0.01, 0.0), (-0.89, 0.063, -0.111),
-			(-0.778, 0.115, -0.222), (-0.667, 0.168, -0.334), (-0.667, 0.168, -0.278),
-			(-0.667, 0.168, -0.223), (-0.667, 0.168, -0.167), (-0.616, 0.194, -0.167),
-			(-0.51, 0.239, -0.167), (-0.344, 0.289, -0.167), (-0.228, 0.309, -0.167),
-			(-0.169, 0.316, -0.167), (-0.052, 0.322, -0.167), (0.052, 0.327, -0.167),
-			(0.169, 0.316, -0.167), (0.228, 0.309, -0.167), (0.344, 0.289, -0.167),
-			(0.51, 0.239, -0.167), (0.616, 0.194, -0.167), (0.667, 0.168, -0.167),
-			(0.667, 0.168, -0.225), (0.667, 0.168, -0.279), (0.667, 0.168, -0.334),
-			(0.778, 0.115, -0.222), (0.89, 0.063, -0.111), (1.001, 0.01, 0.0),
-			(0.89, 0.063, 0.111), (0.778, 0.115, 0.222), (0.667, 0.168, 0.334),
-			(0.667, 0.168, 0.278), (0.667, 0.168, 0.223), (0.667, 0.168, 0.167),
-			(0.616, 0.194, 0.167), (0.51, 0.239, 0.167), (0.344, 0.289, 0.167),
-			(0.228, 0.311, 0.167), (0.169, 0.316, 0.167), (0.05, 0.323, 0.167)
-		]
-		
-		# Scale if needed
-		points = [(x * scale, y * scale, z * scale) for x, y, z in points]
-		
-		# Degree 3 = smooth curved line
-		degree = 3
-		
-		# Auto-generate uniform knot vector for cubic curve
-		knots = list(range(len(points) + degree - 1))
-		
-		# Create the curve
-		crv = cmds.curve(d=degree, p=points, k=knots, n=name)
-		
-		# Close the curve into a full loop
-		cmds.closeCurve(crv, ch=False, ps=True, rpo=True)
-		
-		# Freeze transforms for clean zero state
-		cmds.makeIdentity(crv, apply=True, t=1, r=1, s=1, n=0)
-		
-		return crv
-	
+		transform, _, suffixes = template
+		crv = cmds.duplicate(transform, n=name)[0]
+		crv = cmds.parent(crv, world=True)[0]
+		cls._name_shapes(crv, cmds.listRelatives(crv, s=True, path=True) or [], suffixes, color)
 
-	@classmethod
-	def create_four_arrow_curve(cls, name="ctrl_fourArrow", scale=1.0):
-		"""
-		Create a four-directional arrow control curve (N, S, E, W).
-		The curve is centered at origin on XZ plane.
-		"""
-		pts = [
-			[3.212252242001139, 0.0, 3.212252242001139],
-			[12.849008968004556, 0.0, 3.212252242001139],
-			[12.849008968004556, 0.0, 6.424504484002278],
-			[19.27351345200683, 0.0, 0.0],
-			[12.849008968004556, 0.0, -6.424504484002278],
-			[12.849008968004556, 0.0, -3.212252242001139],
-			[3.212252242001139, 0.0, -3.212252242001139],
-			[3.212252242001139, 0.0, -12.849008968004556],
-			[6.424504484002278, 0.0, -12.849008968004556],
-			[0.0, 0.0, -19.27351345200683],
-			[-6.424504484002278, 0.0, -12.849008968004556],
-			[-3.212252242001139, 0.0, -12.849008968004556],
-			[-3.212252242001139, 0.0, -3.212252242001139],
-			[-12.849008968004556, 0.0, -3.212252242001139],
-			[-12.849008968004556, 0.0, -6.424504484002278],
-			[-19.27351345200683, 0.0, 0.0],
-			[-12.849008968004556, 0.0, 6.424504484002278],
-			[-12.849008968004556, 0.0, 3.212252242001139],
-			[-3.212252242001139, 0.0, 3.212252242001139],
-			[-3.212252242001139, 0.0, 12.849008968004556],
-			[-6.424504484002278, 0.0, 12.849008968004556],
-			[0.0, 0.0, 19.27351345200683],
-			[6.424504484002278, 0.0, 12.849008968004556],
-			[3.212252242001139, 0.0, 12.849008968004556],
-			[3.212252242001139, 0.0, 3.212252242001139],
-		]
-		
-		# Apply scaling if desired
 		if scale != 1.0:
-			pts = [[x * scale, y * scale, z * scale] for x, y, z in pts]
-		
-		crv = cmds.curve(name=name, degree=1, point=pts)
+			cmds.setAttr(f"{crv}.scale", scale, scale, scale, type="double3")
+			cmds.makeIdentity(crv, apply=True, s=True)
 		return crv
-	
-	@classmethod
-	def create_ball_curve(cls, name="ctrl_ball_crv", scale=1.0):
-		"""
-		Build a 3-axis 'ball' control from periodic cubic curves,
-		using the provided CVs *and* knot vectors (so the shape matches exactly).
-		"""
-		# [isPeriodic, degree, points, knots]
-		ball_1 = [True, 3,
-				  [(0.78, 0.0, -0.78), (0.0, 0.0, -1.103), (-0.78, 0.0, -0.78),
-				   (-1.103, 0.0, 0.0), (-0.78, 0.0, 0.78), (0.0, 0.0, 1.103),
-				   (0.78, 0.0, 0.78), (1.103, 0.0, 0.0), (0.78, 0.0, -0.78),
-				   (0.0, 0.0, -1.103), (-0.78, 0.0, -0.78)],
-				  [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]]
-		
-		ball_2 = [True, 3,
-				  [(0.78, 0.78, 0.0), (0.0, 1.103, 0.0), (-0.78, 0.78, 0.0),
-				   (-1.103, 0.0, 0.0), (-0.78, -0.78, 0.0), (0.0, -1.103, 0.0),
-				   (0.78, -0.78, 0.0), (1.103, 0.0, 0.0), (0.78, 0.78, 0.0),
-				   (0.0, 1.103, 0.0), (-0.78, 0.78, 0.0)],
-				  [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]]
-		
-		ball_3 = [True, 3,
-				  [(0.0, -0.78, -0.78), (0.0, 0.0, -1.103), (0.0, 0.78, -0.78),
-				   (0.0, 1.103, 0.0), (0.0, 0.78, 0.78), (0.0, 0.0, 1.103),
-				   (0.0, -0.78, 0.78), (0.0, -1.103, 0.0), (0.0, -0.78, -0.78),
-				   (0.0, 0.0, -1.103), (0.0, 0.78, -0.78)],
-				  [-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]]
-		
-		def _make_curve(name, spec):
-			is_periodic, deg, pts, knots = spec
-			pts = [(x * scale, y * scale, z * scale) for (x, y, z) in pts]
-			# Build with knots and periodic flag so the shape matches
-			crv = cmds.curve(d=deg, p=pts, k=knots, per=bool(is_periodic), n=name)
-			return crv
-		
-		# build three axes
-		base = _make_curve(name, ball_1)
-		c_y = _make_curve(f"{name}_Y", ball_2)
-		c_z = _make_curve(f"{name}_Z", ball_3)
-		
-		# merge shapes under the base transform
-		for crv in (c_y, c_z):
-			for sh in cmds.listRelatives(crv, s=True, f=True) or []:
-				cmds.parent(sh, base, s=True, r=True)
-			cmds.delete(crv)
-		
-		# clean transforms
-		cmds.makeIdentity(base, a=True, t=True, r=True, s=True)
-		return base
-	
-	@classmethod
-	def create_eye_aim_curve(cls, name="ctrl_eyeAim_crv", scale=1.0, mode="poly"):
-		"""
-		Build an eye-aim control
-		
-		"""
-		eyes_1 = [
-			True, 3,
-			[
-				(0.78, 0.0, -0.632),
-				(0.0, 0.0, -0.213),
-				(-0.78, 0.0, -0.632),
-				(-1.103, 0.0, 0.0),
-				(-0.78, 0.0, 0.632),
-				(0.0, 0.0, 0.213),
-				(0.78, 0.0, 0.632),
-				(1.103, 0.0, 0.0),
-				(0.78, 0.0, -0.632),
-				(0.0, 0.0, -0.213),
-				(-0.78, 0.0, -0.632),
-			],
-			[-2.0, -1.0, 0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
-		]
-		
-		is_periodic, degree, points, knots = eyes_1
-		
-		# Apply scale
-		scaled_points = [(x * scale, y * scale, z * scale) for (x, y, z) in points]
-		
-		# Create the actual NURBS curve with full fidelity
-		crv = cmds.curve(
-			d=degree,
-			p=scaled_points,
-			k=knots,
-			per=bool(is_periodic),
-			n=name
-		)
-		
-		# Freeze transforms
-		cmds.makeIdentity(crv, apply=True, t=True, r=True, s=True)
-		cmds.select(clear=True)
-		
-		return crv
-
 
+	@classmethod
+	def template_nodes(cls):
+		"""Every template node in the scene, rig manifests leave them out."""
+		nodes = [TEMPLATE_GRP]
+		for transform, shapes, _ in cls._templates.values():
+			nodes.append(transform)
+			nodes.extend(shapes)
+		return set(nodes)
 
+	@classmethod
+	def clear_templates(cls):
+		"""Delete the templates, e.g. once a build is done; the next call of a shape builds it again."""
+		if cmds.objExists(TEMPLATE_GRP):
+			cmds.delete(TEMPLATE_GRP)
+		cls._templates.clear()
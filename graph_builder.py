@@ -0,0 +1,238 @@
+"""
+Deferred node / attribute / connection builder.
+
+Rig code declares its utility-node network on a GraphBuilder and flushes it
+once, instead of crossing into Maya for every createNode / setAttr /
+connectAttr / setKeyframe:
+
+	graph = GraphBuilder()
+	mult = graph.create_node('multiplyDivide', 'mult_l_ft_knee_0001')
+	graph.set_attr(f'{mult}.operation', 2)
+	graph.connect('jnt_ROOT.scale', f'{mult}.input2')
+	graph.flush()
+
+Modes:
+	'batch'  one generated MEL payload, a single mel.eval per flush
+	'eager'  the same operations replayed as individual cmds calls, for comparing build times
+
+Nodes are referenced by the name they were declared with. If Maya renames a
+node on creation (name clash) the payload keeps using the real name, and
+flush() returns the declared -> real name map.
+
+Reads go the other way in one call as well:
+
+	values = read_plugs(['ctrl_l_ft_knee_0001.weight', 'ctrl_r_ft_knee_0001.weight'])
+"""
+import time
+
+import maya.cmds as cmds
+import maya.mel as mel
+
+MODE_BATCH = 'batch'
+MODE_EAGER = 'eager'
+
+# module default, rig_benchmark switches it to compare both paths
+DEFAULT_MODE = MODE_BATCH
+
+PAYLOAD_PROC = 'graphBuilderFlush'
+READ_PROC = 'graphBuilderRead'
+
+
+def _mel_string(value):
+	return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _mel_value(value):
+	if isinstance(value, bool):
+		return '1' if value else '0'
+	if isinstance(value, str):
+		return _mel_string(value)
+	return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class GraphBuilder(object):
+
+	def __init__(self, mode=None):
+		self.mode = mode or DEFAULT_MODE
+		self._ops = []
+		self._created = {}  # declared name -> index in the payload node array
+		self.stats = {'flushes': 0, 'ops': 0, 'seconds': 0.0}
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if exc_type is None:
+			self.flush()
+		return False
+
+	def __len__(self):
+		return len(self._ops)
+
+	# ======================
+	# Declarations
+	# ======================
+
+	def create_node(self, node_type, name, parent=None):
+		self._created[name] = len(self._created)
+		self._ops.append(('createNode', node_type, name, parent))
+		return name
+
+	def set_attr(self, plug, *values, **kwargs):
+		"""Same arguments as cmds.setAttr, only `type` is supported as a flag."""
+		if len(values) == 1 and isinstance(values[0], (list, tuple)):
+			values = tuple(values[0])
+		self._ops.append(('setAttr', plug, values, kwargs.get('type')))
+
+	def connect(self, src, dst, force=False):
+		self._ops.append(('connectAttr', src, dst, force))
+
+	def add_attr(self, node, long_name, attr_type='double', default_value=None, min_value=None, max_value=None,
+				 keyable=True):
+		self._ops.append(('addAttr', node, long_name, attr_type, default_value, min_value, max_value, keyable))
+
+	def set_keys(self, curve, keys):
+		"""Keys on an animCurveU* node, keys as (driver value, value) pairs."""
+		self._ops.append(('setKeyframe', curve, tuple((float(dv), float(v)) for dv, v in keys)))
+
+	def exists(self, name):
+		"""Declared in this builder and not flushed yet, or already in the scene."""
+		return name in self._created or cmds.objExists(name)
+
+	# ======================
+	# Flush
+	# ======================
+
+	def flush(self):
+		"""
+		Execute every declared operation.
+
+		Returns:
+			dict: declared node name -> real node name
+		"""
+		if not self._ops:
+			return {}
+		start = time.perf_counter()
+		if self.mode == MODE_EAGER:
+			names = self._flush_eager()
+		else:
+			names = self._flush_batch()
+
+		self.stats['flushes'] += 1
+		self.stats['ops'] += len(self._ops)
+		self.stats['seconds'] += time.perf_counter() - start
+		self._ops = []
+		self._created = {}
+		return names
+
+	def _flush_eager(self):
+		names = {}
+
+		def _resolve(plug):
+			node, dot, attr = plug.partition('.')
+			return names.get(node, node) + dot + attr
+
+		for op in self._ops:
+			kind = op[0]
+			if kind == 'createNode':
+				_, node_type, name, parent = op
+				kwargs = {'n': name}
+				if parent:
+					kwargs['p'] = names.get(parent, parent)
+				names[name] = cmds.createNode(node_type, **kwargs)
+			elif kind == 'setAttr':
+				_, plug, values, value_type = op
+				kwargs = {'type': value_type} if value_type else {}
+				cmds.setAttr(_resolve(plug), *values, **kwargs)
+			elif kind == 'connectAttr':
+				_, src, dst, force = op
+				cmds.connectAttr(_resolve(src), _resolve(dst), force=force)
+			elif kind == 'addAttr':
+				_, node, long_name, attr_type, default, min_value, max_value, keyable = op
+				kwargs = {'ln': long_name, 'at': attr_type, 'k': keyable}
+				if default is not None:
+					kwargs['dv'] = default
+				if min_value is not None:
+					kwargs['min'] = min_value
+				if max_value is not None:
+					kwargs['max'] = max_value
+				cmds.addAttr(names.get(node, node), **kwargs)
+			elif kind == 'setKeyframe':
+				_, curve, keys = op
+				for driver_value, value in keys:
+					cmds.setKeyframe(names.get(curve, curve), float=driver_value, value=value)
+		cmds.select(clear=True)
+		return names
+
+	def _mel_plug(self, plug):
+		node, dot, attr = plug.partition('.')
+		if node in self._created:
+			index = self._created[node]
+			return f'($n[{index}] + {_mel_string(dot + attr)})' if dot else f'$n[{index}]'
+		return _mel_string(plug)
+
+	def payload(self):
+		"""The MEL source a batch flush evaluates, returns the created node names in order."""
+		lines = [f'proc string[] {PAYLOAD_PROC}() {{', 'string $n[];']
+		for op in self._ops:
+			kind = op[0]
+			if kind == 'createNode':
+				_, node_type, name, parent = op
+				flags = f' -p {self._mel_plug(parent)}' if parent else ''
+				lines.append(f'$n[{self._created[name]}] = `createNode {_mel_string(node_type)} '
+							 f'-n {_mel_string(name)}{flags}`;')
+			elif kind == 'setAttr':
+				_, plug, values, value_type = op
+				flags = f' -type {_mel_string(value_type)}' if value_type else ''
+				args = ' '.join(_mel_value(v) for v in values)
+				lines.append(f'setAttr{flags} {self._mel_plug(plug)} {args};')
+			elif kind == 'connectAttr':
+				_, src, dst, force = op
+				flags = ' -f' if force else ''
+				lines.append(f'connectAttr{flags} {self._mel_plug(src)} {self._mel_plug(dst)};')
+			elif kind == 'addAttr':
+				_, node, long_name, attr_type, default, min_value, max_value, keyable = op
+				flags = f'-ln {_mel_string(long_name)} -at {_mel_string(attr_type)} -k {_mel_value(bool(keyable))}'
+				if default is not None:
+					flags += f' -dv {_mel_value(default)}'
+				if min_value is not None:
+					flags += f' -min {_mel_value(min_value)}'
+				if max_value is not None:
+					flags += f' -max {_mel_value(max_value)}'
+				lines.append(f'addAttr {flags} {self._mel_plug(node)};')
+			elif kind == 'setKeyframe':
+				_, curve, keys = op
+				for driver_value, value in keys:
+					lines.append(f'setKeyframe -float {_mel_value(driver_value)} -value {_mel_value(value)} '
+								 f'{self._mel_plug(curve)};')
+		lines += ['select -cl;', 'return $n;', '}', f'{PAYLOAD_PROC}();']
+		return '\n'.join(lines)
+
+	def _flush_batch(self):
+		created = mel.eval(self.payload()) or []
+		ordered = sorted(self._created, key=self._created.get)
+		return dict(zip(ordered, created))
+
+
+def read_payload(plugs):
+	"""The MEL source read_plugs evaluates in batch mode, returns every value as one float array."""
+	lines = [f'proc float[] {READ_PROC}() {{', 'float $v[];']
+	for i, plug in enumerate(plugs):
+		lines.append(f'$v[{i}] = `getAttr {_mel_string(plug)}`;')
+	lines += ['return $v;', '}', f'{READ_PROC}();']
+	return '\n'.join(lines)
+
+
+def read_plugs(plugs, mode=None):
+	"""
+	Values of scalar numeric plugs (bool and enum read as numbers), one mel.eval in batch mode.
+
+	Returns:
+		list: one float per plug, in order.
+	"""
+	plugs = list(plugs)
+	if not plugs:
+		return []
+	if (mode or DEFAULT_MODE) == MODE_EAGER:
+		return [float(cmds.getAttr(plug)) for plug in plugs]
+	return [float(v) for v in mel.eval(read_payload(plugs)) or []]
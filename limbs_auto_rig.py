@@ -1,18 +1,17 @@
+from functools import partial
+
 import maya.cmds as cmds
 import maya.mel as mel
-import importlib
-import auto_rig_helpers
-import neck_spine_auto_rig
 import curve_library
-import  build_master_hierachy
-
-importlib.reload(auto_rig_helpers)
-importlib.reload(curve_library)
-importlib.reload(neck_spine_auto_rig)
-importlib.reload(build_master_hierachy)
+import rig_name_cache
+import rig_driven_keys
+import rig_executor
+import rig_plan
+import rig_symmetry
 
 from auto_rig_helpers import AutoRigHelpers
 from neck_spine_auto_rig import SpineNeckAutoRig
+from rig_components import Component, ComponentGraph
 # from build_master_hierachy import Master
 
 crv_lib = curve_library.RigCurveLibrary()
@@ -52,9 +51,73 @@ TOE_TEMP_JOINTS = {
            'temp_l_bk_pinky_metacarple_0001']
 }
 
+# knee pole vector distance from the knee, along the knee joint Y axis
+PV_OFFSET_Y = {
+    ("l", "ft"): -5,
+    ("r", "ft"): 5,
+    ("l", "bk"): 5,
+    ("r", "bk"): -5
+}
+
+
+# ======================
+# Planning, no scene access
+# ======================
+def plan_leg(side, region):
+    """Names and pose tables of one leg."""
+    return {
+        "ctrl_grp": f"grp_{side}_{region}_legCtrls_0001",
+        "fk_grp": f"grp_{side}_{region}_legFkCtrls_0001",
+        "ik_grp": f"grp_{side}_{region}_legIkCtrls_0001",
+        "switch_ctrl": f"ctrl_{side}_{region}_leg_switch_0001",
+        "switch_rvs": f"rvs_{side}_{region}_ikFkSwitch_0001",
+        "pv_offset_y": PV_OFFSET_Y[(side, region)],
+        # (driven offset, foot ctrl attr, [(driver value, rotateZ)])
+        "driven_keys": [
+            ("heel_offset", "heel_roll", [(0, 0), (1, 90)]),
+            ("toe_pivot_offset", "heel_roll", [(0, 0), (-1, 90)]),
+            ("footOut_offset", "foot_bank", [(0, 0), (1, 90)]),
+            ("footIn_offset", "foot_bank", [(0, 0), (-1, 90)])
+        ]
+    }
+
+
+# toe spread: rotateY of the base driven groups at spread 1 and -1
+TOE_SPREAD = {
+    "index": [-35, 15],
+    "middle": [-15, 5],
+    "ring": [15, -5],
+    "pinky": [35, -15]
+}
+# toe fist: rotateZ of the mid and tip driven groups at fist 1, thumb excluded
+TOE_FIST_ANGLE = -70
+
+
+def plan_toe_driven_keys(toes_all_ctrl, driven_groups):
+    """Driven key table of the toes: {driver plug: [(driver value, driven plug, value)]}."""
+    spread, fist = [], []
+    for grp in driven_groups:
+        if "base" in grp:
+            spread.append((0, f"{grp}.rotateY", 0))
+            for toe_name, (out_angle, in_angle) in TOE_SPREAD.items():
+                if toe_name in grp:
+                    spread += [(1, f"{grp}.rotateY", out_angle), (-1, f"{grp}.rotateY", in_angle)]
+                    break
+        if any(x in grp for x in ["_mid_", "tip"]) and "thumb" not in grp:
+            fist += [(0, f"{grp}.rotateZ", 0), (1, f"{grp}.rotateZ", TOE_FIST_ANGLE)]
+    return {f"{toes_all_ctrl}.spread": spread, f"{toes_all_ctrl}.fist": fist}
+
 
 class LimbsAutoRig(object):
-    def __init__(self, master, spine_rig: SpineNeckAutoRig):
+    def __init__(self, master, spine_rig: SpineNeckAutoRig, twist_jnt_num=5):
+        self.twist_jnt_num = twist_jnt_num
+        
+        # rig handles, shared with the master build
+        self.registry = master.registry
+        self._leg_data_cache = {}
+        # plan_leg / plan_twist results, filled before the build, see components()
+        self.plans = {}
+        
         # master variables
         self.master = master
         self.move_all_ctrl = master.move_all_off_ctrl
@@ -79,8 +142,16 @@ class LimbsAutoRig(object):
     def _get_leg_data(self, side, region):
         """
         Return a dictionary
-        
+        Cached per side/region until the registry changes.
         """
+        cached = self._leg_data_cache.get((side, region))
+        if cached and cached[0] == self.registry.version:
+            return cached[1]
+        
+        data = self._leg_data_cache[(side, region)] = (self.registry.version, self._collect_leg_data(side, region))
+        return data[1]
+    
+    def _collect_leg_data(self, side, region):
         return {
             # IK Controls
             "foot": self.get(f"{side}_{region}_footIk_ctrl"),
@@ -132,17 +203,20 @@ class LimbsAutoRig(object):
         }
     
     def _ensure_group(self, name, parent=None):
-        if cmds.objExists(name):
-            return name
+        if name in self.registry:
+            return self.registry.get(name)
+        names = rig_name_cache.current()
+        if names.exists(name):
+            return self._store(name, name)
         grp = cmds.createNode("transform", n=name)
         if parent:
             cmds.parent(grp, parent, relative=True)  # ✅ keep world transform
-        return grp
+        names.record(grp)
+        return self._store(name, grp)
     
     def _store(self, name, value):
-        """self variable assignment"""
-        setattr(self, name, value)
-        return value
+        """Register a rig handle, see rig_registry.RigRegistry."""
+        return self.registry.register(name, value)
     
     def _ordered_chain(self, root):
         """Return full joint chain (root → leaf)."""
@@ -186,14 +260,53 @@ class LimbsAutoRig(object):
                 new_chain.append(jnt)
         return new_chain
     
-    def get(self, name, default=None, warn=True):
-        """Safely retrieve a stored self variable by name."""
-        if hasattr(self, name):
-            return getattr(self, name)
+    def plan_leg(self, side, region):
+        plan = self.plans[("leg", side, region)] = plan_leg(side, region)
+        return plan
+    
+    def plan_twist(self, side, region, twist_jnt_num=None):
+        """Twist build plan of a leg, cached by rig_plan until the template changes."""
+        if twist_jnt_num is None:
+            twist_jnt_num = self.twist_jnt_num
+        joints = self.twist_inputs(side, region)
+        if joints is None:
+            return None
+        plan = self.plans[("twist", side, region, twist_jnt_num)] = rig_plan.cached(
+            rig_plan.plan_twist_build, side, region, twist_jnt_num, joints)
+        return plan
+    
+    def twist_inputs(self, side, region):
+        """
+        Upper leg / knee / ankle joints and the upper leg IK parent of a leg. Before the leg
+        joints exist the names are taken from the template snapshot the way create_base_joints
+        names the duplicated chain, None when the template has no such chain.
+        """
+        def from_template(temp, count):
+            chain = rig_plan.template().chain(temp, count)
+            return [jnt.replace("temp", "jnt").replace("0002", "0001").replace("_l_", f"_{side}_")
+                    for jnt in chain]
+        
+        leg_joints = self.get(f"{side}_{region}_leg_joints", warn=False) or from_template(TEMP_JOINTS[region], 3)
+        if region == "ft":
+            ik_parent = self.get(f"{side}_scapula_joints", warn=False) or from_template(TEMP_JOINTS["scapula"], 1)
+            ik_parent = ik_parent[0] if ik_parent else None
         else:
-            if warn:
-                cmds.warning(f"[Rig] Missing attribute: self.{name}")
-            return default
+            ik_parent = self.pelvis_jnt
+        if len(leg_joints) < 3 or not ik_parent:
+            return None
+        upperleg, knee, ankle = leg_joints[:3]
+        return {"upperleg": upperleg, "knee": knee, "ankle": ankle, "upperleg_ik_parent": ik_parent}
+    
+    def leg_plan(self, side, region):
+        return self.plans.get(("leg", side, region)) or self.plan_leg(side, region)
+    
+    def get(self, name, default=None, warn=True):
+        """Safely retrieve a registered rig handle by name."""
+        if name in self.registry:
+            return self.registry.get(name)
+        if warn:
+            cmds.warning(f"[Rig] Missing attribute: self.{name}")
+        return default
     
     # ======================
     # Base Joints
@@ -304,7 +417,7 @@ class LimbsAutoRig(object):
     # ======================
     def create_fk_ik_chains(self, side, region):
         """Duplicate and rename for FK/IK"""
-        base_chain = getattr(self, f"{side}_{region}_leg_joints", [])
+        base_chain = self.get(f"{side}_{region}_leg_joints", [], warn=False)
         if not base_chain:
             cmds.warning(f"No base chain found for {side}_{region}.")
             return
@@ -344,18 +457,18 @@ class LimbsAutoRig(object):
         AutoRigHelpers.set_attr(fk_chain[0], 'visibility', False)
         
         # create blend controller
-        switch_ctrl = crv_lib.create_ten_cross(f'ctrl_{side}_{region}_leg_switch_0001')
+        plan = self.leg_plan(side, region)
+        switch_ctrl = crv_lib.create('ten_cross', plan['switch_ctrl'])
         cmds.matchTransform(switch_ctrl, ankle_ik_jnt, pos=True, rot=False)
-        AutoRigHelpers.create_control_hierarchy(switch_ctrl, 2)
-        _, _, switch_zero, switch_offset = AutoRigHelpers.get_parent_grp(switch_ctrl)
-        cmds.parent(switch_zero, ctrl_grp)
+        hierarchy = AutoRigHelpers.build_control_hierarchy(switch_ctrl, 2, parent=ctrl_grp)
+        switch_zero, switch_offset = hierarchy.zero, hierarchy.offset
         cmds.pointConstraint(ankle_ik_jnt, switch_offset, mo=True)
         # add and hide attr
         AutoRigHelpers.lock_hide_attr(switch_ctrl, ['tx', 'ty', 'tz', 'rx', 'ry', 'rz'])
         AutoRigHelpers.add_attr(switch_ctrl, 'ik_fk_switch', 'float', 0, 0, 1)
         
         # create reverse
-        rvs_node = cmds.createNode('reverse', n=f'rvs_{side}_{region}_ikFkSwitch_0001')
+        rvs_node = cmds.createNode('reverse', n=plan['switch_rvs'])
         AutoRigHelpers.connect_attr(switch_ctrl, 'ik_fk_switch', rvs_node, 'inputX')
         
         # blend ik fk joints
@@ -370,10 +483,11 @@ class LimbsAutoRig(object):
     
     def create_ctrl_groups(self, side, region):
         """Build controller group hierarchy for FK/IK legs"""
+        plan = self.leg_plan(side, region)
         ctrl_root = self._ensure_group("grp_legCtrls_0001", self.cog_ctrl)
-        ctrl_grp = self._ensure_group(f"grp_{side}_{region}_legCtrls_0001", ctrl_root)
-        fk_grp = self._ensure_group(f"grp_{side}_{region}_legFkCtrls_0001", ctrl_grp)
-        ik_grp = self._ensure_group(f"grp_{side}_{region}_legIkCtrls_0001", ctrl_grp)
+        ctrl_grp = self._ensure_group(plan["ctrl_grp"], ctrl_root)
+        fk_grp = self._ensure_group(plan["fk_grp"], ctrl_grp)
+        ik_grp = self._ensure_group(plan["ik_grp"], ctrl_grp)
         
         self._store(f"{side}_{region}_leg_ctrl_grp", ctrl_grp)
         self._store(f"{side}_{region}_leg_fk_grp", fk_grp)
@@ -381,27 +495,21 @@ class LimbsAutoRig(object):
     
     def build_fk_setup(self, side, region):
         """Create FK controls"""
-        fk_chain = getattr(self, f"{side}_{region}_leg_fk_joints", [])
+        fk_chain = self.get(f"{side}_{region}_leg_fk_joints", [], warn=False)
         if not fk_chain:
             return
         
-        fk_grp = getattr(self, f"{side}_{region}_leg_fk_grp", None)
+        fk_grp = self.get(f"{side}_{region}_leg_fk_grp", None, warn=False)
         prev_ctrl = None
         fk_offsets = []
         fk_ctrls = []
         for jnt in fk_chain[:-1]:
             ctrl_name = jnt.replace("jnt", "ctrl")
-            fk_ctrl = crv_lib.create_cube_curve(ctrl_name)
+            fk_ctrl = crv_lib.create('cube', ctrl_name)
             
             cmds.matchTransform(fk_ctrl, jnt)
-            AutoRigHelpers.create_control_hierarchy(fk_ctrl, 2)
-            
-            zero_grp = fk_ctrl.replace("ctrl", "zero")
-            offset_grp = fk_ctrl.replace("ctrl", "offset")
-            if prev_ctrl is None:
-                cmds.parent(zero_grp, fk_grp)
-            else:
-                cmds.parent(zero_grp, prev_ctrl)
+            # root under the fk group, the rest under the previous control
+            offset_grp = AutoRigHelpers.build_control_hierarchy(fk_ctrl, 2, parent=prev_ctrl or fk_grp).offset
             
             cmds.parentConstraint(fk_ctrl, jnt, mo=False)
             prev_ctrl = fk_ctrl
@@ -415,7 +523,7 @@ class LimbsAutoRig(object):
     
     def build_ik_setup(self, side, region):
         """Create a simple IK placeholder locator"""
-        ik_chain = getattr(self, f"{side}_{region}_leg_ik_joints", [])
+        ik_chain = self.get(f"{side}_{region}_leg_ik_joints", [], warn=False)
         
         # create ik controllers
         self.create_ik_controllers(side, region, ik_chain)
@@ -564,11 +672,11 @@ class LimbsAutoRig(object):
         
         foot_ctrl_name = f'ctrl_{side}_{region}_footIk_0001'
         foot_ctrl = cmds.createNode('joint', n=foot_ctrl_name)
-        AutoRigHelpers.create_control_hierarchy(foot_ctrl)
-        foot_zero, foot_offset, foot_driven, foot_connect = AutoRigHelpers.get_parent_grp(foot_ctrl)
-        foot_ctrl_temp = crv_lib.circle(name=f'crv_{side}_{region}_footIk_0001')
+        hierarchy = AutoRigHelpers.build_control_hierarchy(foot_ctrl)
+        foot_zero, foot_offset = hierarchy.zero, hierarchy.offset
+        foot_ctrl_temp = crv_lib.create('circle', f'crv_{side}_{region}_footIk_0001')
         foot_ctrl_shape = cmds.listRelatives(foot_ctrl_temp, shapes=True, fullPath=True)
-        cmds.parent(foot_zero, getattr(self, f"{side}_{region}_leg_ik_grp"))
+        cmds.parent(foot_zero, self.get(f"{side}_{region}_leg_ik_grp"))
         
         # parent shape to control joint
         cmds.parent(foot_ctrl_shape, foot_ctrl, relative=True, shape=True)
@@ -605,55 +713,48 @@ class LimbsAutoRig(object):
         cmds.makeIdentity(foot_ctrl, a=True)
         
         # create ik hierachy
-        heel_ctrl = crv_lib.create_diamond_sphere(f'ctrl_{side}_{region}_heelPivotIk_0001')
-        cmds.matchTransform(heel_ctrl, getattr(self, f"{side}_{region}_heelPivot_root")[0])
-        AutoRigHelpers.create_control_hierarchy(heel_ctrl, 2)
-        _, _, heel_zero, heel_offset = AutoRigHelpers.get_parent_grp(heel_ctrl)
-        cmds.parent(heel_zero, foot_ctrl)
-        
-        toe_pivot_ctrl = crv_lib.create_diamond_sphere(f'ctrl_{side}_{region}_toePivotIk_0001')
-        cmds.matchTransform(toe_pivot_ctrl, getattr(self, f"{side}_{region}_heelPivot_root")[1])
-        AutoRigHelpers.create_control_hierarchy(toe_pivot_ctrl, 2)
-        _, _, toe_pivot_zero, toe_pivot_offset = AutoRigHelpers.get_parent_grp(toe_pivot_ctrl)
-        cmds.parent(toe_pivot_zero, heel_ctrl)
-        
-        foot_out_ctrl = crv_lib.create_diamond_sphere(f'ctrl_{side}_{region}_footOutPivotIk_0001')
-        cmds.matchTransform(foot_out_ctrl, getattr(self, f"{side}_{region}_footOutPivot_root")[0])
-        AutoRigHelpers.create_control_hierarchy(foot_out_ctrl, 2)
-        _, _, foot_out_zero, foot_out_offset = AutoRigHelpers.get_parent_grp(foot_out_ctrl)
-        cmds.parent(foot_out_zero, toe_pivot_ctrl)
-        
-        foot_in_ctrl = crv_lib.create_diamond_sphere(f'ctrl_{side}_{region}_footInnPivotIk_0001')
-        cmds.matchTransform(foot_in_ctrl, getattr(self, f"{side}_{region}_footOutPivot_root")[1])
-        AutoRigHelpers.create_control_hierarchy(foot_in_ctrl, 2)
-        _, _, foot_in_zero, foot_in_offset = AutoRigHelpers.get_parent_grp(foot_in_ctrl)
-        cmds.parent(foot_in_zero, foot_out_ctrl)
+        heel_ctrl = crv_lib.create('diamond_sphere', f'ctrl_{side}_{region}_heelPivotIk_0001')
+        cmds.matchTransform(heel_ctrl, self.get(f"{side}_{region}_heelPivot_root")[0])
+        hierarchy = AutoRigHelpers.build_control_hierarchy(heel_ctrl, 2, parent=foot_ctrl)
+        heel_zero, heel_offset = hierarchy.zero, hierarchy.offset
+        
+        toe_pivot_ctrl = crv_lib.create('diamond_sphere', f'ctrl_{side}_{region}_toePivotIk_0001')
+        cmds.matchTransform(toe_pivot_ctrl, self.get(f"{side}_{region}_heelPivot_root")[1])
+        hierarchy = AutoRigHelpers.build_control_hierarchy(toe_pivot_ctrl, 2, parent=heel_ctrl)
+        toe_pivot_zero, toe_pivot_offset = hierarchy.zero, hierarchy.offset
+        
+        foot_out_ctrl = crv_lib.create('diamond_sphere', f'ctrl_{side}_{region}_footOutPivotIk_0001')
+        cmds.matchTransform(foot_out_ctrl, self.get(f"{side}_{region}_footOutPivot_root")[0])
+        hierarchy = AutoRigHelpers.build_control_hierarchy(foot_out_ctrl, 2, parent=toe_pivot_ctrl)
+        foot_out_zero, foot_out_offset = hierarchy.zero, hierarchy.offset
+        
+        foot_in_ctrl = crv_lib.create('diamond_sphere', f'ctrl_{side}_{region}_footInnPivotIk_0001')
+        cmds.matchTransform(foot_in_ctrl, self.get(f"{side}_{region}_footOutPivot_root")[1])
+        hierarchy = AutoRigHelpers.build_control_hierarchy(foot_in_ctrl, 2, parent=foot_out_ctrl)
+        foot_in_zero, foot_in_offset = hierarchy.zero, hierarchy.offset
         
         # create ball and toe ctrl
-        ball_ctrl = crv_lib.create_closed_arc(name=f'ctrl_{side}_{region}_ball_0001')
-        cmds.matchTransform(ball_ctrl, getattr(self, f"{side}_{region}_toeRvs_root")[0])
-        AutoRigHelpers.create_control_hierarchy(ball_ctrl, 2)
-        _, _, ball_zero, ball_offset = AutoRigHelpers.get_parent_grp(ball_ctrl)
-        cmds.parent(ball_zero, foot_in_ctrl)
-        
-        toe_ctrl = crv_lib.create_closed_arc(name=f'ctrl_{side}_{region}_toe_0001')
-        cmds.matchTransform(toe_ctrl, getattr(self, f"{side}_{region}_toeRvs_root")[1])
-        AutoRigHelpers.create_control_hierarchy(toe_ctrl, 2)
-        _, _, toe_zero, toe_offset = AutoRigHelpers.get_parent_grp(toe_ctrl)
-        cmds.parent(toe_zero, foot_in_ctrl)
+        ball_ctrl = crv_lib.create('closed_arc', f'ctrl_{side}_{region}_ball_0001')
+        cmds.matchTransform(ball_ctrl, self.get(f"{side}_{region}_toeRvs_root")[0])
+        hierarchy = AutoRigHelpers.build_control_hierarchy(ball_ctrl, 2, parent=foot_in_ctrl)
+        ball_zero, ball_offset = hierarchy.zero, hierarchy.offset
+        
+        toe_ctrl = crv_lib.create('closed_arc', f'ctrl_{side}_{region}_toe_0001')
+        cmds.matchTransform(toe_ctrl, self.get(f"{side}_{region}_toeRvs_root")[1])
+        hierarchy = AutoRigHelpers.build_control_hierarchy(toe_ctrl, 2, parent=foot_in_ctrl)
+        toe_zero, toe_offset = hierarchy.zero, hierarchy.offset
         
         # create leg roll aim
         leg_roll_aim_grp = cmds.createNode('transform', n=f'driven_{side}_{region}_legRollAim_0001')
         cmds.matchTransform(leg_roll_aim_grp, foot_zero)
-        AutoRigHelpers.create_control_hierarchy(leg_roll_aim_grp, 2)
-        _, _, leg_roll_aim_zero, leg_roll_aim_offset = AutoRigHelpers.get_parent_grp(leg_roll_aim_grp)
-        cmds.parent(leg_roll_aim_zero, ball_ctrl)
+        hierarchy = AutoRigHelpers.build_control_hierarchy(leg_roll_aim_grp, 2, parent=ball_ctrl)
+        leg_roll_aim_zero, leg_roll_aim_offset = hierarchy.zero, hierarchy.offset
         
-        leg_roll_ctrl = crv_lib.create_cube_curve(f'ctrl_{side}_{region}_legRoll_0001')
+        leg_roll_ctrl = crv_lib.create('cube', f'ctrl_{side}_{region}_legRoll_0001')
         cmds.matchTransform(leg_roll_ctrl, foot_zero)
-        AutoRigHelpers.create_control_hierarchy(leg_roll_ctrl, 2)
-        _, _, leg_roll_zero, leg_roll_offset = AutoRigHelpers.get_parent_grp(leg_roll_ctrl)
-        cmds.parent(leg_roll_zero, getattr(self, f"{side}_{region}_leg_ik_grp"))
+        hierarchy = AutoRigHelpers.build_control_hierarchy(leg_roll_ctrl, 2,
+                                                           parent=self.get(f"{side}_{region}_leg_ik_grp"))
+        leg_roll_zero, leg_roll_offset = hierarchy.zero, hierarchy.offset
         cmds.orientConstraint(leg_roll_ctrl, leg_roll_aim_grp, mo=True)
         
         # add leg roll ctrl attr
@@ -666,21 +767,13 @@ class LimbsAutoRig(object):
         cmds.parent(ankle_roll_grp, leg_roll_aim_grp)
         
         # create pvik ctrl
-        pv_ik_ctrl = crv_lib.create_cross(f'ctrl_{side}_{region}_kneePvIk_0001')
+        pv_ik_ctrl = crv_lib.create('cross', f'ctrl_{side}_{region}_kneePvIk_0001')
         cmds.matchTransform(pv_ik_ctrl, knee_jnt)
-        AutoRigHelpers.create_control_hierarchy(pv_ik_ctrl, 2)
-        _, _, pv_ik_zero, pv_ik_offset = AutoRigHelpers.get_parent_grp(pv_ik_ctrl)
-        cmds.parent(pv_ik_zero, knee_jnt)
-        if region == 'ft' and side == 'r':
-            AutoRigHelpers.set_attr(pv_ik_zero, 'translateY', 5)
-        elif region == 'ft' and side == 'l':
-            AutoRigHelpers.set_attr(pv_ik_zero, 'translateY', -5)
-        elif region == 'bk' and side == 'r':
-            AutoRigHelpers.set_attr(pv_ik_zero, 'translateY', -5)
-        elif region == 'bk' and side == 'l':
-            AutoRigHelpers.set_attr(pv_ik_zero, 'translateY', 5)
-        
-        cmds.parent(pv_ik_zero, getattr(self, f"{side}_{region}_leg_ik_grp"))
+        hierarchy = AutoRigHelpers.build_control_hierarchy(pv_ik_ctrl, 2, parent=knee_jnt)
+        pv_ik_zero, pv_ik_offset = hierarchy.zero, hierarchy.offset
+        AutoRigHelpers.set_attr(pv_ik_zero, 'translateY', self.leg_plan(side, region)['pv_offset_y'])
+        
+        cmds.parent(pv_ik_zero, self.get(f"{side}_{region}_leg_ik_grp"))
         AutoRigHelpers.set_attr(pv_ik_zero, 'rotateX', 0)
         AutoRigHelpers.set_attr(pv_ik_zero, 'rotateY', 0)
         AutoRigHelpers.set_attr(pv_ik_zero, 'rotateZ', 0)
@@ -707,11 +800,11 @@ class LimbsAutoRig(object):
         cmds.parentConstraint(knee_jnt, anno_trans, mo=False)
         
         # create upperleg ik ctrl
-        upperleg_ctrl = crv_lib.create_closed_arc(f'ctrl_{side}_{region}_upperleg_ik_0001')
+        upperleg_ctrl = crv_lib.create('closed_arc', f'ctrl_{side}_{region}_upperleg_ik_0001')
         cmds.matchTransform(upperleg_ctrl, upperleg_jnt)
-        AutoRigHelpers.create_control_hierarchy(upperleg_ctrl, 2)
-        _, _, upperleg_zero, upperleg_offset = AutoRigHelpers.get_parent_grp(upperleg_ctrl)
-        cmds.parent(upperleg_zero, getattr(self, f"{side}_{region}_leg_ik_grp"))
+        hierarchy = AutoRigHelpers.build_control_hierarchy(upperleg_ctrl, 2,
+                                                           parent=self.get(f"{side}_{region}_leg_ik_grp"))
+        upperleg_zero, upperleg_offset = hierarchy.zero, hierarchy.offset
         cmds.parentConstraint(upperleg_ctrl, upperleg_jnt)
         
         self._store(f"{side}_{region}_footIk_ctrl", foot_ctrl)
@@ -831,40 +924,13 @@ class LimbsAutoRig(object):
         """Set Driven key for foot bank and heel roll"""
         ctrls = self._get_leg_data(side, region)
         foot_ctrl = ctrls['foot']
-        heel_offset = ctrls['heel_offset']
-        toe_pivot_offset = ctrls['toe_pivot_offset']
-        foot_out_offset = ctrls['footOut_offset']
-        foot_in_offset = ctrls['footIn_offset']
-        
-        # heel roll key 1:
-        cmds.setDrivenKeyframe(f'{heel_offset}.rz', cd=f'{foot_ctrl}.heel_roll')
-        cmds.setDrivenKeyframe(f'{toe_pivot_offset}.rz', cd=f'{foot_ctrl}.heel_roll')
-        # heel roll key 2: heel_roll = 1, heel rz=90
-        AutoRigHelpers.set_attr(foot_ctrl, 'heel_roll', 1)
-        AutoRigHelpers.set_attr(heel_offset, 'rotateZ', 90)
-        cmds.setDrivenKeyframe(f'{heel_offset}.rz', cd=f'{foot_ctrl}.heel_roll')
-        AutoRigHelpers.set_attr(heel_offset, 'rotateZ', 0)
-        # # heel roll key 3: heel_roll = -1, toe_pivot rz=90
-        AutoRigHelpers.set_attr(foot_ctrl, 'heel_roll', -1)
-        AutoRigHelpers.set_attr(toe_pivot_offset, 'rotateZ', 90)
-        cmds.setDrivenKeyframe(f'{toe_pivot_offset}.rz', cd=f'{foot_ctrl}.heel_roll')
-        AutoRigHelpers.set_attr(toe_pivot_offset, 'rotateZ', 0)
-        AutoRigHelpers.set_attr(foot_ctrl, 'heel_roll', 0)
-        
-        # foot bank key 1:
-        cmds.setDrivenKeyframe(f'{foot_out_offset}.rz', cd=f'{foot_ctrl}.foot_bank')
-        cmds.setDrivenKeyframe(f'{foot_in_offset}.rz', cd=f'{foot_ctrl}.foot_bank')
-        # foot bank key 2: foot_bank = 1, foot_out_offset rz=90
-        AutoRigHelpers.set_attr(foot_ctrl, 'foot_bank', 1)
-        AutoRigHelpers.set_attr(foot_out_offset, 'rotateZ', 90)
-        cmds.setDrivenKeyframe(f'{foot_out_offset}.rz', cd=f'{foot_ctrl}.foot_bank')
-        AutoRigHelpers.set_attr(foot_out_offset, 'rotateZ', 0)
-        # foot bank key 3: foot_bank = -1, foot_in_offset rz=90
-        AutoRigHelpers.set_attr(foot_ctrl, 'foot_bank', -1)
-        AutoRigHelpers.set_attr(foot_in_offset, 'rotateZ', 90)
-        cmds.setDrivenKeyframe(f'{foot_in_offset}.rz', cd=f'{foot_ctrl}.foot_bank')
-        AutoRigHelpers.set_attr(foot_in_offset, 'rotateZ', 0)
-        AutoRigHelpers.set_attr(foot_ctrl, 'foot_bank', 0)
+        
+        # heel roll: 1 rolls on the heel, -1 on the toe pivot. foot bank: 1 out, -1 in
+        table = rig_driven_keys.DrivenKeyTable()
+        for driven, driver_attr, keys in self.leg_plan(side, region)['driven_keys']:
+            table.add(f'{foot_ctrl}.{driver_attr}',
+                      [(driver_value, f'{ctrls[driven]}.rz', value) for driver_value, value in keys])
+        return table.build()
     
     def create_foot_space_switch(self, side, region):
         ctrls = self._get_leg_data(side, region)
@@ -898,9 +964,7 @@ class LimbsAutoRig(object):
             
             loc = cmds.spaceLocator(n=f'loc_{side}_{region}_footSpace{label}_0001')[0]
             cmds.matchTransform(loc, foot_ctrl)
-            AutoRigHelpers.create_control_hierarchy(loc, 1)
-            zero = AutoRigHelpers.get_parent_grp(loc)[3]
-            cmds.parent(zero, root)
+            zero = AutoRigHelpers.build_control_hierarchy(loc, 1, parent=root).zero
             AutoRigHelpers.set_attr(zero, 'visibility', False)
             foot_locators.append(loc)
         
@@ -950,8 +1014,7 @@ class LimbsAutoRig(object):
                 zso=True  # zero scale orientation
             )
         
-        AutoRigHelpers.create_control_hierarchy(pv_aim_root_jnt, 1)
-        pv_aim_root_zero = AutoRigHelpers.get_parent_grp(pv_aim_root_jnt)[3]
+        pv_aim_root_zero = AutoRigHelpers.build_control_hierarchy(pv_aim_root_jnt, 1).zero
         AutoRigHelpers.set_attr(pv_aim_root_zero, 'visibility', False)
         if region == 'ft':
             cmds.parent(pv_aim_root_zero, scapula_jnt)
@@ -974,9 +1037,7 @@ class LimbsAutoRig(object):
             root = info['root']
             loc = cmds.spaceLocator(n=f'loc_{side}_{region}_kneePvIkSpace{label}_0001')[0]
             cmds.matchTransform(loc, pv_ctrl)
-            AutoRigHelpers.create_control_hierarchy(loc, 1)
-            loc_zero = AutoRigHelpers.get_parent_grp(loc)[3]
-            cmds.parent(loc_zero, root)
+            loc_zero = AutoRigHelpers.build_control_hierarchy(loc, 1, parent=root).zero
             
             knee_locators.append(loc)
         
@@ -1121,9 +1182,7 @@ class LimbsAutoRig(object):
             AutoRigHelpers.set_attr(scapula_aim_end, 'jointOrientZ', 0)
             
             # create zero group
-            AutoRigHelpers.create_control_hierarchy(scapula_aim_root, 1)
-            scapula_aim_zero = AutoRigHelpers.get_parent_grp(scapula_aim_root)[3]
-            cmds.parent(scapula_aim_zero, scapula_jnt_grp)
+            scapula_aim_zero = AutoRigHelpers.build_control_hierarchy(scapula_aim_root, 1, parent=scapula_jnt_grp).zero
             
             # neck point constraint scapula aim joint
             cmds.pointConstraint(self.neck_joints[0], scapula_aim_zero, mo=True)
@@ -1143,26 +1202,23 @@ class LimbsAutoRig(object):
         
         for side in ["l", "r"]:
             side_grp = self._ensure_group(f"grp_{side}_scapulaCtrls_0001", ctrl_root)
-            chain = getattr(self, f"{side}_scapula_joints", [])
+            chain = self.get(f"{side}_scapula_joints", [], warn=False)
             if not chain:
                 continue
             
             jnt = chain[0]
             ctrl_name = f"ctrl_{side}_scapula_0001"
-            ctrl = crv_lib.create_prism_line(ctrl_name)
+            ctrl = crv_lib.create('prism_line', ctrl_name)
             # add attrs
             AutoRigHelpers.add_attr(ctrl, 'auto_rotate', 'float', 0, 0, 1)
             AutoRigHelpers.add_attr(ctrl, 'limb_lock', 'float', 0, 0, 1)
             
             cmds.matchTransform(ctrl, jnt)
-            AutoRigHelpers.create_control_hierarchy(ctrl, 2)
-            zero_grp = ctrl.replace("ctrl", "zero")
-            offset_grp = ctrl.replace("ctrl", "offset")
-            cmds.parent(zero_grp, side_grp)
+            offset_grp = AutoRigHelpers.build_control_hierarchy(ctrl, 2, parent=side_grp).offset
             cmds.parentConstraint(ctrl, jnt, mo=False)
             
             if side == "r":
-                left_ctrl = ctrl.replace("_r_", "_l_")
+                left_ctrl = rig_symmetry.mirror_name(ctrl)
                 if cmds.objExists(left_ctrl):
                     AutoRigHelpers.mirror_curve_shape(left_ctrl, ctrl)
             
@@ -1232,7 +1288,7 @@ class LimbsAutoRig(object):
             loc_world = cmds.spaceLocator(n=f"loc_{side}_scapula_world_0001")[0]
             cmds.parent(loc_world, offset_grp)
             
-            chain = getattr(self, f"{side}_scapula_joints", [])
+            chain = self.get(f"{side}_scapula_joints", [], warn=False)
             if chain:
                 cmds.matchTransform(side_grp, chain[0], pos=True, rot=False)
             
@@ -1292,13 +1348,12 @@ class LimbsAutoRig(object):
         buffer_grp = self._ensure_group(f"grp_buffer_{side}_{region}_toeCtrls_0001", parent=leg_ctrl_grp)
         
         # create toe overall ctrl
-        toes_all_ctrl = crv_lib.create_curved_double_arrow(f'ctrl_{side}_{region}_toesAll_0001')
+        toes_all_ctrl = crv_lib.create('curved_double_arrow', f'ctrl_{side}_{region}_toesAll_0001')
         AutoRigHelpers.add_attr(toes_all_ctrl, 'spread', 'float', 0, -1, 1)
         AutoRigHelpers.add_attr(toes_all_ctrl, 'fist', 'float', 0, 0, 1)
         cmds.matchTransform(toes_all_ctrl, toe_jnt)
-        AutoRigHelpers.create_control_hierarchy(toes_all_ctrl, 2)
-        _, _, toes_zero, toes_offset = AutoRigHelpers.get_parent_grp(toes_all_ctrl)
-        cmds.parent(toes_zero, ctrl_grp)
+        hierarchy = AutoRigHelpers.build_control_hierarchy(toes_all_ctrl, 2, parent=ctrl_grp)
+        toes_zero, toes_offset = hierarchy.zero, hierarchy.offset
         cmds.parentConstraint(toe_jnt, toes_offset, mo=True)
         AutoRigHelpers.lock_hide_attr(toes_all_ctrl, ['tx','ty','tz'])
         
@@ -1322,30 +1377,21 @@ class LimbsAutoRig(object):
                 part = parts[4]
                 buffer_name = f'offset_buffer_{side}_{region}_{toe_name}_{part}_0001'
 
-                ctrl = crv_lib.create_lollipop_ctrl(ctrl_name)
-                buffer = cmds.createNode('transform', n=buffer_name)
+                ctrl = crv_lib.create('lollipop', ctrl_name)
+                buffer = AutoRigHelpers.create_empty_group(buffer_name)
 
                 cmds.matchTransform(ctrl, jnt)
                 cmds.matchTransform(buffer, jnt)
 
-                # Build hierarchy
-                AutoRigHelpers.create_control_hierarchy(ctrl)
-                AutoRigHelpers.create_control_hierarchy(buffer, 1)
-                zero_grp, offset_grp, driven_grp, connect_grp = AutoRigHelpers.get_parent_grp(ctrl)
-                zero_buffer = AutoRigHelpers.get_parent_grp(buffer)[3]
+                # Build hierarchy: root under the toe groups, the rest under the previous control / buffer
+                hierarchy = AutoRigHelpers.build_control_hierarchy(ctrl, parent=prev_ctrl or ctrl_grp)
+                offset_grp, driven_grp, connect_grp = hierarchy.offset, hierarchy.driven, hierarchy.connect
+                AutoRigHelpers.build_control_hierarchy(buffer, 1, parent=prev_buffer or buffer_grp)
 
                 # connect ctrl and buffer
                 for attr in ['tx','ty','tz','rx','ry','rz']:
                     AutoRigHelpers.connect_attr(buffer, attr, offset_grp, attr)
 
-                # Parenting
-                if prev_ctrl is None:
-                    cmds.parent(zero_grp, ctrl_grp)  # root under toeCtrl group
-                    cmds.parent(zero_buffer, buffer_grp)
-                else:
-                    cmds.parent(zero_grp, prev_ctrl)  # child under previous control
-                    cmds.parent(zero_buffer, prev_buffer)
-
                 if "metacarple" in part.lower():
                     driver = ankle_jnt
                 elif "base" in part.lower():
@@ -1371,10 +1417,6 @@ class LimbsAutoRig(object):
 
                 prev_ctrl = ctrl
                 prev_buffer = buffer
-                
-                # set driven key
-                
-                # self.toe_set_driven_key(side, region, toes_all_ctrl, driven_grp)
 
                 toe_ctrls.append(ctrl)
                 buffers.append(buffer)
@@ -1383,17 +1425,14 @@ class LimbsAutoRig(object):
             # Store per toe
             all_toe_ctrls[toe_name] = toe_ctrls
             buffer_groups[toe_name] = buffers
-            for toe_names, driven in all_toe_ctrls.items():
-                for buf in driven:
-                    zero, offset, driven, connect = AutoRigHelpers.get_parent_grp(buf)
-                    all_driven_grps.append(driven)
-            
-            self.toe_set_driven_key(side, region, toes_all_ctrl, all_driven_grps)
-            
-            # Store references for later access
-            self._store(f"{side}_{region}_toe_ctrls_dict", all_toe_ctrls)
-            self._store(f"{side}_{region}_toe_ctrls_grp", ctrl_grp)
-            self._store(f"{side}_{region}_toes_all_ctrl_grp", toes_all_ctrl)
+
+        # set driven keys once, for every toe
+        self.toe_set_driven_key(side, region, toes_all_ctrl, all_driven_grps)
+
+        # Store references for later access
+        self._store(f"{side}_{region}_toe_ctrls_dict", all_toe_ctrls)
+        self._store(f"{side}_{region}_toe_ctrls_grp", ctrl_grp)
+        self._store(f"{side}_{region}_toes_all_ctrl_grp", toes_all_ctrl)
     
     def toe_set_driven_key(self, side, region, toe_all_ctrl, driven_groups):
         """
@@ -1401,232 +1440,112 @@ class LimbsAutoRig(object):
         - 'spread': rotateY on base joints
         - 'fist': rotateZ on mid & tip joints (excluding thumb)
         """
-        # === Spread rotation values per toe ===
-        spread_info = {
-            "index": [-35, 15],
-            "middle": [-15, 5,],
-            "ring": [15, -5],
-            "pinky": [35, -15]
-        }
-        
-        # === Fist angle (same for all non-thumb toes) ===
-        fist_angle = -70
-        
-        # =============================
-        # Spread Keys (base only)
-        # =============================
-        AutoRigHelpers.set_attr(toe_all_ctrl, "spread", 0)
-        for grp in driven_groups:
-            if "base" not in grp:
-                continue  # only apply to base
-            AutoRigHelpers.set_attr(grp, "rotateY", 0)
-            cmds.setDrivenKeyframe(f"{grp}.rotateY", cd=f"{toe_all_ctrl}.spread")
-        
-        AutoRigHelpers.set_attr(toe_all_ctrl, "spread", 1)
-        for grp in driven_groups:
-            if "base" not in grp:
-                continue
-            for toe_name, angle in spread_info.items():
-                out_angel = angle[0]
-                if toe_name in grp:
-                    AutoRigHelpers.set_attr(grp, "rotateY", out_angel)
-                    cmds.setDrivenKeyframe(f"{grp}.rotateY", cd=f"{toe_all_ctrl}.spread")
-                    break
-        
-        AutoRigHelpers.set_attr(toe_all_ctrl, "spread", -1)
-        for grp in driven_groups:
-            if "base" not in grp:
-                continue
-            for toe_name, angle in spread_info.items():
-                in_angel = angle[-1]
-                if toe_name in grp:
-                    AutoRigHelpers.set_attr(grp, "rotateY", in_angel)
-                    cmds.setDrivenKeyframe(f"{grp}.rotateY", cd=f"{toe_all_ctrl}.spread")
-                    break
-        
-        # reset
-        AutoRigHelpers.set_attr(toe_all_ctrl, "spread", 0)
-        
-        # =============================
-        # Fist Keys (mid & tip only)
-        # =============================
-        AutoRigHelpers.set_attr(toe_all_ctrl, "fist", 0)
-        for grp in driven_groups:
-            # only mid or tip joints, skip thumb
-            if not any(x in grp for x in ["_mid_", "tip"]):
-                continue
-            if "thumb" in grp:
-                continue
-            AutoRigHelpers.set_attr(grp, "rotateZ", 0)
-            cmds.setDrivenKeyframe(f"{grp}.rotateZ", cd=f"{toe_all_ctrl}.fist")
-        
-        AutoRigHelpers.set_attr(toe_all_ctrl, "fist", 1)
-        for grp in driven_groups:
-            if not any(x in grp for x in ["_mid_", "tip"]):
-                continue
-            if "thumb" in grp:
-                continue
-            AutoRigHelpers.set_attr(grp, "rotateZ", fist_angle)
-            cmds.setDrivenKeyframe(f"{grp}.rotateZ", cd=f"{toe_all_ctrl}.fist")
-        
-        # reset
-        AutoRigHelpers.set_attr(toe_all_ctrl, "fist", 0)
+        table = rig_driven_keys.DrivenKeyTable()
+        table.update(plan_toe_driven_keys(toe_all_ctrl, driven_groups))
+        return table.build()
         
     # ---- twist joint setup ----
-    def create_twist_joints(self, side, region, twist_jnt_num=5):
-        """ create twist joints"""
-        
-        ctrls = self._get_leg_data(side, region)
-        joint_chain = ctrls['legJnts']
-        upperleg_jnt = joint_chain[0]
-        knee_jnt = joint_chain[1]
-        ankle_jnt = joint_chain[2]
-        scapula_jnt = self.get(f'{side}_scapula_joints')[0]
-        pelvis_jnt = self.pelvis_jnt
-        
-        # ----- create knee twist driver joints------
-        knee_twist_driver = cmds.createNode('joint', n=f'jnt_{side}_{region}_kneeTwistDriver_0001', p=knee_jnt)
-        knee_twist_driver_tip = cmds.createNode('joint', n=f'jnt_{side}_{region}_kneeTwistDriverTip_0001')
-        cmds.matchTransform(knee_twist_driver, knee_jnt)
-        cmds.matchTransform(knee_twist_driver_tip, ankle_jnt, pos=True, rot=False)
-        cmds.parent(knee_twist_driver_tip, knee_twist_driver)
-        AutoRigHelpers.set_attr(knee_twist_driver, 'visibility', False)
-        
-        # clear end joint rotation
-        for rot in ['jointOrientX','jointOrientY','jointOrientZ']:
-            AutoRigHelpers.set_attr(knee_twist_driver_tip, rot, 0)
-        
-        # create single chain ik
-        knee_ikHnd = cmds.ikHandle(sj=knee_twist_driver, ee=knee_twist_driver_tip, sol='ikSCsolver',
-                              n=f'ikHnd_{side}_{region}_kneeTwistDriver_0001')[0]
-        cmds.parent(knee_ikHnd, ankle_jnt)
-        AutoRigHelpers.set_attr(knee_ikHnd, 'visibility', False)
-        
-        # create knee twist joints
-        knee_twist_joints = []
-        for i in range(twist_jnt_num):
-            jnt = cmds.createNode('joint', n=f'jnt_{side}_{region}_kneeTwist_{i+1:04d}', p=knee_jnt)
-            if i == twist_jnt_num - 1:
-                cmds.matchTransform(jnt, ankle_jnt, pos=True, rot=False)
-            knee_twist_joints.append(jnt)
-            
-        # point constraint twist joint to get transformation
-        start_jnt = knee_twist_joints[0]
-        end_jnt = knee_twist_joints[-1]
-        mid_jnt = knee_twist_joints[len(knee_twist_joints) // 2]
-        knee_cons1 = cmds.pointConstraint(start_jnt, end_jnt, mid_jnt, mo=False)[0]
-        knee_cons2 = cmds.pointConstraint(start_jnt, mid_jnt, knee_twist_joints[1], mo=False)[0]
-        knee_cons3 = cmds.pointConstraint(mid_jnt, end_jnt, knee_twist_joints[-2], mo=False)[0]
-        knee_cons5 = cmds.pointConstraint(ankle_jnt, end_jnt, mo=True)[0]
-        # cmds.delete(knee_cons1, knee_cons2, knee_cons3)
-        
-        # connect rotation to knee twist joint
-        knee_mult_node = cmds.createNode('multiplyDivide', n=f'mult_{side}_{region}_kneeTwistDriver_0001')
-        for axis, value in zip(['X','Y','Z'], [0.25, 0.5, 0.75]):
-            AutoRigHelpers.connect_attr(knee_twist_driver, 'rotateX', knee_mult_node, f'input1{axis}')
-            AutoRigHelpers.set_attr(knee_mult_node, f'input2{axis}', value)
-        # connect twist 5
-        AutoRigHelpers.connect_attr(knee_twist_driver, 'rotateX', end_jnt, 'rotateX')
-        # connect twist 2
-        AutoRigHelpers.connect_attr(knee_mult_node, 'outputX', knee_twist_joints[1], 'rotateX')
-        # connect twist 3
-        AutoRigHelpers.connect_attr(knee_mult_node, 'outputY', knee_twist_joints[2], 'rotateX')
-        # connect twist 4
-        AutoRigHelpers.connect_attr(knee_mult_node, 'outputZ', knee_twist_joints[-2], 'rotateX')
-        
-        
-        # ------ create upperleg twist driver joints ----------
-        
-        upperleg_twist_driver = cmds.createNode('joint', n=f'jnt_{side}_{region}_upperlegTwistDriver_0001', p=upperleg_jnt)
-        upperleg_twist_driver_tip = cmds.createNode('joint', n=f'jnt_{side}_{region}_upperlegTwistDriverTip_0001')
-        cmds.matchTransform(upperleg_twist_driver, upperleg_jnt)
-        cmds.matchTransform(upperleg_twist_driver_tip, knee_jnt, pos=True, rot=False)
-        cmds.parent(upperleg_twist_driver_tip, upperleg_twist_driver)
-        AutoRigHelpers.set_attr(upperleg_twist_driver, 'visibility', False)
-        
-        # clear end joint rotation
-        for rot in ['jointOrientX', 'jointOrientY', 'jointOrientZ']:
-            AutoRigHelpers.set_attr(upperleg_twist_driver_tip, rot, 0)
-        
-        # create single chain ik
-        upperleg_ikHnd = cmds.ikHandle(sj=upperleg_twist_driver, ee=upperleg_twist_driver_tip, sol='ikSCsolver',
-                                   n=f'ikHnd_{side}_{region}_upperlegTwistDriver_0001')[0]
-        
-        AutoRigHelpers.set_attr(upperleg_ikHnd, 'visibility', False)
-        if region == 'ft':
-            cmds.parent(upperleg_ikHnd, scapula_jnt)
-        else:
-            cmds.parent(upperleg_ikHnd, pelvis_jnt)
-            
-        # create knee twist joints
-        upperleg_twist_joints = []
-        for i in range(twist_jnt_num):
-            jnt = cmds.createNode('joint', n=f'jnt_{side}_{region}_upperlegTwist_{i + 1:04d}', p=upperleg_jnt)
-            if i == twist_jnt_num - 1:
-                cmds.matchTransform(jnt, knee_jnt, pos=True, rot=False)
-            upperleg_twist_joints.append(jnt)
-        
-        # point constraint twist joint to get transformation
-        upperleg_start_jnt = upperleg_twist_joints[0]
-        upperleg_end_jnt = upperleg_twist_joints[-1]
-        upperleg_mid_jnt = upperleg_twist_joints[len(upperleg_twist_joints) // 2]
-        
-        upperleg_cons1 = cmds.pointConstraint(upperleg_start_jnt, upperleg_end_jnt, upperleg_mid_jnt, mo=False)[0]
-        upperleg_cons2 = cmds.pointConstraint(upperleg_start_jnt, upperleg_mid_jnt, upperleg_twist_joints[1], mo=False)[0]
-        upperleg_cons3 = cmds.pointConstraint(upperleg_mid_jnt, upperleg_end_jnt, upperleg_twist_joints[-2], mo=False)[0]
-        upperleg_cons5 = cmds.pointConstraint(knee_jnt, upperleg_end_jnt, mo=True)[0]
-        # cmds.delete(upperleg_cons1, upperleg_cons2, upperleg_cons3)
-        
-        # connect rotation to upperleg twist joint
-        upperleg_mult_node = cmds.createNode('multiplyDivide', n=f'mult_{side}_{region}_upperlegTwistDriver_0001')
-        for axis, value in zip(['X', 'Y', 'Z'], [0.75, 0.5, 0.25]):
-            AutoRigHelpers.connect_attr(upperleg_twist_driver, 'rotateX', upperleg_mult_node, f'input1{axis}')
-            AutoRigHelpers.set_attr(upperleg_mult_node, f'input2{axis}', value)
-        # connect twist 1
-        AutoRigHelpers.connect_attr(upperleg_twist_driver, 'rotateX', upperleg_start_jnt, 'rotateX')
-        # connect twist 2
-        AutoRigHelpers.connect_attr(upperleg_mult_node, 'outputX', upperleg_twist_joints[1], 'rotateX')
-        # connect twist 3
-        AutoRigHelpers.connect_attr(upperleg_mult_node, 'outputY', upperleg_twist_joints[2], 'rotateX')
-        # connect twist 4
-        AutoRigHelpers.connect_attr(upperleg_mult_node, 'outputZ', upperleg_twist_joints[-2], 'rotateX')
+    def create_twist_joints(self, side, region, twist_jnt_num=None):
+        """
+        Knee and upper leg twist joints, see rig_plan.plan_twist_build. The plan made before the
+        build is reused when the leg joints came out as the template predicted.
+        twist_jnt_num: joints per segment, self.twist_jnt_num when None, 0 builds no twist setup.
+        """
+        plan = self.plan_twist(side, region, twist_jnt_num)
+        if plan is None:
+            cmds.warning(f"[Rig] Missing leg joints for the {side}_{region} twist setup")
+            return {}
+        return rig_executor.PlanExecutor().run(plan)
     
     # ======================
     # Main Rig Constructor
     # ======================
-    def construct_rig(self):
-        """Build the entire rig once with proper logical order."""
+    def create_twist(self, side, region):
+        self.create_twist_joints(side, region, self.twist_jnt_num)
+    
+    def components(self):
+        """
+        Build steps grouped into components that can be rebuilt on their own, in build order.
+        Inputs / outputs are the registry handles each component reads and stores, the graph
+        derives the dependencies between the four legs from them. plan_leg / plan_twist of all
+        legs run before the build, see rig_components.ComponentGraph.plan.
+        """
+        sides = ["l", "r"]
+        regions = ["ft", "bk"]
+        pivots = ["heelPivot", "footOutPivot", "toeRvs"]
         
         # === 1. Base joint creation ===
-        for region in ["ft", "bk"]:
-            self.create_base_joints(region)
-        
-        # === 2. Scapula base joints (depends only on spine) ===
-        self.create_scapula_joint()
-        self.create_scapula_ctrls()
+        components = [Component(f"leg_joints_{region}", self, [partial(self.create_base_joints, region)],
+                                depends=["spine", "pelvis"],
+                                outputs=[f"{side}_{region}_leg_joints" for side in sides]) for region in regions]
+        
+        # === 2. Scapula base joints (spine and the front leg joints) ===
+        components.append(Component(
+            "scapula", self, [self.create_scapula_joint, self.create_scapula_ctrls],
+            depends=["spine"],
+            inputs=[f"{side}_ft_leg_joints" for side in sides],
+            outputs=[f"{side}_{handle}" for side in sides
+                     for handle in ["scapula_joints", "scapula_ctrl", "scapula_offset",
+                                    "scapula_aim_root_joints", "scapula_aim_end_joints"]]))
         
         # === 3. Build FK/IK chains and controller groups first ===
-        for side in ["l", "r"]:
-            for region in ["ft", "bk"]:
-                self.create_fk_ik_chains(side, region)
-                self.create_ctrl_groups(side, region)
+        for side in sides:
+            for region in regions:
+                leg = f"{side}_{region}"
+                components.append(Component(
+                    f"leg_{leg}", self,
+                    [partial(self.create_fk_ik_chains, side, region), partial(self.create_ctrl_groups, side, region)],
+                    depends=["scapula"],
+                    inputs=[f"{leg}_leg_joints"],
+                    outputs=[f"{leg}_leg_fk_joints", f"{leg}_leg_ik_joints", f"grp_{leg}_legJnts",
+                             f"{leg}_leg_ctrl_grp", f"{leg}_leg_fk_grp", f"{leg}_leg_ik_grp"],
+                    plan=partial(self.plan_leg, side, region)))
         
         # === 4. Create toe and pivot joints (now leg groups exist) ===
-        for region in ["ft", "bk"]:
-            self.create_pivot_joints(region)
-            self.create_toe_joints(region)
+        for region in regions:
+            components.append(Component(
+                f"toes_{region}", self,
+                [partial(self.create_pivot_joints, region), partial(self.create_toe_joints, region)],
+                inputs=[f"grp_{side}_{region}_legJnts" for side in sides],
+                outputs=[f"{side}_{region}_{handle}" for side in sides
+                         for handle in [f"{pivot}_root" for pivot in pivots] + ["toe_joints"]]))
         
         # === 5. IK/FK blending and mechanical systems ===
-        for side in ["l", "r"]:
-            for region in ["ft", "bk"]:
-                self.create_ik_fk_blend(side, region)
-                self.set_driven_key(side, region)
-                self.create_foot_space_switch(side, region)
-                self.create_leg_orient(side, region)
-                self.create_scapula_aim_ikHnd(side, region)
-                self.create_scapula_orient(side, region)
-                self.create_toe_ctrl(side, region)
-                self.create_twist_joints(side, region)
+        for side in sides:
+            for region in regions:
+                leg = f"{side}_{region}"
+                components.append(Component(
+                    f"leg_rig_{leg}", self,
+                    [partial(self.create_ik_fk_blend, side, region), partial(self.set_driven_key, side, region),
+                     partial(self.create_foot_space_switch, side, region), partial(self.create_leg_orient, side, region)],
+                    inputs=[f"{leg}_leg_joints", f"{leg}_leg_fk_joints", f"{leg}_leg_ik_joints",
+                            f"{leg}_leg_ctrl_grp", f"{leg}_leg_fk_grp", f"{leg}_leg_ik_grp",
+                            f"{side}_scapula_joints"] + [f"{leg}_{pivot}_root" for pivot in pivots],
+                    outputs=[f"{leg}_footIk_ctrl", f"{leg}_kneePvIk_ctrl", f"{leg}_upperlegIk_ctrl",
+                             f"{leg}_fk_ctrls", f"{leg}_fk_offset_grps"]))
+                components.append(Component(
+                    f"scapula_{leg}", self,
+                    [partial(self.create_scapula_aim_ikHnd, side, region), partial(self.create_scapula_orient, side, region)],
+                    inputs=[f"{leg}_footIk_ctrl", f"{side}_scapula_ctrl", f"{side}_scapula_aim_root_joints"]))
+                components.append(Component(
+                    f"toe_ctrls_{leg}", self, [partial(self.create_toe_ctrl, side, region)],
+                    inputs=[f"{leg}_leg_joints", f"{leg}_toe_joints", f"{leg}_footIk_ctrl"]))
+                components.append(Component(
+                    f"twist_{leg}", self, [partial(self.create_twist, side, region)],
+                    params=["twist_jnt_num"],
+                    inputs=[f"{leg}_leg_joints", f"{leg}_footIk_ctrl", f"{side}_scapula_joints"],
+                    plan=partial(self.plan_twist, side, region)))
+        return components
+    
+    def construct_rig(self, components=None):
+        """
+        Build the entire rig once with proper logical order.
+        
+        Args:
+            components (ComponentGraph): shared with the spine build so limb components can be rebuilt.
+        """
+        components = components if components is not None else ComponentGraph()
+        components.build(self.components())
         
         # === 6. Cleanup and mirror ===
         print("Rig construction completed successfully")
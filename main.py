@@ -1,44 +1,65 @@
 # main.py
 import sys
 import os
-import importlib
 
 pvr_path = r"D:\maya2023\Maya2023\scripts\cat_autoRig"
 if pvr_path not in sys.path:
     sys.path.append(pvr_path)
 
+import rig_modules
+
+# development only: reload edited rig modules, each once, before building
+DEV_RELOAD = True
+if DEV_RELOAD:
+    rig_modules.dev_reload()
+
 import build_master_hierachy
-importlib.reload(build_master_hierachy)
 import neck_spine_auto_rig
-importlib.reload(neck_spine_auto_rig)
-import  limbs_auto_rig
-importlib.reload(limbs_auto_rig)
+import limbs_auto_rig
+import rig_components
+import rig_manifest
+import rig_symmetry
+import rig_transaction
+import controller_shape
+from auto_rig_helpers import AutoRigHelpers
+from curve_library import RigCurveLibrary
 
 
 # Run it
 # group = auto_rig.InitRigSetUp()
 # group.construct_setup()
 
-# master
-master = build_master_hierachy.Master()
-master.construct_master()
+# records every node per component, stored on the master node at the end
+manifest = rig_manifest.RigManifest()
 
-# build neck and spine
-neck_spine_rig = neck_spine_auto_rig.SpineNeckAutoRig(master)
-neck_spine_rig.construct_rig()
+# a failed build deletes everything it created, undo is off while building
+with rig_transaction.BuildTransaction('catAutoRig', undo=False):
+    # master
+    with manifest.component('master'):
+        master = build_master_hierachy.Master()
+        master.construct_master()
 
-# build limbs
-limbs_rig = limbs_auto_rig.LimbsAutoRig(master, neck_spine_rig)
-limbs_rig.construct_rig()
+    # rebuild one component later with e.g. components.rebuild('tail', tail_jnt_num=12)
+    components = rig_components.ComponentGraph(manifest, master.registry, finalize=AutoRigHelpers.lock_and_hide_ctrls)
 
-# ---- edit controllers
-import controller_shape
-importlib.reload(controller_shape)
+    # build neck and spine
+    neck_spine_rig = neck_spine_auto_rig.SpineNeckAutoRig(master)
+    neck_spine_rig.construct_rig(components)
 
+    # build limbs
+    limbs_rig = limbs_auto_rig.LimbsAutoRig(master, neck_spine_rig)
+    limbs_rig.construct_rig(components)
+
+# controls were copied from hidden shape templates, the rig does not need them
+RigCurveLibrary.clear_templates()
+
+# ---- edit controllers
 json_path = r"E:\Vicky Term 4\cat_rig\data\controller_shapes.json"
 if os.path.exists(json_path):
     controller_shape.load_controller_shapes(json_path)
 
-from auto_rig_helpers import AutoRigHelpers
-
+# left / right index of the new rig, used by the mirror, push and RBF tools
+rig_symmetry.current(refresh=True)
 AutoRigHelpers.mirror_all_right_shapes()
+
+manifest.save(master.master_grp, master.registry)
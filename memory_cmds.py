@@ -0,0 +1,2227 @@
+"""
+In-memory stand-in for the subset of maya.cmds used by the auto rig.
+
+The scene is a plain Python DAG: every node keeps its type, parent, children
+and a flat attribute dict. Transforms are composed from translate / rotate /
+scale (plus jointOrient on joints) so matchTransform, xform and parenting keep
+world positions the same way Maya does. Constraints are evaluated once when
+they are created, there is no live dependency graph evaluation.
+
+Install it with rig_backend.use_memory_backend() before importing rig modules.
+"""
+import copy
+import fnmatch
+import math
+import re
+import uuid
+
+
+# ======================
+# Matrix / Vector Math
+# ======================
+# Maya convention: row vectors, world = local * parent_world
+
+def _identity():
+	return [1.0, 0.0, 0.0, 0.0,
+			0.0, 1.0, 0.0, 0.0,
+			0.0, 0.0, 1.0, 0.0,
+			0.0, 0.0, 0.0, 1.0]
+
+
+def _mult(a, b):
+	out = [0.0] * 16
+	for r in range(4):
+		a0, a1, a2, a3 = a[r * 4:r * 4 + 4]
+		for c in range(4):
+			out[r * 4 + c] = a0 * b[c] + a1 * b[4 + c] + a2 * b[8 + c] + a3 * b[12 + c]
+	return out
+
+
+def _inverse(m):
+	"""Inverse of an affine matrix (upper 3x3 + translation row)."""
+	a, b, c = m[0], m[1], m[2]
+	d, e, f = m[4], m[5], m[6]
+	g, h, i = m[8], m[9], m[10]
+	det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+	if abs(det) < 1e-12:
+		return _identity()
+	inv_det = 1.0 / det
+	r = [
+		(e * i - f * h) * inv_det, (c * h - b * i) * inv_det, (b * f - c * e) * inv_det,
+		(f * g - d * i) * inv_det, (a * i - c * g) * inv_det, (c * d - a * f) * inv_det,
+		(d * h - e * g) * inv_det, (b * g - a * h) * inv_det, (a * e - b * d) * inv_det,
+	]
+	tx, ty, tz = m[12], m[13], m[14]
+	return [
+		r[0], r[1], r[2], 0.0,
+		r[3], r[4], r[5], 0.0,
+		r[6], r[7], r[8], 0.0,
+		-(tx * r[0] + ty * r[3] + tz * r[6]),
+		-(tx * r[1] + ty * r[4] + tz * r[7]),
+		-(tx * r[2] + ty * r[5] + tz * r[8]),
+		1.0,
+	]
+
+
+def _rotation(rx, ry, rz):
+	"""Rotation matrix for euler degrees, xyz rotate order."""
+	x, y, z = math.radians(rx), math.radians(ry), math.radians(rz)
+	cx, sx = math.cos(x), math.sin(x)
+	cy, sy = math.cos(y), math.sin(y)
+	cz, sz = math.cos(z), math.sin(z)
+	return [
+		cy * cz, cy * sz, -sy, 0.0,
+		sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy, 0.0,
+		cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy, 0.0,
+		0.0, 0.0, 0.0, 1.0,
+	]
+
+
+def _euler(m):
+	"""Euler degrees (xyz order) from the rotation part of an orthonormal matrix."""
+	sy = max(-1.0, min(1.0, -m[2]))
+	ry = math.asin(sy)
+	if abs(math.cos(ry)) > 1e-6:
+		rx = math.atan2(m[6], m[10])
+		rz = math.atan2(m[1], m[0])
+	else:
+		rz = 0.0
+		rx = math.atan2(-m[9], m[5])
+	return [math.degrees(rx), math.degrees(ry), math.degrees(rz)]
+
+
+def _compose(t, r, s, jo=None):
+	m = _rotation(*r)
+	if jo is not None:
+		m = _mult(m, _rotation(*jo))
+	for row in range(3):
+		for col in range(3):
+			m[row * 4 + col] *= s[row]
+	m[12], m[13], m[14] = t[0], t[1], t[2]
+	return m
+
+
+def _decompose(m):
+	"""Split a matrix into translate, rotate (matrix) and scale."""
+	rows = [list(m[0:3]), list(m[4:7]), list(m[8:11])]
+	scale = [math.sqrt(_dot(row, row)) or 1.0 for row in rows]
+	rows = [[v / s for v in row] for row, s in zip(rows, scale)]
+	if _dot(_cross(rows[0], rows[1]), rows[2]) < 0.0:
+		scale[0] = -scale[0]
+		rows[0] = [-v for v in rows[0]]
+	rot = _identity()
+	for i in range(3):
+		rot[i * 4:i * 4 + 3] = rows[i]
+	return [m[12], m[13], m[14]], rot, scale
+
+
+def _rot_only(m):
+	out = _identity()
+	for i in range(3):
+		out[i * 4:i * 4 + 3] = m[i * 4:i * 4 + 3]
+	return out
+
+
+def _dot(a, b):
+	return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+	return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+
+
+def _sub(a, b):
+	return [a[0] - b[0], a[1] - b[1], a[2] - b[2]]
+
+
+def _normalize(v):
+	length = math.sqrt(_dot(v, v))
+	if length < 1e-12:
+		return [0.0, 0.0, 0.0]
+	return [v[0] / length, v[1] / length, v[2] / length]
+
+
+def _xform_point(p, m):
+	x, y, z = p
+	return [x * m[0] + y * m[4] + z * m[8] + m[12],
+			x * m[1] + y * m[5] + z * m[9] + m[13],
+			x * m[2] + y * m[6] + z * m[10] + m[14]]
+
+
+def _xform_vector(v, m):
+	x, y, z = v
+	return [x * m[0] + y * m[4] + z * m[8],
+			x * m[1] + y * m[5] + z * m[9],
+			x * m[2] + y * m[6] + z * m[10]]
+
+
+def _frame(rows):
+	m = _identity()
+	for i, row in enumerate(rows):
+		m[i * 4:i * 4 + 3] = row
+	return m
+
+
+def _transpose3(m):
+	out = _identity()
+	for r in range(3):
+		for c in range(3):
+			out[r * 4 + c] = m[c * 4 + r]
+	return out
+
+
+def _quat(m):
+	trace = m[0] + m[5] + m[10]
+	if trace > 0.0:
+		s = math.sqrt(trace + 1.0) * 2.0
+		return [(m[6] - m[9]) / s, (m[8] - m[2]) / s, (m[1] - m[4]) / s, 0.25 * s]
+	if m[0] > m[5] and m[0] > m[10]:
+		s = math.sqrt(1.0 + m[0] - m[5] - m[10]) * 2.0
+		return [0.25 * s, (m[4] + m[1]) / s, (m[8] + m[2]) / s, (m[6] - m[9]) / s]
+	if m[5] > m[10]:
+		s = math.sqrt(1.0 + m[5] - m[0] - m[10]) * 2.0
+		return [(m[4] + m[1]) / s, 0.25 * s, (m[9] + m[6]) / s, (m[8] - m[2]) / s]
+	s = math.sqrt(1.0 + m[10] - m[0] - m[5]) * 2.0
+	return [(m[8] + m[2]) / s, (m[9] + m[6]) / s, 0.25 * s, (m[1] - m[4]) / s]
+
+
+def _quat_matrix(q):
+	x, y, z, w = q
+	return [
+		1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w), 0.0,
+		2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w), 0.0,
+		2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y), 0.0,
+		0.0, 0.0, 0.0, 1.0,
+	]
+
+
+def _average_rotation(mats, weights=None):
+	quats = [_quat(m) for m in mats]
+	weights = weights or [1.0] * len(quats)
+	ref = quats[0]
+	total = [0.0, 0.0, 0.0, 0.0]
+	for q, weight in zip(quats, weights):
+		sign = weight if sum(a * b for a, b in zip(q, ref)) >= 0.0 else -weight
+		total = [t + sign * v for t, v in zip(total, q)]
+	length = math.sqrt(sum(v * v for v in total)) or 1.0
+	return _quat_matrix([v / length for v in total])
+
+
+# ======================
+# NURBS Curve Helpers
+# ======================
+
+def _default_knots(count, degree):
+	"""Maya style open uniform knot vector (count + degree - 1 knots)."""
+	if degree <= 1:
+		return [float(i) for i in range(count)]
+	spans = max(1, count - degree)
+	return [0.0] * (degree - 1) + [float(i) for i in range(spans + 1)] + [float(spans)] * (degree - 1)
+
+
+def _curve_domain(data):
+	knots, degree, count = data['knots'], data['degree'], len(data['cvs'])
+	return knots[degree - 1], knots[count - 1]
+
+
+def _curve_point(data, u):
+	"""Evaluate a curve at parameter u with de Boor's algorithm."""
+	cvs, degree = data['cvs'], data['degree']
+	knots = data['knots']
+	full = [knots[0]] + list(knots) + [knots[-1]]
+	n = len(cvs)
+	lo, hi = full[degree], full[n]
+	u = max(lo, min(hi, u))
+	span = degree
+	for k in range(degree, n):
+		if full[k] <= u < full[k + 1]:
+			span = k
+			break
+	else:
+		span = n - 1
+	d = [list(cvs[j + span - degree]) for j in range(degree + 1)]
+	for r in range(1, degree + 1):
+		for j in range(degree, r - 1, -1):
+			i = j + span - degree
+			denom = full[i + degree - r + 1] - full[i]
+			alpha = 0.0 if denom == 0.0 else (u - full[i]) / denom
+			d[j] = [(1.0 - alpha) * a + alpha * b for a, b in zip(d[j - 1], d[j])]
+	return d[degree]
+
+
+def _curve_length(data, samples=64):
+	lo, hi = _curve_domain(data)
+	prev = _curve_point(data, lo)
+	length = 0.0
+	for i in range(1, samples + 1):
+		pt = _curve_point(data, lo + (hi - lo) * i / float(samples))
+		length += math.sqrt(_dot(_sub(pt, prev), _sub(pt, prev)))
+		prev = pt
+	return length
+
+
+# ======================
+# Node Types / Attributes
+# ======================
+
+_TYPE_PARENTS = {
+	'dagNode': 'entity',
+	'transform': 'dagNode',
+	'joint': 'transform',
+	'ikHandle': 'transform',
+	'ikEffector': 'transform',
+	'constraint': 'transform',
+	'parentConstraint': 'constraint',
+	'pointConstraint': 'constraint',
+	'orientConstraint': 'constraint',
+	'aimConstraint': 'constraint',
+	'scaleConstraint': 'constraint',
+	'poleVectorConstraint': 'constraint',
+	'shape': 'dagNode',
+	'nurbsCurve': 'shape',
+	'locator': 'shape',
+	'mesh': 'shape',
+	'annotationShape': 'shape',
+	'weightDriver': 'locator',
+	'geometryFilter': 'entity',
+	'skinCluster': 'geometryFilter',
+	'jiggle': 'geometryFilter',
+	'animCurve': 'entity',
+	'animCurveUU': 'animCurve',
+	'animCurveUA': 'animCurve',
+	'animCurveUL': 'animCurve',
+	'objectSet': 'entity',
+	'shadingEngine': 'objectSet',
+}
+
+_SHORT_NAMES = {
+	't': 'translate', 'tx': 'translateX', 'ty': 'translateY', 'tz': 'translateZ',
+	'r': 'rotate', 'rx': 'rotateX', 'ry': 'rotateY', 'rz': 'rotateZ',
+	's': 'scale', 'sx': 'scaleX', 'sy': 'scaleY', 'sz': 'scaleZ',
+	'v': 'visibility', 'jo': 'jointOrient', 'jox': 'jointOrientX', 'joy': 'jointOrientY', 'joz': 'jointOrientZ',
+	'radi': 'radius', 'ro': 'rotateOrder', 'it': 'inheritsTransform',
+}
+
+_COMPOUNDS = {
+	'translate': ('translateX', 'translateY', 'translateZ'),
+	'rotate': ('rotateX', 'rotateY', 'rotateZ'),
+	'scale': ('scaleX', 'scaleY', 'scaleZ'),
+	'jointOrient': ('jointOrientX', 'jointOrientY', 'jointOrientZ'),
+	'poleVector': ('poleVectorX', 'poleVectorY', 'poleVectorZ'),
+	'input1': ('input1X', 'input1Y', 'input1Z'),
+	'input2': ('input2X', 'input2Y', 'input2Z'),
+	'output': ('outputX', 'outputY', 'outputZ'),
+	'outColor': ('outColorR', 'outColorG', 'outColorB'),
+	'colorIfTrue': ('colorIfTrueR', 'colorIfTrueG', 'colorIfTrueB'),
+	'colorIfFalse': ('colorIfFalseR', 'colorIfFalseG', 'colorIfFalseB'),
+	'output3D': ('output3Dx', 'output3Dy', 'output3Dz'),
+	'outputTranslate': ('outputTranslateX', 'outputTranslateY', 'outputTranslateZ'),
+	'outputRotate': ('outputRotateX', 'outputRotateY', 'outputRotateZ'),
+	'outputScale': ('outputScaleX', 'outputScaleY', 'outputScaleZ'),
+	'inputRotate': ('inputRotateX', 'inputRotateY', 'inputRotateZ'),
+	'point1': ('point1X', 'point1Y', 'point1Z'),
+	'point2': ('point2X', 'point2Y', 'point2Z'),
+	'constraintTranslate': ('constraintTranslateX', 'constraintTranslateY', 'constraintTranslateZ'),
+	'constraintRotate': ('constraintRotateX', 'constraintRotateY', 'constraintRotateZ'),
+	'constraintScale': ('constraintScaleX', 'constraintScaleY', 'constraintScaleZ'),
+	'inTranslate1': ('inTranslateX1', 'inTranslateY1', 'inTranslateZ1'),
+	'inTranslate2': ('inTranslateX2', 'inTranslateY2', 'inTranslateZ2'),
+}
+
+# transform limit attributes -> (transformLimits flag, index), both share node.data['limits']
+_LIMIT_ATTRS = {}
+for _channel, _label in (('t', 'Trans'), ('r', 'Rot'), ('s', 'Scale')):
+	for _axis in 'XYZ':
+		for _index, _bound in enumerate(('min', 'max')):
+			_LIMIT_ATTRS[f'{_bound}{_label}{_axis}Limit'] = (f'{_channel}{_axis.lower()}', _index)
+			_LIMIT_ATTRS[f'{_bound}{_label}{_axis}LimitEnable'] = (f'e{_channel}{_axis.lower()}', _index)
+del _channel, _label, _axis, _index, _bound
+
+
+def _limit_default(key):
+	return [False, False] if key.startswith('e') else [-1.0, 1.0]
+
+
+_MATRIX_ATTRS = ('matrix', 'inverseMatrix', 'worldMatrix', 'worldInverseMatrix', 'parentMatrix',
+				 'parentInverseMatrix')
+
+_KEYABLE_TRANSFORM_ATTRS = ['visibility', 'translateX', 'translateY', 'translateZ',
+							'rotateX', 'rotateY', 'rotateZ', 'scaleX', 'scaleY', 'scaleZ']
+
+_DISPLAY_ATTRS = {
+	'visibility': True,
+	'overrideEnabled': False,
+	'overrideDisplayType': 0,
+	'overrideColor': 0,
+	'overrideRGBColors': False,
+	'template': False,
+}
+
+_TRANSFORM_ATTRS = dict(_DISPLAY_ATTRS, **{
+	'translateX': 0.0, 'translateY': 0.0, 'translateZ': 0.0,
+	'rotateX': 0.0, 'rotateY': 0.0, 'rotateZ': 0.0,
+	'scaleX': 1.0, 'scaleY': 1.0, 'scaleZ': 1.0,
+	'rotateOrder': 0,
+	'inheritsTransform': True,
+})
+
+_JOINT_ATTRS = dict(_TRANSFORM_ATTRS, **{
+	'jointOrientX': 0.0, 'jointOrientY': 0.0, 'jointOrientZ': 0.0,
+	'radius': 1.0,
+	'drawStyle': 0,
+	'segmentScaleCompensate': True,
+})
+
+_TYPE_DEFAULTS = {
+	'multiplyDivide': {'operation': 1, 'input2X': 1.0, 'input2Y': 1.0, 'input2Z': 1.0},
+	'plusMinusAverage': {'operation': 1},
+	'condition': {'operation': 0, 'colorIfTrueR': 0.0, 'colorIfFalseR': 1.0},
+	'remapValue': {'inputMax': 1.0, 'outputMax': 1.0},
+	'displayLayer': {'displayType': 0, 'color': 0, 'visibility': True},
+}
+
+# node types whose attributes are validated strictly, everything else accepts any plug
+_STRICT_TYPES = ('transform', 'joint')
+
+
+def _isa(node_type, base):
+	while node_type:
+		if node_type == base:
+			return True
+		node_type = _TYPE_PARENTS.get(node_type)
+	return False
+
+
+def _long_attr(attr):
+	return _SHORT_NAMES.get(attr, attr)
+
+
+def _flatten_numbers(values):
+	out = []
+	for value in values:
+		if isinstance(value, (list, tuple)):
+			out.extend(_flatten_numbers(value))
+		else:
+			out.append(value)
+	return out
+
+
+def _flatten(args):
+	out = []
+	for arg in args:
+		if arg is None:
+			continue
+		if isinstance(arg, str):
+			out.append(arg)
+		else:
+			out.extend(_flatten(list(arg)))
+	return out
+
+
+def _flag(kwargs, *names, **default):
+	for name in names:
+		if name in kwargs:
+			return kwargs[name]
+	return default.get('default')
+
+
+def _short(name):
+	return name.split('|')[-1]
+
+
+# ======================
+# Scene
+# ======================
+
+class MemoryNode(object):
+
+	def __init__(self, name, node_type):
+		self.name = name
+		self.type = node_type
+		self.uuid = str(uuid.uuid4()).upper()
+		self.parent = None
+		self.children = []
+		self.attrs = {}
+		self.user_attrs = {}
+		self.locked = set()
+		self.unkeyable = set()
+		self.data = {}
+
+		if node_type == 'joint':
+			self.attrs.update(_JOINT_ATTRS)
+		elif _isa(node_type, 'transform'):
+			self.attrs.update(_TRANSFORM_ATTRS)
+		elif _isa(node_type, 'shape'):
+			self.attrs.update(_DISPLAY_ATTRS)
+		self.attrs.update(_TYPE_DEFAULTS.get(node_type, {}))
+
+	@property
+	def is_dag(self):
+		return _isa(self.type, 'dagNode')
+
+	@property
+	def is_transform(self):
+		return _isa(self.type, 'transform')
+
+	@property
+	def is_shape(self):
+		return _isa(self.type, 'shape')
+
+	@property
+	def strict(self):
+		return self.type in _STRICT_TYPES
+
+	def full_path(self):
+		parts = []
+		node = self
+		while node is not None:
+			parts.append(node.name)
+			node = node.parent
+		return '|' + '|'.join(reversed(parts))
+
+	def descendants(self):
+		"""Depth first, pre-order."""
+		out = []
+		for child in self.children:
+			out.append(child)
+			out.extend(child.descendants())
+		return out
+
+
+class MemoryScene(object):
+
+	def __init__(self):
+		self.nodes = {}
+		self.connections = {}
+		self.selection = []
+		self.warnings = []
+		# undo works per outermost chunk only: opening it snapshots the scene, undo() restores it
+		self.undo_state = True
+		self.undo_chunks = 0
+		self.undo_stack = []
+
+	# ---- undo ----
+	def push_undo(self):
+		# clones are registered in the memo first, so node references (parent, children,
+		# connection keys, constraint targets) resolve without recursing down the hierarchy
+		memo = {}
+		for node in self.nodes.values():
+			memo[id(node)] = MemoryNode.__new__(MemoryNode)
+		for node in self.nodes.values():
+			memo[id(node)].__dict__.update(copy.deepcopy(node.__dict__, memo))
+		self.undo_stack.append(copy.deepcopy((self.nodes, self.connections, self.selection), memo))
+
+	def pop_undo(self):
+		if not self.undo_stack:
+			raise RuntimeError("There are no more commands to undo.")
+		self.nodes, self.connections, self.selection = self.undo_stack.pop()
+
+	# ---- naming ----
+	def unique_name(self, name):
+		name = _short(name)
+		if name not in self.nodes:
+			return name
+		match = re.match(r'^(.*?)(\d+)$', name)
+		if match:
+			base, digits = match.group(1), match.group(2)
+			index = int(digits) + 1
+			while True:
+				candidate = f"{base}{index:0{len(digits)}d}"
+				if candidate not in self.nodes:
+					return candidate
+				index += 1
+		index = 1
+		while f"{name}{index}" in self.nodes:
+			index += 1
+		return f"{name}{index}"
+
+	def default_name(self, node_type):
+		return self.unique_name(f"{node_type}1")
+
+	def node(self, name, required=True):
+		if isinstance(name, MemoryNode):
+			return name
+		node = self.nodes.get(_short(str(name)))
+		if node is None and required:
+			raise ValueError(f"No object matches name: {name}")
+		return node
+
+	def add_node(self, node_type, name=None, parent=None):
+		name = self.unique_name(name) if name else self.default_name(node_type)
+		node = MemoryNode(name, node_type)
+		self.nodes[name] = node
+		if parent is not None:
+			self.reparent(node, parent, relative=True)
+		return node
+
+	def rename(self, node, new_name):
+		new_name = _short(new_name)
+		if new_name == node.name:
+			return node.name
+		new_name = self.unique_name(new_name)
+		del self.nodes[node.name]
+		node.name = new_name
+		self.nodes[new_name] = node
+		return new_name
+
+	def delete(self, node):
+		doomed = [node] + node.descendants()
+		effector = node.data.get('effector')
+		if effector is not None and effector.name in self.nodes:
+			doomed.append(effector)
+		doomed_ids = set(id(n) for n in doomed)
+		if node.parent is not None:
+			node.parent.children.remove(node)
+		for n in doomed:
+			self.nodes.pop(n.name, None)
+		for dest, src in list(self.connections.items()):
+			if id(dest[0]) in doomed_ids or id(src[0]) in doomed_ids:
+				del self.connections[dest]
+		self.selection = [n for n in self.selection if id(n) not in doomed_ids]
+
+	# ---- transforms ----
+	def local_matrix(self, node):
+		if not node.is_transform:
+			return _identity()
+		a = node.attrs
+		t = [a['translateX'], a['translateY'], a['translateZ']]
+		r = [a['rotateX'], a['rotateY'], a['rotateZ']]
+		s = [a['scaleX'], a['scaleY'], a['scaleZ']]
+		jo = None
+		if node.type == 'joint':
+			jo = [a['jointOrientX'], a['jointOrientY'], a['jointOrientZ']]
+		return _compose(t, r, s, jo)
+
+	def parent_matrix(self, node):
+		if node.parent is None or not node.attrs.get('inheritsTransform', True):
+			return _identity()
+		return self.world_matrix(node.parent)
+
+	def world_matrix(self, node):
+		local = self.local_matrix(node)
+		if node.parent is None or not node.attrs.get('inheritsTransform', True):
+			return local
+		return _mult(local, self.world_matrix(node.parent))
+
+	def set_local_matrix(self, node, m, solve_orient=False):
+		"""
+		Write a local matrix back onto translate/rotate/scale.
+		Joints keep jointOrient and solve rotate, unless solve_orient keeps rotate instead.
+		"""
+		t, rot, s = _decompose(m)
+		a = node.attrs
+		a['translateX'], a['translateY'], a['translateZ'] = t
+		a['scaleX'], a['scaleY'], a['scaleZ'] = s
+		if node.type == 'joint':
+			jo = _rotation(a['jointOrientX'], a['jointOrientY'], a['jointOrientZ'])
+			r = _rotation(a['rotateX'], a['rotateY'], a['rotateZ'])
+			if solve_orient:
+				a['jointOrientX'], a['jointOrientY'], a['jointOrientZ'] = _euler(_mult(_transpose3(r), rot))
+			else:
+				a['rotateX'], a['rotateY'], a['rotateZ'] = _euler(_mult(rot, _transpose3(jo)))
+		else:
+			a['rotateX'], a['rotateY'], a['rotateZ'] = _euler(rot)
+
+	def set_world_matrix(self, node, m, solve_orient=False):
+		self.set_local_matrix(node, _mult(m, _inverse(self.parent_matrix(node))), solve_orient)
+
+	def reparent(self, node, parent, relative=False):
+		if parent is not None:
+			walk = parent
+			while walk is not None:
+				if walk is node:
+					raise RuntimeError(f"Cannot parent {node.name} under its own descendant {parent.name}")
+				walk = walk.parent
+		world = self.world_matrix(node) if node.is_transform and not relative else None
+		if node.parent is not None:
+			node.parent.children.remove(node)
+		node.parent = parent
+		if parent is not None:
+			parent.children.append(node)
+		if world is not None:
+			self.set_world_matrix(node, world, solve_orient=True)
+
+	# ---- attributes ----
+	def split_plug(self, plug):
+		node_name, _, attr = str(plug).partition('.')
+		return self.node(node_name), _long_attr(attr)
+
+	def has_attr(self, node, attr):
+		attr = _long_attr(attr)
+		base = attr.split('[')[0]
+		if attr in node.attrs or attr in node.user_attrs or base in _MATRIX_ATTRS:
+			return True
+		if attr in _LIMIT_ATTRS and node.is_transform:
+			return True
+		if attr in _COMPOUNDS and all(c in node.attrs for c in _COMPOUNDS[attr]):
+			return True
+		return not node.strict and not node.is_dag and '[' in attr
+
+	def _check_attr(self, node, attr):
+		if node.strict and not self.has_attr(node, attr):
+			raise ValueError(f"No object matches name: {node.name}.{attr}")
+
+	def compound_children(self, node, attr):
+		spec = node.user_attrs.get(attr)
+		if spec and spec.get('children'):
+			return spec['children']
+		return _COMPOUNDS.get(attr)
+
+	def get_plug(self, node, attr):
+		attr = _long_attr(attr)
+		base = attr.split('[')[0]
+		if base in _MATRIX_ATTRS and node.is_dag:
+			return self._matrix_attr(node, base)
+
+		children = self.compound_children(node, attr)
+		if children:
+			return [tuple(self.get_plug(node, child) for child in children)]
+
+		if attr in _LIMIT_ATTRS and node.is_transform:
+			key, index = _LIMIT_ATTRS[attr]
+			return node.data.get('limits', {}).get(key, _limit_default(key))[index]
+
+		evaluator = _EVALUATORS.get(node.type)
+		if evaluator is not None:
+			value = evaluator(self, node, attr)
+			if value is not None:
+				return value
+
+		src = self.connections.get((node, attr))
+		if src is not None and (src[0].is_dag or src[0].type in _EVALUATORS):
+			return self.get_plug(*src)
+
+		if attr in node.attrs:
+			return node.attrs[attr]
+		self._check_attr(node, attr)
+		return 0.0
+
+	def input_value(self, node, attr):
+		src = self.connections.get((node, attr))
+		if src is not None:
+			return self.get_plug(*src)
+		return self.get_plug(node, attr)
+
+	def set_plug(self, node, attr, values):
+		attr = _long_attr(attr)
+		if attr in node.locked:
+			raise RuntimeError(f"The attribute '{node.name}.{attr}' is locked or connected and cannot be modified.")
+		if node.type == 'nurbsCurve':
+			indices = _control_point_indices(node, attr)
+			if indices is not None:
+				flat = _flatten_numbers(values)
+				for k, i in enumerate(indices):
+					node.data['cvs'][i] = [float(v) for v in flat[k * 3:k * 3 + 3]]
+				return
+		self._check_attr(node, attr)
+		if attr in _LIMIT_ATTRS and node.is_transform:
+			key, index = _LIMIT_ATTRS[attr]
+			limits = node.data.setdefault('limits', {})
+			limit = limits.setdefault(key, _limit_default(key))
+			value = _flatten_numbers(values)[0]
+			limit[index] = bool(value) if key.startswith('e') else float(value)
+			return
+		children = self.compound_children(node, attr)
+		if len(values) == 1 and isinstance(values[0], (list, tuple)) and children:
+			values = list(values[0])
+		if children and len(values) == len(children):
+			for child, value in zip(children, values):
+				node.attrs[child] = value
+			return
+		node.attrs[attr] = values[0] if len(values) == 1 else list(values)
+
+	def _matrix_attr(self, node, base):
+		if base == 'matrix':
+			return self.local_matrix(node)
+		if base == 'inverseMatrix':
+			return _inverse(self.local_matrix(node))
+		if base == 'worldMatrix':
+			return self.world_matrix(node)
+		if base == 'worldInverseMatrix':
+			return _inverse(self.world_matrix(node))
+		if base == 'parentMatrix':
+			return self.parent_matrix(node)
+		return _inverse(self.parent_matrix(node))
+
+	def connect(self, src, dest, force=False):
+		if dest in self.connections and self.connections[dest] != src and not force:
+			s_node, s_attr = self.connections[dest]
+			raise RuntimeError(f"{dest[0].name}.{dest[1]} already has an incoming connection "
+							   f"from {s_node.name}.{s_attr}.")
+		self.connections[dest] = src
+
+	# ---- curves ----
+	def curve_shape(self, name):
+		node = self.node(name)
+		if node.type == 'nurbsCurve':
+			return node
+		for child in node.children:
+			if child.type == 'nurbsCurve':
+				return child
+		raise ValueError(f"{name} has no nurbsCurve shape")
+
+	def components(self, spec):
+		"""Resolve 'curve.cv[...]' into (shape, [indices])."""
+		match = re.match(r'^(.*)\.cv\[(.+)\]$', str(spec))
+		if not match:
+			return None, None
+		shape = self.curve_shape(match.group(1))
+		count = len(shape.data['cvs'])
+		index = match.group(2)
+		if index == '*':
+			return shape, list(range(count))
+		if ':' in index:
+			start, end = index.split(':')
+			return shape, list(range(int(start), int(end) + 1))
+		return shape, [int(index)]
+
+	def shape_world(self, shape):
+		return self.world_matrix(shape.parent) if shape.parent is not None else _identity()
+
+
+# ======================
+# Evaluators
+# ======================
+# Only the computed outputs the rig reads back with getAttr.
+
+def _eval_distance(scene, node, attr):
+	if attr != 'distance':
+		return None
+	if (node, 'inMatrix1') in scene.connections or (node, 'inMatrix2') in scene.connections:
+		m1 = scene.input_value(node, 'inMatrix1') if (node, 'inMatrix1') in scene.connections else _identity()
+		m2 = scene.input_value(node, 'inMatrix2') if (node, 'inMatrix2') in scene.connections else _identity()
+		p1, p2 = list(m1[12:15]), list(m2[12:15])
+	else:
+		p1 = list(scene.input_value(node, 'point1')[0])
+		p2 = list(scene.input_value(node, 'point2')[0])
+	d = _sub(p1, p2)
+	return math.sqrt(_dot(d, d))
+
+
+def _eval_curve_info(scene, node, attr):
+	if attr not in ('arcLength', 'knots', 'knots[*]'):
+		return None
+	src = scene.connections.get((node, 'inputCurve'))
+	if src is None or src[0].type != 'nurbsCurve':
+		return 0.0 if attr == 'arcLength' else []
+	shape = src[0]
+	if attr != 'arcLength':
+		return list(shape.data['knots'])
+	world = scene.shape_world(shape)
+	data = dict(shape.data, cvs=[_xform_point(p, world) for p in shape.data['cvs']])
+	return _curve_length(data)
+
+
+def _eval_mult_matrix(scene, node, attr):
+	if attr != 'matrixSum':
+		return None
+	indices = set()
+	for key in list(node.attrs) + [dest[1] for dest in scene.connections if dest[0] is node]:
+		match = re.match(r'^matrixIn\[(\d+)\]$', key)
+		if match:
+			indices.add(int(match.group(1)))
+	result = _identity()
+	for i in sorted(indices):
+		m = scene.input_value(node, f'matrixIn[{i}]')
+		if isinstance(m, (list, tuple)) and len(m) == 16:
+			result = _mult(result, list(m))
+	return result
+
+
+def _eval_inverse_matrix(scene, node, attr):
+	if attr != 'outputMatrix':
+		return None
+	m = scene.input_value(node, 'inputMatrix')
+	if not isinstance(m, (list, tuple)) or len(m) != 16:
+		return _identity()
+	return _inverse(list(m))
+
+
+def _eval_pma(scene, node, attr):
+	if attr != 'output1D':
+		return None
+	values = []
+	indices = set()
+	for key in list(node.attrs) + [dest[1] for dest in scene.connections if dest[0] is node]:
+		match = re.match(r'^input1D\[(\d+)\]$', key)
+		if match:
+			indices.add(int(match.group(1)))
+	for i in sorted(indices):
+		values.append(float(scene.input_value(node, f'input1D[{i}]')))
+	if not values:
+		return 0.0
+	op = node.attrs.get('operation', 1)
+	if op == 2:
+		return values[0] - sum(values[1:])
+	if op == 3:
+		return sum(values) / len(values)
+	return sum(values)
+
+
+def _control_point_indices(node, attr):
+	match = re.match(r'^(?:controlPoints|cp|cv)\[(.+)\]$', attr)
+	if not match:
+		return None
+	index = match.group(1)
+	if index == '*':
+		return list(range(len(node.data['cvs'])))
+	if ':' in index:
+		start, end = index.split(':')
+		return list(range(int(start), int(end) + 1))
+	return [int(index)]
+
+
+def _eval_nurbs_curve(scene, node, attr):
+	data = node.data
+	indices = _control_point_indices(node, attr)
+	if indices is not None:
+		return [tuple(data['cvs'][i]) for i in indices]
+	if attr == 'degree':
+		return data['degree']
+	if attr == 'spans':
+		return len(data['cvs']) - data['degree']
+	if attr == 'form':
+		return 2 if data['form'] == 'periodic' else 0
+	return None
+
+
+_EVALUATORS = {
+	'nurbsCurve': _eval_nurbs_curve,
+	'distanceBetween': _eval_distance,
+	'curveInfo': _eval_curve_info,
+	'multMatrix': _eval_mult_matrix,
+	'inverseMatrix': _eval_inverse_matrix,
+	'plusMinusAverage': _eval_pma,
+}
+
+
+# ======================
+# Scene Access
+# ======================
+
+_scene = MemoryScene()
+
+
+def get_scene():
+	return _scene
+
+
+def new_scene():
+	"""Drop every node and start from an empty scene."""
+	global _scene
+	_scene = MemoryScene()
+	return _scene
+
+
+def _name(node, full_path=False):
+	return node.full_path() if full_path else node.name
+
+
+def _select_new(node, skip=False):
+	if not skip:
+		_scene.selection = [node]
+
+
+# ======================
+# Scene Commands
+# ======================
+
+def createNode(node_type, name=None, n=None, parent=None, p=None, skipSelect=False, ss=False, **kwargs):
+	name = name or n
+	parent = parent or p
+	parent_node = _scene.node(parent) if parent else None
+
+	if _isa(node_type, 'shape') and parent_node is None:
+		parent_node = _scene.add_node('transform', 'transform1')
+	node = _scene.add_node(node_type, name, parent_node)
+	_select_new(node, skipSelect or ss)
+	return node.name
+
+
+def objExists(name):
+	name = str(name)
+	if '.cv[' in name:
+		try:
+			shape, indices = _scene.components(name)
+		except ValueError:
+			return False
+		return all(0 <= i < len(shape.data['cvs']) for i in indices)
+	node_name, _, attr = name.partition('.')
+	node = _scene.node(node_name, required=False)
+	if node is None:
+		return False
+	return _scene.has_attr(node, attr) if attr else True
+
+
+def rename(old, new, **kwargs):
+	if not isinstance(old, str):
+		old = _flatten([old])[0]
+	return _scene.rename(_scene.node(old), new)
+
+
+def delete(*args, **kwargs):
+	if _flag(kwargs, 'ch', 'constructionHistory'):
+		# upstream dependency nodes only, the DAG nodes stay
+		for name in _flatten(args):
+			for node_name in listHistory(name)[1:]:
+				node = _scene.node(node_name, required=False)
+				if node is not None and not node.is_transform and not node.is_shape:
+					_scene.delete(node)
+		return
+	for name in _flatten(args):
+		node = _scene.node(name, required=False)
+		if node is not None:
+			_scene.delete(node)
+
+
+def parent(*args, **kwargs):
+	items = _flatten(args)
+	world = _flag(kwargs, 'w', 'world')
+	relative = _flag(kwargs, 'r', 'relative')
+	shape_mode = _flag(kwargs, 's', 'shape')
+
+	if world:
+		target = None
+		children = [_scene.node(c) for c in items]
+	else:
+		target = _scene.node(items[-1])
+		children = [_scene.node(c) for c in items[:-1]]
+
+	result = []
+	for child in children:
+		if child.parent is target:
+			warning(f"{child.name} is already a child of {target.name if target else 'the world'}.")
+			result.append(child.name)
+			continue
+		_scene.reparent(child, target, relative=bool(relative or shape_mode or child.is_shape))
+		result.append(child.name)
+	return result
+
+
+def listRelatives(*args, **kwargs):
+	names = _flatten(args) or [n.name for n in _scene.selection]
+	shapes = _flag(kwargs, 's', 'shapes')
+	children = _flag(kwargs, 'c', 'children')
+	parent_flag = _flag(kwargs, 'p', 'parent')
+	all_desc = _flag(kwargs, 'ad', 'allDescendents')
+	type_filter = _flag(kwargs, 'type')
+	full_path = _flag(kwargs, 'f', 'fullPath')
+	no_intermediate = _flag(kwargs, 'ni', 'noIntermediate')
+
+	if isinstance(type_filter, str):
+		type_filter = [type_filter]
+
+	found = []
+	for name in names:
+		node = _scene.node(name)
+		if parent_flag:
+			candidates = [node.parent] if node.parent is not None else []
+		elif all_desc:
+			candidates = list(reversed(node.descendants()))
+		else:
+			candidates = list(node.children)
+			if shapes:
+				candidates = [c for c in candidates if c.is_shape]
+		if no_intermediate:
+			candidates = [c for c in candidates if not c.attrs.get('intermediateObject')]
+		if type_filter:
+			candidates = [c for c in candidates if any(_isa(c.type, t) for t in type_filter)]
+		found.extend(candidates)
+
+	if not found:
+		return None
+	return [_name(c, full_path) for c in found]
+
+
+_UUID = re.compile(r'^[0-9A-F]{8}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{4}-[0-9A-F]{12}$')
+
+
+def ls(*args, **kwargs):
+	type_filter = _flag(kwargs, 'type', 'typ')
+	if _flag(kwargs, 'transforms', 'tr'):
+		type_filter = 'transform'
+	selection = _flag(kwargs, 'sl', 'selection')
+	flatten = _flag(kwargs, 'fl', 'flatten')
+	long_names = _flag(kwargs, 'l', 'long')
+	show_type = _flag(kwargs, 'st', 'showType')
+	show_uuid = _flag(kwargs, 'uid', 'uuid')
+	if isinstance(type_filter, str):
+		type_filter = [type_filter]
+
+	patterns = _flatten(args)
+	result = []
+	by_uuid = None
+	if any(_UUID.match(pattern) for pattern in patterns):
+		by_uuid = {n.uuid: n for n in _scene.nodes.values()}
+	if selection:
+		candidates = [(n, None) for n in _scene.selection]
+	elif not patterns:
+		candidates = [(n, None) for n in _scene.nodes.values()]
+	else:
+		candidates = []
+		for pattern in patterns:
+			if '.cv[' in pattern:
+				shape, indices = _scene.components(pattern)
+				if flatten:
+					result.extend(f"{shape.name}.cv[{i}]" for i in indices)
+				else:
+					result.append(f"{shape.name}.cv[{indices[0]}:{indices[-1]}]")
+				continue
+			if by_uuid is not None and _UUID.match(pattern):
+				if pattern in by_uuid:
+					candidates.append((by_uuid[pattern], None))
+				continue
+			short = _short(pattern)
+			if '*' in short or '?' in short:
+				candidates.extend((n, None) for n in _scene.nodes.values()
+								  if fnmatch.fnmatchcase(n.name, short))
+			else:
+				node = _scene.node(short.split('.')[0], required=False)
+				if node is not None:
+					candidates.append((node, short.partition('.')[2] or None))
+
+	seen = set()
+	for node, attr in candidates:
+		if type_filter and not any(_isa(node.type, t) for t in type_filter):
+			continue
+		key = (node.name, attr)
+		if key in seen:
+			continue
+		seen.add(key)
+		name = node.uuid if show_uuid else _name(node, long_names)
+		result.append(f"{name}.{attr}" if attr else name)
+		if show_type:
+			result.append(node.type)
+	return result
+
+
+def select(*args, **kwargs):
+	if _flag(kwargs, 'cl', 'clear'):
+		_scene.selection = []
+		return
+	nodes = []
+	for name in _flatten(args):
+		if '.cv[' in name:
+			shape, indices = _scene.components(name)
+			nodes.append(shape)
+			_scene.selection_components = [(shape, indices)]
+		else:
+			nodes.append(_scene.node(name))
+	if _flag(kwargs, 'add', 'af'):
+		_scene.selection.extend(nodes)
+	elif _flag(kwargs, 'd', 'deselect'):
+		_scene.selection = [n for n in _scene.selection if n not in nodes]
+	else:
+		_scene.selection = nodes
+
+
+def duplicate(*args, **kwargs):
+	name = _flag(kwargs, 'n', 'name')
+	source = _scene.node(_flatten(args)[0])
+
+	def _copy(src, new_name, new_parent):
+		dup = MemoryNode(_scene.unique_name(new_name), src.type)
+		dup.attrs = dict(src.attrs)
+		dup.user_attrs = {k: dict(v) for k, v in src.user_attrs.items()}
+		dup.locked = set(src.locked)
+		dup.unkeyable = set(src.unkeyable)
+		dup.data = {k: (list(v) if isinstance(v, list) else v) for k, v in src.data.items()}
+		if 'cvs' in dup.data:
+			dup.data['cvs'] = [list(p) for p in src.data['cvs']]
+		_scene.nodes[dup.name] = dup
+		if new_parent is not None:
+			dup.parent = new_parent
+			new_parent.children.append(dup)
+		created = [dup]
+		for child in src.children:
+			created.extend(_copy(child, child.name, dup))
+		return created
+
+	created = _copy(source, name or source.name, source.parent)
+	_select_new(created[0])
+	return [n.name for n in created]
+
+
+def getAttr(plug, **kwargs):
+	node, attr = _scene.split_plug(plug)
+	if _flag(kwargs, 'lock', 'l'):
+		return attr in node.locked
+	if _flag(kwargs, 'keyable', 'k'):
+		return attr not in node.unkeyable
+	if _flag(kwargs, 'type'):
+		value = _scene.get_plug(node, attr)
+		return 'matrix' if isinstance(value, list) and len(value) == 16 else type(value).__name__
+	return _scene.get_plug(node, attr)
+
+
+def setAttr(plug, *values, **kwargs):
+	node, attr = _scene.split_plug(plug)
+	lock = _flag(kwargs, 'lock', 'l')
+	keyable = _flag(kwargs, 'keyable', 'k')
+	children = _scene.compound_children(node, attr) or [attr]
+	if lock is not None:
+		for a in [attr] + list(children):
+			(node.locked.add if lock else node.locked.discard)(a)
+	if keyable is not None:
+		for a in [attr] + list(children):
+			(node.unkeyable.discard if keyable else node.unkeyable.add)(a)
+	if not values:
+		return
+	_scene.set_plug(node, attr, list(values))
+
+
+def addAttr(node, **kwargs):
+	node = _scene.node(node)
+	name = _flag(kwargs, 'ln', 'longName')
+	if name in node.user_attrs or name in node.attrs:
+		raise RuntimeError(f"Found a duplicate attribute name: {node.name}.{name}")
+	attr_type = _flag(kwargs, 'at', 'attributeType') or _flag(kwargs, 'dt', 'dataType') or 'double'
+	default = _flag(kwargs, 'dv', 'defaultValue', default=0.0)
+	spec = {
+		'type': attr_type,
+		'keyable': bool(_flag(kwargs, 'k', 'keyable', default=False)),
+		'min': _flag(kwargs, 'min', 'minValue'),
+		'max': _flag(kwargs, 'max', 'maxValue'),
+		'enum': _flag(kwargs, 'en', 'enumName'),
+		'default': default,
+		'children': [],
+	}
+	parent_attr = _flag(kwargs, 'p', 'parent')
+	node.user_attrs[name] = spec
+	if parent_attr:
+		node.user_attrs[parent_attr]['children'].append(name)
+	if attr_type not in ('double3', 'float3', 'compound'):
+		node.attrs[name] = 0 if attr_type == 'enum' else default
+	if not spec['keyable']:
+		node.unkeyable.add(name)
+
+
+def attributeQuery(attr, **kwargs):
+	node = _scene.node(_flag(kwargs, 'n', 'node'))
+	attr = _long_attr(attr)
+	if _flag(kwargs, 'ex', 'exists'):
+		return _scene.has_attr(node, attr)
+	spec = node.user_attrs.get(attr, {})
+	if _flag(kwargs, 'k', 'keyable'):
+		return attr not in node.unkeyable
+	if _flag(kwargs, 'at', 'attributeType'):
+		return spec.get('type', 'double')
+	if _flag(kwargs, 'lc', 'listChildren'):
+		return list(_scene.compound_children(node, attr) or []) or None
+	if _flag(kwargs, 'minExists', 'mne'):
+		return spec.get('min') is not None
+	if _flag(kwargs, 'maxExists', 'mxe'):
+		return spec.get('max') is not None
+	if _flag(kwargs, 'min', 'minimum'):
+		return [spec.get('min')]
+	if _flag(kwargs, 'max', 'maximum'):
+		return [spec.get('max')]
+	if _flag(kwargs, 'le', 'listEnum'):
+		return [spec.get('enum')] if spec.get('enum') else None
+	return None
+
+
+def listAttr(*args, **kwargs):
+	node = _scene.node(_flatten(args)[0])
+	keyable = _flag(kwargs, 'k', 'keyable')
+	user_defined = _flag(kwargs, 'ud', 'userDefined')
+	names = []
+	if not user_defined and node.is_transform:
+		names.extend(_KEYABLE_TRANSFORM_ATTRS)
+	elif not user_defined and keyable and not node.is_dag:
+		# utility nodes: every numeric attribute the node holds a value for
+		names.extend(a for a, v in node.attrs.items() if isinstance(v, (bool, int, float)) and '[' not in a)
+	names.extend(node.user_attrs)
+	if keyable:
+		names = [a for a in names if a not in node.unkeyable]
+	return names or None
+
+
+def connectAttr(src_plug, dest_plug, **kwargs):
+	src = _scene.split_plug(src_plug)
+	dest = _scene.split_plug(dest_plug)
+	_scene._check_attr(*src)
+	_scene._check_attr(*dest)
+	if dest[1] in dest[0].locked:
+		raise RuntimeError(f"The destination attribute '{dest_plug}' is locked.")
+	_scene.connect(src, dest, force=_flag(kwargs, 'f', 'force'))
+
+
+def disconnectAttr(src_plug, dest_plug, **kwargs):
+	dest = _scene.split_plug(dest_plug)
+	_scene.connections.pop(dest, None)
+
+
+def isConnected(src_plug, dest_plug, **kwargs):
+	src = _scene.split_plug(src_plug)
+	dest = _scene.split_plug(dest_plug)
+	return _scene.connections.get(dest) == src
+
+
+def listConnections(*args, **kwargs):
+	source = _flag(kwargs, 's', 'source', default=True)
+	destination = _flag(kwargs, 'd', 'destination', default=True)
+	plugs = _flag(kwargs, 'p', 'plugs')
+	type_filter = _flag(kwargs, 't', 'type')
+	pairs = _flag(kwargs, 'c', 'connections')
+
+	found = []
+	for name in _flatten(args):
+		node_name, _, attr = name.partition('.')
+		node = _scene.node(node_name)
+		attr = _long_attr(attr) if attr else None
+		for (d_node, d_attr), (s_node, s_attr) in _scene.connections.items():
+			if source and d_node is node and (attr is None or d_attr == attr):
+				if pairs:
+					found.append(f"{d_node.name}.{d_attr}")
+				found.append(f"{s_node.name}.{s_attr}" if plugs else s_node.name)
+			if destination and s_node is node and (attr is None or s_attr == attr):
+				if pairs:
+					found.append(f"{s_node.name}.{s_attr}")
+				found.append(f"{d_node.name}.{d_attr}" if plugs else d_node.name)
+	if type_filter:
+		if pairs:
+			kept = []
+			for own, other in zip(found[0::2], found[1::2]):
+				if _isa(_scene.node(other.split('.')[0]).type, type_filter):
+					kept.extend((own, other))
+			found = kept
+		else:
+			found = [f for f in found if _isa(_scene.node(f.split('.')[0]).type, type_filter)]
+	return found or None
+
+
+def listHistory(*args, **kwargs):
+	start = [_scene.node(n) for n in _flatten(args)]
+	queue = []
+	for node in start:
+		queue.append(node)
+		queue.extend(c for c in node.children if c.is_shape)
+	history = []
+	seen = set()
+	while queue:
+		node = queue.pop(0)
+		if id(node) in seen:
+			continue
+		seen.add(id(node))
+		history.append(node.name)
+		for (d_node, _), (s_node, _) in _scene.connections.items():
+			if d_node is node and not s_node.is_transform:
+				queue.append(s_node)
+	return history
+
+
+# ======================
+# Transform Commands
+# ======================
+
+def xform(*args, **kwargs):
+	items = _flatten(args) or [n.name for n in _scene.selection]
+	query = _flag(kwargs, 'q', 'query')
+	world = _flag(kwargs, 'ws', 'worldSpace')
+	relative = _flag(kwargs, 'r', 'relative')
+	translation = _flag(kwargs, 't', 'translation')
+	rotation = _flag(kwargs, 'ro', 'rotation')
+	scale = _flag(kwargs, 's', 'scale')
+	matrix = _flag(kwargs, 'm', 'matrix')
+
+	item = items[0]
+	if '.cv[' in item:
+		shape, indices = _scene.components(item)
+		world_m = _scene.shape_world(shape) if world else _identity()
+		if query:
+			out = []
+			for i in indices:
+				out.extend(_xform_point(shape.data['cvs'][i], world_m))
+			return out
+		inv = _inverse(world_m)
+		for i in indices:
+			point = list(translation)
+			if relative:
+				point = [a + b for a, b in zip(_xform_point(shape.data['cvs'][i], world_m), point)]
+			shape.data['cvs'][i] = _xform_point(point, inv)
+		return
+
+	node = _scene.node(item)
+	if query:
+		if translation:
+			if world:
+				return list(_scene.world_matrix(node)[12:15])
+			return [node.attrs['translateX'], node.attrs['translateY'], node.attrs['translateZ']]
+		if rotation:
+			if world:
+				return _euler(_decompose(_scene.world_matrix(node))[1])
+			return [node.attrs['rotateX'], node.attrs['rotateY'], node.attrs['rotateZ']]
+		if scale:
+			return [node.attrs['scaleX'], node.attrs['scaleY'], node.attrs['scaleZ']]
+		if matrix:
+			return _scene.world_matrix(node) if world else _scene.local_matrix(node)
+		return None
+
+	for name in items:
+		node = _scene.node(name)
+		if matrix is not None:
+			if world:
+				_scene.set_world_matrix(node, list(matrix))
+			else:
+				_scene.set_local_matrix(node, list(matrix))
+		if translation is not None:
+			if world:
+				m = _scene.world_matrix(node)
+				t = list(translation)
+				if relative:
+					t = [a + b for a, b in zip(m[12:15], t)]
+				m[12], m[13], m[14] = t
+				_scene.set_world_matrix(node, m)
+			else:
+				for axis, value in zip('XYZ', translation):
+					node.attrs[f'translate{axis}'] = (node.attrs[f'translate{axis}'] if relative else 0.0) + value
+		if rotation is not None:
+			if world:
+				m = _scene.world_matrix(node)
+				t, _, s = _decompose(m)
+				_scene.set_world_matrix(node, _compose(t, rotation, s))
+			else:
+				for axis, value in zip('XYZ', rotation):
+					node.attrs[f'rotate{axis}'] = (node.attrs[f'rotate{axis}'] if relative else 0.0) + value
+		if scale is not None:
+			for axis, value in zip('XYZ', scale):
+				node.attrs[f'scale{axis}'] = value
+
+
+def move(*args, **kwargs):
+	values = [a for a in args if isinstance(a, (int, float))]
+	items = _flatten([a for a in args if not isinstance(a, (int, float))]) or [n.name for n in _scene.selection]
+	relative = _flag(kwargs, 'r', 'relative')
+	object_space = _flag(kwargs, 'os', 'objectSpace')
+	for name in items:
+		node = _scene.node(name)
+		m = _scene.world_matrix(node)
+		delta = list(values)
+		if object_space:
+			delta = _xform_vector(delta, _decompose(m)[1])
+		if relative:
+			target = [a + b for a, b in zip(m[12:15], delta)]
+		else:
+			target = delta
+		m[12], m[13], m[14] = target
+		_scene.set_world_matrix(node, m)
+
+
+def matchTransform(*args, **kwargs):
+	items = _flatten(args)
+	node = _scene.node(items[0])
+	target = _scene.node(items[1])
+
+	pos = _flag(kwargs, 'pos', 'position')
+	rot = _flag(kwargs, 'rot', 'rotation')
+	scl = _flag(kwargs, 'scl', 'scale')
+	axes = [_flag(kwargs, f'position{a}', f'p{a.lower()}') for a in 'XYZ']
+	if not (pos or rot or scl or any(axes)):
+		pos = rot = scl = True
+
+	current = _scene.world_matrix(node)
+	goal = _scene.world_matrix(target)
+	t, r, s = _decompose(current)
+	gt, gr, gs = _decompose(goal)
+
+	if pos:
+		t = gt
+	elif any(axes):
+		t = [g if flag else c for c, g, flag in zip(t, gt, axes)]
+	if rot:
+		r = gr
+	if scl:
+		s = gs
+	m = _mult(_rot_only(r), _identity())
+	for row in range(3):
+		for col in range(3):
+			m[row * 4 + col] *= s[row]
+	m[12], m[13], m[14] = t
+	_scene.set_world_matrix(node, m)
+
+
+def makeIdentity(*args, **kwargs):
+	if not _flag(kwargs, 'a', 'apply'):
+		return
+	do_t = _flag(kwargs, 't', 'translate')
+	do_r = _flag(kwargs, 'r', 'rotate')
+	do_s = _flag(kwargs, 's', 'scale')
+	if not (do_t or do_r or do_s):
+		do_t = do_r = do_s = True
+
+	ordered = []
+	seen = set()
+	for name in _flatten(args):
+		root = _scene.node(name)
+		for node in [root] + root.descendants():
+			if node.is_transform and id(node) not in seen:
+				seen.add(id(node))
+				ordered.append(node)
+
+	for node in ordered:
+		a = node.attrs
+		local = _scene.local_matrix(node)
+		if node.type == 'joint':
+			if do_r:
+				rot = _mult(_rotation(a['rotateX'], a['rotateY'], a['rotateZ']),
+							_rotation(a['jointOrientX'], a['jointOrientY'], a['jointOrientZ']))
+				a['jointOrientX'], a['jointOrientY'], a['jointOrientZ'] = _euler(rot)
+				a['rotateX'] = a['rotateY'] = a['rotateZ'] = 0.0
+			if not do_s:
+				continue
+			a['scaleX'] = a['scaleY'] = a['scaleZ'] = 1.0
+		else:
+			if do_t:
+				a['translateX'] = a['translateY'] = a['translateZ'] = 0.0
+			if do_r:
+				a['rotateX'] = a['rotateY'] = a['rotateZ'] = 0.0
+			if do_s:
+				a['scaleX'] = a['scaleY'] = a['scaleZ'] = 1.0
+		frozen = _mult(local, _inverse(_scene.local_matrix(node)))
+		for child in node.children:
+			if child.type == 'nurbsCurve':
+				child.data['cvs'] = [_xform_point(p, frozen) for p in child.data['cvs']]
+			elif child.is_transform:
+				_scene.set_local_matrix(child, _mult(_scene.local_matrix(child), frozen))
+
+
+# ======================
+# Creation Commands
+# ======================
+
+def spaceLocator(*args, **kwargs):
+	name = _flag(kwargs, 'n', 'name') or 'locator1'
+	transform = _scene.add_node('transform', name)
+	_scene.add_node('locator', f"{transform.name}Shape", transform)
+	position = _flag(kwargs, 'p', 'position')
+	if position:
+		transform.attrs['translateX'], transform.attrs['translateY'], transform.attrs['translateZ'] = position
+	_select_new(transform)
+	return [transform.name]
+
+
+def _make_curve(name, shape_name, degree, points, knots, periodic):
+	transform = _scene.add_node('transform', name or 'curve1')
+	shape = _scene.add_node('nurbsCurve', shape_name, transform)
+	points = [[float(v) for v in p] for p in points]
+	if periodic and degree > 1 and points[:degree] != points[-degree:]:
+		points = points + [list(p) for p in points[:degree]]
+	shape.data = {
+		'degree': degree,
+		'cvs': points,
+		'knots': [float(k) for k in knots] if knots else _default_knots(len(points), degree),
+		'form': 'periodic' if periodic else 'open',
+	}
+	_select_new(transform)
+	return transform
+
+
+def curve(*args, **kwargs):
+	degree = _flag(kwargs, 'd', 'degree', default=3)
+	points = _flag(kwargs, 'p', 'point')
+	knots = _flag(kwargs, 'k', 'knot')
+	periodic = _flag(kwargs, 'per', 'periodic')
+	name = _flag(kwargs, 'n', 'name')
+	transform = _make_curve(name, 'curveShape1', degree, points, knots, periodic)
+	return transform.name
+
+
+def circle(*args, **kwargs):
+	name = _flag(kwargs, 'n', 'name') or 'nurbsCircle1'
+	radius = _flag(kwargs, 'r', 'radius', default=1.0)
+	normal = _normalize(list(_flag(kwargs, 'nr', 'normal', default=(0, 0, 1))))
+	center = _flag(kwargs, 'c', 'center', default=(0, 0, 0))
+	sections = _flag(kwargs, 's', 'sections', default=8)
+
+	helper = [1.0, 0.0, 0.0] if abs(normal[0]) < 0.9 else [0.0, 1.0, 0.0]
+	axis_u = _normalize(_cross(normal, helper))
+	axis_v = _cross(axis_u, normal)
+	points = []
+	for i in range(sections):
+		angle = 2.0 * math.pi * i / sections
+		cu, cv = math.cos(angle) * radius, math.sin(angle) * radius
+		points.append([center[k] + axis_u[k] * cu + axis_v[k] * cv for k in range(3)])
+	knots = [float(i) for i in range(-2, sections + 3)]
+	transform = _make_curve(name, f"{_short(name)}Shape", 3, points, knots, True)
+	maker = _scene.add_node('makeNurbCircle', 'makeNurbCircle1')
+	_scene.connect((maker, 'outputCurve'), (transform.children[0], 'create'))
+	return [transform.name, maker.name]
+
+
+def closeCurve(*args, **kwargs):
+	for name in _flatten(args):
+		shape = _scene.curve_shape(name)
+		data = shape.data
+		if data['form'] == 'periodic':
+			continue
+		degree = data['degree']
+		if degree == 1:
+			if data['cvs'][0] != data['cvs'][-1]:
+				data['cvs'].append(list(data['cvs'][0]))
+		else:
+			data['cvs'].extend(list(p) for p in data['cvs'][:degree])
+		count = len(data['cvs'])
+		data['knots'] = [float(i) for i in range(-(degree - 1), count)][:count + degree - 1]
+		data['form'] = 'periodic'
+	return _flatten(args)
+
+
+def reverseCurve(*args, **kwargs):
+	for name in _flatten(args):
+		data = _scene.curve_shape(name).data
+		data['cvs'].reverse()
+		lo, hi = data['knots'][0], data['knots'][-1]
+		data['knots'] = [lo + hi - k for k in reversed(data['knots'])]
+	return _flatten(args)
+
+
+def rebuildCurve(*args, **kwargs):
+	spans = _flag(kwargs, 's', 'spans', default=4)
+	degree = _flag(kwargs, 'd', 'degree', default=3)
+	keep_range = _flag(kwargs, 'kr', 'keepRange', default=1)
+	for name in _flatten(args):
+		shape = _scene.curve_shape(name)
+		data = shape.data
+		lo, hi = _curve_domain(data)
+		count = spans + degree
+		points = [_curve_point(data, lo + (hi - lo) * i / float(count - 1)) for i in range(count)]
+		if keep_range == 0:
+			start, end = 0.0, 1.0
+		elif keep_range == 2:
+			start, end = 0.0, float(spans)
+		else:
+			start, end = lo, hi
+		inner = [start + (end - start) * i / float(spans) for i in range(spans + 1)]
+		data['cvs'] = points
+		data['degree'] = degree
+		data['knots'] = [start] * (degree - 1) + inner + [end] * (degree - 1)
+		data['form'] = 'open'
+	return _flatten(args)
+
+
+def pointOnCurve(*args, **kwargs):
+	shape = _scene.curve_shape(_flatten(args)[0])
+	param = _flag(kwargs, 'pr', 'parameter', default=0.0)
+	if _flag(kwargs, 'top', 'turnOnPercentage'):
+		lo, hi = _curve_domain(shape.data)
+		param = lo + (hi - lo) * param
+	return _xform_point(_curve_point(shape.data, param), _scene.shape_world(shape))
+
+
+def pointPosition(*args, **kwargs):
+	shape, indices = _scene.components(_flatten(args)[0])
+	world = _flag(kwargs, 'w', 'world', default=True) and not _flag(kwargs, 'l', 'local')
+	point = shape.data['cvs'][indices[0]]
+	return _xform_point(point, _scene.shape_world(shape)) if world else list(point)
+
+
+def joint(*args, **kwargs):
+	if _flag(kwargs, 'e', 'edit'):
+		_edit_joint(_flatten(args) or [n.name for n in _scene.selection], kwargs)
+		return
+
+	name = _flag(kwargs, 'n', 'name') or 'joint1'
+	selected = _scene.selection[0] if _scene.selection else None
+	parent_node = selected if selected is not None and selected.type == 'joint' else None
+	node = _scene.add_node('joint', name, parent_node)
+	node.attrs['radius'] = _flag(kwargs, 'rad', 'radius', default=1.0)
+	position = _flag(kwargs, 'p', 'position')
+	if position is not None:
+		m = _scene.world_matrix(node)
+		m[12], m[13], m[14] = position
+		_scene.set_world_matrix(node, m)
+	orientation = _flag(kwargs, 'o', 'orientation')
+	if orientation is not None:
+		node.attrs['jointOrientX'], node.attrs['jointOrientY'], node.attrs['jointOrientZ'] = orientation
+	_select_new(node)
+	return node.name
+
+
+_AXIS_INDEX = {'x': 0, 'y': 1, 'z': 2}
+
+
+def _edit_joint(names, kwargs):
+	orient = _flag(kwargs, 'oj', 'orientJoint')
+	if not orient:
+		return
+	secondary = _flag(kwargs, 'sao', 'secondaryAxisOrient', default='yup')
+	children = _flag(kwargs, 'ch', 'children')
+
+	nodes = []
+	for name in names:
+		root = _scene.node(name)
+		nodes.append(root)
+		if children:
+			nodes.extend(n for n in root.descendants() if n.type == 'joint')
+
+	for node in nodes:
+		child_joints = [c for c in node.children if c.type == 'joint']
+		child_worlds = [(c, _scene.world_matrix(c)) for c in node.children if c.is_transform]
+		world = _scene.world_matrix(node)
+		pos = list(world[12:15])
+
+		if orient == 'none' or not child_joints:
+			parent_world = _scene.parent_matrix(node)
+			rot = _rot_only(_decompose(parent_world)[1])
+		else:
+			aim = _normalize(_sub(list(_scene.world_matrix(child_joints[0])[12:15]), pos))
+			up = [0.0, 0.0, 0.0]
+			up[_AXIS_INDEX[secondary[0]]] = -1.0 if secondary.endswith('down') else 1.0
+			primary, second = _AXIS_INDEX[orient[0]], _AXIS_INDEX[orient[1]]
+			third = 3 - primary - second
+			second_vec = _normalize(_sub(up, [aim[i] * _dot(up, aim) for i in range(3)]))
+			if _dot(second_vec, second_vec) < 1e-12:
+				second_vec = [0.0, 0.0, 1.0] if abs(aim[2]) < 0.9 else [1.0, 0.0, 0.0]
+			rows = [None, None, None]
+			rows[primary] = aim
+			rows[second] = second_vec
+			if (primary, second) in ((0, 1), (1, 2), (2, 0)):
+				rows[third] = _cross(aim, second_vec)
+			else:
+				rows[third] = _cross(second_vec, aim)
+			rot = _frame(rows)
+
+		a = node.attrs
+		a['rotateX'] = a['rotateY'] = a['rotateZ'] = 0.0
+		parent_rot = _rot_only(_decompose(_scene.parent_matrix(node))[1])
+		a['jointOrientX'], a['jointOrientY'], a['jointOrientZ'] = _euler(_mult(rot, _transpose3(parent_rot)))
+		for child, child_world in child_worlds:
+			_scene.set_world_matrix(child, child_world)
+
+
+def mirrorJoint(*args, **kwargs):
+	root = _scene.node(_flatten(args)[0])
+	search, replace = _flag(kwargs, 'sr', 'searchReplace', default=('', ''))
+	behavior = _flag(kwargs, 'mb', 'mirrorBehavior')
+
+	def _mirror_matrix(m):
+		t, rot, s = _decompose(m)
+		rows = [rot[0:3], rot[4:7], rot[8:11]]
+		if behavior:
+			rows = [[r[0], -r[1], -r[2]] for r in rows]
+		else:
+			rows = [[-r[0], r[1], r[2]] for r in rows]
+			rows[0] = [-v for v in rows[0]]
+		out = _frame(rows)
+		for row in range(3):
+			for col in range(3):
+				out[row * 4 + col] *= abs(s[row])
+		out[12], out[13], out[14] = -t[0], t[1], t[2]
+		return out
+
+	created = []
+
+	def _mirror(src, new_parent):
+		name = src.name.replace(search, replace) if search else src.name
+		dup = _scene.add_node(src.type, name)
+		dup.attrs.update({k: v for k, v in src.attrs.items() if k not in ('translateX', 'translateY', 'translateZ')})
+		dup.user_attrs = {k: dict(v) for k, v in src.user_attrs.items()}
+		if new_parent is not None:
+			dup.parent = new_parent
+			new_parent.children.append(dup)
+		dup.attrs['rotateX'] = dup.attrs['rotateY'] = dup.attrs['rotateZ'] = 0.0
+		_scene.set_world_matrix(dup, _mirror_matrix(_scene.world_matrix(src)), solve_orient=True)
+		created.append(dup.name)
+		for child in src.children:
+			if child.type == 'joint':
+				_mirror(child, dup)
+
+	_mirror(root, root.parent)
+	return created
+
+
+def ikHandle(*args, **kwargs):
+	start = _scene.node(_flag(kwargs, 'sj', 'startJoint'))
+	end = _scene.node(_flag(kwargs, 'ee', 'endEffector'))
+	name = _flag(kwargs, 'n', 'name') or 'ikHandle1'
+	handle = _scene.add_node('ikHandle', name)
+	handle.attrs.update({'poleVectorX': 0.0, 'poleVectorY': 0.0, 'poleVectorZ': 0.0, 'twist': 0.0,
+						 'dTwistControlEnable': False, 'dWorldUpType': 0, 'dForwardAxis': 0})
+	effector = _scene.add_node('ikEffector', 'effector1', end.parent)
+	m = _scene.world_matrix(end)
+	_scene.set_world_matrix(handle, _compose(m[12:15], [0, 0, 0], [1, 1, 1]))
+	_scene.set_world_matrix(effector, _compose(m[12:15], [0, 0, 0], [1, 1, 1]))
+	handle.data = {
+		'start': start,
+		'end': end,
+		'solver': _flag(kwargs, 'sol', 'solver', default='ikRPsolver'),
+		'curve': _flag(kwargs, 'c', 'curve'),
+		'effector': effector,
+	}
+	_select_new(handle)
+	return [handle.name, effector.name]
+
+
+# ======================
+# Constraints
+# ======================
+
+def _constraint_weight_aliases(node):
+	return [f"{t.name}W{i}" for i, t in enumerate(node.data['targets'])]
+
+
+def _constraint_query(kind, node_name, kwargs):
+	node = _scene.node(node_name)
+	if node.type != kind:
+		node = next((c for c in node.children if c.type == kind), None)
+		if node is None:
+			return None
+	if _flag(kwargs, 'wal', 'weightAliasList'):
+		return _constraint_weight_aliases(node)
+	if _flag(kwargs, 'tl', 'targetList'):
+		return [t.name for t in node.data['targets']]
+	return None
+
+
+_CONSTRAINT_CHANNELS = {
+	'parentConstraint': ('translate', 'rotate'),
+	'pointConstraint': ('translate',),
+	'orientConstraint': ('rotate',),
+	'aimConstraint': ('rotate',),
+	'scaleConstraint': ('scale',),
+}
+
+
+def _constraint(kind, args, kwargs):
+	items = _flatten(args)
+	if _flag(kwargs, 'q', 'query'):
+		return _constraint_query(kind, items[0], kwargs)
+
+	targets = [_scene.node(t) for t in items[:-1]]
+	driven = _scene.node(items[-1])
+	weight = float(_flag(kwargs, 'w', 'weight', default=1.0))
+	existing = next((c for c in driven.children if c.type == kind), None)
+	if existing is not None:
+		cons = existing
+		for target in targets:
+			if target not in cons.data['targets']:
+				cons.data['targets'].append(target)
+				addAttr(cons.name, ln=f"{target.name}W{len(cons.data['targets']) - 1}", at='double',
+						dv=weight, k=True)
+			else:
+				cons.attrs[f"{target.name}W{cons.data['targets'].index(target)}"] = weight
+	else:
+		name = _flag(kwargs, 'n', 'name') or f"{driven.name}_{kind}1"
+		cons = _scene.add_node(kind, name, driven)
+		cons.data = {'targets': list(targets), 'mo': bool(_flag(kwargs, 'mo', 'maintainOffset'))}
+		for i, target in enumerate(targets):
+			addAttr(cons.name, ln=f"{target.name}W{i}", at='double', dv=weight, k=True)
+		if kind == 'poleVectorConstraint':
+			_scene.connect((cons, 'constraintTranslate'), (driven, 'poleVector'), force=True)
+		else:
+			for channel in _CONSTRAINT_CHANNELS[kind]:
+				for axis in 'XYZ':
+					_scene.connect((cons, f'constraint{channel.capitalize()}{axis}'), (driven, f'{channel}{axis}'),
+								   force=True)
+
+	if not _flag(kwargs, 'mo', 'maintainOffset'):
+		_snap_constraint(kind, cons, driven, kwargs)
+	return [cons.name]
+
+
+def _snap_constraint(kind, cons, driven, kwargs):
+	targets = cons.data['targets']
+	weights = [float(cons.attrs.get(alias, 1.0)) for alias in _constraint_weight_aliases(cons)]
+	total = sum(weights) or 1.0
+	if kind == 'poleVectorConstraint':
+		start = driven.data.get('start')
+		origin = list(_scene.world_matrix(start)[12:15]) if start else [0.0, 0.0, 0.0]
+		pv = _sub(list(_scene.world_matrix(targets[0])[12:15]), origin)
+		driven.attrs['poleVectorX'], driven.attrs['poleVectorY'], driven.attrs['poleVectorZ'] = pv
+		return
+
+	skip = _flag(kwargs, 'sk', 'skip') or []
+	if isinstance(skip, str):
+		skip = [skip]
+	before = dict(driven.attrs)
+	world = _scene.world_matrix(driven)
+	t, rot, s = _decompose(world)
+	target_worlds = [_scene.world_matrix(target) for target in targets]
+
+	if kind in ('parentConstraint', 'pointConstraint'):
+		t = [sum(m[12 + i] * w for m, w in zip(target_worlds, weights)) / total for i in range(3)]
+	if kind in ('parentConstraint', 'orientConstraint'):
+		rot = _average_rotation([_rot_only(_decompose(m)[1]) for m in target_worlds], weights)
+	if kind == 'aimConstraint':
+		rot = _aim_rotation(t, target_worlds, kwargs) or rot
+	if kind == 'scaleConstraint':
+		s = _decompose(target_worlds[0])[2]
+
+	m = _rot_only(rot)
+	for row in range(3):
+		for col in range(3):
+			m[row * 4 + col] *= s[row]
+	m[12], m[13], m[14] = t
+	_scene.set_world_matrix(driven, m)
+
+	for axis in skip:
+		for channel in _CONSTRAINT_CHANNELS[kind]:
+			attr = f'{channel}{axis.upper()}'
+			driven.attrs[attr] = before[attr]
+
+
+def _aim_rotation(position, target_worlds, kwargs):
+	count = float(len(target_worlds))
+	target = [sum(m[12 + i] for m in target_worlds) / count for i in range(3)]
+	aim_dir = _normalize(_sub(target, position))
+	if _dot(aim_dir, aim_dir) < 1e-12:
+		return None
+	aim_vec = _normalize(list(_flag(kwargs, 'aim', 'aimVector', default=(1, 0, 0))))
+	up_vec = list(_flag(kwargs, 'u', 'upVector', default=(0, 1, 0)))
+	up_type = str(_flag(kwargs, 'wut', 'worldUpType', default='vector')).lower()
+	world_up = list(_flag(kwargs, 'wu', 'worldUpVector', default=(0, 1, 0)))
+	up_object = _flag(kwargs, 'wuo', 'worldUpObject')
+
+	if up_type == 'object' and up_object:
+		world_up = _sub(list(_scene.world_matrix(_scene.node(up_object))[12:15]), position)
+	elif up_type == 'objectrotation' and up_object:
+		world_up = _xform_vector(world_up, _rot_only(_decompose(_scene.world_matrix(_scene.node(up_object)))[1]))
+	elif up_type == 'none':
+		world_up = [0.0, 1.0, 0.0] if abs(aim_dir[1]) < 0.99 else [0.0, 0.0, 1.0]
+
+	up_vec = _normalize(_sub(up_vec, [aim_vec[i] * _dot(up_vec, aim_vec) for i in range(3)]))
+	world_up = _normalize(_sub(world_up, [aim_dir[i] * _dot(world_up, aim_dir) for i in range(3)]))
+	if _dot(up_vec, up_vec) < 1e-12 or _dot(world_up, world_up) < 1e-12:
+		return None
+	local = _frame([aim_vec, up_vec, _cross(aim_vec, up_vec)])
+	goal = _frame([aim_dir, world_up, _cross(aim_dir, world_up)])
+	return _mult(_transpose3(local), goal)
+
+
+def parentConstraint(*args, **kwargs):
+	return _constraint('parentConstraint', args, kwargs)
+
+
+def pointConstraint(*args, **kwargs):
+	return _constraint('pointConstraint', args, kwargs)
+
+
+def orientConstraint(*args, **kwargs):
+	return _constraint('orientConstraint', args, kwargs)
+
+
+def aimConstraint(*args, **kwargs):
+	return _constraint('aimConstraint', args, kwargs)
+
+
+def scaleConstraint(*args, **kwargs):
+	return _constraint('scaleConstraint', args, kwargs)
+
+
+def poleVectorConstraint(*args, **kwargs):
+	return _constraint('poleVectorConstraint', args, kwargs)
+
+
+# ======================
+# Deformers / Keys / Sets
+# ======================
+
+def _geometry_shape(name):
+	node = _scene.node(name)
+	if node.is_shape:
+		return node
+	return next((c for c in node.children if c.is_shape), None)
+
+
+def skinCluster(*args, **kwargs):
+	items = _flatten(args)
+	influences = [n for n in items if _scene.node(n).type == 'joint']
+	geometry = [n for n in items if _scene.node(n).type != 'joint']
+	skin = _scene.add_node('skinCluster', _flag(kwargs, 'n', 'name') or 'skinCluster1')
+	skin.data = {'influences': influences, 'weights': {}}
+	for i, geo in enumerate(geometry):
+		shape = _geometry_shape(geo)
+		if shape is not None:
+			_scene.connect((skin, f'outputGeometry[{i}]'), (shape, 'create'), force=True)
+	return [skin.name]
+
+
+def skinPercent(skin, *components, **kwargs):
+	node = _scene.node(skin)
+	for comp in _flatten(components):
+		node.data['weights'][comp] = list(_flag(kwargs, 'tv', 'transformValue', default=[]))
+
+
+def _anim_curve_type(attr):
+	if attr.startswith('rotate'):
+		return 'animCurveUA'
+	if attr.startswith('translate'):
+		return 'animCurveUL'
+	return 'animCurveUU'
+
+
+def setDrivenKeyframe(*args, **kwargs):
+	driver_plug = _flag(kwargs, 'cd', 'currentDriver')
+	driver_node, driver_attr = _scene.split_plug(driver_plug)
+	for plug in _flatten(args):
+		node, attr = _scene.split_plug(plug)
+		src = _scene.connections.get((node, attr))
+		if src is not None and _isa(src[0].type, 'animCurve'):
+			anim = src[0]
+		else:
+			anim = _scene.add_node(_anim_curve_type(attr), f"{node.name}_{attr}")
+			anim.data = {'keys': {}}
+			_scene.connect((driver_node, driver_attr), (anim, 'input'), force=True)
+			_scene.connect((anim, 'output'), (node, attr), force=True)
+		driver_value = _flag(kwargs, 'dv', 'driverValue')
+		if driver_value is None:
+			driver_value = _scene.get_plug(driver_node, driver_attr)
+		value = _flag(kwargs, 'v', 'value')
+		if value is None:
+			value = node.attrs.get(attr, 0.0)
+		anim.data['keys'][float(driver_value)] = float(value)
+
+
+def setKeyframe(*args, **kwargs):
+	"""Keys on animCurveU* nodes given directly, the driver value passed as float."""
+	driver_value = _flag(kwargs, 'f', 'float')
+	value = _flag(kwargs, 'v', 'value')
+	for name in _flatten(args):
+		anim = _scene.node(name)
+		if not _isa(anim.type, 'animCurve') or driver_value is None:
+			raise NotImplementedError("memory backend only keys animCurve nodes with -float")
+		anim.data.setdefault('keys', {})[float(driver_value)] = float(value)
+	return len(_flatten(args))
+
+
+def keyframe(*args, **kwargs):
+	anim = _scene.node(_flatten(args)[0])
+	keys = sorted(anim.data.get('keys', {}).items())
+	if _flag(kwargs, 'fc', 'floatChange'):
+		return [k for k, _ in keys]
+	if _flag(kwargs, 'vc', 'valueChange'):
+		return [v for _, v in keys]
+	return len(keys)
+
+
+def createDisplayLayer(*args, **kwargs):
+	layer = _scene.add_node('displayLayer', _flag(kwargs, 'n', 'name') or 'layer1')
+	layer.data = {'members': []}
+	if not _flag(kwargs, 'e', 'empty'):
+		layer.data['members'].extend(n.name for n in _scene.selection)
+	return layer.name
+
+
+def editDisplayLayerMembers(layer, *members, **kwargs):
+	layer = _scene.node(layer)
+	added = 0
+	for name in _flatten(members):
+		node = _scene.node(name)
+		if node.name not in layer.data['members']:
+			layer.data['members'].append(node.name)
+			added += 1
+	return added
+
+
+def sets(*args, **kwargs):
+	if _flag(kwargs, 'e', 'edit'):
+		target = _flag(kwargs, 'fe', 'forceElement') or _flag(kwargs, 'add', 'addElement')
+		node = _scene.node(target)
+		node.data.setdefault('members', []).extend(_flatten(args))
+		return
+	node_type = 'shadingEngine' if _flag(kwargs, 'renderable') else 'objectSet'
+	node = _scene.add_node(node_type, _flag(kwargs, 'n', 'name') or f'{node_type}1')
+	node.data = {'members': [] if _flag(kwargs, 'empty', 'em') else _flatten(args)}
+	return node.name
+
+
+def shadingNode(node_type, **kwargs):
+	return createNode(node_type, name=_flag(kwargs, 'n', 'name'), skipSelect=True)
+
+
+def annotate(*args, **kwargs):
+	target = _scene.node(_flatten(args)[0])
+	transform = _scene.add_node('transform', 'annotation1')
+	shape = _scene.add_node('annotationShape', 'annotationShape1', transform)
+	shape.attrs['text'] = _flag(kwargs, 'tx', 'text', default='')
+	_scene.connect((target, 'worldMatrix[0]'), (shape, 'dagObjectMatrix[0]'), force=True)
+	return shape.name
+
+
+def transformLimits(*args, **kwargs):
+	node = _scene.node(_flatten(args)[0])
+	limits = node.data.setdefault('limits', {})
+	query = _flag(kwargs, 'q', 'query')
+	for channel in ('tx', 'ty', 'tz', 'rx', 'ry', 'rz', 'sx', 'sy', 'sz'):
+		for key in (channel, f'e{channel}'):
+			if key not in kwargs:
+				continue
+			if query:
+				return list(limits.get(key, _limit_default(key)))
+			limits[key] = list(kwargs[key])
+	return None
+
+
+def warning(message, **kwargs):
+	_scene.warnings.append(str(message))
+	print(f"Warning: {message}")
+
+
+def inViewMessage(*args, **kwargs):
+	return None
+
+
+def nodeType(name, **kwargs):
+	return _scene.node(name).type
+
+
+def file(*args, **kwargs):
+	"""Only `file(new=True, force=True)` is supported, it empties the scene."""
+	if _flag(kwargs, 'new', 'n'):
+		new_scene()
+		return None
+	raise NotImplementedError("memory backend only supports cmds.file(new=True)")
+
+
+def undoInfo(*args, **kwargs):
+	if _flag(kwargs, 'q', 'query'):
+		if _flag(kwargs, 'st', 'state'):
+			return _scene.undo_state
+		return None
+	if _flag(kwargs, 'ock', 'openChunk'):
+		if _scene.undo_state and not _scene.undo_chunks:
+			_scene.push_undo()
+		_scene.undo_chunks += 1
+	if _flag(kwargs, 'cck', 'closeChunk'):
+		_scene.undo_chunks = max(0, _scene.undo_chunks - 1)
+	state = _flag(kwargs, 'st', 'state')
+	if state is not None and not state:
+		_scene.undo_stack = []
+	if state is None:
+		state = _flag(kwargs, 'swf', 'stateWithoutFlush')
+	if state is not None:
+		_scene.undo_state = bool(state)
+
+
+def undo(*args, **kwargs):
+	"""Restore the scene from before the last outermost undo chunk."""
+	_scene.pop_undo()
+
+
+# ======================
+# UI Commands
+# ======================
+# Headless no-ops so modules that build a window at import can still be imported.
+
+def _ui_command(command_name):
+	def command(*args, **kwargs):
+		if _flag(kwargs, 'ex', 'exists'):
+			return False
+		if _flag(kwargs, 'q', 'query'):
+			return None
+		return args[0] if args and isinstance(args[0], str) else f"{command_name}1"
+
+	command.__name__ = command_name
+	return command
+
+
+for _ui_name in ('window', 'showWindow', 'deleteUI', 'columnLayout', 'rowColumnLayout', 'rowLayout',
+				 'frameLayout', 'setParent', 'text', 'separator', 'button', 'checkBox', 'textField',
+				 'textFieldGrp', 'textFieldButtonGrp', 'floatField', 'floatFieldGrp', 'intField',
+				 'optionMenuGrp', 'menuItem'):
+	globals()[_ui_name] = _ui_command(_ui_name)
+del _ui_name
+
+
+_MEL_TOKEN = re.compile(r'\(\$n\[(\d+)\] \+ "((?:[^"\\]|\\.)*)"\)|\$n\[(\d+)\]|"((?:[^"\\]|\\.)*)"|(-[A-Za-z]\w*)|(\S+)')
+_MEL_FLAGS = {
+	'createNode': {'-n': 'n', '-p': 'p'},
+	'setAttr': {'-type': 'type'},
+	'connectAttr': {'-f': 'force'},
+	'addAttr': {'-ln': 'ln', '-at': 'at', '-k': 'k', '-dv': 'dv', '-min': 'min', '-max': 'max'},
+	'setKeyframe': {'-float': 'float', '-value': 'value'},
+}
+_MEL_SWITCHES = ('-f',)
+
+
+def _mel_unescape(text):
+	return re.sub(r'\\(.)', r'\1', text)
+
+
+def _mel_args(text, names):
+	values = []
+	for plug_index, plug_attr, index, string, flag, word in _MEL_TOKEN.findall(text):
+		if plug_index:
+			values.append(('value', names[int(plug_index)] + _mel_unescape(plug_attr)))
+		elif index:
+			values.append(('value', names[int(index)]))
+		elif flag:
+			values.append(('flag', flag))
+		elif not word:
+			values.append(('value', _mel_unescape(string)))
+		else:
+			values.append(('value', int(word) if re.match(r'^-?\d+$', word) else float(word)))
+	return values
+
+
+def _eval_graph_payload(command):
+	"""Run the createNode / setAttr / connectAttr / addAttr / setKeyframe payload written by graph_builder."""
+	names = []
+	for line in command.splitlines():
+		line = line.strip()
+		assign = re.match(r'^\$n\[(\d+)\] = `(.*)`;$', line)
+		if assign:
+			line = assign.group(2)
+		name = line.split(' ', 1)[0].rstrip(';')
+		if name not in _MEL_FLAGS:
+			continue
+		tokens = _mel_args(line[len(name):].rstrip(';'), names)
+		args, kwargs = [], {}
+		i = 0
+		while i < len(tokens):
+			kind, value = tokens[i]
+			if kind == 'flag':
+				if value in _MEL_SWITCHES:
+					kwargs[_MEL_FLAGS[name][value]] = True
+				else:
+					i += 1
+					kwargs[_MEL_FLAGS[name][value]] = tokens[i][1]
+			else:
+				args.append(value)
+			i += 1
+		if name == 'createNode':
+			names.append(createNode(*args, **kwargs))
+		elif name == 'setAttr':
+			setAttr(args[0], *args[1:], **kwargs)
+		elif name == 'connectAttr':
+			connectAttr(*args, **kwargs)
+		elif name == 'setKeyframe':
+			setKeyframe(*args, **kwargs)
+		else:
+			kwargs['k'] = bool(kwargs.get('k'))
+			addAttr(*args, **kwargs)
+	_scene.selection = []
+	return names
+
+
+def _eval_read_payload(command):
+	"""Run the getAttr payload written by graph_builder.read_plugs."""
+	values = []
+	for line in command.splitlines():
+		read = re.match(r'^\$v\[\d+\] = `getAttr "((?:[^"\\]|\\.)*)"`;$', line.strip())
+		if read:
+			values.append(float(getAttr(_mel_unescape(read.group(1)))))
+	return values
+
+
+def mel_eval(command):
+	"""Tiny maya.mel.eval stand-in for the MEL calls the rig makes."""
+	command = command.strip()
+	if command.startswith('proc string[] graphBuilderFlush'):
+		return _eval_graph_payload(command)
+	if command.startswith('proc float[] graphBuilderRead'):
+		return _eval_read_payload(command)
+	if command.startswith('doJiggle'):
+		shapes = [n for n in _scene.selection if n.is_shape]
+		for shape in shapes:
+			jiggle = _scene.add_node('jiggle', 'jiggle1')
+			_scene.connect((jiggle, 'outputGeometry[0]'), (shape, 'create'), force=True)
+		return None
+	raise NotImplementedError(f"memory backend cannot evaluate MEL: {command}")
+
+
+def __getattr__(name):
+	if name.startswith('__'):
+		raise AttributeError(name)
+	raise NotImplementedError(f"cmds.{name} is not available in the memory backend")
@@ -0,0 +1,96 @@
+"""
+Muscle curve geometry computed from joint world matrices, no Maya import.
+
+A muscle curve runs through the muscle joints plus two extra points at 30% of
+the first and 70% of the last segment. Its up (rail) curve is the same points
+moved `offset` along each joint's Y axis, down for the right side. The uvPin
+coordinates spread the bind joints evenly over the curve.
+
+	matrices = muscle_joint.world_matrices(joints)      # one xform per joint, read once
+	plans = plan_muscles([{'matrices': matrices, 'side': 'l', 'offset': 0.5, 'jnt_num': 5}, ...])
+	plans[0]['positions'], plans[0]['up_positions'], plans[0]['coordinates']
+
+All muscles are computed in one batch: with numpy every matrix of every muscle
+is one (n, 4, 4) array, without it the same math runs on plain lists.
+"""
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+# extra curve points, fraction of the first and of the last joint segment
+START_MID = 0.3
+END_MID = 0.7
+
+
+def _lerp(a, b, t):
+	return [(1.0 - t) * p + t * q for p, q in zip(a, b)]
+
+
+def _with_mids(points):
+	"""Insert the START_MID / END_MID points, the muscle curve CV layout."""
+	points = [list(p) for p in points]
+	mid_1 = _lerp(points[0], points[1], START_MID)
+	mid_2 = _lerp(points[-2], points[-1], END_MID)
+	points.insert(1, mid_1)
+	points.insert(len(points) - 1, mid_2)
+	return points
+
+
+def _positions_and_up(matrices, shifts):
+	"""World positions and the positions moved shifts[i] along each matrix's normalized Y axis."""
+	if np is not None:
+		m = np.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+		positions = m[:, 3, :3]
+		y_axes = m[:, 1, :3]
+		y_axes = y_axes / np.linalg.norm(y_axes, axis=1)[:, None]
+		up = positions + y_axes * np.asarray(shifts, dtype=float)[:, None]
+		return positions.tolist(), up.tolist()
+
+	positions, up = [], []
+	for m, shift in zip(matrices, shifts):
+		pos = list(m[12:15])
+		y_axis = m[4:7]
+		length = (y_axis[0] ** 2 + y_axis[1] ** 2 + y_axis[2] ** 2) ** 0.5
+		positions.append(pos)
+		up.append([p + a / length * shift for p, a in zip(pos, y_axis)])
+	return positions, up
+
+
+def uv_coordinates(jnt_num):
+	"""coordinateU of every bind joint, evenly spaced from 0 to 1."""
+	if jnt_num < 2:
+		return [0.0] * jnt_num
+	return [float(i) / (jnt_num - 1) for i in range(jnt_num)]
+
+
+def plan_muscles(muscles):
+	"""
+	Args:
+		muscles (list): dicts with 'matrices' (world matrices of the muscle joints, 16 floats
+			each), 'side' ('l' / 'r'), 'offset' (up curve distance) and 'jnt_num' (bind joints).
+
+	Returns:
+		list: one dict per muscle with 'positions' and 'up_positions' (curve points) and
+			'coordinates' (uvPin coordinateU per bind joint).
+	"""
+	matrices, shifts, counts = [], [], []
+	for muscle in muscles:
+		shift = muscle['offset'] if muscle['side'] == 'l' else -muscle['offset']
+		matrices.extend(muscle['matrices'])
+		shifts.extend([shift] * len(muscle['matrices']))
+		counts.append(len(muscle['matrices']))
+
+	positions, up = _positions_and_up(matrices, shifts) if matrices else ([], [])
+
+	plans = []
+	start = 0
+	for muscle, count in zip(muscles, counts):
+		end = start + count
+		plans.append({
+			'positions': _with_mids(positions[start:end]),
+			'up_positions': _with_mids(up[start:end]),
+			'coordinates': uv_coordinates(muscle['jnt_num']),
+		})
+		start = end
+	return plans
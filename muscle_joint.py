@@ -1,6 +1,16 @@
+import json
+import math
+
 import maya.cmds as cmds
 import maya.mel as mel
-import math
+
+from auto_rig_helpers import AutoRigHelpers
+from curve_library import RigCurveLibrary
+import muscle_geometry
+import rig_manifest
+import rig_mirror
+
+MUSCLE_LAYER = 'MUSCLE_JNTS'
 
 # ----------------- HELPERS ----------------- #
 def add_attr(node, long_name, attr_type, default_value=None, min_value=None, max_value=None, keyable=True,
@@ -58,9 +68,7 @@ def get_percent_position(jnt1, jnt2, percent=0.3):
 
 
 def circle(radius=1.0, name="circle_crv"):
-    circle = cmds.circle(center=(0, 0, 0), normal=(0, 1, 0), radius=radius, name=name)[0]
-    cmds.delete(circle, ch=True)
-    return  circle
+    return RigCurveLibrary.create('circle', name, radius)
     
 def create_display_layer(name, members, reference=False, color=19):
     display_layer = cmds.createDisplayLayer(name=name, empty=True)
@@ -76,54 +84,8 @@ def create_display_layer(name, members, reference=False, color=19):
 
 
 def create_control_hierarchy(ctrl, levels=4):
-    """
-    Create a flexible control hierarchy for the given control.
-
-    Args:
-        ctrl (str): Name of the control curve transform.
-        levels (int): Number of hierarchy levels to create.
-            1 = zero
-            2 = zero, offset
-            3 = zero, offset, driven
-            4 = zero, offset, driven, connect (default)
-
-    Returns:
-        dict: {level_name: group_name, ...}
-    """
-    if not cmds.objExists(ctrl):
-        cmds.warning(f"Control {ctrl} does not exist.")
-        return {}
-    
-    # Predefined hierarchy naming
-    base_levels = ["zero", "offset", "driven", "connect"]
-    if levels < 1:
-        cmds.warning("Levels must be at least 1.")
-        return {}
-    levels = min(levels, len(base_levels))  # Clamp to max supported
-    used_levels = base_levels[:levels]
-    
-    hierarchy = {}
-    previous_grp = None
-    
-    # Extract base naming (e.g. "ctrl_c_head_0001" → "c_head_0001")
-    parts = ctrl.split("_")
-    base_suffix = "_".join(parts[1:]) if len(parts) > 1 else ctrl
-    
-    # Build hierarchy
-    for lvl in used_levels:
-        grp_name = f"{lvl}_{base_suffix}"
-        grp = cmds.createNode("transform", name=grp_name)
-        cmds.matchTransform(grp, ctrl)
-        
-        if previous_grp:
-            cmds.parent(grp, previous_grp)
-        previous_grp = grp
-        hierarchy[lvl] = grp
-    
-    # Parent the control under the last created group
-    cmds.parent(ctrl, previous_grp)
-    
-    return hierarchy
+    """Zero / offset / driven / connect groups above ctrl, see AutoRigHelpers.build_control_hierarchy."""
+    return AutoRigHelpers.create_control_hierarchy(ctrl, levels)
 
 
 def get_parent_grp(ctrl):
@@ -131,35 +93,10 @@ def get_parent_grp(ctrl):
     Return all possible parent groups of a control:
     zero → offset → driven → connect → ctrl
 
-    This function is safe even if some groups don't exist.
-    It will return None for missing groups.
-
     Returns:
         (zero, offset, driven, connect)
     """
-    if not cmds.objExists(ctrl):
-        cmds.warning(f"Control '{ctrl}' does not exist.")
-        return None, None, None, None
-    
-    zero = offset = driven = connect = None
-    
-    try:
-        connect = cmds.listRelatives(ctrl, parent=True, type="transform")
-        if connect:
-            connect = connect[0]
-            driven = cmds.listRelatives(connect, parent=True, type="transform")
-            if driven:
-                driven = driven[0]
-                offset = cmds.listRelatives(driven, parent=True, type="transform")
-                if offset:
-                    offset = offset[0]
-                    zero = cmds.listRelatives(offset, parent=True, type="transform")
-                    if zero:
-                        zero = zero[0]
-    except Exception as e:
-        cmds.warning(f"Error getting parent hierarchy for {ctrl}: {e}")
-    
-    return zero, offset, driven, connect
+    return AutoRigHelpers.get_parent_grp(ctrl)
 
 
 def mirror_curve_shape(left_ctrl, right_ctrl):
@@ -167,29 +104,7 @@ def mirror_curve_shape(left_ctrl, right_ctrl):
     Mirror only the NURBS curve shape from left_ctrl → right_ctrl.
     Does NOT touch transforms or hierarchy.
     """
-    if not cmds.objExists(left_ctrl) or not cmds.objExists(right_ctrl):
-        cmds.warning(f"❌ Missing controls: {left_ctrl}, {right_ctrl}")
-        return
-    
-    shapes_l = cmds.listRelatives(left_ctrl, shapes=True, type='nurbsCurve', fullPath=True) or []
-    shapes_r = cmds.listRelatives(right_ctrl, shapes=True, type='nurbsCurve', fullPath=True) or []
-    
-    if not shapes_l or not shapes_r:
-        cmds.warning(f"⚠️ Missing shapes on {left_ctrl} or {right_ctrl}")
-        return
-    
-    for shape_l, shape_r in zip(shapes_l, shapes_r):
-        cvs_l = cmds.ls(f"{shape_l}.cv[*]", flatten=True)
-        cvs_r = cmds.ls(f"{shape_r}.cv[*]", flatten=True)
-        
-        if len(cvs_l) != len(cvs_r):
-            cmds.warning(f"⚠️ CV count mismatch: {shape_l} vs {shape_r}")
-            continue
-        
-        for i, cv_l in enumerate(cvs_l):
-            pos = cmds.xform(cv_l, q=True, ws=True, t=True)
-            pos[0] *= -1  # Mirror X only
-            cmds.xform(cvs_r[i], ws=True, t=pos)
+    return AutoRigHelpers.mirror_curve_shape(left_ctrl, right_ctrl)
     
 def create_square_curve(name="square_ctrl", size=2.0):
     """
@@ -261,9 +176,42 @@ def assign_mult_to_joints(jnt_list):
     return mapping
 
 
+def muscle_chain(input_jnt):
+    """Muscle joint and its child joints, root first."""
+    children = cmds.listRelatives(input_jnt, c=True, ad=True, type='joint')[::-1]
+    return [input_jnt] + children
+
+
+def world_matrices(joints):
+    return [cmds.xform(jnt, q=True, ws=True, m=True) for jnt in joints]
+
+
+def plan_muscle(input_jnt, side, jnt_num, offset):
+    """muscle_geometry plan of one muscle side, see create_muscle_set_up for several at once."""
+    joints = muscle_chain(input_jnt.replace('_l_', f'_{side}_'))
+    return muscle_geometry.plan_muscles([{'matrices': world_matrices(joints), 'side': side,
+                                          'offset': offset, 'jnt_num': jnt_num}])[0]
+
+
 # ---------------------------------------- main
 
-def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent):
+def add_to_muscle_layer(joints):
+    """Add skel bind joints to the MUSCLE_JNTS display layer with one edit, creating it if needed."""
+    if not joints:
+        return
+    if not cmds.objExists(MUSCLE_LAYER):
+        create_display_layer(MUSCLE_LAYER, members=joints, color=20)
+    else:
+        cmds.editDisplayLayerMembers(MUSCLE_LAYER, joints, nr=True)
+
+
+def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent, plan=None, layer_members=None):
+    """
+    Build the muscle curve, its up curve, the uvPin and the bind joints.
+    plan comes from muscle_geometry.plan_muscles, computed here when not given.
+    layer_members: list collecting the skel joints for one add_to_muscle_layer() call,
+    they are added to the layer right away when not given.
+    """
     token = input_jnt.split('_')
     ori_side = _side_from_name(input_jnt)
     region = token[2]
@@ -276,16 +224,11 @@ def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent):
     
     input_jnt = input_jnt.replace('_l_', f'_{side}_')
     
-    children = cmds.listRelatives(input_jnt, c=True, ad=True, type='joint')[::-1]
-    joints = [input_jnt] + children
-    
-    # get joint position
-    positions = [ cmds.xform(jnt, q=True, ws=True, t=True) for jnt in joints]
-    
-    pos_mid_1 = get_percent_position(joints[0], joints[1], percent=0.3)
-    pos_mid_2 = get_percent_position(joints[-2], joints[-1], percent=0.7)
-    positions.insert(1, pos_mid_1)
-    positions.insert(len(positions)-1, pos_mid_2)
+    joints = muscle_chain(input_jnt)
+    if plan is None:
+        plan = plan_muscle(input_jnt, side, jnt_num, offset)
+    positions = plan['positions']
+    up_positions = plan['up_positions']
     
     # create curve
     curve = cmds.curve(n=f'crv_{side}_{region}_{desc}_{index}', p=positions, d=2)
@@ -294,27 +237,6 @@ def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent):
     cmds.parent(curve, curve_grp)
     
     # create up curve
-    up_positions = []
-    up_locators = []
-    # create temp locators
-    for jnt in joints:
-        loc = cmds.spaceLocator()[0]
-        cmds.matchTransform(loc, jnt)
-        if side == 'l':
-            cmds.move(0, offset, 0, loc, objectSpace=True, r=True)
-        else:
-            cmds.move(0, -offset, 0, loc, objectSpace=True, r=True)
-        up_pose = cmds.xform(loc, q=True, ws=True, t=True)
-        up_positions.append(up_pose)
-        up_locators.append(loc)
-
-    up_pos_mid_1 = get_percent_position(up_locators[0], up_locators[1], percent=0.3)
-    up_pos_mid_2 = get_percent_position(up_locators[-2], up_locators[-1], percent=0.7)
-    up_positions.insert(1, up_pos_mid_1)
-    up_positions.insert(len(up_positions) - 1, up_pos_mid_2)
-    
-    cmds.delete(loc for loc in up_locators)
-    
     up_curve = cmds.curve(n=f'crv_{side}_{region}_{desc}_up_{index}', p=up_positions, d=2)
     up_crv_shape = cmds.listRelatives(up_curve, c=True, type='shape')[0]
     up_crv_shape = cmds.rename(up_crv_shape, f'{up_curve}Shape')
@@ -334,9 +256,7 @@ def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent):
 
     for i in range(jnt_num):
         jnt = cmds.createNode('joint', n=f'jnt_{side}_{region}_{desc}_bind_{index}_{i + 1:04d}')
-        create_control_hierarchy(jnt, 1)
-        zero = get_parent_grp(jnt)[3]
-        cmds.parent(zero, jnt_grp)
+        zero = AutoRigHelpers.build_control_hierarchy(jnt, 1, parent=jnt_grp).zero
         cmds.scaleConstraint(parent, zero, mo=True)
 
         # create decompose node
@@ -349,11 +269,9 @@ def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent):
 
         bind_joints.append(jnt)
 
-        # set uvpin uv coorinates
-        # evenly spaced UVs based on joint number
-        for i in range(jnt_num):
-            u = float(i) / (jnt_num - 1)  # value between 0 and 1
-            set_attr(uv_pin, f'coordinate[{i}].coordinateU', u)
+    # set uvpin uv coorinates, evenly spaced along the curve
+    for i, u in enumerate(plan['coordinates']):
+        set_attr(uv_pin, f'coordinate[{i}].coordinateU', u)
     
     # create skel joints
     skel_parent = parent.replace('jnt', 'skel')
@@ -379,20 +297,21 @@ def create_curve_on_joint(input_jnt, side, jnt_num, offset, parent):
         skel_bind_joints.append(skel_bind_jnt)
         
     # create display layer
-    if not cmds.objExists('MUSCLE_JNTS'):
-        create_display_layer('MUSCLE_JNTS', members=skel_bind_joints, color=20)
+    if layer_members is None:
+        add_to_muscle_layer(skel_bind_joints)
     else:
-        cmds.editDisplayLayerMembers('MUSCLE_JNTS', skel_bind_joints, nr=True)
+        layer_members.extend(skel_bind_joints)
         
     return joints, positions, curve, up_curve, parent_grp, bind_joints
 
 
-def create_muscle_jnt_controllers(input_jnt, side, jnt_num, parent, offset):
+def create_muscle_jnt_controllers(input_jnt, side, jnt_num, parent, offset, plan=None, layer_members=None):
     """
     create three controllers for main joints
     """
     input_jnt = input_jnt.replace('_l_', f'_{side}_')
-    joints, positions, curve, up_curve, parent_grp, bind_joints = create_curve_on_joint(input_jnt, side, jnt_num, offset, parent)
+    joints, positions, curve, up_curve, parent_grp, bind_joints = create_curve_on_joint(input_jnt, side, jnt_num, offset,
+                                                                                        parent, plan, layer_members)
     tokens = input_jnt.split('_')
     region = tokens[2]
     desc = tokens[3]
@@ -448,9 +367,9 @@ def create_muscle_jnt_controllers(input_jnt, side, jnt_num, parent, offset):
             cmds.parent(jnt, ctrl)
             
             # create hierarchy
-            create_control_hierarchy(ctrl)
-            zero, offset, driven, connect = get_parent_grp(ctrl)
-            cmds.parent(zero, ctrl_grp)
+            hierarchy = AutoRigHelpers.build_control_hierarchy(ctrl, parent=ctrl_grp)
+            zero, offset = hierarchy.zero, hierarchy.offset
+            driven, connect = hierarchy.driven, hierarchy.connect
             
             last_jnt = jnt
             
@@ -577,9 +496,9 @@ def create_muscle_jnt_controllers(input_jnt, side, jnt_num, parent, offset):
             cmds.matchTransform(pos, ctrls[-1])
             
         
-        create_control_hierarchy(pos)
-        loc_zero, loc_offset, loc_driven, loc_connect = get_parent_grp(pos)
-        cmds.parent(loc_zero, driver_loc_grp)
+        hierarchy = AutoRigHelpers.build_control_hierarchy(pos, parent=driver_loc_grp)
+        loc_zero, loc_offset = hierarchy.zero, hierarchy.offset
+        loc_driven, loc_connect = hierarchy.driven, hierarchy.connect
         
         loc_drivens.append(loc_driven)
         loc_connects.append(loc_connect)
@@ -802,80 +721,23 @@ def do_jiggle_deformer(ctrl, curve, up_curve):
     cmds.select(clear=True)
     
     
-def mirror_attr_value():
+def _exists(node, manifest):
+    return (manifest is not None and node in manifest) or cmds.objExists(node)
+
+
+def mirror_attr_value(manifest=None, scope=None):
     """
     Get left keyable attribute values and mirror to right side.
     Special case:
     - auto_push_direction (double3): multiply XYZ by -1
     - auto_push_X / Y / Z: multiply value by -1
+    manifest: rig_manifest.RigManifest, loaded from the master node when not given.
+    scope: rig_mirror.MirrorScope, the whole rig when not given.
     """
-    ctrls = cmds.ls('ctrl_l_*_mid_*', type='transform') or []
-
-    skip_prefixes = ("translate", "rotate", "scale")
-    skip_exact    = {"visibility"}
+    return rig_mirror.mirror_attr_values(scope, manifest)
 
-    
-    for l_ctrl in ctrls:
-        # build right ctrl name
-        r_ctrl = l_ctrl.replace('ctrl_l_', 'ctrl_r_')
-        if not cmds.objExists(r_ctrl):
-            cmds.warning("Right control not found for {} → {}".format(l_ctrl, r_ctrl))
-            continue
-
-        attrs = cmds.listAttr(l_ctrl, k=True) or []
-
-        for attr in attrs:
-            # skip TRS + vis
-            if any(attr.startswith(p) for p in skip_prefixes):
-                continue
-            if attr in skip_exact:
-                continue
-
-            # make sure right side has the same attr
-            if not cmds.attributeQuery(attr, node=r_ctrl, exists=True):
-                continue
-
-            l_plug = "{}.{}".format(l_ctrl, attr)
-            r_plug = "{}.{}".format(r_ctrl, attr)
-
-            try:
-                val = cmds.getAttr(l_plug)
-            except Exception:
-                continue
-
-            # ------------- special cases: auto-push position -------------
-            if attr == "auto_push_direction":
-                # val is like [(x, y, z)]
-                if isinstance(val, (list, tuple)) and val:
-                    x, y, z = val[0]
-                    # multiply all components by -1
-                    cmds.setAttr(r_plug, -x, -y, -z, type="double3")
-                continue
-
-            if attr in ("auto_push_X", "auto_push_Y", "auto_push_Z"):
-                # scalar float (sometimes comes back as [x])
-                if isinstance(val, (list, tuple)):
-                    val = val[0]
-                cmds.setAttr(r_plug, -val)
-                continue
 
-            # ------------- default: just copy the value -------------
-            if isinstance(val, (list, tuple)) and len(val) == 1:
-                val = val[0]
-
-            try:
-                cmds.setAttr(r_plug, val)
-            except Exception:
-                # handle strings etc.
-                if isinstance(val, str):
-                    try:
-                        cmds.setAttr(r_plug, val, type="string")
-                    except Exception:
-                        pass
-                else:
-                    pass
-      
-def mirror_limit_info():
+def mirror_limit_info(manifest=None, scope=None):
     """
     Mirror limit information for all:
         driven_l_*_endPos_*_0001  →  driven_r_*_endPos_*_0001
@@ -885,69 +747,24 @@ def mirror_limit_info():
             swap min/max, negate values, swap enable flags
       - Rotate limits:
             copy as-is (no negate, no swap)
+    manifest: rig_manifest.RigManifest, loaded from the master node when not given.
+    scope: rig_mirror.MirrorScope, the whole rig when not given.
     """
-
-    driven_end = cmds.ls('driven_l_*_endPos_*_0001', type='transform') or []
-
-    for driven in driven_end:
-        driven_r = driven.replace('_l_', '_r_')
-        if not cmds.objExists(driven_r):
-            cmds.warning("Right-side node not found for {}".format(driven))
-            continue
-
-        # ---------------------------
-        # TRANSLATE LIMITS (swap + negate)
-        # ---------------------------
-        for flag, eflag in (('tx', 'etx'), ('ty', 'ety'), ('tz', 'etz')):
-            # query L side
-            try:
-                tmin, tmax = cmds.transformLimits(driven, q=True, **{flag: True})
-                emin, emax = cmds.transformLimits(driven, q=True, **{eflag: True})
-            except Exception:
-                # if node doesn't support that axis, skip
-                continue
-
-            # mirror: swap + negate
-            new_min = -tmax
-            new_max = -tmin
-            new_emin = emax   # min enable on R = max enable on L
-            new_emax = emin   # max enable on R = min enable on L
-
-            cmds.transformLimits(
-                driven_r,
-                **{flag: (new_min, new_max), eflag: (new_emin, new_emax)}
-            )
-
-        # ---------------------------
-        # ROTATE LIMITS (copy only)
-        # ---------------------------
-        for flag, eflag in (('rx', 'erx'), ('ry', 'ery'), ('rz', 'erz')):
-            try:
-                rmin, rmax = cmds.transformLimits(driven, q=True, **{flag: True})
-                emin, emax = cmds.transformLimits(driven, q=True, **{eflag: True})
-            except Exception:
-                continue
-
-            cmds.transformLimits(
-                driven_r,
-                **{flag: (rmin, rmax), eflag: (emin, emax)}
-            )
-
-        # print("Mirrored limits: {} → {}".format(driven, driven_r))
-mirror_limit_info()
+    return rig_mirror.mirror_limits(scope, manifest)
 
 
-
-def select_bind_joints(jnt_name):
+def select_bind_joints(jnt_name, manifest=None):
     """
     From a skel joint like:
         skel_l_bk_caudalThighFold_bind_0001_0001
     build a pattern:
         skel_*_bk_caudalThighFold_bind_*
     and select all matching bind joints.
+    manifest: rig_manifest.RigManifest, loaded from the master node when not given.
     """
     cmds.select(clear=True)
-    if not jnt_name or not cmds.objExists(jnt_name):
+    manifest = manifest or rig_manifest.RigManifest.find()
+    if not jnt_name or not _exists(jnt_name, manifest):
         cmds.warning("Joint does not exist: {}".format(jnt_name))
         return []
 
@@ -966,35 +783,101 @@ def select_bind_joints(jnt_name):
     base = '_'.join(tokens[:5])
     pattern = base + '_*'    # → skel_*_bk_caudalThighFold_bind_*
 
-    bind_joints = cmds.ls(pattern, type='joint') or []
+    bind_joints = rig_manifest.ls(pattern, 'joint', manifest)
     cmds.select(bind_joints, r=True)
 
     return bind_joints
 
 
-def create_muscle_set_up(input_jnt, constraint_jnt_1, constraint_jnt_2, mirror, uniform=True, jnt_num=5, offset=0.5):
-    if mirror:
-        sides = ['l', 'r']
-    else:
-        sides = ['l']
+def muscle_spec(input_jnt, constraint_jnt_1, constraint_jnt_2, mirror=True, uniform=True, jnt_num=5, offset=0.5):
+    """One muscle manifest entry, the arguments of create_muscle_set_up."""
+    return {
+        'input_jnt': input_jnt,
+        'constraint_jnt_1': constraint_jnt_1,
+        'constraint_jnt_2': constraint_jnt_2,
+        'mirror': mirror,
+        'uniform': uniform,
+        'jnt_num': jnt_num,
+        'offset': offset,
+    }
+
+
+def load_muscle_manifest(path):
+    """
+    Muscle specs from a JSON file, a list of objects with the muscle_spec keys:
+        [{"input_jnt": "jnt_l_ft_longTriceps_0001_0001",
+          "constraint_jnt_1": "jnt_l_ft_upperlegTwist_0001",
+          "constraint_jnt_2": "jnt_l_ft_kneeTwist_0001",
+          "jnt_num": 5, "offset": 0.3}, ...]
+    Missing keys get the muscle_spec defaults.
+    """
+    with open(path, 'r') as f:
+        return [muscle_spec(**entry) for entry in json.load(f)]
+
+
+def save_muscle_manifest(path, specs):
+    with open(path, 'w') as f:
+        json.dump([muscle_spec(**spec) for spec in specs], f, indent=4)
+
+
+def _muscle_sides(spec):
+    return ['l', 'r'] if spec['mirror'] else ['l']
+
+
+def build_muscles(specs, mirror_passes=True, manifest=None):
+    """
+    Build every muscle of a manifest in one pass.
+    All joints are checked before anything is created, the curve geometry of every muscle side
+    is planned in one batch, the skel joints join MUSCLE_JNTS with a single layer edit and the
+    mirror passes run once at the end instead of per muscle.
     
-    for side in sides:
-        loc_drivens, curve, up_curve = create_muscle_jnt_controllers(input_jnt, side, jnt_num, parent=constraint_jnt_1, offset=offset)
+    Args:
+        specs (list): muscle_spec() dicts, e.g. from load_muscle_manifest().
+        mirror_passes (bool): run mirror_attr_value / mirror_limit_info once all muscles exist, scoped to
+            the mirrored muscles.
+        manifest (rig_manifest.RigManifest): passed to the mirror passes.
+    
+    Returns:
+        list: (input_jnt, side, curve, up_curve) per built muscle side.
+    """
+    builds = [(spec, side) for spec in specs for side in _muscle_sides(spec)]
+    
+    required = []
+    for spec, side in builds:
+        required.extend(name.replace('_l_', f'_{side}_') for name in
+                        (spec['input_jnt'], spec['constraint_jnt_1'], spec['constraint_jnt_2']))
+    existing = set(cmds.ls(required) or [])
+    missing = sorted(set(name for name in required if name not in existing))
+    if missing:
+        raise ValueError(f"Muscle joints not found: {', '.join(missing)}")
+    
+    # curve points of every muscle side from the template joints, in one batch before anything is built
+    plans = muscle_geometry.plan_muscles([
+        {'matrices': world_matrices(muscle_chain(spec['input_jnt'].replace('_l_', f'_{side}_'))), 'side': side,
+         'offset': spec['offset'], 'jnt_num': spec['jnt_num']} for spec, side in builds])
+    
+    built = []
+    layer_members = []
+    for (spec, side), plan in zip(builds, plans):
+        loc_drivens, curve, up_curve = create_muscle_jnt_controllers(spec['input_jnt'], side, spec['jnt_num'],
+                                                                     parent=spec['constraint_jnt_1'],
+                                                                     offset=spec['offset'], plan=plan,
+                                                                     layer_members=layer_members)
         
         # locator driven groups
         loc_start = loc_drivens[0]
         loc_end = loc_drivens[-1]
         
         # constraint driver locators driven group
-        jnt1 = constraint_jnt_1.replace('_l_', f'_{side}_')
-        jnt2 = constraint_jnt_2.replace('_l_', f'_{side}_')
+        jnt1 = spec['constraint_jnt_1'].replace('_l_', f'_{side}_')
+        jnt2 = spec['constraint_jnt_2'].replace('_l_', f'_{side}_')
         
         cons1 = cmds.parentConstraint(jnt1, loc_start, mo=True)[0]
         cons2 = cmds.parentConstraint(jnt2, loc_end, mo=True)[0]
         set_attr(cons1, 'interpType', 2)
         set_attr(cons2, 'interpType', 2)
         
-        if uniform:
+        if spec['uniform']:
             for crv in [curve, up_curve]:
                 cmds.rebuildCurve(crv,
                                   rebuildType=0,  # Uniform
@@ -1007,6 +890,35 @@ def create_muscle_set_up(input_jnt, constraint_jnt_1, constraint_jnt_2, mirror,
                                   replaceOriginal=True,
                                   ch=True
                                   )
+        built.append((spec['input_jnt'], side, curve, up_curve))
+    
+    add_to_muscle_layer(layer_members)
+    RigCurveLibrary.clear_templates()
+    
+    mirrored = [spec['input_jnt'] for spec in specs if spec['mirror']]
+    if mirror_passes and mirrored:
+        scope = rig_mirror.MirrorScope.muscles(mirrored)
+        mirror_attr_value(manifest, scope)
+        mirror_limit_info(manifest, scope)
+    
+    print(f"✅ Built {len(built)} muscle sides from {len(specs)} muscles")
+    return built
+
+
+def create_muscle_set_up(input_jnt, constraint_jnt_1, constraint_jnt_2, mirror, uniform=True, jnt_num=5, offset=0.5):
+    """One muscle from the UI, see build_muscles for a whole manifest."""
+    return build_muscles([muscle_spec(input_jnt, constraint_jnt_1, constraint_jnt_2, mirror, uniform, jnt_num, offset)],
+                         mirror_passes=False)
+
+
+def build_muscles_from_file(path=None):
+    """Pick a muscle manifest JSON file and build every muscle in it."""
+    if path is None:
+        picked = cmds.fileDialog2(fileFilter="Muscle manifest (*.json)", fileMode=1, caption="Build Muscles")
+        if not picked:
+            return []
+        path = picked[0]
+    return build_muscles(load_muscle_manifest(path))
 
 
 # ----------------- UI ----------------- #
@@ -1160,6 +1072,12 @@ def create_muscle_setup_ui():
     
     cmds.separator(h=4, style="none")
     
+    cmds.button(
+        l="Build Muscles From Manifest...",
+        h=28,
+        c=lambda *_: build_muscles_from_file()
+    )
+    
     cmds.button(
         l="Mirror Mid Ctrl Attributes",
         h=28,
@@ -1206,7 +1124,8 @@ def create_muscle_setup_ui():
     
     cmds.showWindow(win)
 
-create_muscle_setup_ui()
+if __name__ == "__main__":
+    create_muscle_setup_ui()
 
 # create_muscle_set_up('jnt_l_ft_longTriceps_0001_0001',
 #  					 'jnt_l_ft_upperlegTwist_0001',
@@ -1,13 +1,12 @@
-import importlib
 import maya.cmds as cmds
 import curve_library
-import auto_rig_helpers
-import  build_master_hierachy
-
-importlib.reload(curve_library)
-importlib.reload(auto_rig_helpers)
+import nurbs_curve
+import rig_executor
+import rig_name_cache
+import rig_plan
 
 from auto_rig_helpers import AutoRigHelpers
+from rig_components import Component, ComponentGraph
 # from build_master_hierachy import Master
 crv_lib = curve_library.RigCurveLibrary()
 
@@ -22,7 +21,13 @@ LOC_EYE = 'temp_l_loc_eye_0001'
 
 class SpineNeckAutoRig(object):
 	
-	def __init__(self, master):
+	def __init__(self, master, spine_jnt_num=6, neck_jnt_num=5, tail_jnt_num=8, tail_joints_per_ctrl=3):
+		# joint densities
+		self.spine_jnt_num = spine_jnt_num
+		self.neck_jnt_num = neck_jnt_num
+		self.tail_jnt_num = tail_jnt_num
+		self.tail_joints_per_ctrl = tail_joints_per_ctrl
+		
 		# master variables
 		self.neck_bend_controls = None
 		self.eye_ctrl_grp = None
@@ -87,35 +92,31 @@ class SpineNeckAutoRig(object):
 		self.neck_curve = "curve2"
 		self.tail_curve = 'curve3'
 	
+	def rebuild_curve_copy(self, cv, name, span=7):
+		"""Duplicate of cv rebuilt with span uniform spans for joint_on_curve, cv itself is left untouched."""
+		copy = cmds.duplicate(cv, rc=True, name=name)[0]
+		cmds.rebuildCurve(copy, ch=0, rpo=1, rt=0, end=1, kr=0,
+						  kcp=0, kep=1, kt=0, s=span, d=3)
+		return copy
+	
 	def joint_on_curve(self, cv, name="spine", jntNum=7, span=7, store=True):
 		"""
 		Create a chain of joints evenly distributed along a curve.
-
+		The curve must have span uniform spans (see rebuild_curve_copy), it is sampled in Python
+		(nurbs_curve) and not changed: joints are spaced by arc length, aim X down the chain and
+		keep Y up, no temporary spline IK.
 		"""
-		# Rebuild curve for even parameterization
-		cmds.rebuildCurve(cv, ch=1, rpo=1, rt=0, end=1, kr=0,
-						  kcp=0, kep=1, kt=0, s=span, d=3)
+		curve = nurbs_curve.NurbsCurve.from_flat(AutoRigHelpers.read_cv_positions(cv), nurbs_curve.uniform_knots(span))
+		positions = curve.points(curve.arc_length_params(jntNum + 1))
+		orients = nurbs_curve.joint_orients(nurbs_curve.chain_frames(positions))
 		
+		# cmds.joint parents to the selection
+		cmds.select(clear=True)
 		joint_chain = []
-		for j in range(jntNum + 1):
-			idx = str(j + 1).zfill(4)
-			jnt_name = f"jnt_c_{name}_{idx}"
-			
-			# Get position along curve
-			param = float(j) / jntNum
-			pos = cmds.pointOnCurve(cv, pr=param, p=True)
-			joint = cmds.joint(p=pos, rad=1, n=jnt_name)
+		for j, (pos, orient) in enumerate(zip(positions, orients)):
+			joint = cmds.joint(p=pos, o=orient, rad=1, n=f"jnt_c_{name}_{j + 1:04d}")
 			joint_chain.append(joint)
 		
-		# Orient chain properly
-		ikh_name = f"ikHnd_c_{name}_0001"
-		ikh = cmds.ikHandle(sj=joint_chain[0], ee=joint_chain[-1],
-							c=cv, ccv=False, sol='ikSplineSolver',
-							pcv=0, n=ikh_name)[0]
-		cmds.delete(ikh)
-		cmds.makeIdentity(joint_chain, apply=True, t=1, r=1, s=1, n=0, pn=1)
-		cmds.joint(joint_chain[0], e=True, oj="xyz", secondaryAxisOrient="yup", ch=True, zso=True)
-		
 		# Store automatically if desired
 		if store:
 			setattr(self, f"{name}_joints", joint_chain)
@@ -144,20 +145,23 @@ class SpineNeckAutoRig(object):
 		return ordered
 	
 	def create_curve(self):
-		"""Safely create or reuse curves for spine and neck."""
-		if not cmds.objExists("crv_c_spineFw_0001"):
-			self.spine_fw_curve = cmds.rename(self.spine_fw_curve, "crv_c_spineFw_0001")
+		"""Safely create or reuse curves for spine and neck, the template curves are left untouched."""
+		names = rig_name_cache.current()
+		if not names.exists("crv_c_spineFw_0001"):
+			self.spine_fw_curve = self.rebuild_curve_copy(self.spine_fw_curve, "crv_c_spineFw_0001")
+			names.record(self.spine_fw_curve)
 		else:
 			self.spine_fw_curve = "crv_c_spineFw_0001"
 		
-		if not cmds.objExists("crv_c_spineBw_0001"):
+		if not names.exists("crv_c_spineBw_0001"):
 			self.spine_bw_curve = cmds.duplicate(self.spine_fw_curve, rc=True, name="crv_c_spineBw_0001")[0]
 			cmds.reverseCurve(self.spine_bw_curve, ch=False, rpo=True)
+			names.record(self.spine_bw_curve)
 		else:
 			self.spine_bw_curve = "crv_c_spineBw_0001"
 		
 		# Spine data group
-		if not cmds.objExists("grp_spineData_0001"):
+		if not names.exists("grp_spineData_0001"):
 			self.spine_data_grp = AutoRigHelpers.create_empty_group("grp_spineData_0001", parent="rigNodesLocal")
 			cmds.parent(self.spine_fw_curve, self.spine_data_grp)
 			cmds.parent(self.spine_bw_curve, self.spine_data_grp)
@@ -165,8 +169,9 @@ class SpineNeckAutoRig(object):
 			self.spine_data_grp = "grp_spineData_0001"
 		
 		# Neck
-		if not cmds.objExists("crv_c_neck_0001"):
-			self.neck_curve = cmds.rename(self.neck_curve, "crv_c_neck_0001")
+		if not names.exists("crv_c_neck_0001"):
+			self.neck_curve = self.rebuild_curve_copy(self.neck_curve, "crv_c_neck_0001")
+			names.record(self.neck_curve)
 			self.neck_data_grp = AutoRigHelpers.create_empty_group("grp_neckData_0001", parent="rigNodesLocal")
 			cmds.parent(self.neck_curve, self.neck_data_grp)
 		else:
@@ -176,9 +181,9 @@ class SpineNeckAutoRig(object):
 	
 	def create_spine_joints(self):
 		"""Create and organize spine joint chains (forward/backward, stretch/non-stretch)."""
-		# 1️⃣ Create the base spine joints along the curve
-		
-		self.joint_on_curve(self.spine_fw_curve, jntNum=6)
+		# 1️⃣ Create the base spine joints along the rebuilt copy of the spine curve
+		self.create_curve()
+		self.joint_on_curve(self.spine_fw_curve, jntNum=self.spine_jnt_num)
 		
 		# 2️⃣ Create main groups
 		self.spine_joints_grp = AutoRigHelpers.create_empty_group("grp_spineJnts_0001", parent='joints')
@@ -220,8 +225,6 @@ class SpineNeckAutoRig(object):
 		AutoRigHelpers.set_attr(self.non_str_joints[0], 'visibility', False)
 		AutoRigHelpers.set_attr(self.spine_bw_joints_grp, 'visibility', False)
 		AutoRigHelpers.set_attr(self.spine_fw_joints_grp, 'visibility', False)
-		
-		self.create_curve()
 	
 	def reverse_joint_chain(self, joint_chain):
 		"""
@@ -331,10 +334,8 @@ class SpineNeckAutoRig(object):
 		pelvis_loc = cmds.spaceLocator(n=f'lc_c_pelvisTwist_0001')[0]
 		chest_loc = cmds.spaceLocator(n=f'lc_c_chestTwist_0001')[0]
 		
-		AutoRigHelpers.create_control_hierarchy(pelvis_loc, 1)
-		AutoRigHelpers.create_control_hierarchy(chest_loc, 1)
-		pelvis_loc_zero = AutoRigHelpers.get_parent_grp(pelvis_loc)[3]
-		chest_loc_zero = AutoRigHelpers.get_parent_grp(chest_loc)[3]
+		pelvis_loc_zero = AutoRigHelpers.build_control_hierarchy(pelvis_loc, 1).zero
+		chest_loc_zero = AutoRigHelpers.build_control_hierarchy(chest_loc, 1).zero
 		
 		cmds.matchTransform(pelvis_loc_zero, self.spine_joints[0])
 		cmds.matchTransform(chest_loc_zero, self.spine_joints[-1])
@@ -393,9 +394,9 @@ class SpineNeckAutoRig(object):
 		for i in range(0, len(self.spine_joints), step):
 			jnt  = self.spine_joints[i]
 			
-			spine_bend_ctrl = crv_lib.create_cube_curve(f'ctrl_c_spineBend_{i//step + 1:04d}')
-			AutoRigHelpers.create_control_hierarchy(spine_bend_ctrl, 2)
-			_, _, spine_bend_zero, spine_bend_offset = AutoRigHelpers.get_parent_grp(spine_bend_ctrl)
+			spine_bend_ctrl = crv_lib.create('cube', f'ctrl_c_spineBend_{i//step + 1:04d}')
+			hierarchy = AutoRigHelpers.build_control_hierarchy(spine_bend_ctrl, 2)
+			spine_bend_zero, spine_bend_offset = hierarchy.zero, hierarchy.offset
 			
 			cmds.matchTransform(spine_bend_zero, jnt, pos=True, rot=False)
 			
@@ -410,10 +411,10 @@ class SpineNeckAutoRig(object):
 		
 		
 		# create controls
-		pelvis_ik_ctrl = crv_lib.create_cube_curve("ctrl_c_pelvis_ik_0001")
-		chest_ik_ctrl = crv_lib.create_cube_curve("ctrl_c_chest_ik_0001")
-		spine_mid_ctrl = crv_lib.create_diamond("ctrl_c_spineMid_ik_0001")
-		spine_switch_ctrl = crv_lib.create_lollipop_ctrl("ctrl_c_spineSwitch_0001")
+		pelvis_ik_ctrl = crv_lib.create('cube', "ctrl_c_pelvis_ik_0001")
+		chest_ik_ctrl = crv_lib.create('cube', "ctrl_c_chest_ik_0001")
+		spine_mid_ctrl = crv_lib.create('diamond', "ctrl_c_spineMid_ik_0001")
+		spine_switch_ctrl = crv_lib.create('lollipop', "ctrl_c_spineSwitch_0001")
 		
 		# match transform
 		cmds.matchTransform(pelvis_ik_ctrl, self.pelvis_ik_jnt)
@@ -421,10 +422,11 @@ class SpineNeckAutoRig(object):
 		cmds.matchTransform(spine_mid_ctrl, self.spine_mid_jnt)
 		cmds.matchTransform(spine_switch_ctrl, pelvis_ik_ctrl)
 		
-		AutoRigHelpers.create_control_hierarchy(pelvis_ik_ctrl)
-		AutoRigHelpers.create_control_hierarchy(chest_ik_ctrl)
-		AutoRigHelpers.create_control_hierarchy(spine_mid_ctrl)
-		AutoRigHelpers.create_control_hierarchy(spine_switch_ctrl, 1)
+		# zero groups are created under their parents
+		AutoRigHelpers.build_control_hierarchy(pelvis_ik_ctrl, parent=spine_ctrl_grp)
+		AutoRigHelpers.build_control_hierarchy(chest_ik_ctrl, parent=spine_bend_controls[-1])
+		spine_mid = AutoRigHelpers.build_control_hierarchy(spine_mid_ctrl, parent=spine_ctrl_grp)
+		AutoRigHelpers.build_control_hierarchy(spine_switch_ctrl, 1, parent=pelvis_ik_ctrl)
 		
 		# lock and hide attr
 		AutoRigHelpers.lock_hide_attr(spine_switch_ctrl, ['tx', 'ty', 'tz', 'rx','ry','rz'])
@@ -438,18 +440,7 @@ class SpineNeckAutoRig(object):
 		cmds.parent(self.chest_ik_jnt, chest_ik_ctrl)
 		cmds.parent(self.spine_mid_jnt, spine_mid_ctrl)
 		
-		# Get zero and offset
-		spine_mid_zero, spine_mid_offset, *_ = AutoRigHelpers.get_parent_grp(spine_mid_ctrl)
-		pelvis_ik_zero, *_ = AutoRigHelpers.get_parent_grp(pelvis_ik_ctrl)
-		chest_ik_zero, *_ = AutoRigHelpers.get_parent_grp(chest_ik_ctrl)
-		spine_switch_zero = AutoRigHelpers.get_parent_grp(spine_switch_ctrl)
-		
-		# parent zero group
-		cmds.parent(pelvis_ik_zero, spine_ctrl_grp)
-		cmds.parent(chest_ik_zero, spine_bend_controls[-1])
-		cmds.parent(spine_mid_zero, spine_ctrl_grp)
-		cmds.parent(spine_switch_zero, pelvis_ik_ctrl)
-		
+		spine_mid_zero, spine_mid_offset = spine_mid.zero, spine_mid.offset
 		cmds.pointConstraint(self.pelvis_ik_jnt, self.chest_ik_jnt, spine_mid_offset, mo=True)
 
 		# create up group
@@ -464,8 +455,8 @@ class SpineNeckAutoRig(object):
 									  wuo=spine_mid_up)
 		
 		# create tangent ctrls
-		pelvis_tangent_ctrl = crv_lib.create_arrow_curve('ctrl_pelvis_tangent_0001')
-		chest_tangent_ctrl = crv_lib.create_arrow_curve('ctrl_chest_tangent_0001')
+		pelvis_tangent_ctrl = crv_lib.create('arrow', 'ctrl_pelvis_tangent_0001')
+		chest_tangent_ctrl = crv_lib.create('arrow', 'ctrl_chest_tangent_0001')
 		AutoRigHelpers.add_attr(pelvis_tangent_ctrl, 'tangent_length', 'float', 1)
 		AutoRigHelpers.add_attr(chest_tangent_ctrl, 'tangent_length', 'float', 1)
 		AutoRigHelpers.lock_hide_attr(pelvis_tangent_ctrl, ['tx','ty','tz','sx','sy','sz','v'])
@@ -473,16 +464,11 @@ class SpineNeckAutoRig(object):
 		
 		cmds.matchTransform(pelvis_tangent_ctrl, pelvis_ik_ctrl)
 		cmds.matchTransform(chest_tangent_ctrl, chest_ik_ctrl)
-		AutoRigHelpers.create_control_hierarchy(pelvis_tangent_ctrl, 2)
-		AutoRigHelpers.create_control_hierarchy(chest_tangent_ctrl, 2)
-		pelvis_tangent_zero = AutoRigHelpers.get_parent_grp(pelvis_tangent_ctrl)[2]
-		chest_tangent_zero = AutoRigHelpers.get_parent_grp(chest_tangent_ctrl)[2]
-		
-		cmds.parent(pelvis_tangent_zero, spine_ctrl_grp)
-		cmds.parent(chest_tangent_zero, spine_ctrl_grp)
+		pelvis_tangent = AutoRigHelpers.build_control_hierarchy(pelvis_tangent_ctrl, 2, parent=spine_ctrl_grp)
+		chest_tangent = AutoRigHelpers.build_control_hierarchy(chest_tangent_ctrl, 2, parent=spine_ctrl_grp)
 
-		cmds.parentConstraint(pelvis_ik_ctrl, AutoRigHelpers.get_parent_grp(pelvis_tangent_ctrl)[3], mo=False)
-		cmds.parentConstraint(chest_ik_ctrl, AutoRigHelpers.get_parent_grp(chest_tangent_ctrl)[3], mo=False)
+		cmds.parentConstraint(pelvis_ik_ctrl, pelvis_tangent.offset, mo=False)
+		cmds.parentConstraint(chest_ik_ctrl, chest_tangent.offset, mo=False)
 		
 		AutoRigHelpers.connect_attr(pelvis_tangent_ctrl, "rotate", self.pelvis_ik_jnt, 'rotate')
 		AutoRigHelpers.connect_attr(pelvis_tangent_ctrl, "tangent_length", self.pelvis_ik_jnt, 'sz')
@@ -593,7 +579,7 @@ class SpineNeckAutoRig(object):
 		"""Create and organize neck joint chains """
 		# 1 Create the base spine joints along the curve
 		
-		self.joint_on_curve(self.neck_curve, 'neck', 5)
+		self.joint_on_curve(self.neck_curve, 'neck', self.neck_jnt_num)
 		
 		# Create main groups
 		self.neck_joints_grp = AutoRigHelpers.create_empty_group("grp_neckJnts_0001", parent='joints')
@@ -683,10 +669,8 @@ class SpineNeckAutoRig(object):
 		neck_lower_loc = cmds.spaceLocator(n=f'lc_c_neckLowerTwist_0001')[0]
 		head_loc = cmds.spaceLocator(n=f'lc_c_headTwist_0001')[0]
 		
-		AutoRigHelpers.create_control_hierarchy(neck_lower_loc, 1)
-		AutoRigHelpers.create_control_hierarchy(head_loc, 1)
-		neck_lower_loc_zero = AutoRigHelpers.get_parent_grp(neck_lower_loc)[3]
-		head_loc_zero = AutoRigHelpers.get_parent_grp(head_loc)[3]
+		neck_lower_loc_zero = AutoRigHelpers.build_control_hierarchy(neck_lower_loc, 1).zero
+		head_loc_zero = AutoRigHelpers.build_control_hierarchy(head_loc, 1).zero
 		
 		cmds.matchTransform(neck_lower_loc_zero, self.neck_joints[0])
 		cmds.matchTransform(head_loc_zero, self.neck_joints[-2])
@@ -717,11 +701,11 @@ class SpineNeckAutoRig(object):
 			jnt = self.neck_joints[idx]
 			
 			ctrl_name = f"ctrl_c_neckBend_{i + 1:04d}"
-			neck_bend_ctrl = crv_lib.create_square_curve(ctrl_name, size=1.5)
+			neck_bend_ctrl = crv_lib.create('square', ctrl_name)
 			
 			# make hierarchy
-			AutoRigHelpers.create_control_hierarchy(neck_bend_ctrl, 2)
-			_, _, zero, offset = AutoRigHelpers.get_parent_grp(neck_bend_ctrl)
+			hierarchy = AutoRigHelpers.build_control_hierarchy(neck_bend_ctrl, 2)
+			zero, offset = hierarchy.zero, hierarchy.offset
 			
 			# parent zero under the main group or previous ctrl
 			if prev_ctrl is None:
@@ -737,20 +721,20 @@ class SpineNeckAutoRig(object):
 			
 		
 		# create controls
-		head_ctrl = crv_lib.create_cube_curve("ctrl_c_head_ik_0001")
-		neck_mid_ctrl = crv_lib.create_diamond("ctrl_c_neckMid_ik_0001")
-		neck_switch_ctrl = crv_lib.create_lollipop_ctrl("ctrl_c_neckSwitch_0001")
+		head_ctrl = crv_lib.create('cube', "ctrl_c_head_ik_0001")
+		neck_mid_ctrl = crv_lib.create('diamond', "ctrl_c_neckMid_ik_0001")
+		neck_switch_ctrl = crv_lib.create('lollipop', "ctrl_c_neckSwitch_0001")
 		
 		# match transform
 		cmds.matchTransform(head_ctrl, self.neck_ik_jnt)
 		cmds.matchTransform(neck_mid_ctrl, self.neck_mid_jnt)
 		cmds.matchTransform(neck_switch_ctrl, self.chest_ik_ctrl)
 		
-		AutoRigHelpers.create_control_hierarchy(self.neck_lower_jnt, 2)
-		_, _, neck_lower_jnt_zero, neck_lower_jnt_offset = AutoRigHelpers.get_parent_grp(self.neck_lower_jnt)
-		AutoRigHelpers.create_control_hierarchy(head_ctrl)
-		AutoRigHelpers.create_control_hierarchy(neck_mid_ctrl)
-		AutoRigHelpers.create_control_hierarchy(neck_switch_ctrl, 1)
+		# zero groups are created under their parents
+		neck_lower_jnt_offset = AutoRigHelpers.build_control_hierarchy(self.neck_lower_jnt, 2, parent=neck_ctrl_grp).offset
+		AutoRigHelpers.build_control_hierarchy(head_ctrl, parent=neck_ctrl_grp)
+		neck_mid = AutoRigHelpers.build_control_hierarchy(neck_mid_ctrl, parent=neck_ctrl_grp)
+		AutoRigHelpers.build_control_hierarchy(neck_switch_ctrl, 1, parent=neck_ctrl_grp)
 		
 		# lock and hide attr
 		AutoRigHelpers.lock_hide_attr(head_ctrl, ['sx', 'sy', 'sz', 'v'])
@@ -765,16 +749,7 @@ class SpineNeckAutoRig(object):
 		cmds.parent(self.neck_ik_jnt, head_ctrl)
 		cmds.parent(self.neck_mid_jnt, neck_mid_ctrl)
 		
-		# Get zero and offset
-		neck_mid_zero, neck_mid_offset, *_ = AutoRigHelpers.get_parent_grp(neck_mid_ctrl)
-		neck_ik_zero, *_ = AutoRigHelpers.get_parent_grp(head_ctrl)
-		neck_switch_zero = AutoRigHelpers.get_parent_grp(neck_switch_ctrl)
-		
-		# parent zero group
-		cmds.parent(neck_lower_jnt_zero, neck_ctrl_grp)
-		cmds.parent(neck_ik_zero, neck_ctrl_grp)
-		cmds.parent(neck_mid_zero, neck_ctrl_grp)
-		cmds.parent(neck_switch_zero, neck_ctrl_grp)
+		neck_mid_zero, neck_mid_offset = neck_mid.zero, neck_mid.offset
 		
 		cmds.pointConstraint(self.chest_ik_jnt, self.neck_ik_jnt, neck_mid_offset, mo=True)
 		cmds.pointConstraint(self.spine_joints[-1], neck_lower_jnt_offset, mo=True)
@@ -791,8 +766,8 @@ class SpineNeckAutoRig(object):
 									  wuo=neck_mid_up)
 		
 		# create tangent ctrls
-		neck_lower_tangent_ctrl = crv_lib.create_arrow_curve('ctrl_neck_tangent_0001')
-		neck_tangent_ctrl = crv_lib.create_arrow_curve('ctrl_neck_tangent_0002')
+		neck_lower_tangent_ctrl = crv_lib.create('arrow', 'ctrl_neck_tangent_0001')
+		neck_tangent_ctrl = crv_lib.create('arrow', 'ctrl_neck_tangent_0002')
 		AutoRigHelpers.add_attr(neck_lower_tangent_ctrl, 'tangent_length', 'float', 1)
 		AutoRigHelpers.add_attr(neck_tangent_ctrl, 'tangent_length', 'float', 1)
 		AutoRigHelpers.lock_hide_attr(neck_lower_tangent_ctrl, ['tx', 'ty', 'tz', 'sx', 'sy', 'sz', 'v'])
@@ -800,15 +775,11 @@ class SpineNeckAutoRig(object):
 		
 		cmds.matchTransform(neck_lower_tangent_ctrl, self.chest_ik_ctrl)
 		cmds.matchTransform(neck_tangent_ctrl, head_ctrl)
-		AutoRigHelpers.create_control_hierarchy(neck_lower_tangent_ctrl, 2)
-		AutoRigHelpers.create_control_hierarchy(neck_tangent_ctrl, 2)
-		neck_lower_tangent_zero = AutoRigHelpers.get_parent_grp(neck_lower_tangent_ctrl)[2]
-		neck_tangent_zero = AutoRigHelpers.get_parent_grp(neck_tangent_ctrl)[2]
-		cmds.parent(neck_lower_tangent_zero, neck_ctrl_grp)
-		cmds.parent(neck_tangent_zero, neck_ctrl_grp)
+		neck_lower_tangent = AutoRigHelpers.build_control_hierarchy(neck_lower_tangent_ctrl, 2, parent=neck_ctrl_grp)
+		neck_tangent = AutoRigHelpers.build_control_hierarchy(neck_tangent_ctrl, 2, parent=neck_ctrl_grp)
 		
-		cmds.parentConstraint(self.chest_ik_ctrl, AutoRigHelpers.get_parent_grp(neck_lower_tangent_ctrl)[3], mo=False)
-		cmds.parentConstraint(head_ctrl, AutoRigHelpers.get_parent_grp(neck_tangent_ctrl)[3], mo=False)
+		cmds.parentConstraint(self.chest_ik_ctrl, neck_lower_tangent.offset, mo=False)
+		cmds.parentConstraint(head_ctrl, neck_tangent.offset, mo=False)
 		
 		AutoRigHelpers.connect_attr(neck_lower_tangent_ctrl, "rotate", self.neck_lower_jnt, 'rotate')
 		AutoRigHelpers.connect_attr(neck_lower_tangent_ctrl, "tangent_length", self.neck_lower_jnt, 'sz')
@@ -830,19 +801,15 @@ class SpineNeckAutoRig(object):
 		cog_jnt = cmds.createNode('joint', name='jnt_c_cog_0001', parent=JOINTS_GRP)
 		
 		# create controller
-		cog_ctrl = crv_lib.create_cube_curve(name='ctrl_c_cog_0001')
-		cog_off_ctrl = crv_lib.create_cube_curve(name='ctrl_c_cog_off_0001')
+		cog_ctrl = crv_lib.create('cube', 'ctrl_c_cog_0001')
+		cog_off_ctrl = crv_lib.create('cube', 'ctrl_c_cog_off_0001')
 		# CONSTRAINT
 		cmds.parentConstraint(cog_off_ctrl, cog_jnt, mo=False)
 		cmds.matchTransform(cog_ctrl, LOC_COG)
 		cmds.matchTransform(cog_off_ctrl, LOC_COG)
 		
-		AutoRigHelpers.create_control_hierarchy(cog_ctrl, 1)
-		AutoRigHelpers.create_control_hierarchy(cog_off_ctrl, 1)
-		cog_zero = AutoRigHelpers.get_parent_grp(cog_ctrl)[3]
-		cog_off_zero = AutoRigHelpers.get_parent_grp(cog_off_ctrl)[3]
-		cmds.parent(cog_off_zero, cog_ctrl)
-		cmds.parent(cog_zero, self.move_all_ctrl)
+		AutoRigHelpers.build_control_hierarchy(cog_ctrl, 1, parent=self.move_all_ctrl)
+		AutoRigHelpers.build_control_hierarchy(cog_off_ctrl, 1, parent=cog_ctrl)
 		
 
 		self.cog_off_ctrl = cog_off_ctrl
@@ -882,29 +849,27 @@ class SpineNeckAutoRig(object):
 		
 		# create controllers
 		belly_ctrls = []
+		belly_hierarchies = []
 		for i in range(3):
 			ctrl_name = f'ctrl_c_belly_{i + 1:04d}'
 			jnt = belly_joints[i]
 			if i < 2:
-				belly_ctrl = crv_lib.create_cube_curve(ctrl_name)
+				belly_ctrl = crv_lib.create('cube', ctrl_name)
 				cmds.matchTransform(belly_ctrl, jnt)
-				AutoRigHelpers.create_control_hierarchy(belly_ctrl, 2)
-				cmds.parent(AutoRigHelpers.get_parent_grp(belly_ctrl)[2], belly_ctrl_grp)
+				belly_hierarchies.append(AutoRigHelpers.build_control_hierarchy(belly_ctrl, 2, parent=belly_ctrl_grp))
 				
 				AutoRigHelpers.lock_hide_attr(belly_ctrl, ['sx', 'sy', 'sz', 'v'])
 				belly_ctrls.append(belly_ctrl)
 				cmds.parentConstraint(belly_ctrl, jnt, mo=False)
 				continue
 			else:
-				belly_ctrl = crv_lib.create_cube_curve(ctrl_name)
+				belly_ctrl = crv_lib.create('cube', ctrl_name)
 				cmds.matchTransform(belly_ctrl, jnt)
-				AutoRigHelpers.create_control_hierarchy(belly_ctrl, 2)
-				cmds.parent(AutoRigHelpers.get_parent_grp(belly_ctrl)[2], belly_ctrl_grp)
+				belly_hierarchies.append(AutoRigHelpers.build_control_hierarchy(belly_ctrl, 2, parent=belly_ctrl_grp))
 				
-				belly_off_ctrl = crv_lib.create_cube_curve('ctrl_c_belly_off_0003')
+				belly_off_ctrl = crv_lib.create('cube', 'ctrl_c_belly_off_0003')
 				cmds.matchTransform(belly_off_ctrl, belly_ctrl)
-				AutoRigHelpers.create_control_hierarchy(belly_off_ctrl, 2)
-				cmds.parent(AutoRigHelpers.get_parent_grp(belly_off_ctrl)[2], belly_ctrl)
+				AutoRigHelpers.build_control_hierarchy(belly_off_ctrl, 2, parent=belly_ctrl)
 				AutoRigHelpers.lock_hide_attr(belly_ctrl, ['sx', 'sy', 'sz', 'v'])
 				AutoRigHelpers.lock_hide_attr(belly_off_ctrl, ['sx', 'sy', 'sz', 'v'])
 				cmds.parentConstraint(belly_off_ctrl, jnt, mo=False)
@@ -962,7 +927,7 @@ class SpineNeckAutoRig(object):
 						   worldUpObject=loc_belly01_up,
 						   mo=False)
 		
-		cmds.parentConstraint(loc_belly01_target, AutoRigHelpers.get_parent_grp(belly_ctrls[0])[3], mo=False)
+		cmds.parentConstraint(loc_belly01_target, belly_hierarchies[0].offset, mo=False)
 		
 		# belly 02 constraint
 		cmds.parentConstraint(self.spine_joints[-3], belly02_target_grp, mo=True)
@@ -990,11 +955,11 @@ class SpineNeckAutoRig(object):
 						   worldUpObject=loc_belly02_up,
 						   mo=False)
 		
-		cmds.parentConstraint(loc_belly02_target, AutoRigHelpers.get_parent_grp(belly_ctrls[1])[3], mo=False)
+		cmds.parentConstraint(loc_belly02_target, belly_hierarchies[1].offset, mo=False)
 		
 		# constraint belly03 ctrl
-		cmds.pointConstraint(self.neck_joints[0], AutoRigHelpers.get_parent_grp(belly_ctrls[2])[3], mo=True)
-		cmds.parent(AutoRigHelpers.get_parent_grp(belly_ctrls[2])[2], self.chest_ik_ctrl)
+		cmds.pointConstraint(self.neck_joints[0], belly_hierarchies[2].offset, mo=True)
+		cmds.parent(belly_hierarchies[2].zero, self.chest_ik_ctrl)
 		
 		self.belly_joints = belly_joints
 		
@@ -1051,11 +1016,9 @@ class SpineNeckAutoRig(object):
 		cmds.parent(pelvis_jnt, pelvis_grp)
 		
 		# create controller
-		pelvis_ctrl = crv_lib.create_cube_curve('ctrl_c_pelvis_0001')
+		pelvis_ctrl = crv_lib.create('cube', 'ctrl_c_pelvis_0001')
 		cmds.matchTransform(pelvis_ctrl, pelvis_jnt)
-		AutoRigHelpers.create_control_hierarchy(pelvis_ctrl, 2)
-		pelvis_zero = AutoRigHelpers.get_parent_grp(pelvis_ctrl)[2]
-		cmds.parent(pelvis_zero, self.pelvis_ik_ctrl)
+		pelvis_zero = AutoRigHelpers.build_control_hierarchy(pelvis_ctrl, 2, parent=self.pelvis_ik_ctrl).zero
 		
 		cmds.parentConstraint(pelvis_ctrl, pelvis_jnt, mo=False)
 		
@@ -1063,7 +1026,9 @@ class SpineNeckAutoRig(object):
 		self.pelvis_jnt = pelvis_jnt
 		
 	def create_tail(self):
-		tail_joints = self.joint_on_curve(self.tail_curve, 'tail', 8)
+		tail_curve = self.rebuild_curve_copy(self.tail_curve, 'crv_c_tail_0001')
+		tail_joints = self.joint_on_curve(tail_curve, 'tail', self.tail_jnt_num)
+		cmds.delete(tail_curve)
 		tail_root = tail_joints[0]
 		
 		# create jnt grp
@@ -1088,11 +1053,11 @@ class SpineNeckAutoRig(object):
 		prev_ctrl = None
 		
 		for i, jnt in enumerate(tail_joints[:-1]):
-			small_ctrl = crv_lib.circle(1, f'ctrl_c_tail_{i+1:04d}')
+			small_ctrl = crv_lib.create('circle', f'ctrl_c_tail_{i+1:04d}')
 			cmds.matchTransform(small_ctrl, jnt)
 			cmds.parentConstraint(small_ctrl, jnt, mo=False)
-			AutoRigHelpers.create_control_hierarchy(small_ctrl, 3)
-			_, small_zero, small_offset, small_driven = AutoRigHelpers.get_parent_grp(small_ctrl)
+			hierarchy = AutoRigHelpers.build_control_hierarchy(small_ctrl, 3)
+			small_zero, small_offset, small_driven = hierarchy.zero, hierarchy.offset, hierarchy.driven
 			
 			if prev_ctrl is None:
 				cmds.parent(small_zero, ctrl_root_grp)
@@ -1103,7 +1068,8 @@ class SpineNeckAutoRig(object):
 			small_controls.append(small_ctrl)
 			small_driven_groups.append(small_driven)
 			
-		self.create_tail_sub_ctrls(tail_joints, ctrl_root_grp, small_driven_groups, small_controls)
+		self.create_tail_sub_ctrls(tail_joints, ctrl_root_grp, small_driven_groups, small_controls,
+								   joints_per_ctrl=self.tail_joints_per_ctrl)
 	
 	
 	def create_tail_sub_ctrls(self, tail_joints, root_ctrl_grp, driven_grp, small_ctrl, joints_per_ctrl=3, prefix='ctrl_c_tailDrv'):
@@ -1112,65 +1078,24 @@ class SpineNeckAutoRig(object):
 		Each sub-controller drives a fixed number of joints (joints_per_ctrl).
 		Example:
 			tail_joints = 9, joints_per_ctrl = 3 → controllers at joints [0, 3, 6]
-		"""
-		# Create control group
-		ctrl_grp = cmds.createNode('transform', n='grp_c_tailDrvCtrls_0001', p=root_ctrl_grp)
 		
-		# Remove the terminal joint
-		chain = tail_joints[:-1]
-		n = len(chain)
-		if n == 0:
+		The setup is rig_plan.plan_tail_sub_ctrls, the one plan_tail made before the build when
+		the names match.
+		"""
+		plan = rig_plan.cached(rig_plan.plan_tail_sub_ctrls, tail_joints, root_ctrl_grp, driven_grp, small_ctrl,
+							   joints_per_ctrl, prefix)
+		created = rig_executor.PlanExecutor().run(plan)
+		sub_ctrls = [created[op[2]] for op in plan.ops if op[0] == 'control']
+		if not sub_ctrls:
 			cmds.warning("No tail joints found.")
-			return []
-		
-		# Determine evenly spaced indices — e.g., [0, 3, 6]
-		step = max(1, joints_per_ctrl)
-		idxs = list(range(0, n, step))
-		
-		# ⚙️ Clamp last index to avoid duplication of last joint
-		if idxs[-1] >= n:
-			idxs[-1] = n - 1
-		
-		sub_ctrls = []
-		for i, idx in enumerate(idxs, 1):
-			jnt = chain[idx]
-			ctrl = crv_lib.create_square_curve(f"{prefix}_{i:04d}", 20)
-			cmds.matchTransform(ctrl, jnt)
-			
-			# Build hierarchy
-			AutoRigHelpers.create_control_hierarchy(ctrl, 2)
-			_, _, ctrl_zero, ctrl_offset = AutoRigHelpers.get_parent_grp(ctrl)
-			cmds.parent(ctrl_zero, ctrl_grp)
-			sub_ctrls.append(ctrl)
-			
-			# Constrain next range of joints to this control
-			start_idx = idx
-			end_idx = min(idx + step, n)
-			segment = driven_grp[start_idx:end_idx]
-			ctrl_segment = small_ctrl[start_idx:end_idx]
-			
-			# create multiply divide
-			div_node = cmds.createNode('multiplyDivide', n=f'div_c_tailDrv_{i:04d}')
-			AutoRigHelpers.set_attr(div_node, 'operation', 2)
-			for attr in ['outputX','outputY','outputZ']:
-				AutoRigHelpers.set_attr(div_node, attr, joints_per_ctrl)
-			AutoRigHelpers.connect_attr(ctrl, 'rotate', div_node, 'input1')
-			
-			# connect rotation
-			for seg_driven in segment:
-				for rot, attr in zip(['rotateX','rotateY','rotateZ'], ['X','Y','Z']):
-					AutoRigHelpers.connect_attr(div_node, f'output{attr}', seg_driven, rot)
-			
-			if i > 1:  # skip sub ctrl 001
-				# parent under small_ctrl at the start joint of its own range
-				parent_target_idx = idx-1  # start joint index of this segment
-				if parent_target_idx < len(small_ctrl):
-					parent_target = small_ctrl[parent_target_idx]
-					cmds.parent(ctrl_zero, parent_target)
-		
-			AutoRigHelpers.lock_hide_attr(ctrl, ['tx', 'ty', 'tz'])
 		return sub_ctrls
 	
+	def plan_tail(self):
+		"""Tail sub controls of the tail as create_tail names it, planned before the build."""
+		names = rig_plan.tail_names(self.tail_jnt_num)
+		return rig_plan.cached(rig_plan.plan_tail_sub_ctrls, names['joints'], 'grp_c_tailCtrls_0001',
+							   names['driven'], names['ctrls'], self.tail_joints_per_ctrl, 'ctrl_c_tailDrv')
+	
 	# --------- eye -------------
 	
 	def create_eye_setup(self):
@@ -1185,10 +1110,9 @@ class SpineNeckAutoRig(object):
 		cmds.parentConstraint(self.neck_joints[-2], eye_ball_grp, mo=True)
 		
 		# ---------- create eye Aim control
-		main_aim_ctrl = crv_lib.create_eye_aim_curve('ctrl_c_eyeAim_0001')
-		AutoRigHelpers.create_control_hierarchy(main_aim_ctrl, 2)
-		_, _, main_aim_zero, main_aim_offset = AutoRigHelpers.get_parent_grp(main_aim_ctrl)
-		cmds.parent(main_aim_zero, eye_ctrl_grp)
+		main_aim_ctrl = crv_lib.create('eye_aim', 'ctrl_c_eyeAim_0001')
+		hierarchy = AutoRigHelpers.build_control_hierarchy(main_aim_ctrl, 2, parent=eye_ctrl_grp)
+		main_aim_zero, main_aim_offset = hierarchy.zero, hierarchy.offset
 		cmds.matchTransform(main_aim_zero, LOC_EYE, positionY=True, positionZ=True)
 		ctrl_tx = AutoRigHelpers.get_attr(main_aim_zero, 'translateZ')
 		AutoRigHelpers.set_attr(main_aim_zero, 'translateZ', ctrl_tx + 15)
@@ -1220,7 +1144,7 @@ class SpineNeckAutoRig(object):
 		for side in ['l', 'r']:
 			# create joints and ctrls
 			jnt = cmds.createNode('joint', n=f'jnt_{side}_eyeBall_0001', p=eye_jnt_grp)
-			ctrl = crv_lib.create_ball_curve(f'ctrl_{side}_eyeBall_0001')
+			ctrl = crv_lib.create('ball', f'ctrl_{side}_eyeBall_0001')
 			
 			cmds.matchTransform(jnt, LOC_EYE)
 			if side == 'r':
@@ -1234,9 +1158,8 @@ class SpineNeckAutoRig(object):
 			AutoRigHelpers.set_attr(up_grp, 'translateY', 5)
 			
 			cmds.matchTransform(ctrl, jnt)
-			AutoRigHelpers.create_control_hierarchy(ctrl, 2)
-			_, _, eye_zero, eye_offset = AutoRigHelpers.get_parent_grp(ctrl)
-			cmds.parent(eye_zero, ctrl_grp)
+			hierarchy = AutoRigHelpers.build_control_hierarchy(ctrl, 2, parent=ctrl_grp)
+			eye_zero, eye_offset = hierarchy.zero, hierarchy.offset
 			
 			# parent constraint
 			cmds.parentConstraint(ctrl, jnt, mo=False)
@@ -1248,10 +1171,9 @@ class SpineNeckAutoRig(object):
 			AutoRigHelpers.set_attr(loc, 'translateZ', loc_tx + 15)
 			
 			# create individual aim controller
-			aim_ctrl = crv_lib.circle(3, f'ctrl_{side}_eyeAim_0001')
-			AutoRigHelpers.create_control_hierarchy(aim_ctrl, 2)
-			_, _, aim_zero, aim_offset = AutoRigHelpers.get_parent_grp(aim_ctrl)
-			cmds.parent(aim_zero, main_aim_ctrl)
+			aim_ctrl = crv_lib.create('circle', f'ctrl_{side}_eyeAim_0001', 3)
+			hierarchy = AutoRigHelpers.build_control_hierarchy(aim_ctrl, 2, parent=main_aim_ctrl)
+			aim_zero, aim_offset = hierarchy.zero, hierarchy.offset
 			cmds.matchTransform(aim_zero, loc)
 			
 			# do aim constraint
@@ -1278,38 +1200,40 @@ class SpineNeckAutoRig(object):
 
 	
 	
-	def construct_rig(self):
-		self.create_cog()
-		
-		# spine
-		self.create_spine_joints()
-		self.create_spine_setup()
+	def setup_spine_blend(self):
 		self.setup_stretch('spine', 'strFw', self.str_fw_joints, self.spine_fw_curve, self.move_all_ctrl)
 		self.setup_stretch('spine', 'strBw', self.str_bw_joints, self.spine_bw_curve, self.move_all_ctrl)
 		self.blend_fw_bw(self.spine_switch_ctrl, 'spine', self.str_fw_joints, self.str_bw_joints, self.str_joints)
 		self.blend_fw_bw(self.spine_switch_ctrl, 'spine', self.non_str_fw_joints, self.non_str_bw_joints, self.non_str_joints)
 		self.blend_str_nonStr(self.spine_switch_ctrl, 'spine', self.str_joints, self.non_str_joints, self.spine_joints)
-		
-		# neck
-		self.create_neck_joints()
-		self.create_neck_setup()
+	
+	def setup_neck_blend(self):
 		self.setup_stretch('neck', 'str', self.neck_str_joints, self.neck_curve, self.move_all_ctrl, False)
 		self.blend_str_nonStr(self.neck_switch_ctrl, 'neck', self.neck_str_joints, self.neck_non_str_joints, self.neck_joints)
-		
-		# create belly
-		self.create_belly_setup()
-		
-		# create pelvis
-		self.create_pelvis()
-		
-		# head orient
-		self.setup_head_orient()
-		
-		# create tail
-		self.create_tail()
-		
-		# create eye
-		self.create_eye_setup()
+	
+	def components(self):
+		"""Build steps grouped into components that can be rebuilt on their own, in build order."""
+		return [
+			Component('cog', self, [self.create_cog]),
+			Component('spine', self, [self.create_spine_joints, self.create_spine_setup, self.setup_spine_blend],
+					  depends=['cog'], params=['spine_jnt_num']),
+			Component('neck', self, [self.create_neck_joints, self.create_neck_setup, self.setup_neck_blend],
+					  depends=['spine'], params=['neck_jnt_num']),
+			Component('belly', self, [self.create_belly_setup], depends=['spine', 'neck']),
+			Component('pelvis', self, [self.create_pelvis], depends=['spine']),
+			Component('head_orient', self, [self.setup_head_orient], depends=['neck']),
+			Component('tail', self, [self.create_tail], depends=['spine'],
+					  params=['tail_jnt_num', 'tail_joints_per_ctrl'], plan=self.plan_tail),
+			Component('eye', self, [self.create_eye_setup], depends=['neck']),
+		]
+	
+	def construct_rig(self, components=None):
+		"""
+		Args:
+			components (ComponentGraph): records the built components so they can be rebuilt later.
+		"""
+		components = components if components is not None else ComponentGraph()
+		components.build(self.components())
 		
 		AutoRigHelpers.lock_and_hide_ctrls()
 		
@@ -0,0 +1,204 @@
+"""
+Pure-Python NURBS curve evaluation for placing joint chains. No Maya import,
+so it runs (and can be checked) outside Maya.
+
+	curve = NurbsCurve(cvs, uniform_knots(spans=7, degree=3))
+	points = curve.points(curve.arc_length_params(8))   # 8 joints, evenly spaced, ends included
+	frames = chain_frames(points, up=(0, 1, 0))          # X aims down the chain, Y parallel transported
+	orients = joint_orients(frames)                      # jointOrient XYZ degrees, relative to the previous joint
+
+CVs are world space positions, as read with one xform query
+(AutoRigHelpers.read_cv_positions). Curves are non-rational, which is what
+rebuildCurve produces. Knots follow Maya's convention: spans + 2 * degree - 1
+values, without the two extra end knots of the textbook form.
+"""
+import bisect
+import math
+
+# length table resolution, chords per span
+ARC_SAMPLES = 32
+
+
+def uniform_knots(spans, degree=3, start=0.0, end=1.0):
+	"""Knots of a curve rebuilt with uniform spans (rebuildCurve kt=0), kr=0 maps it to 0..1."""
+	inner = [start + (end - start) * i / float(spans) for i in range(spans + 1)]
+	return [start] * (degree - 1) + inner + [end] * (degree - 1)
+
+
+def _sub(a, b):
+	return [a[0] - b[0], a[1] - b[1], a[2] - b[2]]
+
+
+def _dot(a, b):
+	return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+def _cross(a, b):
+	return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+
+
+def _length(a):
+	return math.sqrt(_dot(a, a))
+
+
+def _normalize(a):
+	length = _length(a)
+	return [a[0] / length, a[1] / length, a[2] / length] if length > 1e-12 else [0.0, 0.0, 0.0]
+
+
+class NurbsCurve(object):
+
+	def __init__(self, cvs, knots, degree=3):
+		self.cvs = [list(cv) for cv in cvs]
+		self.degree = degree
+		if len(knots) != len(self.cvs) + degree - 1:
+			raise ValueError(f"{len(self.cvs)} CVs of degree {degree} need {len(self.cvs) + degree - 1} knots, "
+							 f"got {len(knots)}")
+		self.knots = [knots[0]] + list(knots) + [knots[-1]]
+		self._lengths = None
+
+	@classmethod
+	def from_flat(cls, positions, knots, degree=3):
+		"""From a flat [x, y, z, x, y, z, ...] CV list."""
+		return cls([positions[i:i + 3] for i in range(0, len(positions), 3)], knots, degree)
+
+	@property
+	def domain(self):
+		return self.knots[self.degree], self.knots[len(self.cvs)]
+
+	def _span(self, u):
+		lo, hi = self.degree, len(self.cvs) - 1
+		if u >= self.knots[hi + 1]:
+			return hi
+		return max(lo, min(hi, bisect.bisect_right(self.knots, u) - 1))
+
+	def point(self, u):
+		"""Position at parameter u (de Boor), clamped to the domain."""
+		lo, hi = self.domain
+		u = max(lo, min(hi, u))
+		degree, knots = self.degree, self.knots
+		span = self._span(u)
+		d = [list(self.cvs[j + span - degree]) for j in range(degree + 1)]
+		for r in range(1, degree + 1):
+			for j in range(degree, r - 1, -1):
+				i = j + span - degree
+				denom = knots[i + degree - r + 1] - knots[i]
+				alpha = 0.0 if denom == 0.0 else (u - knots[i]) / denom
+				d[j] = [a + alpha * (b - a) for a, b in zip(d[j - 1], d[j])]
+		return d[degree]
+
+	def points(self, params):
+		return [self.point(u) for u in params]
+
+	# ======================
+	# Arc length
+	# ======================
+
+	def _length_table(self):
+		if self._lengths is None:
+			lo, hi = self.domain
+			count = max(1, (len(self.cvs) - self.degree) * ARC_SAMPLES)
+			params = [lo + (hi - lo) * i / float(count) for i in range(count + 1)]
+			points = self.points(params)
+			lengths = [0.0]
+			for a, b in zip(points, points[1:]):
+				lengths.append(lengths[-1] + _length(_sub(b, a)))
+			self._lengths = (params, lengths)
+		return self._lengths
+
+	def length(self):
+		return self._length_table()[1][-1]
+
+	def arc_length_params(self, count):
+		"""Parameters of count points spaced evenly by length, first and last on the curve ends."""
+		params, lengths = self._length_table()
+		if count < 2:
+			return params[:1]
+		total = lengths[-1]
+		out = []
+		for i in range(count):
+			target = total * i / float(count - 1)
+			k = min(len(lengths) - 1, max(1, bisect.bisect_left(lengths, target)))
+			seg = lengths[k] - lengths[k - 1]
+			t = (target - lengths[k - 1]) / seg if seg > 0.0 else 0.0
+			out.append(params[k - 1] + t * (params[k] - params[k - 1]))
+		return out
+
+
+# ======================
+# Frames
+# ======================
+
+def _transport(vector, from_dir, to_dir):
+	"""Rotate vector by the smallest rotation taking from_dir onto to_dir (Rodrigues)."""
+	axis = _cross(from_dir, to_dir)
+	sin = _length(axis)
+	cos = _dot(from_dir, to_dir)
+	if sin < 1e-9:
+		return list(vector)
+	axis = [a / sin for a in axis]
+	k_cross = _cross(axis, vector)
+	k_dot = _dot(axis, vector)
+	return [vector[i] * cos + k_cross[i] * sin + axis[i] * k_dot * (1.0 - cos) for i in range(3)]
+
+
+def chain_frames(points, up=(0.0, 1.0, 0.0)):
+	"""
+	World orientation of a joint on every point: X aims at the next point, Y starts as close
+	to up as possible on the first joint and is parallel transported down the chain, so it
+	does not flip where the chain turns. The last joint keeps the frame of the one before.
+
+	Returns:
+		list: (x, y, z) axis vectors per point.
+	"""
+	aims = [_normalize(_sub(b, a)) for a, b in zip(points, points[1:])]
+	if not aims:
+		return [([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])] * len(points)
+	aims.append(aims[-1])
+
+	x = aims[0]
+	y = _normalize(_sub(up, [a * _dot(up, x) for a in x]))
+	if _dot(y, y) == 0.0:
+		y = _normalize(_cross([0.0, 0.0, 1.0] if abs(x[2]) < 0.9 else [1.0, 0.0, 0.0], x))
+
+	frames = []
+	for i, x in enumerate(aims):
+		if i:
+			y = _transport(y, aims[i - 1], x)
+		# keep Y exactly perpendicular, transport accumulates rounding
+		y = _normalize(_sub(y, [a * _dot(y, x) for a in x]))
+		frames.append((x, y, _cross(x, y)))
+	return frames
+
+
+def euler_xyz(rows):
+	"""Euler degrees (xyz rotate order) of a rotation given as its three axis rows."""
+	sy = max(-1.0, min(1.0, -rows[0][2]))
+	ry = math.asin(sy)
+	if abs(math.cos(ry)) > 1e-6:
+		rx = math.atan2(rows[1][2], rows[2][2])
+		rz = math.atan2(rows[0][1], rows[0][0])
+	else:
+		rz = 0.0
+		rx = math.atan2(-rows[2][1], rows[1][1])
+	return [math.degrees(rx), math.degrees(ry), math.degrees(rz)]
+
+
+def joint_orients(frames, parent=None):
+	"""
+	jointOrient of a chain whose joints are parented in order, zero rotate assumed.
+
+	Args:
+		frames (list): chain_frames() output.
+		parent (tuple): world axis rows of the root's parent, world when None.
+	"""
+	orients = []
+	for frame in frames:
+		if parent is None:
+			local = frame
+		else:
+			# row vectors: world = local * parent, parent is orthonormal
+			local = [[_dot(row, axis) for axis in parent] for row in frame]
+		orients.append(euler_xyz(local))
+		parent = frame
+	return orients
@@ -1,5 +1,8 @@
 import maya.cmds as cmds
 
+import rig_symmetry
+from graph_builder import GraphBuilder
+
 
 # ----------------- HELPERS ----------------- #
 
@@ -57,18 +60,11 @@ def _ensure_node(name, type_name):
 	return cmds.createNode(type_name, n=name)
 
 
-def _lr_mirror(name):
-	if "_l_" in name:
-		return name.replace("_l_", "_r_", 1)
-	elif "_r_" in name:
-		return name.replace("_r_", "_l_", 1)
-	return name
-
-
 # ----------------- SETUP ----------------- #
 
 def create_push_setup(input_joint, cons_joint1, cons_joint2, name, region, axis, offset_axis, offset_val):
-	if not cmds.objExists(input_joint):
+	symmetry = rig_symmetry.current([input_joint, cons_joint1, cons_joint2])
+	if input_joint not in symmetry:
 		cmds.warning("Input joint does not exist.")
 		return
 	
@@ -78,12 +74,13 @@ def create_push_setup(input_joint, cons_joint1, cons_joint2, name, region, axis,
 		return
 	
 	for side in ["l", "r"]:
-		joint = input_joint.replace("_l_", f"_{side}_").replace("_r_", f"_{side}_")
-		c1 = cons_joint1.replace("_l_", f"_{side}_").replace("_r_", f"_{side}_")
-		c2 = cons_joint2.replace("_l_", f"_{side}_").replace("_r_", f"_{side}_")
+		# both sides from the symmetry map, None when that side does not exist
+		joint = symmetry.on_side(input_joint, side)
+		c1 = symmetry.on_side(cons_joint1, side)
+		c2 = symmetry.on_side(cons_joint2, side)
 		
-		if not cmds.objExists(joint):
-			cmds.warning("Input joint missing for side {}: {}".format(side, joint))
+		if joint is None:
+			cmds.warning("Input joint missing for side {}: {}".format(side, rig_symmetry.mirror_name(input_joint)))
 			continue
 		
 		existing = cmds.ls(f"jnt_{side}_{region}_{name}_push_*", type="joint") or []
@@ -102,7 +99,7 @@ def create_push_setup(input_joint, cons_joint1, cons_joint2, name, region, axis,
 		cmds.matchTransform(zero, joint)
 		cmds.parent(zero, joint)
 		
-		if cmds.objExists(c1) and cmds.objExists(c2):
+		if c1 and c2:
 			ori_cons = cmds.orientConstraint(c1, c2, zero, mo=False)[0]
 			set_attr(ori_cons, 'interpType', 2)
 		
@@ -122,6 +119,7 @@ def create_push_setup(input_joint, cons_joint1, cons_joint2, name, region, axis,
 		cmds.pointConstraint(jnt, skel_jnt, mo=False)
 		cmds.orientConstraint(jnt, skel_jnt, mo=False)
 		connect_attr(jnt, 'scale', skel_jnt, 'scale')
+		symmetry.add([zero, offset, jnt, skel_jnt])
 		
 		print(f"Created {jnt_name}")
 	return
@@ -140,7 +138,12 @@ def use_pose_attr(input_jnt):
 	return pose_attr_name
 
 
-def add_pose_to_push(push_jnt, input_jnt, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr=True):
+def add_pose_to_push(push_jnt, input_jnt, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr=True,
+					 graph=None):
+	"""
+	graph: optional graph_builder.GraphBuilder, the utility-node network is declared
+		on it and flushed by the caller. Without one it is flushed at the end of this call.
+	"""
 	if not cmds.objExists(push_jnt) or not cmds.objExists(input_jnt):
 		return
 	
@@ -167,30 +170,35 @@ def add_pose_to_push(push_jnt, input_jnt, name, region, axis, start_val, end_val
 	loc = cmds.spaceLocator(name=loc_name)[0]
 	cmds.matchTransform(loc, offset_grp)
 	cmds.parent(loc, offset_grp)
+	rig_symmetry.current().add([loc])
+	
+	flush = graph is None
+	if flush:
+		graph = GraphBuilder()
 	
 	# -------------------------
 	# Pose Attribute path
 	# -------------------------
 	rmp_name = f'rmp_{side}_{region}_{name}_pushPose_{push_idx}_{pose_number:04d}'
-	rmp_node = cmds.createNode('remapValue', n=rmp_name)
-	connect_attr(input_jnt, axis, rmp_node, 'inputValue', True)
-	set_attr(rmp_node, 'inputMin', start_val)
-	set_attr(rmp_node, 'inputMax', end_val)
+	rmp_node = graph.create_node('remapValue', rmp_name)
+	graph.connect(f'{input_jnt}.{axis}', f'{rmp_node}.inputValue', True)
+	graph.set_attr(f'{rmp_node}.inputMin', start_val)
+	graph.set_attr(f'{rmp_node}.inputMax', end_val)
 	
 	# remap chain logic stays SAME
 	if pose_number > 1:
 		prev_rmp = f'rmp_{side}_{region}_{name}_pushPose_{push_idx}_{(pose_number - 1):04d}'
-		if cmds.objExists(prev_rmp):
-			set_attr(prev_rmp, "value[1].value_Position", rmp_pos_val)
-			set_attr(prev_rmp, "value[1].value_FloatValue", 1)
-			set_attr(prev_rmp, "value[1].value_Interp", 1)
-			set_attr(prev_rmp, "value[2].value_Position", 1)
-			set_attr(prev_rmp, "value[2].value_FloatValue", 0)
+		if graph.exists(prev_rmp):
+			graph.set_attr(f"{prev_rmp}.value[1].value_Position", rmp_pos_val)
+			graph.set_attr(f"{prev_rmp}.value[1].value_FloatValue", 1)
+			graph.set_attr(f"{prev_rmp}.value[1].value_Interp", 1)
+			graph.set_attr(f"{prev_rmp}.value[2].value_Position", 1)
+			graph.set_attr(f"{prev_rmp}.value[2].value_FloatValue", 0)
 	if pose_attr:
 		
 		# Create pose attribute and drive with remap
 		pose_attr_name = use_pose_attr(input_jnt)
-		connect_attr(rmp_node, 'outValue', input_jnt, pose_attr_name, True)
+		graph.connect(f'{rmp_node}.outValue', f'{input_jnt}.{pose_attr_name}', True)
 	else:
 		# no pose attr
 		# rmp_node = None
@@ -198,55 +206,56 @@ def add_pose_to_push(push_jnt, input_jnt, name, region, axis, start_val, end_val
 		pass
 	
 	# MultiplyDivide nodes (same)
-	mdT = cmds.createNode('multiplyDivide',
-						  n=f'mult_{side}_{region}_{name}_pushPose_trans_{push_idx}_{pose_number:04d}')
-	mdR = cmds.createNode('multiplyDivide', n=f'mult_{side}_{region}_{name}_pushPose_rot_{push_idx}_{pose_number:04d}')
-	mdS = cmds.createNode('multiplyDivide',
-						  n=f'mult_{side}_{region}_{name}_pushPose_scale_{push_idx}_{pose_number:04d}')
-	set_attr(mdS, 'operation', 3)
+	mdT = graph.create_node('multiplyDivide', f'mult_{side}_{region}_{name}_pushPose_trans_{push_idx}_{pose_number:04d}')
+	mdR = graph.create_node('multiplyDivide', f'mult_{side}_{region}_{name}_pushPose_rot_{push_idx}_{pose_number:04d}')
+	mdS = graph.create_node('multiplyDivide', f'mult_{side}_{region}_{name}_pushPose_scale_{push_idx}_{pose_number:04d}')
+	graph.set_attr(f'{mdS}.operation', 3)
 	
 	# If using pose attr, hook it in
 	if pose_attr:
 		for ax in 'XYZ':
-			connect_attr(input_jnt, pose_attr_name, mdT, f'input2{ax}', True)
-			connect_attr(input_jnt, pose_attr_name, mdR, f'input2{ax}', True)
-			connect_attr(input_jnt, pose_attr_name, mdS, f'input2{ax}', True)
+			graph.connect(f'{input_jnt}.{pose_attr_name}', f'{mdT}.input2{ax}', True)
+			graph.connect(f'{input_jnt}.{pose_attr_name}', f'{mdR}.input2{ax}', True)
+			graph.connect(f'{input_jnt}.{pose_attr_name}', f'{mdS}.input2{ax}', True)
 	
 	# loc drives input1
-	connect_attr(loc, 'translate', mdT, 'input1', True)
-	connect_attr(loc, 'rotate', mdR, 'input1', True)
-	connect_attr(loc, 'scale', mdS, 'input1', True)
+	graph.connect(f'{loc}.translate', f'{mdT}.input1', True)
+	graph.connect(f'{loc}.rotate', f'{mdR}.input1', True)
+	graph.connect(f'{loc}.scale', f'{mdS}.input1', True)
 	
 	# PMA for translate / rotate
 	for attr, md in (('translate', mdT), ('rotate', mdR)):
 		pma_name = f'pma_{side}_{region}_{name}_pushPose_{attr}_{push_idx}'
-		if not cmds.objExists(pma_name):
-			pma_node = cmds.createNode('plusMinusAverage', n=pma_name)
-			connect_attr(pma_node, 'output3D', push_jnt, attr, True)
+		if not graph.exists(pma_name):
+			pma_node = graph.create_node('plusMinusAverage', pma_name)
+			graph.connect(f'{pma_node}.output3D', f'{push_jnt}.{attr}', True)
 		else:
 			pma_node = pma_name
-		connect_attr(md, 'output', pma_node, f'input3D[{pose_number - 1}]', True)
+		graph.connect(f'{md}.output', f'{pma_node}.input3D[{pose_number - 1}]', True)
 	
 	# Scale chain
 	scale_base = f"mult_{side}_{region}_{name}_pushPose_scaleOutput_{push_idx}"
 	if pose_number <= 2:
 		out = f"{scale_base}_0001"
-		if not cmds.objExists(out):
-			out = cmds.createNode("multiplyDivide", n=out)
-			connect_attr(out, "output", push_jnt, "scale", True)
-		connect_attr(mdS, "output", out, "input1" if pose_number == 1 else "input2", True)
+		if not graph.exists(out):
+			out = graph.create_node("multiplyDivide", out)
+			graph.connect(f"{out}.output", f"{push_jnt}.scale", True)
+		graph.connect(f"{mdS}.output", f"{out}.input1" if pose_number == 1 else f"{out}.input2", True)
 	else:
 		prev = f"{scale_base}_{(pose_number - 2):04d}"
 		out = f"{scale_base}_{(pose_number - 1):04d}"
-		if not cmds.objExists(prev):
-			prev = cmds.createNode("multiplyDivide", n=prev)
+		if not graph.exists(prev):
+			prev = graph.create_node("multiplyDivide", prev)
 			if pose_number == 3 and not cmds.listConnections(f"{push_jnt}.scale", s=True, d=False):
-				connect_attr(prev, "output", push_jnt, "scale", True)
-		if not cmds.objExists(out):
-			out = cmds.createNode("multiplyDivide", n=out)
-		connect_attr(prev, "output", out, "input1", True)
-		connect_attr(mdS, "output", out, "input2", True)
-		connect_attr(out, "output", push_jnt, "scale", True)
+				graph.connect(f"{prev}.output", f"{push_jnt}.scale", True)
+		if not graph.exists(out):
+			out = graph.create_node("multiplyDivide", out)
+		graph.connect(f"{prev}.output", f"{out}.input1", True)
+		graph.connect(f"{mdS}.output", f"{out}.input2", True)
+		graph.connect(f"{out}.output", f"{push_jnt}.scale", True)
+	
+	if flush:
+		graph.flush()
 	
 	cmds.inViewMessage(amg=f"Pose added to {push_jnt} (pose_attr={pose_attr})", pos="midCenter", fade=True)
 
@@ -304,30 +313,26 @@ def auto_add_pose(push_jnt, input_jnt, name, region, axis,
 # ----------------- BOTH SIDES ----------------- #
 
 def add_pose_both_sides(push_jnt, input_jnt, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr=True):
-	add_pose_to_push(push_jnt, input_jnt, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr)
+	# both sides declared on one builder, one flush
+	graph = GraphBuilder()
+	add_pose_to_push(push_jnt, input_jnt, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr, graph)
 	
-	mirror_push = _lr_mirror(push_jnt)
-	mirror_input = _lr_mirror(input_jnt)
-	if mirror_push != push_jnt and cmds.objExists(mirror_push) and cmds.objExists(mirror_input):
-		add_pose_to_push(mirror_push, mirror_input, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr)
+	symmetry = rig_symmetry.current([push_jnt, input_jnt])
+	mirror_push = symmetry.counterpart(push_jnt)
+	mirror_input = symmetry.counterpart(input_jnt)
+	if mirror_push and mirror_input:
+		add_pose_to_push(mirror_push, mirror_input, name, region, axis, start_val, end_val, rmp_pos_val, pose_attr,
+						 graph)
+	graph.flush()
 
 
 def mirror_push():
-	# find all left pushPose locators + offsets
-	left_locs = cmds.ls("loc_l_*_pushPose_*", transforms=True) or []
-	left_offset = cmds.ls("offset_l_*_push_*", transforms=True) or []
-	
-	left_push = left_locs + left_offset
+	# every left pushPose locator + offset with its right counterpart, from the symmetry map
+	symmetry = rig_symmetry.current()
+	for left in symmetry.unpaired('l', behavior=rig_symmetry.MIRROR_NEGATE):
+		cmds.warning(f"Missing: {rig_symmetry.mirror_name(left)}")
 	
-	for left in left_push:
-		parts = left.split('_')
-		parts[1] = "r"  # swap l to r
-		right = "_".join(parts)
-		
-		if not cmds.objExists(right):
-			cmds.warning(f"Missing: {right}")
-			continue
-		
+	for left, right in symmetry.pairs(behavior=rig_symmetry.MIRROR_NEGATE):
 		tx, ty, tz = cmds.getAttr(left + ".translate")[0]
 		rx, ry, rz = cmds.getAttr(left + ".rotate")[0]
 		sx, sy, sz = cmds.getAttr(left + ".scale")[0]
@@ -483,4 +488,5 @@ def push_pose_ui():
 	cmds.showWindow("pushJointUI")
 
 
-push_pose_ui()
+if __name__ == "__main__":
+	push_pose_ui()
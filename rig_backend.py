@@ -0,0 +1,69 @@
+"""
+Choose which maya.cmds implementation the rig modules import.
+
+Inside Maya nothing needs to happen, the real maya.cmds is used. On a machine
+without Maya call use_memory_backend() before importing any rig module and the
+existing `import maya.cmds as cmds` lines resolve to memory_cmds instead.
+"""
+import sys
+import types
+
+BACKEND_MAYA = 'maya'
+BACKEND_MEMORY = 'memory'
+
+_FAKE_MODULES = ('maya', 'maya.cmds', 'maya.mel')
+
+
+def use_memory_backend(new_scene=True):
+	"""
+	Install memory_cmds as maya.cmds (and a matching maya.mel).
+
+	Args:
+		new_scene (bool): start from an empty in-memory scene.
+
+	Returns:
+		module: the memory_cmds module.
+	"""
+	import memory_cmds
+
+	if new_scene:
+		memory_cmds.new_scene()
+	if active_backend() == BACKEND_MEMORY:
+		return memory_cmds
+
+	maya_module = types.ModuleType('maya')
+	mel_module = types.ModuleType('maya.mel')
+	mel_module.eval = memory_cmds.mel_eval
+	maya_module.cmds = memory_cmds
+	maya_module.mel = mel_module
+	maya_module.__path__ = []
+	maya_module.__rig_backend__ = BACKEND_MEMORY
+
+	sys.modules['maya'] = maya_module
+	sys.modules['maya.cmds'] = memory_cmds
+	sys.modules['maya.mel'] = mel_module
+	return memory_cmds
+
+
+def use_maya_backend():
+	"""Remove the memory backend so the next import picks up the real Maya modules."""
+	if active_backend() != BACKEND_MEMORY:
+		return
+	for name in _FAKE_MODULES:
+		sys.modules.pop(name, None)
+
+
+def active_backend():
+	"""Return BACKEND_MEMORY, BACKEND_MAYA, or None when maya has not been imported yet."""
+	maya_module = sys.modules.get('maya')
+	if maya_module is None:
+		return None
+	return getattr(maya_module, '__rig_backend__', BACKEND_MAYA)
+
+
+def reset_scene():
+	"""Empty the in-memory scene between builds."""
+	if active_backend() != BACKEND_MEMORY:
+		raise RuntimeError("reset_scene() is only available on the memory backend")
+	import memory_cmds
+	return memory_cmds.new_scene()
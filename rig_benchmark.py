@@ -0,0 +1,446 @@
+"""
+Benchmark harness for full quadruped builds.
+
+Builds master + spine/neck + limbs + muscles + push joints (and stores the rig
+manifest) against a template scene for a sweep of joint densities, and records
+build time, peak Python memory and node count per scenario. With a stored
+baseline it fails when any scenario gets more than `threshold` percent slower.
+
+Outside Maya (memory backend):
+	python rig_benchmark.py --update-baseline
+	python rig_benchmark.py --threshold 10
+	python rig_benchmark.py --shapes 1000     # shape templates against cmds.curve per control
+	python rig_benchmark.py --plans 1000      # twist / tail build plans, planned and from the plan cache
+	python rig_benchmark.py --check-rebuilds  # rebuilding a component without changes must change nothing
+
+Inside Maya:
+	import rig_benchmark
+	rig_benchmark.run_benchmarks(template=r"D:/cat/template.json", baseline_path=r"D:/cat/baseline.json")
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+DEFAULT_PARAMS = {
+	'spine_jnt_num': 6,
+	'neck_jnt_num': 5,
+	'tail_jnt_num': 8,
+	'tail_joints_per_ctrl': 3,
+	'twist_jnt_num': 5,
+	'muscle_jnt_num': 5,
+}
+
+# each parameter is swept on its own, everything else stays at DEFAULT_PARAMS
+SWEEPS = {
+	'spine_jnt_num': [4, 10],
+	'neck_jnt_num': [3, 9],
+	'tail_jnt_num': [4, 16],
+	'tail_joints_per_ctrl': [2, 4],
+	'twist_jnt_num': [3, 9],
+	'muscle_jnt_num': [3, 9],
+}
+
+DENSE_PARAMS = {
+	'spine_jnt_num': 10,
+	'neck_jnt_num': 9,
+	'tail_jnt_num': 16,
+	'tail_joints_per_ctrl': 2,
+	'twist_jnt_num': 9,
+	'muscle_jnt_num': 9,
+}
+
+# muscle_spec(input_jnt, constraint_jnt_1, constraint_jnt_2), built with build_muscles
+MUSCLES = [
+	('temp_l_ft_tricep_0001', 'jnt_l_ft_upperLeg_0001', 'jnt_l_ft_knee_0001'),
+	('temp_l_bk_thigh_0001', 'jnt_l_bk_upperLeg_0001', 'jnt_l_bk_knee_0001'),
+]
+
+# create_push_setup(input_joint, cons_joint1, cons_joint2, name, region, axis, offset_axis, offset_val)
+# followed by one pose on both sides
+PUSH_JOINTS = [
+	('skel_l_ft_knee_0001', 'skel_l_ft_upperLeg_0001', 'skel_l_ft_ankle_0001', 'knee', 'ft', 'rotateZ', 'translateY', 0.5),
+	('skel_l_bk_knee_0001', 'skel_l_bk_upperLeg_0001', 'skel_l_bk_ankle_0001', 'knee', 'bk', 'rotateZ', 'translateY', 0.5),
+]
+
+# run_shape_benchmark cycles through these (shape, scale, color) controls
+SHAPE_BENCHMARK = [
+	('diamond', 1.0, None),
+	('lollipop', 2.0, 17),
+	('four_arrow', 0.5, None),
+	('ball', 1.5, 6),
+	('cube', 1.0, 13),
+]
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rig_benchmark_baseline.json')
+
+
+def build_scenarios():
+	"""Default build, one scenario per swept value, and an all-dense build."""
+	scenarios = [('default', dict(DEFAULT_PARAMS))]
+	for param, values in SWEEPS.items():
+		for value in values:
+			params = dict(DEFAULT_PARAMS, **{param: value})
+			scenarios.append((f'{param}={value}', params))
+	scenarios.append(('dense', dict(DEFAULT_PARAMS, **DENSE_PARAMS)))
+	return scenarios
+
+
+# ======================
+# Build
+# ======================
+
+def _ensure_backend():
+	"""Use real Maya when available (mayapy or GUI), the memory backend otherwise."""
+	import rig_backend
+	if rig_backend.active_backend() is not None:
+		return
+	try:
+		import maya.standalone
+		maya.standalone.initialize()
+	except ImportError:
+		rig_backend.use_memory_backend()
+
+
+def _prepare_scene(template):
+	import maya.cmds as cmds
+	import template_scene
+
+	cmds.file(new=True, force=True)
+	if template is None:
+		template_scene.build_default_template()
+	else:
+		template_scene.load_template(template)
+
+
+def build_full_rig(params):
+	"""Build every rig component into the open template scene."""
+	import build_master_hierachy
+	import neck_spine_auto_rig
+	import limbs_auto_rig
+	import muscle_joint
+	import push_joints
+	import rig_components
+	import rig_manifest
+	import rig_symmetry
+	from auto_rig_helpers import AutoRigHelpers
+	from curve_library import RigCurveLibrary
+
+	manifest = rig_manifest.RigManifest()
+
+	with manifest.component('master'):
+		master = build_master_hierachy.Master()
+		master.construct_master()
+	components = rig_components.ComponentGraph(manifest, master.registry, finalize=AutoRigHelpers.lock_and_hide_ctrls)
+
+	spine_rig = neck_spine_auto_rig.SpineNeckAutoRig(
+		master,
+		spine_jnt_num=params['spine_jnt_num'],
+		neck_jnt_num=params['neck_jnt_num'],
+		tail_jnt_num=params['tail_jnt_num'],
+		tail_joints_per_ctrl=params['tail_joints_per_ctrl'],
+	)
+	spine_rig.construct_rig(components)
+
+	limbs_rig = limbs_auto_rig.LimbsAutoRig(master, spine_rig, twist_jnt_num=params['twist_jnt_num'])
+	limbs_rig.construct_rig(components)
+	# one symmetry index per rig, muscles and push joints look their other side up in it
+	rig_symmetry.current(refresh=True)
+
+	with manifest.component('muscles'):
+		muscle_joint.build_muscles([muscle_joint.muscle_spec(input_jnt, cons_1, cons_2, jnt_num=params['muscle_jnt_num'])
+									for input_jnt, cons_1, cons_2 in MUSCLES], manifest=manifest)
+
+	with manifest.component('push_joints'):
+		for input_jnt, cons_1, cons_2, name, region, axis, offset_axis, offset_val in PUSH_JOINTS:
+			push_joints.create_push_setup(input_jnt, cons_1, cons_2, name, region, axis, offset_axis, offset_val)
+			push_jnt = f'jnt_l_{region}_{name}_push_0001'
+			push_joints.add_pose_both_sides(push_jnt, input_jnt, name, region, axis, 0, 90, 0.5)
+
+	RigCurveLibrary.clear_templates()
+	manifest.save(master.master_grp, master.registry)
+	return components
+
+
+def run_scenario(name, params, template=None, repeat=3):
+	"""
+	Returns:
+		dict: seconds (best of repeat), mean_seconds, peak_memory_kb, node_count,
+			name_cache (hits / misses of the last build).
+	"""
+	import maya.cmds as cmds
+	import rig_name_cache
+
+	timings = []
+	for _ in range(repeat):
+		_prepare_scene(template)
+		start = time.perf_counter()
+		build_full_rig(params)
+		timings.append(time.perf_counter() - start)
+	node_count = len(cmds.ls())
+	name_cache = dict(rig_name_cache.current().stats)
+
+	# separate pass, tracemalloc slows the build down
+	_prepare_scene(template)
+	tracemalloc.start()
+	try:
+		build_full_rig(params)
+		_, peak = tracemalloc.get_traced_memory()
+	finally:
+		tracemalloc.stop()
+
+	return {
+		'params': params,
+		'seconds': min(timings),
+		'mean_seconds': sum(timings) / len(timings),
+		'peak_memory_kb': peak / 1024.0,
+		'node_count': node_count,
+		'name_cache': name_cache,
+	}
+
+
+def run_shape_benchmark(count=1000, repeat=3):
+	"""
+	Build count controls with cmds.curve per control, then as copies of shape templates.
+
+	Returns:
+		dict: curve_seconds and template_seconds (best of repeat, templates built once per run), speedup.
+	"""
+	import maya.cmds as cmds
+	from curve_library import RigCurveLibrary
+
+	def build(use_templates):
+		cmds.file(new=True, force=True)
+		RigCurveLibrary.clear_templates()
+		RigCurveLibrary.use_templates = use_templates
+		start = time.perf_counter()
+		for i in range(count):
+			shape, scale, color = SHAPE_BENCHMARK[i % len(SHAPE_BENCHMARK)]
+			RigCurveLibrary.create(shape, f'ctrl_c_shape_{i + 1:04d}', scale, color)
+		return time.perf_counter() - start
+
+	use_templates = RigCurveLibrary.use_templates
+	try:
+		curve_seconds = min(build(False) for _ in range(repeat))
+		template_seconds = min(build(True) for _ in range(repeat))
+	finally:
+		RigCurveLibrary.use_templates = use_templates
+		RigCurveLibrary.clear_templates()
+
+	result = {
+		'count': count,
+		'curve_seconds': curve_seconds,
+		'template_seconds': template_seconds,
+		'speedup': curve_seconds / template_seconds if template_seconds else 0.0,
+	}
+	print(f"{count} controls: cmds.curve {curve_seconds:.3f}s, template copy {template_seconds:.3f}s "
+		  f"({result['speedup']:.1f}x)")
+	return result
+
+
+def run_plan_benchmark(count=1000, repeat=3):
+	"""
+	Plan the twist setup of every leg and the tail sub controls count times, pure Python, then
+	the same plans from the rig_plan cache.
+
+	Returns:
+		dict: ops per round, plan_seconds and cached_seconds (best of repeat), speedup.
+	"""
+	import rig_plan
+
+	twist_joints = {
+		(side, region): {'upperleg': f'jnt_{side}_{region}_upperLeg_0001', 'knee': f'jnt_{side}_{region}_knee_0001',
+						 'ankle': f'jnt_{side}_{region}_ankle_0001',
+						 'upperleg_ik_parent': f'jnt_{side}_scapula_0001' if region == 'ft' else 'jnt_c_pelvis_0001'}
+		for side in ('l', 'r') for region in ('ft', 'bk')
+	}
+	tail = rig_plan.tail_names(DEFAULT_PARAMS['tail_jnt_num'])
+
+	def plan_all(plan):
+		ops = 0
+		for (side, region), joints in twist_joints.items():
+			ops += len(plan(rig_plan.plan_twist_build, side, region, DEFAULT_PARAMS['twist_jnt_num'], joints))
+		ops += len(plan(rig_plan.plan_tail_sub_ctrls, tail['joints'], 'grp_c_tailCtrls_0001', tail['driven'],
+						tail['ctrls'], DEFAULT_PARAMS['tail_joints_per_ctrl']))
+		return ops
+
+	def run(plan):
+		rig_plan.clear_cache()
+		start = time.perf_counter()
+		for _ in range(count):
+			plan_all(plan)
+		return time.perf_counter() - start
+
+	ops = plan_all(lambda planner, *args: planner(*args))
+	plan_seconds = min(run(lambda planner, *args: planner(*args)) for _ in range(repeat))
+	cached_seconds = min(run(rig_plan.cached) for _ in range(repeat))
+	rig_plan.clear_cache()
+
+	result = {
+		'count': count,
+		'ops': ops,
+		'plan_seconds': plan_seconds,
+		'cached_seconds': cached_seconds,
+		'speedup': plan_seconds / cached_seconds if cached_seconds else 0.0,
+	}
+	print(f"{count} x {ops} planned operations: planned {plan_seconds:.3f}s, cached {cached_seconds:.3f}s "
+		  f"({result['speedup']:.1f}x)")
+	return result
+
+
+def check_noop_rebuilds(template=None, names=None, verbose=False):
+	"""
+	Build the default rig and rebuild components one after the other without changing a
+	parameter. Each rebuild has to find the scene as it would build it: an empty diff.
+
+	Args:
+		names (list): components to rebuild, every component in build order by default.
+
+	Returns:
+		dict: component -> diff summary of the rebuilds that changed something or failed.
+	"""
+	stdout = sys.stdout
+	if not verbose:
+		sys.stdout = _quiet()
+	failures = {}
+	try:
+		_prepare_scene(template)
+		components = build_full_rig(dict(DEFAULT_PARAMS))
+		for name in names or list(components._order):
+			try:
+				result = components.rebuild(name)
+			except Exception as exc:
+				failures[name] = f"failed: {exc}"
+				continue
+			if result:
+				failures[name] = result.summary()
+	finally:
+		sys.stdout = stdout
+
+	for name, summary in failures.items():
+		print(f"❌ {name}: {summary}")
+	if not failures:
+		print(f"✅ {len(names or components._order)} rebuilds without changes left the rig unchanged")
+	return failures
+
+
+# ======================
+# Baseline
+# ======================
+
+def compare_to_baseline(results, baseline, threshold=10.0):
+	"""
+	Returns:
+		list: (scenario, baseline seconds, current seconds, percent slower) for regressions.
+	"""
+	regressions = []
+	for name, result in results.items():
+		base = baseline.get('scenarios', {}).get(name)
+		if not base or not base.get('seconds'):
+			continue
+		slower = (result['seconds'] / base['seconds'] - 1.0) * 100.0
+		if slower > threshold:
+			regressions.append((name, base['seconds'], result['seconds'], slower))
+	return regressions
+
+
+def _quiet():
+	class _Sink(object):
+		def write(self, *_):
+			pass
+
+		def flush(self):
+			pass
+
+	return _Sink()
+
+
+def run_benchmarks(template=None, baseline_path=DEFAULT_BASELINE, threshold=10.0, repeat=3,
+				   update_baseline=False, scenarios=None, verbose=False):
+	"""
+	Run every scenario and compare against the stored baseline.
+
+	Returns:
+		tuple: (results dict, regressions list)
+	"""
+	_ensure_backend()
+	if isinstance(template, str):
+		with open(template, 'r') as f:
+			template = json.load(f)
+
+	results = {}
+	for name, params in scenarios or build_scenarios():
+		stdout = sys.stdout
+		if not verbose:
+			sys.stdout = _quiet()
+		try:
+			results[name] = run_scenario(name, params, template, repeat)
+		finally:
+			sys.stdout = stdout
+		r = results[name]
+		print(f"{name:28s} {r['seconds']:8.3f}s  peak {r['peak_memory_kb'] / 1024.0:8.1f}MB  nodes {r['node_count']}  "
+			  f"name cache {r['name_cache']['hits']}/{r['name_cache']['hits'] + r['name_cache']['misses']} hits")
+
+	regressions = []
+	if os.path.exists(baseline_path) and not update_baseline:
+		with open(baseline_path, 'r') as f:
+			baseline = json.load(f)
+		regressions = compare_to_baseline(results, baseline, threshold)
+		for name, base, current, slower in regressions:
+			print(f"❌ {name}: {base:.3f}s -> {current:.3f}s ({slower:+.1f}%, limit {threshold}%)")
+		if not regressions:
+			print(f"✅ No scenario slower than {threshold}% over baseline")
+
+	if update_baseline:
+		with open(baseline_path, 'w') as f:
+			json.dump({'scenarios': results}, f, indent=4)
+		print(f"✅ Baseline written: {baseline_path}")
+
+	return results, regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Benchmark full quadruped rig builds.")
+	parser.add_argument('--template', help="recorded template JSON, defaults to the synthetic template")
+	parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON path")
+	parser.add_argument('--threshold', type=float, default=10.0, help="allowed slowdown in percent")
+	parser.add_argument('--repeat', type=int, default=3, help="timed builds per scenario, best is kept")
+	parser.add_argument('--update-baseline', action='store_true', help="store this run as the new baseline")
+	parser.add_argument('--only', nargs='*', help="scenario names to run")
+	parser.add_argument('--verbose', action='store_true', help="keep the rig build output")
+	parser.add_argument('--graph-mode', choices=('batch', 'eager'), default='batch',
+						help="flush deferred node networks as one MEL payload or as individual cmds calls")
+	parser.add_argument('--shapes', type=int, metavar='COUNT',
+						help="time COUNT controls from shape templates against cmds.curve instead of the builds")
+	parser.add_argument('--plans', type=int, metavar='COUNT',
+						help="time COUNT rounds of twist / tail planning, uncached and cached, instead of the builds")
+	parser.add_argument('--check-rebuilds', nargs='*', metavar='COMPONENT',
+						help="rebuild components (all by default) without changes and fail on any difference")
+	args = parser.parse_args(argv)
+
+	_ensure_backend()
+	import graph_builder
+	graph_builder.DEFAULT_MODE = args.graph_mode
+
+	if args.shapes:
+		run_shape_benchmark(args.shapes, args.repeat)
+		return 0
+	if args.plans:
+		run_plan_benchmark(args.plans, args.repeat)
+		return 0
+	if args.check_rebuilds is not None:
+		return 1 if check_noop_rebuilds(args.template, args.check_rebuilds, args.verbose) else 0
+
+	scenarios = build_scenarios()
+	if args.only:
+		scenarios = [s for s in scenarios if s[0] in args.only]
+
+	_, regressions = run_benchmarks(args.template, args.baseline, args.threshold, args.repeat,
+									args.update_baseline, scenarios, args.verbose)
+	return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
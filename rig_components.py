@@ -0,0 +1,707 @@
+"""
+Rig components and the diff engine that rebuilds only what changed.
+
+The builders split their construct_rig() into named components (cog, spine,
+neck, tail, leg_l_ft, twist_r_bk, ...), each a list of build steps with the
+components it depends on. A ComponentGraph builds them in order and records
+the nodes of each one in the rig manifest.
+
+Components can declare the registry handles they read (inputs) and store
+(outputs); the graph turns those into dependencies, so a component reading
+'l_ft_leg_joints' depends on the one that stores it. A component can also
+have a plan, the pure-Python part of its build (node names, pose tables,
+weights). build() runs the plans of all components on a thread pool first and
+then the scene-changing steps one after the other. Plans made with
+rig_plan.cached() are kept while the template snapshot is unchanged, so a
+rebuild only plans the components whose parameters changed.
+
+Iterating on one component:
+
+	components = rig_components.ComponentGraph(manifest, master.registry, finalize=AutoRigHelpers.lock_and_hide_ctrls)
+	neck_spine_rig.construct_rig(components)
+	limbs_rig.construct_rig(components)
+	...
+	diff = components.rebuild('tail', tail_jnt_num=12)
+	print(diff.summary())
+
+rebuild() describes the component and its dependents as they are in the scene
+(node types, parents, attribute values, locks, incoming connections), builds
+them again inside an undo chunk, describes the result and undoes it. The diff
+of the two descriptions is then applied to the existing nodes: new nodes are
+created, removed ones deleted, changed values, parents and connections set.
+Existing nodes keep their names and everything outside the component that
+points at them (skin clusters, user constraints, custom control shapes).
+
+Nodes made by commands rather than attributes (constraints, IK handles, set
+driven key curves, deformers) cannot be declared node by node. When the diff
+adds or changes one of those, the fresh build is kept instead of undone and
+outside children / outgoing connections are hooked back up by name.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import maya.cmds as cmds
+
+import rig_name_cache
+import rig_plan
+import template_scene
+from curve_library import RigCurveLibrary
+from graph_builder import GraphBuilder
+from rig_manifest import NodeRecorder, RigManifest
+
+MODE_UNCHANGED = 'unchanged'
+MODE_PATCHED = 'patched'
+MODE_REBUILT = 'rebuilt'
+
+# one thread per limb, plans are short pure-Python functions
+PLAN_WORKERS = 4
+
+_TRANSFORM_ATTRS = ('translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ',
+					'scaleX', 'scaleY', 'scaleZ', 'visibility', 'rotateOrder')
+_JOINT_ATTRS = _TRANSFORM_ATTRS + ('jointOrientX', 'jointOrientY', 'jointOrientZ', 'radius')
+_ANGLE_ATTRS = ('rotateX', 'rotateY', 'rotateZ', 'jointOrientX', 'jointOrientY', 'jointOrientZ')
+_SHAPE_ATTRS = ('visibility', 'overrideEnabled', 'overrideColor')
+_SHAPE_TYPES = ('nurbsCurve', 'locator', 'mesh', 'nurbsSurface', 'annotationShape')
+
+# created by Maya for angle <-> linear connections, described as the connection they convert
+_CONVERSION_TYPES = ('unitConversion',)
+
+_COMMAND_TYPES = ('ikHandle', 'ikEffector', 'skinCluster', 'jiggle', 'weightDriver')
+
+_COMPOUND_SUFFIXES = ('X', 'Y', 'Z', 'R', 'G', 'B', 'x', 'y', 'z')
+
+
+def is_command_built(node_type):
+	"""True for node types whose state lives outside their attributes and connections."""
+	return (node_type in _COMMAND_TYPES or node_type.endswith('Constraint')
+			or node_type.startswith('animCurve'))
+
+
+# ======================
+# Components
+# ======================
+
+class Component(object):
+	"""
+	Args:
+		name (str): unique component name, e.g. 'tail' or 'leg_l_ft'.
+		owner: the builder instance, rebuild() parameters are set on it.
+		steps (list): callables run in order.
+		depends (list): names of the components this one reads from.
+		params (list): owner attributes the component reads, e.g. ['tail_jnt_num'].
+		inputs (list): registry handles the steps read, e.g. ['l_ft_leg_joints'].
+			The graph adds the components producing them to depends.
+		outputs (list): registry handles the steps store.
+		plan (callable): pure-Python preparation (names, positions, pose tables), run before
+			the steps and possibly on a worker thread, so it must not touch the scene.
+			The owner keeps what it needs from it.
+	"""
+
+	def __init__(self, name, owner, steps, depends=(), params=(), inputs=(), outputs=(), plan=None):
+		self.name = name
+		self.owner = owner
+		self.steps = list(steps)
+		self.depends = tuple(depends)
+		self.params = tuple(params)
+		self.inputs = tuple(inputs)
+		self.outputs = tuple(outputs)
+		self.plan = plan
+		self.planned = None
+		# owner attributes the first build overwrote, with their values from before it
+		self._initial = None
+
+	def __repr__(self):
+		return f"<Component {self.name}>"
+
+	def build(self):
+		if self.plan is not None and self.planned is None:
+			self.planned = self.plan()
+		# cmds.joint parents to the selection
+		cmds.select(clear=True)
+		before = _owner_state(self.owner)
+		for step in self.steps:
+			step()
+		if self._initial is None:
+			after = vars(self.owner)
+			self._initial = {key: value for key, value in before.items() if after.get(key) != value}
+
+	def reset(self, keep=()):
+		"""Put back the owner attributes the build overwrote, e.g. spine_fw_curve, before building again."""
+		for key, value in (self._initial or {}).items():
+			if key not in keep:
+				setattr(self.owner, key, _copy_value(value))
+
+
+def _copy_value(value):
+	if isinstance(value, (list, dict, set)):
+		return type(value)(value)
+	return value
+
+
+def _owner_state(owner):
+	return {key: _copy_value(value) for key, value in vars(owner).items()}
+
+
+class ComponentGraph(object):
+
+	def __init__(self, manifest=None, registry=None, finalize=None, workers=PLAN_WORKERS):
+		self.manifest = manifest if manifest is not None else RigManifest()
+		# entries of deleted nodes are dropped before a rebuild, builders look groups up there first
+		self.registry = registry
+		# run after every rebuild, e.g. AutoRigHelpers.lock_and_hide_ctrls
+		self.finalize = finalize
+		# plan threads, 0 plans serially inside each component build
+		self.workers = workers
+		# template snapshot the plans read, taken once per build and again for each rebuild
+		self._template = None
+		self._components = {}
+		self._order = []
+		self._producers = {}  # registry handle -> component storing it
+
+	def __contains__(self, name):
+		return name in self._components
+
+	def __getitem__(self, name):
+		return self._components[name]
+
+	def names(self):
+		return list(self._order)
+
+	def add(self, component):
+		# dependencies built outside of this graph (e.g. limbs on their own) are not tracked
+		if component.name in self._components:
+			raise ValueError(f"Component already exists: {component.name}")
+		for handle in component.inputs:
+			producer = self._producers.get(handle)
+			if producer is not None and producer not in component.depends:
+				component.depends += (producer,)
+		for handle in component.outputs:
+			self._producers[handle] = component.name
+		self._components[component.name] = component
+		self._order.append(component.name)
+		return component
+
+	def build(self, components):
+		"""
+		Add, plan and build components in order, recording each one in the manifest.
+		The plans of all components run first, concurrently, the scene is only changed by the steps.
+		"""
+		components = list(components)
+		for component in components:
+			self.add(component)
+		self._check_order(components)
+		self.plan(components)
+		with self.manifest.recording():
+			for component in components:
+				with self.manifest.component(component.name):
+					component.build()
+				self._check_outputs(component)
+
+	def plan(self, components):
+		"""Run the plan of every component that has one on a thread pool."""
+		# the plans share one template snapshot, read here on the main thread
+		if self._template is None:
+			self._template = rig_plan.template(refresh=True)
+		pending = [component for component in components if component.plan is not None]
+		if not pending or not self.workers:
+			return
+		with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+			for component, planned in zip(pending, pool.map(lambda c: c.plan(), pending)):
+				component.planned = planned
+
+	def _check_order(self, components):
+		for component in components:
+			for handle in component.inputs:
+				producer = self._producers.get(handle)
+				if producer is not None and self._order.index(producer) > self._order.index(component.name):
+					raise ValueError(f"{component.name} reads {handle} before {producer} creates it")
+
+	def _check_outputs(self, component):
+		if self.registry is None:
+			return
+		missing = [handle for handle in component.outputs if handle not in self.registry]
+		if missing:
+			cmds.warning(f"{component.name} did not store {', '.join(missing)}")
+
+	def dependents(self, name):
+		"""name and every component that depends on it, directly or not, in build order."""
+		affected = {name}
+		for other in self._order:
+			if any(dependency in affected for dependency in self._components[other].depends):
+				affected.add(other)
+		return [other for other in self._order if other in affected]
+
+	# ======================
+	# Rebuild
+	# ======================
+
+	def rebuild(self, name, **params):
+		"""
+		Rebuild one component and its dependents, changing only what differs in the scene.
+
+		Args:
+			name (str): component name.
+			**params: owner attributes to change first, e.g. tail_jnt_num=12.
+
+		Returns:
+			RigDiff: the applied changes, diff.mode is 'unchanged', 'patched' or 'rebuilt'.
+		"""
+		start = time.perf_counter()
+		component = self._components[name]
+		# the template may have been edited since the build, unchanged it keeps the cached plans
+		self._template = None
+		for param, value in params.items():
+			if not hasattr(component.owner, param):
+				raise ValueError(f"{type(component.owner).__name__} has no parameter {param}")
+			setattr(component.owner, param, value)
+
+		names = self.dependents(name)
+		old_nodes = []
+		for other in names:
+			old_nodes.extend(self.manifest.nodes(other))
+		# cmds.ls([]) lists the whole scene
+		old_nodes = cmds.ls(old_nodes) or [] if old_nodes else []
+		old = describe(old_nodes)
+		outside = _outside_links(old_nodes)
+
+		undo_state = cmds.undoInfo(q=True, state=True)
+		cmds.undoInfo(stateWithoutFlush=True)
+		cmds.undoInfo(openChunk=True, chunkName=f'rebuild_{name}')
+		try:
+			created = self._build_fresh(names, old_nodes, outside, keep=params)
+			new = describe([node for nodes in created.values() for node in nodes], curves=True)
+		except Exception:
+			cmds.undoInfo(closeChunk=True)
+			cmds.undo()
+			cmds.undoInfo(stateWithoutFlush=undo_state)
+			rig_name_cache.reset()
+			raise
+		cmds.undoInfo(closeChunk=True)
+
+		try:
+			result = diff(old, new)
+			if result.requires_rebuild:
+				_reconnect_outside(outside)
+				result.mode = MODE_REBUILT
+			else:
+				cmds.undo()
+				if result:
+					apply_diff(result, new)
+					result.mode = MODE_PATCHED
+		finally:
+			cmds.undoInfo(stateWithoutFlush=undo_state)
+			# undo and the patch renamed and reparented nodes behind the name cache's back
+			rig_name_cache.reset()
+			RigCurveLibrary.clear_templates()
+
+		for other, nodes in created.items():
+			self.manifest.set_component(other, nodes)
+		result.components = names
+		result.seconds = time.perf_counter() - start
+		print(f"✅ Rebuilt {name} ({', '.join(names)}): {result.summary()}")
+		return result
+
+	def _build_fresh(self, names, old_nodes, outside, keep=()):
+		# outside children would be deleted with their parent
+		for child, _ in outside['children']:
+			cmds.parent(child, world=True)
+		if old_nodes:
+			cmds.delete(old_nodes)
+		if self.registry is not None:
+			self.registry.discard_nodes(old_nodes)
+		rig_name_cache.current().forget(old_nodes)
+
+		components = [self._components[other] for other in names]
+		for component in components:
+			component.planned = None
+		self.plan(components)
+
+		created = {}
+		with NodeRecorder() as recorder:
+			for other in names:
+				self._components[other].reset(keep)
+				self._components[other].build()
+				created[other] = recorder.take(exclude=RigCurveLibrary.template_nodes())
+		if self.finalize is not None:
+			self.finalize()
+		return created
+
+
+# ======================
+# Description
+# ======================
+
+def _round(value):
+	return round(value, 5) if isinstance(value, float) else value
+
+
+def _same_value(attr, old, new):
+	"""Equal values, angles modulo 360: matchTransform gives -180 or 180 for the same orientation."""
+	if old == new:
+		return True
+	if attr not in _ANGLE_ATTRS or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (old, new)):
+		return False
+	return abs((old - new + 180.0) % 360.0 - 180.0) < 1e-4
+
+
+def _is_driven(attr, connected):
+	if attr in connected:
+		return True
+	for plug in connected:
+		if attr.startswith(plug) and (attr[len(plug):] in _COMPOUND_SUFFIXES or attr[len(plug)] == '.'):
+			return True
+	return False
+
+
+def _incoming(node):
+	"""{attr: source plug} of a node, looking through unit conversion nodes."""
+	pairs = cmds.listConnections(node, s=True, d=False, c=True, p=True) or []
+	incoming = {}
+	for dst, src in zip(pairs[0::2], pairs[1::2]):
+		src_node = src.split('.', 1)[0]
+		if cmds.nodeType(src_node) in _CONVERSION_TYPES:
+			src = (cmds.listConnections(f'{src_node}.input', s=True, d=False, p=True) or [None])[0]
+			if src is None:
+				continue
+		incoming[dst.split('.', 1)[1]] = src
+	return incoming
+
+
+def _described_attrs(node, node_type, user_attrs):
+	if node_type == 'joint':
+		attrs = list(_JOINT_ATTRS)
+	elif node_type in _SHAPE_TYPES:
+		attrs = list(_SHAPE_ATTRS)
+	elif cmds.ls(node, type='transform'):
+		attrs = list(_TRANSFORM_ATTRS)
+	else:
+		attrs = cmds.listAttr(node, keyable=True, scalar=True) or []
+	return attrs + [attr for attr in user_attrs if attr not in attrs]
+
+
+def _user_attr_spec(node, attr):
+	spec = {'type': cmds.attributeQuery(attr, node=node, attributeType=True)}
+	if spec['type'] == 'typed':
+		spec['type'] = 'string'
+	if cmds.attributeQuery(attr, node=node, minExists=True):
+		spec['min'] = cmds.attributeQuery(attr, node=node, minimum=True)[0]
+	if cmds.attributeQuery(attr, node=node, maxExists=True):
+		spec['max'] = cmds.attributeQuery(attr, node=node, maximum=True)[0]
+	enum = cmds.attributeQuery(attr, node=node, listEnum=True)
+	if enum:
+		spec['enum'] = enum[0]
+	return spec
+
+
+def describe(nodes, curves=False):
+	"""
+	Declarative description of nodes as they are in the scene.
+
+	Args:
+		nodes (list): node names, usually one or more manifest components.
+		curves (bool): include the CV data needed to recreate nurbsCurve shapes.
+
+	Returns:
+		dict: {'nodes': {name: record}, 'connections': {destination plug: source plug}}
+	"""
+	records = {}
+	connections = {}
+	for node in nodes:
+		node_type = cmds.nodeType(node)
+		if node_type in _CONVERSION_TYPES:
+			continue
+		parent = (cmds.listRelatives(node, parent=True) or [None])[0]
+		incoming = _incoming(node)
+		for attr, src in incoming.items():
+			connections[f'{node}.{attr}'] = src
+
+		user_attrs = cmds.listAttr(node, userDefined=True) or []
+		attrs, locked, hidden = {}, [], []
+		for attr in _described_attrs(node, node_type, user_attrs):
+			if _is_driven(attr, incoming):
+				continue
+			plug = f'{node}.{attr}'
+			value = cmds.getAttr(plug)
+			# compounds, arrays and matrices are not declared by value
+			if isinstance(value, (list, tuple)):
+				continue
+			attrs[attr] = _round(value)
+			if cmds.getAttr(plug, lock=True):
+				locked.append(attr)
+			if not cmds.getAttr(plug, keyable=True):
+				hidden.append(attr)
+
+		record = {'type': node_type, 'parent': parent, 'attrs': attrs, 'locked': locked, 'hidden': hidden,
+				  'user_attrs': {attr: _user_attr_spec(node, attr) for attr in user_attrs}}
+		if curves and node_type == 'nurbsCurve':
+			record['curve'] = template_scene.record_curve(node)
+		records[node] = record
+	return {'nodes': records, 'connections': connections}
+
+
+# ======================
+# Diff
+# ======================
+
+class RigDiff(object):
+	"""Changes that turn one description into another."""
+
+	def __init__(self):
+		self.added = []
+		self.removed = []
+		self.renamed = {}        # old name -> new name, default named shapes under the same transform
+		self.reparented = {}     # node -> (old parent, new parent)
+		self.changed = {}        # plug -> (old value, new value)
+		self.locks = {}          # plug -> (locked, hidden)
+		self.connected = {}      # destination -> source
+		self.disconnected = {}   # destination -> old source
+		self.added_attrs = {}    # node -> [user attribute names]
+		self.requires_rebuild = []
+		self.mode = MODE_UNCHANGED
+		self.components = []
+		self.seconds = 0.0
+
+	def __bool__(self):
+		return bool(self.added or self.removed or self.renamed or self.reparented or self.changed or self.locks
+					or self.connected or self.disconnected or self.added_attrs)
+
+	def summary(self):
+		return (f"{self.mode}, +{len(self.added)} -{len(self.removed)} nodes, {len(self.changed)} values, "
+				f"{len(self.connected)}/{len(self.disconnected)} (dis)connections, "
+				f"{len(self.reparented)} parents, {self.seconds:.2f}s")
+
+
+def diff(old, new):
+	"""
+	Args:
+		old (dict): describe() of the nodes in the scene.
+		new (dict): describe() of the wanted nodes.
+
+	Returns:
+		RigDiff
+	"""
+	result = RigDiff()
+	result.renamed = _match_shapes(old['nodes'], new['nodes'])
+	if result.renamed:
+		old = _rename_description(old, result.renamed)
+	old_nodes, new_nodes = old['nodes'], new['nodes']
+	touched = set()
+
+	for node, record in new_nodes.items():
+		before = old_nodes.get(node)
+		if before is None or before['type'] != record['type']:
+			if before is not None:
+				result.removed.append(node)
+			result.added.append(node)
+			touched.add(node)
+			continue
+		if before['parent'] != record['parent']:
+			result.reparented[node] = (before['parent'], record['parent'])
+			touched.add(node)
+		for attr, value in record['attrs'].items():
+			if not _same_value(attr, before['attrs'].get(attr), value):
+				result.changed[f'{node}.{attr}'] = (before['attrs'].get(attr), value)
+				touched.add(node)
+			lock = (attr in record['locked'], attr in record['hidden'])
+			if (attr in before['locked'], attr in before['hidden']) != lock:
+				result.locks[f'{node}.{attr}'] = lock
+		missing = [attr for attr in record['user_attrs'] if attr not in before['user_attrs']]
+		if missing:
+			result.added_attrs[node] = missing
+			touched.add(node)
+
+	result.removed.extend(node for node in old_nodes if node not in new_nodes)
+
+	for dst, src in new['connections'].items():
+		if old['connections'].get(dst) != src or dst.split('.', 1)[0] in result.added:
+			result.connected[dst] = src
+			touched.add(dst.split('.', 1)[0])
+	for dst, src in old['connections'].items():
+		node = dst.split('.', 1)[0]
+		if dst not in new['connections'] and node not in result.removed:
+			result.disconnected[dst] = src
+			touched.add(node)
+
+	result.requires_rebuild = sorted(node for node in touched if is_command_built(new_nodes[node]['type']))
+	return result
+
+
+def _match_shapes(old_nodes, new_nodes):
+	"""Shapes that only changed name (curveShape12 -> curveShape57), matched by parent and order."""
+	unmatched = {}
+	for node, record in old_nodes.items():
+		if node not in new_nodes and record['type'] in _SHAPE_TYPES:
+			unmatched.setdefault((record['parent'], record['type']), []).append(node)
+	renamed = {}
+	for node, record in new_nodes.items():
+		if node in old_nodes or record['type'] not in _SHAPE_TYPES:
+			continue
+		candidates = unmatched.get((record['parent'], record['type']))
+		if candidates:
+			renamed[candidates.pop(0)] = node
+	return renamed
+
+
+def _rename_description(description, renamed):
+	def _plug(plug):
+		node, dot, attr = plug.partition('.')
+		return renamed.get(node, node) + dot + attr
+
+	nodes = {}
+	for node, record in description['nodes'].items():
+		nodes[renamed.get(node, node)] = dict(record, parent=renamed.get(record['parent'], record['parent']))
+	connections = {_plug(dst): _plug(src) for dst, src in description['connections'].items()}
+	return {'nodes': nodes, 'connections': connections}
+
+
+# ======================
+# Apply
+# ======================
+
+def _create_curve_shape(name, parent, curve):
+	transform = template_scene.create_curve_node({'name': f'{name}_rebuildTmp'}, dict(curve, name=name))
+	cmds.parent(name, parent, relative=True, shape=True)
+	cmds.delete(transform)
+
+
+def _depth(name, records):
+	depth = 0
+	parent = records[name]['parent']
+	while parent in records:
+		depth += 1
+		parent = records[parent]['parent']
+	return depth
+
+
+def apply_diff(result, new, graph=None):
+	"""
+	Apply a diff to the scene.
+
+	Args:
+		result (RigDiff): from diff(), without command built nodes.
+		new (dict): the describe(curves=True) the diff was made against.
+		graph (GraphBuilder): optional builder for the node network, flushed here.
+	"""
+	records = new['nodes']
+	graph = GraphBuilder() if graph is None else graph
+
+	# through temporary names, a new name can still be held by another renamed node
+	temporary = {old: cmds.rename(old, f'{old}_rebuildTmp') for old in result.renamed}
+	for old, new_name in result.renamed.items():
+		cmds.rename(temporary[old], new_name)
+
+	# type changes: the old node goes first so the name is free
+	retyped = [node for node in result.added if node in result.removed]
+	if retyped:
+		cmds.delete(cmds.ls(retyped) or [])
+
+	added = sorted(result.added, key=lambda node: _depth(node, records))
+	curves = []
+	for node in added:
+		record = records[node]
+		if record['type'] == 'nurbsCurve':
+			curves.append(node)
+		else:
+			graph.create_node(record['type'], node, record['parent'])
+	graph.flush()
+	for node in curves:
+		_create_curve_shape(node, records[node]['parent'], records[node]['curve'])
+
+	for node, (_, parent) in result.reparented.items():
+		if parent:
+			cmds.parent(node, parent)
+		else:
+			cmds.parent(node, world=True)
+
+	removed = set(result.removed) - set(retyped)
+	if removed:
+		for node in cmds.ls(list(removed), dag=True) or []:
+			for child in cmds.listRelatives(node, children=True) or []:
+				if child not in removed:
+					cmds.parent(child, world=True)
+		cmds.delete(cmds.ls(list(removed)) or [])
+
+	for dst, src in result.disconnected.items():
+		if cmds.objExists(src) and cmds.isConnected(src, dst):
+			cmds.disconnectAttr(src, dst)
+
+	for node in result.added:
+		_declare_user_attrs(graph, node, records[node]['user_attrs'])
+	for node, attrs in result.added_attrs.items():
+		_declare_user_attrs(graph, node, {attr: records[node]['user_attrs'][attr] for attr in attrs})
+	graph.flush()
+
+	values = {}
+	for node in result.added:
+		for attr, value in records[node]['attrs'].items():
+			values[f'{node}.{attr}'] = value
+	for plug, (_, value) in result.changed.items():
+		values[plug] = value
+
+	locks = dict(result.locks)
+	for node in result.added:
+		for attr in records[node]['locked'] + records[node]['hidden']:
+			locks[f'{node}.{attr}'] = (attr in records[node]['locked'], attr in records[node]['hidden'])
+
+	# locked plugs are opened for the edit and get their lock back afterwards
+	unlocked = [plug for plug in list(values) + list(result.connected) if cmds.getAttr(plug, lock=True)]
+	for plug in unlocked:
+		cmds.setAttr(plug, lock=False)
+
+	for plug, value in values.items():
+		if isinstance(value, str):
+			graph.set_attr(plug, value, type='string')
+		else:
+			graph.set_attr(plug, value)
+	for dst, src in result.connected.items():
+		graph.connect(src, dst, force=True)
+	graph.flush()
+
+	for plug in unlocked:
+		if plug not in locks:
+			cmds.setAttr(plug, lock=True)
+	for plug, (locked, hidden) in locks.items():
+		cmds.setAttr(plug, lock=locked, keyable=not hidden, channelBox=False)
+
+
+def _declare_user_attrs(graph, node, specs):
+	for attr, spec in specs.items():
+		if cmds.objExists(node) and cmds.attributeQuery(attr, node=node, exists=True):
+			continue
+		if spec['type'] == 'string':
+			cmds.addAttr(node, ln=attr, dt='string')
+		elif spec.get('enum'):
+			cmds.addAttr(node, ln=attr, at='enum', en=spec['enum'], k=True)
+		else:
+			graph.add_attr(node, attr, spec['type'], min_value=spec.get('min'), max_value=spec.get('max'))
+
+
+# ======================
+# Outside links
+# ======================
+
+def _outside_links(nodes):
+	"""DAG children and outgoing connections of nodes that lead outside of them."""
+	inside = set(nodes)
+	children = []
+	connections = []
+	for node in nodes:
+		for child in cmds.listRelatives(node, children=True) or []:
+			if child not in inside:
+				children.append((child, node))
+		pairs = cmds.listConnections(node, s=False, d=True, c=True, p=True) or []
+		for src, dst in zip(pairs[0::2], pairs[1::2]):
+			if dst.split('.', 1)[0] not in inside:
+				connections.append((src, dst))
+	return {'children': children, 'connections': connections}
+
+
+def _reconnect_outside(outside):
+	"""Hook outside children and connections back up to the rebuilt nodes of the same name."""
+	for child, parent in outside['children']:
+		if cmds.objExists(child) and cmds.objExists(parent):
+			cmds.parent(child, parent)
+	for src, dst in outside['connections']:
+		if cmds.objExists(src.split('.', 1)[0]) and cmds.objExists(dst.split('.', 1)[0]):
+			if not cmds.isConnected(src, dst):
+				cmds.connectAttr(src, dst, force=True)
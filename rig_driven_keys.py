@@ -0,0 +1,119 @@
+"""
+Driven keys compiled from a table instead of posing the rig.
+
+setDrivenKeyframe keys whatever the driver and the driven plug currently hold,
+so keying a pose means setting the driver, setting the driven value, keying
+and resetting, and the rig re-evaluates for every pose. A DrivenKeyTable
+declares the keys instead and builds one curve per driven plug, created,
+connected and keyed in a single GraphBuilder flush:
+
+	table = DrivenKeyTable()
+	table.add('ctrl_l_ft_toesAll_0001.spread', [
+		(0, 'driven_l_ft_index_base_0001.rotateY', 0),
+		(1, 'driven_l_ft_index_base_0001.rotateY', -35),
+		(-1, 'driven_l_ft_index_base_0001.rotateY', 15),
+	])
+	table.build()   # {'driven_l_ft_index_base_0001.rotateY': 'driven_l_ft_index_base_0001_rotateY'}
+
+Keying the same plug at the same driver value twice keeps the last value, so
+adding a group again does not add keys. Curves are named and typed like the
+ones setDrivenKeyframe makes: node_longAttr, animCurveUA for rotate,
+animCurveUL for translate and animCurveUU for everything else.
+"""
+import maya.cmds as cmds
+
+from graph_builder import GraphBuilder
+
+# short channel names -> the long names Maya uses for curve names
+LONG_NAMES = {
+	f'{short}{axis.lower()}': f'{long}{axis}'
+	for short, long in (('t', 'translate'), ('r', 'rotate'), ('s', 'scale'))
+	for axis in 'XYZ'
+}
+LONG_NAMES['v'] = 'visibility'
+
+
+def long_plug(plug):
+	node, _, attr = plug.partition('.')
+	return f'{node}.{LONG_NAMES.get(attr, attr)}'
+
+
+def curve_type(attr):
+	"""animCurve type setDrivenKeyframe creates for a driven attribute, the driver is unitless."""
+	if attr.startswith('rotate'):
+		return 'animCurveUA'
+	if attr.startswith('translate'):
+		return 'animCurveUL'
+	return 'animCurveUU'
+
+
+def curve_name(plug):
+	node, _, attr = long_plug(plug).partition('.')
+	return f'{node}_{attr}'
+
+
+class DrivenKeyTable(object):
+
+	def __init__(self):
+		self._curves = {}  # driven plug -> (driver plug, {driver value: value})
+
+	def __len__(self):
+		return len(self._curves)
+
+	def __contains__(self, plug):
+		return long_plug(plug) in self._curves
+
+	def add(self, driver, keys):
+		"""
+		Args:
+			driver (str): driver plug, e.g. 'ctrl_l_ft_foot_0001.heel_roll'.
+			keys (list): (driver value, driven plug, driven value) entries.
+		"""
+		for driver_value, driven, value in keys:
+			driven = long_plug(driven)
+			entry = self._curves.setdefault(driven, (driver, {}))
+			if entry[0] != driver:
+				raise ValueError(f"{driven} is already driven by {entry[0]}, not {driver}")
+			entry[1][float(driver_value)] = float(value)
+
+	def update(self, table):
+		"""Add a whole table: {driver plug: [(driver value, driven plug, driven value), ...]}."""
+		for driver, keys in table.items():
+			self.add(driver, keys)
+
+	def keys(self, plug):
+		"""(driver value, value) pairs of a driven plug, sorted by driver value."""
+		return sorted(self._curves[long_plug(plug)][1].items())
+
+	def build(self, graph=None):
+		"""
+		Create, connect and key every curve. Plugs that are already keyed by a curve of the
+		expected name get their keys added to that curve, like setDrivenKeyframe does.
+
+		Args:
+			graph (GraphBuilder): declare on this builder and leave the flush to the caller,
+				otherwise a builder of its own is flushed.
+
+		Returns:
+			dict: driven plug -> curve name, as declared when a graph is given.
+		"""
+		if not self._curves:
+			return {}
+		own_graph = graph is None
+		if own_graph:
+			graph = GraphBuilder()
+		names = {plug: curve_name(plug) for plug in self._curves}
+		existing = set(cmds.ls(list(names.values()), type='animCurve') or [])
+
+		for plug, (driver, keys) in self._curves.items():
+			curve = names[plug]
+			if curve not in existing:
+				curve = graph.create_node(curve_type(plug.partition('.')[2]), curve)
+				graph.connect(driver, f'{curve}.input')
+				graph.connect(f'{curve}.output', plug, force=True)
+			graph.set_keys(curve, sorted(keys.items()))
+
+		if own_graph:
+			renamed = graph.flush()
+			names = {plug: renamed.get(curve, curve) for plug, curve in names.items()}
+		return names
@@ -0,0 +1,108 @@
+"""
+Applies rig_plan.RigPlan operations to the scene.
+
+Consecutive create / set / connect operations are declared on one GraphBuilder
+and flushed together; operations that need the scene as it is (match, parent,
+constraints, IK handles, controls) flush first and run as plain cmds calls.
+
+	executor = PlanExecutor()
+	executor.run(rig_plan.plan_tail_sub_ctrls(tail_joints, 'grp_c_tailCtrls_0001', driven, ctrls))
+	executor.names   # planned name -> scene name, where Maya renamed a node or a control got groups
+
+Planned names that Maya changes on creation (name clashes) are mapped, later
+operations use the real names.
+"""
+import maya.cmds as cmds
+
+from auto_rig_helpers import AutoRigHelpers
+from curve_library import RigCurveLibrary
+from graph_builder import GraphBuilder
+
+# operations declared on the GraphBuilder, the rest need a flushed scene
+BATCHED = ('create', 'set', 'connect')
+
+
+class PlanExecutor(object):
+
+	def __init__(self, mode=None):
+		self.mode = mode
+		self.names = {}  # planned name -> scene name
+		self._graph = None
+		self.stats = {'ops': 0, 'flushes': 0}
+
+	def node(self, name):
+		return self.names.get(name, name) if name else name
+
+	def plug(self, plug):
+		node, dot, attr = plug.partition('.')
+		return self.node(node) + dot + attr
+
+	def run(self, plan):
+		"""
+		Execute every operation of plan in order.
+
+		Returns:
+			dict: planned name -> scene name of the nodes the plan created
+		"""
+		for op in plan.ops:
+			kind, args = op[0], op[1:]
+			if kind in BATCHED:
+				if self._graph is None:
+					self._graph = GraphBuilder(mode=self.mode)
+				getattr(self, f'_{kind}')(*args)
+			else:
+				self.flush()
+				getattr(self, f'_{kind}')(*args)
+			self.stats['ops'] += 1
+		self.flush()
+		return {name: self.node(name) for name in plan.nodes()}
+
+	def flush(self):
+		if self._graph is None:
+			return
+		graph, self._graph = self._graph, None
+		self.names.update(graph.flush())
+		self.stats['flushes'] += 1
+
+	# ======================
+	# Batched
+	# ======================
+
+	def _create(self, node_type, name, parent):
+		self._graph.create_node(node_type, name, self.node(parent))
+
+	def _set(self, plug, value):
+		self._graph.set_attr(self.plug(plug), value)
+
+	def _connect(self, src, dst):
+		self._graph.connect(self.plug(src), self.plug(dst))
+
+	# ======================
+	# Scene
+	# ======================
+
+	def _control(self, shape, name, levels, parent, match):
+		ctrl = RigCurveLibrary.create(shape, name)
+		if match:
+			cmds.matchTransform(ctrl, self.node(match))
+		hierarchy = AutoRigHelpers.build_control_hierarchy(ctrl, levels, parent=self.node(parent))
+		self.names[name] = ctrl
+		# groups as the plan names them, see rig_plan.control_zero
+		base_suffix = name.split('_', 1)[1] if '_' in name else name
+		for lvl, group in hierarchy.groups.items():
+			self.names[f"{lvl}_{base_suffix}"] = group
+
+	def _match(self, node, target, pos, rot):
+		cmds.matchTransform(self.node(node), self.node(target), pos=pos, rot=rot)
+
+	def _parent(self, node, parent):
+		cmds.parent(self.node(node), self.node(parent))
+
+	def _constraint(self, kind, targets, node, flags):
+		getattr(cmds, kind)(*[self.node(target) for target in targets], self.node(node), **flags)
+
+	def _ik(self, name, start, end, solver):
+		self.names[name] = cmds.ikHandle(sj=self.node(start), ee=self.node(end), sol=solver, n=name)[0]
+
+	def _lock_hide(self, node, attrs):
+		AutoRigHelpers.lock_hide_attr(self.node(node), attrs)
@@ -0,0 +1,261 @@
+"""
+Scene manifest of a built rig.
+
+The builder records the nodes each component creates and stores them, grouped
+by component and node type, together with the rig registry as one JSON string
+attribute on the master transform. Post-build tools load it with a single
+getAttr instead of scanning the scene with cmds.ls wildcards.
+
+Build:
+	manifest = RigManifest()
+	with manifest.component('master'):
+		master = build_master_hierachy.Master()
+		master.construct_master()
+	with manifest.component('limbs'):
+		...
+	manifest.save(master.master_grp, master.registry)
+
+Consecutive blocks inside manifest.recording() share one NodeRecorder: in Maya
+node-added callbacks report the new nodes, headless each block lists the scene
+once instead of twice.
+
+After reopening the file:
+	rig = RigManifest.load()            # or RigManifest.find(), None when no rig is stored
+	rig.registry.get('l_ft_footIk_ctrl')
+	rig.ls('ctrl_l_*_mid_*', 'transform')
+"""
+import fnmatch
+import json
+from contextlib import contextmanager
+
+import maya.cmds as cmds
+
+try:
+	import maya.api.OpenMaya as om
+except ImportError:
+	# headless memory backend, NodeRecorder compares scene listings instead
+	om = None
+
+from curve_library import RigCurveLibrary
+from rig_registry import RigRegistry
+
+MASTER_NODE = 'master'
+MANIFEST_ATTR = 'rigManifest'
+MANIFEST_VERSION = 1
+
+
+def _node_name(node):
+	if node.hasFn(om.MFn.kDagNode):
+		return om.MFnDagNode(node).partialPathName()
+	return om.MFnDependencyNode(node).name()
+
+
+class NodeRecorder(object):
+	"""
+	Nodes created while recording, in creation order, collected block by block with take().
+
+	In Maya a node-added callback reports every new node and nothing is scanned; names are
+	read at take(), after renames. Without the Maya API (memory backend) each take() lists
+	the scene once and compares it with the listing of the previous take().
+
+		with NodeRecorder() as recorder:
+			build_cog()
+			cog_nodes = recorder.take()
+			build_spine()
+			spine_nodes = recorder.take()
+	"""
+
+	def __init__(self):
+		self._callback = None
+		self._handles = []
+		self._seen = None
+
+	def __enter__(self):
+		if om is not None:
+			self._callback = om.MDGMessage.addNodeAddedCallback(self._added, 'dependNode')
+		else:
+			self._seen = set(cmds.ls())
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if self._callback is not None:
+			om.MMessage.removeCallback(self._callback)
+			self._callback = None
+		return False
+
+	def _added(self, node, client_data):
+		self._handles.append(om.MObjectHandle(node))
+
+	def take(self, exclude=()):
+		"""Nodes created since recording started or since the last take(), deleted ones left out."""
+		if om is not None:
+			handles, self._handles = self._handles, []
+			created = [_node_name(handle.object()) for handle in handles if handle.isValid()]
+		else:
+			listed = cmds.ls()
+			created = [node for node in listed if node not in self._seen]
+			self._seen = set(listed)
+		return [node for node in created if node not in exclude]
+
+
+class RigManifest(object):
+
+	def __init__(self, components=None, registry=None):
+		# component -> node type -> [node names]
+		self.components = components or {}
+		self.registry = registry or RigRegistry()
+		# shared by consecutive component() blocks, see recording()
+		self._recorder = None
+		self._build_lookup()
+
+	def _build_lookup(self):
+		self._types = {}
+		for by_type in self.components.values():
+			for node_type, nodes in by_type.items():
+				for node in nodes:
+					self._types[node] = node_type
+
+	def __contains__(self, node):
+		return node in self._types
+
+	def __len__(self):
+		return len(self._types)
+
+	# ======================
+	# Recording
+	# ======================
+
+	@contextmanager
+	def recording(self):
+		"""
+		Record the component() blocks inside with one NodeRecorder. Each block gets the nodes
+		created since the previous one ended, so nothing may create nodes between the blocks.
+		"""
+		if self._recorder is not None:
+			yield self
+			return
+		with NodeRecorder() as recorder:
+			self._recorder = recorder
+			try:
+				yield self
+			finally:
+				self._recorder = None
+
+	@contextmanager
+	def component(self, name):
+		"""Record every node created inside the block under component `name`, shape templates left out."""
+		with self.recording():
+			try:
+				yield self
+			finally:
+				self.add_nodes(name, self._recorder.take(exclude=RigCurveLibrary.template_nodes()))
+
+	def add_nodes(self, component, nodes):
+		"""Add existing nodes to a component, typed with one ls call."""
+		if not nodes:
+			return
+		typed = cmds.ls(nodes, showType=True) or []
+		by_type = self.components.setdefault(component, {})
+		for node, node_type in zip(typed[0::2], typed[1::2]):
+			if node in self._types:
+				continue
+			by_type.setdefault(node_type, []).append(node)
+			self._types[node] = node_type
+
+	def set_component(self, component, nodes):
+		"""Replace the recorded nodes of a component, e.g. after it was rebuilt."""
+		for node in self.nodes(component):
+			self._types.pop(node, None)
+		self.components[component] = {}
+		self.add_nodes(component, nodes)
+
+	# ======================
+	# Queries
+	# ======================
+
+	def node_type(self, node):
+		return self._types.get(node)
+
+	def nodes(self, component=None, node_type=None):
+		components = [self.components.get(component, {})] if component else self.components.values()
+		out = []
+		for by_type in components:
+			if node_type:
+				out.extend(by_type.get(node_type, []))
+			else:
+				for nodes in by_type.values():
+					out.extend(nodes)
+		return out
+
+	def ls(self, pattern, node_type=None, component=None):
+		"""cmds.ls(pattern, type=node_type) answered from the manifest, exact node types only."""
+		return [node for node in self.nodes(component, node_type) if fnmatch.fnmatchcase(node, pattern)]
+
+	# ======================
+	# Persistence
+	# ======================
+
+	def to_dict(self):
+		return {
+			'version': MANIFEST_VERSION,
+			'components': self.components,
+			'registry': self.registry.to_dict(),
+		}
+
+	@classmethod
+	def from_dict(cls, data):
+		if data.get('version') != MANIFEST_VERSION:
+			raise ValueError(f"Unsupported rig manifest version: {data.get('version')}")
+		return cls(data['components'], RigRegistry.from_dict(data['registry']))
+
+	def save(self, node=MASTER_NODE, registry=None, attr=MANIFEST_ATTR):
+		"""
+		Store the manifest on node. Nodes deleted since they were recorded are dropped.
+
+		Args:
+			node (str): usually the master transform.
+			registry (RigRegistry): the build's registry, replaces the current one.
+		"""
+		if registry is not None:
+			self.registry = registry
+		alive = set(cmds.ls(list(self._types)) or [])
+		for by_type in self.components.values():
+			for node_type in list(by_type):
+				by_type[node_type] = [n for n in by_type[node_type] if n in alive]
+				if not by_type[node_type]:
+					del by_type[node_type]
+		self._build_lookup()
+
+		if not cmds.attributeQuery(attr, node=node, exists=True):
+			cmds.addAttr(node, ln=attr, dt='string')
+		cmds.setAttr(f'{node}.{attr}', json.dumps(self.to_dict(), separators=(',', ':')), type='string')
+		print(f"✅ Rig manifest stored on {node}.{attr}: {len(self)} nodes in {len(self.components)} components")
+
+	@classmethod
+	def load(cls, node=MASTER_NODE, attr=MANIFEST_ATTR):
+		"""Rehydrate a stored manifest and its registry with one getAttr."""
+		if not cmds.objExists(node) or not cmds.attributeQuery(attr, node=node, exists=True):
+			raise ValueError(f"No rig manifest stored on {node}.{attr}")
+		return cls.from_dict(json.loads(cmds.getAttr(f'{node}.{attr}')))
+
+	@classmethod
+	def find(cls, node=MASTER_NODE, attr=MANIFEST_ATTR):
+		"""load(), or None when the scene has no stored manifest."""
+		try:
+			return cls.load(node, attr)
+		except ValueError:
+			return None
+
+
+def ls(pattern, node_type=None, manifest=None):
+	"""
+	Nodes matching pattern, from the manifest when it has any, cmds.ls otherwise
+	(e.g. setups built after the manifest was saved).
+	"""
+	if manifest is not None:
+		nodes = manifest.ls(pattern, node_type)
+		if nodes:
+			return nodes
+	if node_type:
+		return cmds.ls(pattern, type=node_type) or []
+	return cmds.ls(pattern) or []
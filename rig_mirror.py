@@ -0,0 +1,204 @@
+"""
+Left to right mirror passes over an explicit scope.
+
+A pass pairs every left node matching a pattern with its right twin from the
+rig_symmetry map and copies (or negates) a set of attributes across. The pairs and the attributes both
+sides share are worked out once per scope and cached; each run checks the
+cached nodes still exist with one ls, reads every left value with one batched
+getAttr payload and writes every right value with one GraphBuilder flush.
+
+	mirror_attr_values()                                        # whole rig, manifest when one is stored
+	mirror_limits(MirrorScope.component('muscles'), manifest)   # one manifest component
+	mirror_all(MirrorScope.muscles(['temp_l_ft_tricep_0001']))  # just these muscles
+	clear_pair_cache()                                          # after renaming or adding attributes
+"""
+import maya.cmds as cmds
+
+import rig_manifest
+import rig_symmetry
+from graph_builder import GraphBuilder, read_plugs
+
+CTRL_PATTERN = 'ctrl_l_*_mid_*'
+LIMIT_PATTERN = 'driven_l_*_endPos_*_0001'
+
+# mirror_attr_values: TRS and visibility stay put, the push direction is negated
+SKIP_PREFIXES = ('translate', 'rotate', 'scale')
+SKIP_ATTRS = {'visibility'}
+NEGATED_ATTRS = {'auto_push_X', 'auto_push_Y', 'auto_push_Z'}
+# compounds are read and written through their children
+COMPOUND_ATTRS = {'auto_push_direction': ('auto_push_X', 'auto_push_Y', 'auto_push_Z')}
+
+
+def _limit_plugs():
+	"""(left attr, right attr, scale) per limit plug, scale None copies an enable flag."""
+	plugs = []
+	for axis in 'XYZ':
+		# translate: min and max swap and negate, so do their enable flags (swapped only)
+		plugs += [
+			(f'maxTrans{axis}Limit', f'minTrans{axis}Limit', -1.0),
+			(f'minTrans{axis}Limit', f'maxTrans{axis}Limit', -1.0),
+			(f'maxTrans{axis}LimitEnable', f'minTrans{axis}LimitEnable', None),
+			(f'minTrans{axis}LimitEnable', f'maxTrans{axis}LimitEnable', None),
+		]
+		# rotate: copied as is
+		plugs += [
+			(f'minRot{axis}Limit', f'minRot{axis}Limit', 1.0),
+			(f'maxRot{axis}Limit', f'maxRot{axis}Limit', 1.0),
+			(f'minRot{axis}LimitEnable', f'minRot{axis}LimitEnable', None),
+			(f'maxRot{axis}LimitEnable', f'maxRot{axis}LimitEnable', None),
+		]
+	return plugs
+
+
+LIMIT_PLUGS = _limit_plugs()
+
+# (pass, scope key, pattern, node type) -> [(left, right, [(left attr, right attr, scale), ...]), ...]
+_PAIR_CACHE = {}
+
+
+def clear_pair_cache():
+	_PAIR_CACHE.clear()
+
+
+class MirrorScope(object):
+	"""Which left nodes a mirror pass looks at."""
+
+	def __init__(self, kind, names=()):
+		self.kind = kind
+		self.names = tuple(names)
+
+	@classmethod
+	def rig(cls):
+		"""Every matching node of the rig, from the manifest when it has any, the scene otherwise."""
+		return cls('rig')
+
+	@classmethod
+	def component(cls, name):
+		"""Nodes a manifest component recorded, e.g. 'muscles'."""
+		return cls('component', [name])
+
+	@classmethod
+	def muscles(cls, input_jnts):
+		"""
+		Nodes of the given muscles, from their left input joints:
+			'temp_l_ft_tricep_0001' -> ctrl_l_ft_tricep_mid_*, driven_l_ft_tricep_endPos_*_0001
+		"""
+		if isinstance(input_jnts, str):
+			input_jnts = [input_jnts]
+		names = []
+		for input_jnt in input_jnts:
+			tokens = input_jnt.split('_')
+			if len(tokens) < 4:
+				raise ValueError(f"Name is not in expected format: {input_jnt}")
+			names.append(f'{tokens[2]}_{tokens[3]}')
+		return cls('muscles', sorted(set(names)))
+
+	@property
+	def key(self):
+		return self.kind, self.names
+
+	def __repr__(self):
+		return f"<MirrorScope {self.kind} {', '.join(self.names)}>"
+
+	def left_nodes(self, pattern, node_type, manifest=None):
+		if self.kind == 'component':
+			if manifest is None:
+				raise ValueError(f"Component scope {self.names[0]} needs a rig manifest")
+			return manifest.ls(pattern, node_type, self.names[0])
+		if self.kind == 'muscles':
+			nodes = []
+			for name in self.names:
+				nodes.extend(rig_manifest.ls(pattern.replace('_l_*_', f'_l_{name}_', 1), node_type, manifest))
+			return nodes
+		return rig_manifest.ls(pattern, node_type, manifest)
+
+
+def _attr_mappings(left, right):
+	"""Keyable attributes both controls have, with their mirror scale, from one listAttr per side."""
+	left_attrs = cmds.listAttr(left, k=True) or []
+	right_attrs = set(cmds.listAttr(right, k=True) or [])
+	mappings = []
+	seen = set()
+	for attr in left_attrs:
+		if attr.startswith(SKIP_PREFIXES) or attr in SKIP_ATTRS:
+			continue
+		for child in COMPOUND_ATTRS.get(attr, (attr,)):
+			if child in seen or child not in right_attrs:
+				continue
+			seen.add(child)
+			mappings.append((child, child, -1.0 if child in NEGATED_ATTRS else 1.0))
+	return mappings
+
+
+def _pair_table(pass_name, scope, pattern, node_type, manifest, mappings, refresh=False):
+	"""Cached left / right pairs of a pass, rebuilt when refreshed or when a cached node is gone."""
+	key = (pass_name, scope.key, pattern, node_type)
+	table = _PAIR_CACHE.get(key)
+	if table is not None and not refresh:
+		nodes = [node for left, right, _ in table for node in (left, right)]
+		if len(set(cmds.ls(nodes) or [])) == len(set(nodes)):
+			return table
+
+	lefts = scope.left_nodes(pattern, node_type, manifest)
+	symmetry = rig_symmetry.current(lefts)
+	table = []
+	for left in lefts:
+		right = symmetry.counterpart(left)
+		if right is None:
+			cmds.warning(f"Right-side node not found for {left} → {rig_symmetry.mirror_name(left)}")
+			continue
+		table.append((left, right, mappings(left, right)))
+	_PAIR_CACHE[key] = table
+	return table
+
+
+def _run(table):
+	"""Read every left plug with one query, write every right plug with one flush."""
+	reads = [(f'{left}.{src}', f'{right}.{dst}', scale) for left, right, attrs in table for src, dst, scale in attrs]
+	values = read_plugs([plug for plug, _, _ in reads])
+	graph = GraphBuilder()
+	for (_, dst_plug, scale), value in zip(reads, values):
+		graph.set_attr(dst_plug, bool(value) if scale is None else value * scale)
+	graph.flush()
+	return len(reads)
+
+
+def mirror_attr_values(scope=None, manifest=None, refresh=False):
+	"""
+	Copy the keyable attributes of left mid controls (CTRL_PATTERN) to the right ones,
+	the auto push direction negated.
+
+	Args:
+		scope (MirrorScope): whole rig when None.
+		manifest (rig_manifest.RigManifest): loaded from the master node when not given.
+		refresh (bool): rebuild the cached pair table.
+
+	Returns:
+		int: plugs written.
+	"""
+	scope = scope or MirrorScope.rig()
+	if manifest is None:
+		manifest = rig_manifest.RigManifest.find()
+	return _run(_pair_table('attrs', scope, CTRL_PATTERN, 'transform', manifest, _attr_mappings, refresh))
+
+
+def mirror_limits(scope=None, manifest=None, refresh=False):
+	"""
+	Mirror the transform limits of left driven end groups (LIMIT_PATTERN) to the right ones:
+	translate limits swap min / max and negate, enable flags swap with them, rotate limits copy.
+
+	Args and return value as mirror_attr_values.
+	"""
+	scope = scope or MirrorScope.rig()
+	if manifest is None:
+		manifest = rig_manifest.RigManifest.find()
+	return _run(_pair_table('limits', scope, LIMIT_PATTERN, 'transform', manifest,
+							lambda left, right: LIMIT_PLUGS, refresh))
+
+
+def mirror_all(scope=None, manifest=None, refresh=False):
+	"""Both passes over one scope."""
+	if manifest is None:
+		manifest = rig_manifest.RigManifest.find()
+	return (mirror_attr_values(scope, manifest, refresh) +
+			mirror_limits(scope, manifest, refresh))
@@ -0,0 +1,99 @@
+"""
+Module loading for the cat auto rig.
+
+Rig modules import each other normally and are executed once per session. While
+developing in Maya, call dev_reload() once before a build to pick up edited
+files; it reloads every rig module exactly once, dependencies first, so class
+state such as AutoRigHelpers.registry is not wiped halfway through a build.
+
+Optional tools are loaded on first use only:
+	rig_modules.muscle_joint.create_muscle_set_up(...)
+	rig_modules.show_push_ui()
+"""
+import importlib
+import sys
+
+# dependency order, every module only imports modules listed before it
+RIG_MODULES = [
+	'rig_registry',
+	'rig_name_cache',
+	'rig_symmetry',
+	'auto_rig_helpers',
+	'curve_library',
+	'rig_manifest',
+	'rig_transaction',
+	'graph_builder',
+	'rig_driven_keys',
+	'rig_mirror',
+	'nurbs_curve',
+	'template_scene',
+	'rig_plan',
+	'rig_executor',
+	'rig_components',
+	'controller_shape',
+	'build_master_hierachy',
+	'neck_spine_auto_rig',
+	'limbs_auto_rig',
+	'muscle_geometry',
+	'muscle_joint',
+	'push_joints',
+	'RBF',
+]
+
+
+class LazyModule(object):
+	"""Imports the module on first attribute access."""
+
+	def __init__(self, name):
+		self._name = name
+		self._module = None
+
+	def _load(self):
+		if self._module is None:
+			self._module = importlib.import_module(self._name)
+		return self._module
+
+	def __getattr__(self, attr):
+		return getattr(self._load(), attr)
+
+	def __repr__(self):
+		state = 'loaded' if self._module is not None else 'not loaded'
+		return f"<LazyModule {self._name} ({state})>"
+
+
+muscle_joint = LazyModule('muscle_joint')
+push_joints = LazyModule('push_joints')
+rbf = LazyModule('RBF')
+
+
+def dev_reload(verbose=True):
+	"""
+	Reload every rig module that is already imported, once each, dependencies first.
+	Modules that were never imported stay unloaded.
+
+	Returns:
+		list: names of the reloaded modules.
+	"""
+	reloaded = []
+	for name in RIG_MODULES:
+		module = sys.modules.get(name)
+		if module is None:
+			continue
+		importlib.reload(module)
+		reloaded.append(name)
+
+	# lazy proxies must not keep the old module objects
+	for proxy in (muscle_joint, push_joints, rbf):
+		proxy._module = None
+
+	if verbose:
+		print(f"🔁 Reloaded: {', '.join(reloaded) or 'nothing'}")
+	return reloaded
+
+
+def show_muscle_ui():
+	return muscle_joint.create_muscle_setup_ui()
+
+
+def show_push_ui():
+	return push_joints.push_pose_ui()
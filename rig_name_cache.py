@@ -0,0 +1,184 @@
+"""
+Write-through name / parent cache of the nodes a build creates.
+
+Builder helpers create and parent nodes through the cache, so asking whether a
+node they made moments ago exists, or walking a control hierarchy they just
+built, is answered from memory. Anything the cache was not told about falls
+back to one scene query; every answer is counted as a hit or a miss.
+
+	names = rig_name_cache.current()
+	grp = names.create_node('transform', 'grp_l_ft_legJnts_0001')
+	names.reparent(grp, 'grp_legJnts_0001', relative=True)
+	names.exists(grp)        # hit
+	names.parent(grp)        # hit, 'grp_legJnts_0001'
+	print(names.report())    # "... 412 hits, 96 misses (81% answered from memory)"
+
+Parents stay correct only while the node is moved through the cache. A node
+that callers go on to move with plain cmds.parent, like the top group of a
+control hierarchy, is released(): its existence is still cached, its parent is
+asked from the scene again. Deleting or renaming cached nodes outside the
+cache needs forget() or a reset().
+
+The cache belongs to the build that filled it: it is reset per Master build and,
+in Maya, whenever a new scene is created or a file is opened. Post-build tools
+ask the scene directly instead.
+"""
+import maya.cmds as cmds
+
+try:
+	import maya.api.OpenMaya as om
+except ImportError:
+	# headless memory backend, no scene messages
+	om = None
+
+
+class NameCache(object):
+
+	def __init__(self):
+		self._nodes = set()
+		self._parents = {}   # node -> parent set through the cache, None for world
+		self._children = {}  # node -> children created or parented through the cache, see children()
+		self._owned = set()  # created through the cache, children() answered from memory
+		self.stats = {'hits': 0, 'misses': 0}
+
+	def __contains__(self, node):
+		return node in self._nodes
+
+	def __len__(self):
+		return len(self._nodes)
+
+	def _hit(self):
+		self.stats['hits'] += 1
+
+	def _miss(self):
+		self.stats['misses'] += 1
+
+	# ======================
+	# Write-through
+	# ======================
+
+	def create_node(self, node_type, name, parent=None):
+		"""cmds.createNode, recorded with its parent."""
+		kwargs = {'n': name}
+		if parent:
+			kwargs['p'] = parent
+		node = cmds.createNode(node_type, **kwargs)
+		self._owned.add(node)
+		self.record(node, parent)
+		return node
+
+	def reparent(self, node, parent, **kwargs):
+		"""cmds.parent, recorded. parent None moves the node to the world."""
+		if parent:
+			cmds.parent(node, parent, **kwargs)
+		else:
+			cmds.parent(node, world=True, **kwargs)
+		self.record(node, parent)
+		return node
+
+	def record(self, node, parent=False):
+		"""
+		A node made with a plain cmds call, e.g. a duplicate. With parent (None for world)
+		its parent is recorded as well, leave it out when it is not known.
+		"""
+		self._nodes.add(node)
+		if parent is False:
+			return
+		self._unlink(node)
+		self._parents[node] = parent or None
+		if parent:
+			self._children.setdefault(parent, []).append(node)
+
+	def _unlink(self, node):
+		old = self._parents.pop(node, None)
+		if old and node in self._children.get(old, ()):
+			self._children[old].remove(node)
+		return old
+
+	def release(self, node):
+		"""Stop answering node's parent from memory, e.g. before it is moved with cmds.parent."""
+		old = self._unlink(node)
+		# where the node ends up is unknown, so are the old parent's children
+		self._owned.discard(old)
+
+	def forget(self, nodes):
+		"""Drop deleted or renamed nodes."""
+		for node in nodes:
+			self.release(node)
+			self._nodes.discard(node)
+			self._owned.discard(node)
+			self._children.pop(node, None)
+
+	def reset(self):
+		self.__init__()
+
+	# ======================
+	# Queries
+	# ======================
+
+	def exists(self, node):
+		"""cmds.objExists, nodes found in the scene are remembered."""
+		if node in self._nodes:
+			self._hit()
+			return True
+		self._miss()
+		if cmds.objExists(node):
+			self._nodes.add(node)
+			return True
+		return False
+
+	def parent(self, node):
+		"""Parent transform of node, None for world."""
+		if node in self._parents:
+			self._hit()
+			return self._parents[node]
+		self._miss()
+		return (cmds.listRelatives(node, parent=True, type='transform') or [None])[0]
+
+	def children(self, node):
+		"""
+		Children of node. Only nodes created through the cache are answered from memory, and
+		only with the children the cache placed: constraints or nodes parented under them
+		with plain cmds calls are not seen, ask the scene for those.
+		"""
+		if node in self._owned:
+			self._hit()
+			return list(self._children.get(node, []))
+		self._miss()
+		return cmds.listRelatives(node, children=True) or []
+
+	def report(self):
+		total = self.stats['hits'] + self.stats['misses']
+		ratio = 100.0 * self.stats['hits'] / total if total else 0.0
+		return (f"{len(self._nodes)} cached nodes, {self.stats['hits']} hits, {self.stats['misses']} misses "
+				f"({ratio:.0f}% answered from memory)")
+
+
+_current = NameCache()
+
+
+def current():
+	"""The name cache of the current build."""
+	return _current
+
+
+def reset():
+	"""Start a new build, or forget everything after nodes were changed outside the cache."""
+	_current.reset()
+	return _current
+
+
+def _scene_changed(client_data):
+	_current.reset()
+
+
+def _watch_scene():
+	if om is None:
+		return []
+	return [om.MSceneMessage.addCallback(message, _scene_changed)
+			for message in (om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen)]
+
+
+# registered once per session, rig_modules.dev_reload() runs this module again
+if '_scene_callbacks' not in globals():
+	_scene_callbacks = _watch_scene()
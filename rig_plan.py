@@ -0,0 +1,377 @@
+"""
+Build plans: what a build step creates, as plain data, no Maya import.
+
+A planner is a pure function from names and counts to a RigPlan, the ordered
+operations of one build step: nodes to create, transforms to match, parents,
+attribute values, connections, constraints and IK handles. Plans serialize to
+JSON, compare with diff() and are cached, rig_executor applies them:
+
+	snapshot = rig_plan.template(refresh=True)                 # template nodes, read once (needs Maya)
+	plan = rig_plan.cached(rig_plan.plan_twist_build, 'l', 'ft', 5, joints)
+	rig_executor.PlanExecutor().run(plan)
+	plan.diff(rig_plan.plan_twist_build('l', 'ft', 7, joints))  # [('+', [...]), ('-', [...]), ...]
+
+Transforms are planned as 'match' steps against nodes built earlier (joints
+placed on rebuilt curves, mirrored chains) and resolved by the executor. The
+cache is keyed by planner, arguments and the template snapshot digest, so
+rebuilding a component against an unchanged template plans nothing again.
+
+Only the leg twist and the tail sub control steps are planned so far, the rest
+of the build still runs as cmds calls.
+"""
+import difflib
+import hashlib
+import json
+import threading
+
+PLAN_VERSION = 1
+
+# operations and their arguments, see RigPlan
+OPERATIONS = {
+	'create': ('type', 'name', 'parent'),
+	'control': ('shape', 'name', 'levels', 'parent', 'match'),
+	'match': ('node', 'target', 'pos', 'rot'),
+	'parent': ('node', 'parent'),
+	'set': ('plug', 'value'),
+	'connect': ('src', 'dst'),
+	'constraint': ('kind', 'targets', 'node', 'flags'),
+	'ik': ('name', 'start', 'end', 'solver'),
+	'lock_hide': ('node', 'attrs'),
+}
+
+
+class RigPlan(object):
+	"""
+	Ordered build operations, each a list [operation, *arguments] as in OPERATIONS.
+
+	Args:
+		name (str): what the plan builds, e.g. 'twist_l_ft'.
+		inputs (dict): the planner arguments, scene nodes the plan builds on included.
+	"""
+
+	def __init__(self, name, inputs=None, ops=None):
+		self.name = name
+		self.inputs = dict(inputs or {})
+		self.ops = [list(op) for op in ops or []]
+
+	def __len__(self):
+		return len(self.ops)
+
+	def __eq__(self, other):
+		return isinstance(other, RigPlan) and self.to_dict() == other.to_dict()
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __repr__(self):
+		return f"<RigPlan {self.name}: {len(self.ops)} operations>"
+
+	def _add(self, op, *args):
+		self.ops.append([op] + list(args))
+		return args[1] if op in ('create', 'control') else args[0]
+
+	# ======================
+	# Operations
+	# ======================
+
+	def create(self, node_type, name, parent=None):
+		return self._add('create', node_type, name, parent)
+
+	def control(self, shape, name, levels, parent=None, match=None):
+		"""A RigCurveLibrary shape, matched to `match` and given `levels` hierarchy groups under parent."""
+		return self._add('control', shape, name, levels, parent, match)
+
+	def match(self, node, target, pos=True, rot=True):
+		return self._add('match', node, target, pos, rot)
+
+	def parent(self, node, parent):
+		return self._add('parent', node, parent)
+
+	def set(self, plug, value):
+		return self._add('set', plug, value)
+
+	def connect(self, src, dst):
+		return self._add('connect', src, dst)
+
+	def constraint(self, kind, targets, node, **flags):
+		"""kind is the command, e.g. 'pointConstraint'."""
+		return self._add('constraint', kind, list(targets), node, flags)
+
+	def ik(self, name, start, end, solver='ikSCsolver'):
+		return self._add('ik', name, start, end, solver)
+
+	def lock_hide(self, node, attrs):
+		return self._add('lock_hide', node, list(attrs))
+
+	# ======================
+	# Queries
+	# ======================
+
+	def nodes(self):
+		"""Names of the nodes the plan creates, in creation order."""
+		out = []
+		for op in self.ops:
+			if op[0] in ('create', 'control'):
+				out.append(op[2])
+			elif op[0] == 'ik':
+				out.append(op[1])
+		return out
+
+	def to_dict(self):
+		return {'version': PLAN_VERSION, 'name': self.name, 'inputs': self.inputs, 'ops': self.ops}
+
+	@classmethod
+	def from_dict(cls, data):
+		if data.get('version') != PLAN_VERSION:
+			raise ValueError(f"Unsupported plan version {data.get('version')}, expected {PLAN_VERSION}")
+		return cls(data['name'], data['inputs'], data['ops'])
+
+	def to_json(self, indent=None):
+		return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+	@classmethod
+	def from_json(cls, text):
+		return cls.from_dict(json.loads(text))
+
+	@property
+	def digest(self):
+		return hashlib.sha1(self.to_json().encode('utf-8')).hexdigest()
+
+	def diff(self, other):
+		"""
+		Operations other adds ('+') and drops ('-') compared to this plan, in plan order.
+
+		Returns:
+			list: (sign, operation)
+		"""
+		old = [json.dumps(op) for op in self.ops]
+		new = [json.dumps(op) for op in other.ops]
+		changes = []
+		for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+			if tag in ('delete', 'replace'):
+				changes.extend(('-', op) for op in self.ops[i1:i2])
+			if tag in ('insert', 'replace'):
+				changes.extend(('+', op) for op in other.ops[j1:j2])
+		return changes
+
+
+# ======================
+# Template snapshot
+# ======================
+
+class TemplateSnapshot(object):
+	"""The template nodes as template_scene.record_template() data, read from the scene once."""
+
+	def __init__(self, data):
+		self.data = data
+		self._nodes = {record['name']: record for record in data.get('nodes', [])}
+		self._children = {}
+		for record in data.get('nodes', []):
+			self._children.setdefault(record['parent'], []).append(record['name'])
+		self.digest = hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+
+	@classmethod
+	def read(cls, roots=None):
+		"""Record the template of the open scene (needs Maya or the memory backend)."""
+		import template_scene
+		return cls(template_scene.record_template(roots=roots))
+
+	def __contains__(self, name):
+		return name in self._nodes
+
+	def node(self, name):
+		return self._nodes.get(name)
+
+	def children(self, name, node_type='joint'):
+		return [child for child in self._children.get(name, []) if self._nodes[child]['type'] == node_type]
+
+	def chain(self, root, count=None):
+		"""root and its first child joint, that one's first child joint and so on, count joints at most."""
+		chain = []
+		node = root if root in self._nodes else None
+		while node and (count is None or len(chain) < count):
+			chain.append(node)
+			node = (self.children(node) or [None])[0]
+		return chain
+
+
+# ======================
+# Cache
+# ======================
+
+_snapshot = None
+_cache = {}
+stats = {'hits': 0, 'misses': 0}
+# ComponentGraph.plan calls cached() from a thread pool; planners are pure Python, holding the
+# lock while one plans costs no parallelism and keeps two threads from planning the same key
+_lock = threading.RLock()
+
+
+def template(refresh=False):
+	"""The template snapshot of the session, read on first use or when refreshed, e.g. before a rebuild."""
+	global _snapshot
+	if _snapshot is None or refresh:
+		_snapshot = TemplateSnapshot.read()
+	return _snapshot
+
+
+def cached(planner, *args):
+	"""
+	planner(*args), reused while the template snapshot is unchanged. Plans are shared, do not edit them.
+	Thread safe, see _lock.
+	"""
+	key = (planner.__module__, planner.__name__, json.dumps(args, sort_keys=True),
+		   _snapshot.digest if _snapshot is not None else None)
+	with _lock:
+		plan = _cache.get(key)
+		if plan is None:
+			stats['misses'] += 1
+			plan = _cache[key] = planner(*args)
+		else:
+			stats['hits'] += 1
+	return plan
+
+
+def clear_cache():
+	with _lock:
+		_cache.clear()
+		stats.update(hits=0, misses=0)
+
+
+# ======================
+# Planners
+# ======================
+
+def control_zero(ctrl):
+	"""Zero group name of a control, as AutoRigHelpers.build_control_hierarchy names it."""
+	return f"zero_{ctrl.split('_', 1)[1]}" if '_' in ctrl else f"zero_{ctrl}"
+
+
+def plan_twist(side, region, twist_jnt_num):
+	"""
+	Twist joint names, the twist fraction of every in-between joint and the segments in build order.
+	A segment names its start and end joint and the parent of its IK handle by their keys in the joints
+	of plan_twist_build; reverse grows the twist towards the first joint, the driver twists the far end
+	of the knee and the near end of the upper leg.
+	"""
+	count = twist_jnt_num - 1
+	return {
+		"knee": [f"jnt_{side}_{region}_kneeTwist_{i + 1:04d}" for i in range(twist_jnt_num)],
+		"upperleg": [f"jnt_{side}_{region}_upperlegTwist_{i + 1:04d}" for i in range(twist_jnt_num)],
+		"weights": [float(i + 1) / count for i in range(twist_jnt_num - 2)],
+		"segments": [
+			{"segment": "knee", "start": "knee", "end": "ankle", "ik_parent": "ankle", "reverse": False},
+			{"segment": "upperleg", "start": "upperleg", "end": "knee", "ik_parent": "upperleg_ik_parent",
+			 "reverse": True},
+		],
+	}
+
+
+def _plan_twist_segment(plan, side, region, segment, joints, start, end, ik_parent, weights, reverse):
+	"""
+	Driver joint with a single chain IK from start to end, twist joints spread from start to end.
+	The in-between joints are point constrained between the first and last twist joint and get
+	a fraction of the driver twist (0.25 / 0.5 / 0.75 for five joints), growing towards the last
+	joint, or towards the first one with reverse. Each multiplyDivide serves three joints.
+	"""
+	driver = plan.create('joint', f'jnt_{side}_{region}_{segment}TwistDriver_0001', start)
+	tip = plan.create('joint', f'jnt_{side}_{region}_{segment}TwistDriverTip_0001')
+	plan.match(driver, start)
+	plan.match(tip, end, rot=False)
+	plan.parent(tip, driver)
+	plan.set(f'{driver}.visibility', False)
+	# clear end joint rotation
+	for axis in 'XYZ':
+		plan.set(f'{tip}.jointOrient{axis}', 0)
+
+	ik_hnd = plan.ik(f'ikHnd_{side}_{region}_{segment}TwistDriver_0001', driver, tip)
+	plan.parent(ik_hnd, ik_parent)
+	plan.set(f'{ik_hnd}.visibility', False)
+
+	for i, name in enumerate(joints):
+		plan.create('joint', name, start)
+		if i == len(joints) - 1:
+			plan.match(name, end, rot=False)
+
+	first, last = joints[0], joints[-1]
+	plan.constraint('pointConstraint', [end], last, mo=True)
+
+	mult_node = None
+	for i, (jnt, weight) in enumerate(zip(joints[1:-1], weights)):
+		plan.constraint('pointConstraint', [first], jnt, mo=False, w=1.0 - weight)
+		plan.constraint('pointConstraint', [last], jnt, mo=False, w=weight)
+
+		axis = 'XYZ'[i % 3]
+		if axis == 'X':
+			mult_node = plan.create('multiplyDivide', f'mult_{side}_{region}_{segment}TwistDriver_{i // 3 + 1:04d}')
+		plan.connect(f'{driver}.rotateX', f'{mult_node}.input1{axis}')
+		plan.set(f'{mult_node}.input2{axis}', 1.0 - weight if reverse else weight)
+		plan.connect(f'{mult_node}.output{axis}', f'{jnt}.rotateX')
+
+	plan.connect(f'{driver}.rotateX', f'{first if reverse else last}.rotateX')
+
+
+def plan_twist_build(side, region, twist_jnt_num, joints):
+	"""
+	Knee and upper leg twist setup of one leg, an empty plan for no twist joints.
+
+	Args:
+		joints (dict): upperleg, knee and ankle joints, and upperleg_ik_parent (scapula or pelvis joint).
+	"""
+	names = plan_twist(side, region, twist_jnt_num)
+	plan = RigPlan(f'twist_{side}_{region}', {'side': side, 'region': region,
+											  'twist_jnt_num': twist_jnt_num, 'joints': joints})
+	for segment in names['segments']:
+		twist_joints = names[segment['segment']]
+		if not twist_joints:
+			continue
+		_plan_twist_segment(plan, side, region, segment['segment'], twist_joints, joints[segment['start']],
+							joints[segment['end']], joints[segment['ik_parent']], names['weights'],
+							segment['reverse'])
+	return plan
+
+
+def tail_names(tail_jnt_num):
+	"""Tail joints (one more than tail_jnt_num, the last one has no control), FK controls and their driven groups."""
+	return {
+		'joints': [f'jnt_c_tail_{i + 1:04d}' for i in range(tail_jnt_num + 1)],
+		'ctrls': [f'ctrl_c_tail_{i + 1:04d}' for i in range(tail_jnt_num)],
+		'driven': [f'driven_c_tail_{i + 1:04d}' for i in range(tail_jnt_num)],
+	}
+
+
+def plan_tail_sub_ctrls(tail_joints, root_ctrl_grp, driven_grps, small_ctrls, joints_per_ctrl=3,
+						prefix='ctrl_c_tailDrv'):
+	"""
+	Tail sub controls along the tail chain, each one rotating joints_per_ctrl FK controls through
+	their driven groups: 9 tail joints, 3 per control -> controls at joints [0, 3, 6].
+	"""
+	plan = RigPlan('tail_sub_ctrls', {'tail_joints': tail_joints, 'root_ctrl_grp': root_ctrl_grp,
+									  'driven_grps': driven_grps, 'small_ctrls': small_ctrls,
+									  'joints_per_ctrl': joints_per_ctrl, 'prefix': prefix})
+	ctrl_grp = plan.create('transform', 'grp_c_tailDrvCtrls_0001', root_ctrl_grp)
+
+	# the terminal joint has no control
+	chain = tail_joints[:-1]
+	n = len(chain)
+	step = max(1, joints_per_ctrl)
+	for i, idx in enumerate(range(0, n, step), 1):
+		ctrl = plan.control('square', f"{prefix}_{i:04d}", 2, ctrl_grp, chain[idx])
+
+		div_node = plan.create('multiplyDivide', f'div_c_tailDrv_{i:04d}')
+		plan.set(f'{div_node}.operation', 2)
+		for axis in 'XYZ':
+			plan.set(f'{div_node}.output{axis}', joints_per_ctrl)
+		plan.connect(f'{ctrl}.rotate', f'{div_node}.input1')
+
+		# rotate the next range of FK controls
+		for driven in driven_grps[idx:min(idx + step, n)]:
+			for axis in 'XYZ':
+				plan.connect(f'{div_node}.output{axis}', f'{driven}.rotate{axis}')
+
+		# sub controls after the first one follow the FK control before their range
+		if i > 1 and idx - 1 < len(small_ctrls):
+			plan.parent(control_zero(ctrl), small_ctrls[idx - 1])
+
+		plan.lock_hide(ctrl, ['tx', 'ty', 'tz'])
+	return plan
@@ -0,0 +1,215 @@
+"""
+Name-indexed registry of the nodes a rig build creates.
+
+Replaces the setattr / hasattr store on AutoRigHelpers and LimbsAutoRig. Every
+handle is kept under its store name ("l_ft_footIk_ctrl") and a typed key
+(side, region, part, role) parsed from it, with one index per key field so
+bulk queries do not walk the whole registry.
+
+Example:
+	registry.register('l_ft_footIk_ctrl', 'ctrl_l_ft_foot_0001')
+	registry.get('l_ft_footIk_ctrl')
+	registry.find(side='l', region='ft', part='*Ik', role='ctrl')   # all IK controls of l_ft
+	registry.save('master')                # JSON string attribute on the master node
+	registry = RigRegistry.load('master')  # later session, no scene scan
+"""
+import fnmatch
+import json
+from collections import defaultdict, namedtuple
+
+import maya.cmds as cmds
+
+SIDES = ('l', 'r', 'c')
+REGIONS = ('ft', 'bk')
+
+REGISTRY_ATTR = 'rigRegistry'
+REGISTRY_VERSION = 1
+
+RigKey = namedtuple('RigKey', ['side', 'region', 'part', 'role'])
+
+
+def parse_key(name):
+	"""
+	Typed key from a store name.
+		'l_ft_footIk_ctrl'        -> RigKey('l', 'ft', 'footIk', 'ctrl')
+		'grp_l_ft_toeJnts_0001'   -> RigKey('l', 'ft', 'toeJnts', 'grp')
+		'r_scapula_joints'        -> RigKey('r', None, 'scapula', 'joints')
+	"""
+	tokens = name.split('_')
+	role = None
+	if len(tokens) > 1 and tokens[0] == 'grp':
+		role = 'grp'
+		tokens = tokens[1:]
+	if len(tokens) > 1 and tokens[-1].isdigit():
+		tokens = tokens[:-1]
+
+	side = region = None
+	if len(tokens) > 1 and tokens[0] in SIDES:
+		side = tokens.pop(0)
+	if len(tokens) > 1 and tokens[0] in REGIONS:
+		region = tokens.pop(0)
+	if role is None and len(tokens) > 1:
+		role = tokens.pop()
+	return RigKey(side, region, '_'.join(tokens), role)
+
+
+def _flatten_value(value):
+	if isinstance(value, str):
+		return [value]
+	if isinstance(value, dict):
+		value = value.values()
+	elif not isinstance(value, (list, tuple)):
+		return []
+	out = []
+	for item in value:
+		out.extend(_flatten_value(item))
+	return out
+
+
+class RigRegistry(object):
+	"""Store name -> value, with O(1) lookup by name or typed key and indexed bulk queries."""
+
+	def __init__(self):
+		self.clear()
+
+	def clear(self):
+		self._values = {}
+		self._keys = {}
+		self._by_key = {}
+		self._index = {field: defaultdict(set) for field in RigKey._fields}
+		# bumped on every change so callers can cache derived lookups
+		self.version = 0
+
+	def __contains__(self, name):
+		return name in self._values
+
+	def __len__(self):
+		return len(self._values)
+
+	def names(self):
+		return list(self._values)
+
+	# ======================
+	# Register / Lookup
+	# ======================
+
+	def register(self, name, value, key=None):
+		"""
+		Args:
+			name (str): store name, e.g. 'l_ft_footIk_ctrl'.
+			value: node name, list or dict of node names.
+			key (RigKey): typed key, parsed from the name when not given.
+		"""
+		if name in self._values:
+			self._unindex(name)
+		key = key or parse_key(name)
+		self._values[name] = value
+		self._keys[name] = key
+		self._by_key[key] = name
+		for field, field_value in zip(RigKey._fields, key):
+			self._index[field][field_value].add(name)
+		self.version += 1
+		return value
+
+	def remove(self, name):
+		if name in self._values:
+			self._unindex(name)
+			del self._values[name]
+			del self._keys[name]
+			self.version += 1
+
+	def discard_nodes(self, nodes):
+		"""
+		Remove every entry holding one of nodes, e.g. after they were deleted.
+
+		Returns:
+			list: removed store names.
+		"""
+		nodes = set(nodes)
+		removed = [name for name in list(self._values) if nodes.intersection(_flatten_value(self._values[name]))]
+		for name in removed:
+			self.remove(name)
+		return removed
+
+	def _unindex(self, name):
+		key = self._keys[name]
+		if self._by_key.get(key) == name:
+			del self._by_key[key]
+		for field, field_value in zip(RigKey._fields, key):
+			self._index[field][field_value].discard(name)
+
+	def get(self, name, default=None):
+		return self._values.get(name, default)
+
+	def key(self, name):
+		return self._keys.get(name)
+
+	def lookup(self, side=None, region=None, part=None, role=None, default=None):
+		"""Value stored under an exact typed key."""
+		name = self._by_key.get(RigKey(side, region, part, role))
+		return self._values[name] if name is not None else default
+
+	def find(self, side=None, region=None, part=None, role=None):
+		"""
+		Every entry matching the given key fields, part may be a wildcard ('*Ik').
+
+		Returns:
+			dict: store name -> value
+		"""
+		candidates = None
+		for field, field_value in (('side', side), ('region', region), ('role', role)):
+			if field_value is None:
+				continue
+			names = self._index[field].get(field_value, set())
+			candidates = set(names) if candidates is None else candidates & names
+		if part is not None and not any(c in part for c in '*?['):
+			names = self._index['part'].get(part, set())
+			candidates = set(names) if candidates is None else candidates & names
+		if candidates is None:
+			candidates = set(self._values)
+
+		result = {}
+		for name in sorted(candidates):
+			if part is not None and not fnmatch.fnmatchcase(self._keys[name].part, part):
+				continue
+			result[name] = self._values[name]
+		return result
+
+	def nodes(self):
+		"""Every node name held by the registry, flattened out of lists and dicts."""
+		out = []
+		for value in self._values.values():
+			out.extend(_flatten_value(value))
+		return out
+
+	# ======================
+	# Serialization
+	# ======================
+
+	def to_dict(self):
+		return {
+			'version': REGISTRY_VERSION,
+			'entries': {name: {'key': list(self._keys[name]), 'value': value} for name, value in self._values.items()},
+		}
+
+	@classmethod
+	def from_dict(cls, data):
+		if data.get('version') != REGISTRY_VERSION:
+			raise ValueError(f"Unsupported registry version: {data.get('version')}")
+		registry = cls()
+		for name, entry in data['entries'].items():
+			registry.register(name, entry['value'], RigKey(*entry['key']))
+		return registry
+
+	def save(self, node, attr=REGISTRY_ATTR):
+		"""Write the registry as a JSON string attribute on node (usually 'master')."""
+		if not cmds.attributeQuery(attr, node=node, exists=True):
+			cmds.addAttr(node, ln=attr, dt='string')
+		cmds.setAttr(f'{node}.{attr}', json.dumps(self.to_dict(), separators=(',', ':')), type='string')
+
+	@classmethod
+	def load(cls, node, attr=REGISTRY_ATTR):
+		"""Rehydrate a registry saved on node, one getAttr, no scene scan."""
+		if not cmds.objExists(node) or not cmds.attributeQuery(attr, node=node, exists=True):
+			raise ValueError(f"No rig registry stored on {node}.{attr}")
+		return cls.from_dict(json.loads(cmds.getAttr(f'{node}.{attr}')))
@@ -0,0 +1,190 @@
+"""
+Left / right symmetry index of a rig.
+
+Built once per rig from a single ls, it maps every sided transform or joint (a
+'l' or 'r' name token) to its counterpart, the axis it mirrors across and how its values mirror, so
+tools look counterparts up in a dict instead of replacing '_l_' with '_r_'
+and asking objExists.
+
+	symmetry = rig_symmetry.current(refresh=True)               # once the rig is built
+	symmetry.counterpart('ctrl_l_ft_tricep_mid_0001')          # 'ctrl_r_ft_tricep_mid_0001', None when missing
+	symmetry.on_side('jnt_l_ft_knee_0001', 'r')                # either side in, the node of that side out
+	symmetry.pairs('loc_l_*_pushPose_*', MIRROR_NEGATE)        # [(left, right), ...]
+
+current() rebuilds the index when asked about a node it has never seen, e.g.
+setups created after it was built; tools that create both sides can add() them.
+It also drops the asked nodes and their counterparts that were deleted since
+(every node when asked about none), so a lookup never returns a deleted node.
+"""
+import fnmatch
+from collections import namedtuple
+
+import maya.cmds as cmds
+
+SIDES = ('l', 'r')
+MIRROR_AXIS = 'x'
+
+# mirror behaviors
+MIRROR_COPY = 'copy'                 # values copied as they are
+MIRROR_NEGATE = 'negate'             # translate negated, rotate and scale copied
+MIRROR_SWAP_LIMITS = 'swap_limits'   # translate limits swapped and negated, rotate limits copied
+
+# first matching pattern wins, MIRROR_COPY otherwise
+BEHAVIOR_RULES = [
+	('driven_*_endPos_*', MIRROR_SWAP_LIMITS),
+	('loc_*_pushPose_*', MIRROR_NEGATE),
+	('offset_*_push_*', MIRROR_NEGATE),
+]
+
+SymmetryEntry = namedtuple('SymmetryEntry', ['side', 'counterpart', 'axis', 'behavior'])
+
+
+def side_token(name):
+	"""Index of the first 'l' / 'r' token of a name, None for center and unsided nodes."""
+	for i, token in enumerate(name.split('_')):
+		if token in SIDES:
+			return i
+	return None
+
+
+def mirror_name(name):
+	"""Name of the other side, the name itself when it has no side token."""
+	index = side_token(name)
+	if index is None:
+		return name
+	tokens = name.split('_')
+	tokens[index] = 'r' if tokens[index] == 'l' else 'l'
+	return '_'.join(tokens)
+
+
+def mirror_behavior(name):
+	for pattern, value in BEHAVIOR_RULES:
+		if fnmatch.fnmatchcase(name, pattern):
+			return value
+	return MIRROR_COPY
+
+
+class SymmetryMap(object):
+
+	def __init__(self, nodes=()):
+		self._nodes = set()
+		self._entries = {}  # sided node -> SymmetryEntry
+		self.add(nodes)
+
+	@classmethod
+	def build(cls):
+		"""Index every transform and joint of the scene, one ls."""
+		return cls(cmds.ls(type='transform') or [])
+
+	def add(self, nodes):
+		"""Index nodes created after the map was built, pairing them with nodes already known."""
+		nodes = list(nodes)
+		self._nodes.update(nodes)
+		for node in nodes:
+			if side_token(node) is None:
+				continue
+			self._index(node)
+			other = mirror_name(node)
+			if other in self._nodes:
+				self._index(other)
+
+	def discard(self, nodes):
+		"""Forget deleted nodes, their counterparts are left without one."""
+		nodes = [node for node in nodes if node in self._nodes]
+		for node in nodes:
+			self._nodes.discard(node)
+			self._entries.pop(node, None)
+		for node in nodes:
+			other = mirror_name(node)
+			if other in self._entries:
+				self._index(other)
+
+	def validate(self, nodes=()):
+		"""Discard the nodes and counterparts that no longer exist, all of them when no nodes are given; one ls."""
+		if nodes:
+			known = [node for node in nodes if node in self._nodes]
+			check = set(known) | {self.counterpart(node) for node in known} - {None}
+		else:
+			check = set(self._nodes)
+		if not check:
+			return
+		missing = check - set(cmds.ls(list(check)) or [])
+		if missing:
+			self.discard(missing)
+
+	def _index(self, node):
+		other = mirror_name(node)
+		self._entries[node] = SymmetryEntry(node.split('_')[side_token(node)],
+											other if other in self._nodes else None,
+											MIRROR_AXIS, mirror_behavior(node))
+
+	def __contains__(self, node):
+		return node in self._nodes
+
+	def __len__(self):
+		return len(self._nodes)
+
+	# ======================
+	# Queries
+	# ======================
+
+	def entry(self, node):
+		"""SymmetryEntry of a sided node, None for center nodes and nodes the map does not know."""
+		return self._entries.get(node)
+
+	def counterpart(self, node):
+		entry = self._entries.get(node)
+		return entry.counterpart if entry else None
+
+	def on_side(self, node, side):
+		"""
+		node when it is on side (or has no side), its counterpart otherwise,
+		None when that does not exist.
+		"""
+		entry = self._entries.get(node)
+		if entry is None:
+			return node if node in self._nodes else None
+		return node if entry.side == side else entry.counterpart
+
+	def pairs(self, pattern=None, behavior=None):
+		"""
+		(left, right) of every left node with a counterpart, optionally filtered by name pattern
+		and mirror behavior. Left nodes without a right one are left out, see unpaired().
+		"""
+		out = []
+		for node, entry in self._entries.items():
+			if entry.side != 'l' or entry.counterpart is None:
+				continue
+			if pattern and not fnmatch.fnmatchcase(node, pattern):
+				continue
+			if behavior and entry.behavior != behavior:
+				continue
+			out.append((node, entry.counterpart))
+		return sorted(out)
+
+	def unpaired(self, side='l', pattern=None, behavior=None):
+		"""Nodes of side without a counterpart, filtered like pairs()."""
+		return sorted(node for node, entry in self._entries.items()
+					  if entry.side == side and entry.counterpart is None
+					  and (not pattern or fnmatch.fnmatchcase(node, pattern))
+					  and (not behavior or entry.behavior == behavior))
+
+
+_current = None
+
+
+def current(nodes=(), refresh=False):
+	"""
+	The session's symmetry map, built on first use.
+
+	Args:
+		nodes (list): nodes about to be looked up, the map is rebuilt if any of them is unknown
+			and validated against deletions otherwise.
+		refresh (bool): rebuild it, e.g. after a new rig was built.
+	"""
+	global _current
+	if _current is None or refresh or any(node not in _current for node in nodes):
+		_current = SymmetryMap.build()
+	else:
+		_current.validate(nodes)
+	return _current
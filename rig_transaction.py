@@ -0,0 +1,116 @@
+"""
+Build transaction: one undo chunk for the whole build and a clean rollback.
+
+	with BuildTransaction('catAutoRig', undo=False) as build:
+		master.construct_master()
+		...
+
+Every node that did not exist when the block started is tracked. If the block
+raises, those nodes are removed with one cmds.delete and the exception is
+re-raised, so a failed build leaves the scene as it was instead of half built.
+Pre-existing nodes the build parented under new nodes (e.g. 'geometry' under
+'master') are put back under their original parent first. Attribute edits and
+renames of pre-existing nodes are not rolled back.
+
+Nodes are told apart by UUID, not by name: a pre-existing node whose name is
+not unique, or that the build renamed or moved, is never taken for a new one.
+
+undo=False turns undo recording off for the build (faster, no undo queue
+growth) and restores the previous state afterwards; undo=True keeps recording
+inside a single chunk so the whole build is one Ctrl+Z.
+"""
+import time
+
+import maya.cmds as cmds
+
+import rig_name_cache
+
+
+class BuildTransaction(object):
+
+	def __init__(self, name='rigBuild', undo=True, rollback=True):
+		self.name = name
+		self.undo = undo
+		self.rollback = rollback
+		self.created = []
+		self.rolled_back = False
+		self.seconds = 0.0
+		self._before = None
+		self._undo_state = None
+		self._start = None
+
+	def __enter__(self):
+		self._start = time.perf_counter()
+		self._before = self._snapshot()
+		self._undo_state = cmds.undoInfo(q=True, state=True)
+		if self.undo:
+			cmds.undoInfo(openChunk=True, chunkName=self.name)
+		else:
+			cmds.undoInfo(stateWithoutFlush=False)
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		try:
+			self.created = self.created_nodes()
+			if exc_type is not None and self.rollback:
+				self._rollback()
+		finally:
+			if self.undo:
+				cmds.undoInfo(closeChunk=True)
+			else:
+				cmds.undoInfo(stateWithoutFlush=self._undo_state)
+			self.seconds = time.perf_counter() - self._start
+
+		if exc_type is not None:
+			state = f"rolled back {len(self.created)} nodes" if self.rolled_back else "not rolled back"
+			cmds.warning(f"❌ {self.name} failed after {self.seconds:.2f}s, {state}: {exc_value}")
+		return False
+
+	@staticmethod
+	def _snapshot():
+		"""UUID -> UUID of the parent (None for world and DG nodes) of every node in the scene."""
+		uuids = cmds.ls(uuid=True) or []
+		names = cmds.ls(long=True) or []
+		if len(names) != len(uuids):
+			# instanced paths listed more than once, pair them up node by node
+			names = [cmds.ls(uid, long=True)[0] for uid in uuids]
+		by_name = dict(zip(names, uuids))
+		return {uid: by_name.get(name.rsplit('|', 1)[0]) if '|' in name else None
+				for uid, name in zip(uuids, names)}
+
+	def created_uuids(self):
+		"""UUIDs of the nodes created since the transaction started."""
+		return [uid for uid in cmds.ls(uuid=True) or [] if uid not in self._before]
+
+	def created_nodes(self):
+		"""Long names of the nodes created since the transaction started."""
+		uuids = self.created_uuids()
+		return cmds.ls(uuids, long=True) or [] if uuids else []
+
+	def _restore_preexisting_children(self, created_transforms):
+		# only direct children of new nodes, nested pre-existing nodes move with their parent
+		for node in cmds.listRelatives(created_transforms, children=True, fullPath=True) or []:
+			uid = (cmds.ls(node, uuid=True) or [None])[0]
+			if uid not in self._before:
+				continue
+			parent_uuid = self._before[uid]
+			parent = (cmds.ls(parent_uuid, long=True) or [None])[0] if parent_uuid else None
+			if parent:
+				cmds.parent(node, parent)
+			else:
+				cmds.parent(node, world=True)
+
+	def _rollback(self):
+		uuids = self.created_uuids()
+		created = cmds.ls(uuids, long=True) or [] if uuids else []
+		if not created:
+			return
+		transforms = cmds.ls(created, transforms=True) or []
+		if transforms:
+			self._restore_preexisting_children(transforms)
+		# deleting a parent also deletes its children, so re-check before the single delete
+		remaining = cmds.ls(uuids, long=True) or []
+		if remaining:
+			cmds.delete(remaining)
+		rig_name_cache.reset()
+		self.rolled_back = True
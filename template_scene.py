@@ -0,0 +1,273 @@
+"""
+Record and reload the template scene the auto rig builds from.
+
+A template is the set of guide nodes an artist places before running main.py:
+temp_* joints, the spine/neck/tail curves, the loc_c_* locators and the bind
+skeleton under jnt_ROOT. record_template() stores them as JSON (local channel
+values plus curve CVs), load_template() recreates them in an empty scene, in
+Maya or in the memory backend.
+"""
+import json
+
+import maya.cmds as cmds
+
+TEMPLATE_VERSION = 1
+
+DEFAULT_TEMPLATE_ROOTS = ['temp_*', 'curve1', 'curve2', 'curve3', 'loc_c_*', 'jnt_ROOT']
+
+_CHANNELS = {
+	'transform': ('translate', 'rotate', 'scale'),
+	'joint': ('translate', 'rotate', 'scale', 'jointOrient'),
+}
+
+
+# ======================
+# Record / Load
+# ======================
+
+def _template_roots(patterns):
+	nodes = []
+	for pattern in patterns:
+		for node in cmds.ls(pattern, type='transform') or []:
+			if node not in nodes:
+				nodes.append(node)
+	# keep only top-most nodes, children are recorded with their root
+	node_set = set(nodes)
+	roots = []
+	for node in nodes:
+		parent = (cmds.listRelatives(node, parent=True) or [None])[0]
+		while parent and parent not in node_set:
+			parent = (cmds.listRelatives(parent, parent=True) or [None])[0]
+		if parent is None:
+			roots.append(node)
+	return roots
+
+
+def record_curve(shape):
+	"""Degree, form, knots and object space CVs of a nurbsCurve shape."""
+	info = cmds.createNode('curveInfo')
+	cmds.connectAttr(f'{shape}.worldSpace[0]', f'{info}.inputCurve')
+	knots = cmds.getAttr(f'{info}.knots[*]')
+	cmds.delete(info)
+
+	flat = cmds.xform(f'{shape}.cv[*]', q=True, os=True, t=True)
+	return {
+		'name': shape,
+		'type': 'nurbsCurve',
+		'degree': cmds.getAttr(f'{shape}.degree'),
+		'periodic': cmds.getAttr(f'{shape}.form') == 2,
+		'knots': list(knots or []),
+		'cvs': [flat[i:i + 3] for i in range(0, len(flat), 3)],
+	}
+
+
+def _record_node(node, parent):
+	node_type = cmds.nodeType(node)
+	record = {
+		'name': node,
+		'type': node_type,
+		'parent': parent,
+		'attrs': {},
+		'shapes': [],
+	}
+	for channel in _CHANNELS.get(node_type, _CHANNELS['transform']):
+		record['attrs'][channel] = list(cmds.getAttr(f'{node}.{channel}')[0])
+	if node_type == 'joint':
+		record['attrs']['radius'] = cmds.getAttr(f'{node}.radius')
+
+	for shape in cmds.listRelatives(node, shapes=True) or []:
+		shape_type = cmds.nodeType(shape)
+		if shape_type == 'nurbsCurve':
+			record['shapes'].append(record_curve(shape))
+		elif shape_type == 'locator':
+			record['shapes'].append({'name': shape, 'type': 'locator'})
+	return record
+
+
+def record_template(path=None, roots=None):
+	"""
+	Capture the template nodes of the open scene.
+
+	Args:
+		path (str): optional JSON file to write.
+		roots (list): node names or wildcards, defaults to DEFAULT_TEMPLATE_ROOTS.
+
+	Returns:
+		dict: template data, as accepted by load_template().
+	"""
+	nodes = []
+
+	def _walk(node, parent):
+		nodes.append(_record_node(node, parent))
+		for child in cmds.listRelatives(node, children=True, type='transform') or []:
+			_walk(child, node)
+
+	for root in _template_roots(roots or DEFAULT_TEMPLATE_ROOTS):
+		_walk(root, None)
+
+	data = {'version': TEMPLATE_VERSION, 'nodes': nodes}
+	if path:
+		with open(path, 'w') as f:
+			json.dump(data, f, indent=1)
+		print(f"✅ Template recorded: {len(nodes)} nodes -> {path}")
+	return data
+
+
+def create_curve_node(record, shape):
+	"""Curve transform named record['name'] with one shape rebuilt from record_curve() data."""
+	degree = shape['degree']
+	points = [list(p) for p in shape['cvs']]
+	if shape['periodic'] and degree > 1 and points[:degree] != points[-degree:]:
+		points += [list(p) for p in points[:degree]]
+	knots = shape.get('knots') or []
+	if len(knots) != len(points) + degree - 1:
+		knots = None
+
+	kwargs = {'d': degree, 'p': points, 'n': record['name']}
+	if knots:
+		kwargs['k'] = knots
+	if shape['periodic']:
+		kwargs['per'] = True
+		if not knots:
+			kwargs['k'] = list(range(-(degree - 1), len(points)))
+	node = cmds.curve(**kwargs)
+	curve_shape = cmds.listRelatives(node, shapes=True)[0]
+	cmds.rename(curve_shape, shape['name'])
+	return node
+
+
+def load_template(template):
+	"""
+	Recreate a recorded template in the open scene.
+
+	Args:
+		template (str | dict): JSON path or the dict returned by record_template().
+
+	Returns:
+		list: names of the created transforms.
+	"""
+	if isinstance(template, str):
+		with open(template, 'r') as f:
+			template = json.load(f)
+	if template.get('version') != TEMPLATE_VERSION:
+		raise ValueError(f"Unsupported template version: {template.get('version')}")
+
+	created = []
+	for record in template['nodes']:
+		shapes = record.get('shapes', [])
+		curve_shapes = [s for s in shapes if s['type'] == 'nurbsCurve']
+
+		if record['type'] == 'transform' and len(curve_shapes) == 1:
+			node = create_curve_node(record, curve_shapes[0])
+		else:
+			node = cmds.createNode(record['type'], n=record['name'])
+			for shape in shapes:
+				if shape['type'] == 'locator':
+					cmds.createNode('locator', n=shape['name'], p=node)
+		if node != record['name']:
+			cmds.warning(f"Template node {record['name']} was created as {node}")
+
+		if record.get('parent'):
+			cmds.parent(node, record['parent'], relative=True)
+		for attr, value in record['attrs'].items():
+			if isinstance(value, list):
+				cmds.setAttr(f'{node}.{attr}', *value)
+			else:
+				cmds.setAttr(f'{node}.{attr}', value)
+		created.append(node)
+
+	cmds.select(clear=True)
+	return created
+
+
+# ======================
+# Default Template
+# ======================
+# Synthetic cat proportions (Y up, facing +Z, left side on +X), used when no
+# recorded template is available, e.g. for benchmarks on the memory backend.
+
+DEFAULT_CURVES = {
+	'curve1': [(0, 20, -12), (0, 20.5, -4), (0, 21, 4), (0, 21, 10)],
+	'curve2': [(0, 22, 12), (0, 25, 15), (0, 28, 18), (0, 30, 20)],
+	'curve3': [(0, 20, -14), (0, 19, -22), (0, 18, -30), (0, 16, -40)],
+}
+
+DEFAULT_LOCATORS = {
+	'loc_c_neck_end_0001': (0, 33, 23),
+	'loc_c_cog_0001': (0, 20, 0),
+	'temp_l_loc_eye_0001': (1.5, 33, 25),
+}
+
+DEFAULT_LEGS = {
+	'ft': [('upperLeg', (4, 18, 9)), ('knee', (4, 11, 8)), ('ankle', (4, 5, 9)),
+		   ('ball', (4, 1, 10)), ('toe', (4, 0.5, 12)), ('toeEnd', (4, 0.3, 13.5))],
+	'bk': [('upperLeg', (4, 19, -11)), ('knee', (4, 12, -7)), ('ankle', (4, 5, -12)),
+		   ('ball', (4, 1, -10)), ('toe', (4, 0.5, -8)), ('toeEnd', (4, 0.3, -6.5))],
+}
+
+DEFAULT_TOES = {
+	'ft': ['thumb', 'index', 'middle', 'ring', 'pinky'],
+	'bk': ['index', 'middle', 'ring', 'pinky'],
+}
+
+# muscle source chains: (region, desc, [start, mid, end])
+DEFAULT_MUSCLES = [
+	('ft', 'tricep', [(4.5, 17, 8), (4.8, 14, 7.5), (4.5, 11.5, 7.8)]),
+	('bk', 'thigh', [(4.5, 18, -10), (4.9, 15, -8.5), (4.5, 12.5, -7.2)]),
+]
+
+
+def _create_chain(spec, secondary='yup', parent=None):
+	root = None
+	for name, pos in spec:
+		jnt = cmds.createNode('joint', n=name, p=parent) if parent else cmds.createNode('joint', n=name)
+		cmds.xform(jnt, ws=True, t=pos)
+		parent = jnt
+		root = root or jnt
+	cmds.joint(root, e=True, oj='xyz', sao=secondary, ch=True, zso=True)
+	return root
+
+
+def build_default_template():
+	"""Create the synthetic template in the open scene."""
+	for name, points in DEFAULT_CURVES.items():
+		cmds.curve(n=name, d=3, p=points)
+	for name, pos in DEFAULT_LOCATORS.items():
+		loc = cmds.spaceLocator(n=name)[0]
+		cmds.xform(loc, ws=True, t=pos)
+
+	for region, chain in DEFAULT_LEGS.items():
+		_create_chain([(f'temp_l_{region}_{part}_0001', pos) for part, pos in chain])
+
+		heel, toe_end = chain[2][1], chain[-1][1]
+		ball, toe = chain[3][1], chain[4][1]
+		_create_chain([(f'temp_l_{region}_heelPivot_0001', (heel[0], 0, heel[2] - 0.5)),
+					   (f'temp_l_{region}_toePivot_0001', (toe_end[0], 0, toe_end[2] + 0.5))])
+		_create_chain([(f'temp_l_{region}_footOutPivot_0001', (ball[0] + 1.5, 0, ball[2] + 1)),
+					   (f'temp_l_{region}_footInPivot_0001', (ball[0] - 1.5, 0, ball[2] + 1))])
+		_create_chain([(f'temp_l_{region}_toeRvs_0001', toe),
+					   (f'temp_l_{region}_ballRvs_0001', ball)])
+
+		for i, toe_name in enumerate(DEFAULT_TOES[region]):
+			x = ball[0] - 1.4 + i * 0.7
+			parts = ['metacarple', 'base', 'mid', 'tip', 'end']
+			_create_chain([(f'temp_l_{region}_{toe_name}_{part}_0001', (x, ball[1] - 0.2 * k, ball[2] + 0.8 * k))
+						   for k, part in enumerate(parts)])
+
+	_create_chain([('temp_l_scapula_0001', (3, 24, 8)), ('temp_l_scapula_end_0001', DEFAULT_LEGS['ft'][0][1])])
+
+	# muscle source chains, both sides
+	for region, desc, positions in DEFAULT_MUSCLES:
+		for side, sign in (('l', 1), ('r', -1)):
+			labels = ['', 'Mid', 'End']
+			_create_chain([(f'temp_{side}_{region}_{desc}{label}_0001', (pos[0] * sign, pos[1], pos[2]))
+						   for label, pos in zip(labels, positions)])
+
+	# bind skeleton the muscle and push setups parent into
+	root = cmds.createNode('joint', n='jnt_ROOT')
+	for region, chain in DEFAULT_LEGS.items():
+		for side, sign in (('l', 1), ('r', -1)):
+			_create_chain([(f'skel_{side}_{region}_{part}_0001', (pos[0] * sign, pos[1], pos[2]))
+						   for part, pos in chain[:3]], parent=root)
+
+	cmds.select(clear=True)
@@ -0,0 +1,15 @@
+"""
+The rig modules import maya.cmds; outside Maya the tests run them on the
+in-memory backend, see rig_backend.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rig_backend
+
+try:
+	import maya.cmds  # noqa: F401
+except ImportError:
+	rig_backend.use_memory_backend()
@@ -0,0 +1,71 @@
+"""The diff engine works on describe() dictionaries, checked without building a rig."""
+import copy
+
+import rig_components
+
+
+def _record(node_type, parent=None, **attrs):
+	return {'type': node_type, 'parent': parent, 'attrs': attrs, 'locked': [], 'hidden': [], 'user_attrs': {}}
+
+
+def _description():
+	return {
+		'nodes': {
+			'ctrl_c_tail_0001': _record('transform', 'grp_c_tailCtrls_0001', translateX=1.0, rotateY=-180.0),
+			'curveShape12': _record('nurbsCurve', 'ctrl_c_tail_0001', overrideEnabled=True, overrideColor=17),
+			'jnt_c_tail_0001_parentConstraint1': _record('parentConstraint', 'jnt_c_tail_0001', enableRestPosition=True),
+			'driven_c_tail_0001_rotateX': _record('animCurveUA'),
+		},
+		'connections': {
+			'jnt_c_tail_0001_parentConstraint1.target[0].targetParentMatrix': 'ctrl_c_tail_0001.parentMatrix[0]',
+			'driven_c_tail_0001_rotateX.input': 'ctrl_c_tail_0001.rotateX',
+		},
+	}
+
+
+def test_unchanged_description_has_empty_diff():
+	result = rig_components.diff(_description(), _description())
+	assert not result
+	assert result.requires_rebuild == []
+
+
+def test_renamed_shape_is_matched():
+	old = _description()
+	new = copy.deepcopy(old)
+	new['nodes']['curveShape57'] = new['nodes'].pop('curveShape12')
+	assert rig_components._match_shapes(old['nodes'], new['nodes']) == {'curveShape12': 'curveShape57'}
+
+	result = rig_components.diff(old, new)
+	assert result.renamed == {'curveShape12': 'curveShape57'}
+	assert result.added == [] and result.removed == [] and result.changed == {}
+
+
+def test_angles_compare_modulo_360():
+	assert rig_components._same_value('rotateY', -180.0, 180.0)
+	assert rig_components._same_value('jointOrientZ', 359.99999, 0.0)
+	assert not rig_components._same_value('translateX', -180.0, 180.0)
+	assert not rig_components._same_value('rotateY', 0.0, 90.0)
+
+	new = _description()
+	new['nodes']['ctrl_c_tail_0001']['attrs']['rotateY'] = 180.0
+	assert not rig_components.diff(_description(), new)
+
+
+def test_plain_change_is_patched():
+	new = _description()
+	new['nodes']['ctrl_c_tail_0001']['attrs']['translateX'] = 2.0
+	result = rig_components.diff(_description(), new)
+	assert result.changed == {'ctrl_c_tail_0001.translateX': (1.0, 2.0)}
+	assert result.requires_rebuild == []
+
+
+def test_touched_constraint_requires_rebuild():
+	new = _description()
+	new['nodes']['jnt_c_tail_0001_parentConstraint1']['attrs']['enableRestPosition'] = False
+	assert rig_components.diff(_description(), new).requires_rebuild == ['jnt_c_tail_0001_parentConstraint1']
+
+
+def test_touched_anim_curve_requires_rebuild():
+	new = _description()
+	new['connections']['driven_c_tail_0001_rotateX.input'] = 'ctrl_c_tail_0001.rotateZ'
+	assert rig_components.diff(_description(), new).requires_rebuild == ['driven_c_tail_0001_rotateX']
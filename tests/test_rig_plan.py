@@ -0,0 +1,48 @@
+"""Planners are pure Python, checked without a scene."""
+import rig_plan
+
+JOINTS = {'upperleg': 'jnt_l_ft_upperleg_0001', 'knee': 'jnt_l_ft_knee_0001', 'ankle': 'jnt_l_ft_ankle_0001',
+		  'upperleg_ik_parent': 'jnt_l_scapula_0001'}
+
+
+def _twist_fractions(plan, segment):
+	"""multiplyDivide input2 values of a segment, in joint order."""
+	return [op[2] for op in plan.ops
+			if op[0] == 'set' and op[1].startswith(f'mult_l_ft_{segment}TwistDriver_') and '.input2' in op[1]]
+
+
+def test_twist_weights():
+	assert rig_plan.plan_twist('l', 'ft', 5)['weights'] == [0.25, 0.5, 0.75]
+
+
+def test_twist_fractions_reversed_for_upper_leg():
+	plan = rig_plan.plan_twist_build('l', 'ft', 5, JOINTS)
+	assert _twist_fractions(plan, 'knee') == [0.25, 0.5, 0.75]
+	assert _twist_fractions(plan, 'upperleg') == [0.75, 0.5, 0.25]
+
+
+def test_no_twist_joints_plans_nothing():
+	assert len(rig_plan.plan_twist_build('l', 'ft', 0, JOINTS)) == 0
+
+
+def test_tail_sub_ctrls_every_third_joint():
+	names = rig_plan.tail_names(9)
+	plan = rig_plan.plan_tail_sub_ctrls(names['joints'], 'grp_c_tailCtrls_0001', names['driven'], names['ctrls'])
+	matched = [op[5] for op in plan.ops if op[0] == 'control']
+	assert matched == [names['joints'][i] for i in (0, 3, 6)]
+
+
+def test_json_round_trip():
+	plan = rig_plan.plan_twist_build('l', 'ft', 5, JOINTS)
+	loaded = rig_plan.RigPlan.from_json(plan.to_json())
+	assert loaded == plan
+	assert plan.diff(loaded) == []
+
+
+def test_cached_second_call_is_a_hit():
+	rig_plan.clear_cache()
+	first = rig_plan.cached(rig_plan.plan_twist_build, 'l', 'ft', 5, JOINTS)
+	second = rig_plan.cached(rig_plan.plan_twist_build, 'l', 'ft', 5, JOINTS)
+	assert second is first
+	assert rig_plan.stats == {'hits': 1, 'misses': 1}
+	rig_plan.clear_cache()